@@ -9,9 +9,7 @@ from pydantic import BaseModel
 import uvicorn
 import os
 from dotenv import load_dotenv
-import yfinance as yf
-import google.generativeai as genai
-import pandas as pd
+from functools import lru_cache
 from typing import List, Optional
 import logging
 
@@ -40,12 +38,20 @@ app.add_middleware(
 
 # Gemini API 설정
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash')
-else:
+if not GEMINI_API_KEY:
     logger.warning("GEMINI_API_KEY가 설정되지 않았습니다.")
 
+
+# yfinance / google.generativeai는 import만으로 시작 시간 대부분을 차지하므로 처음 사용할 때 불러옴
+@lru_cache(maxsize=1)
+def get_gemini_model():
+    """Gemini 모델 (키가 없으면 None)"""
+    if not GEMINI_API_KEY:
+        return None
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel('gemini-2.5-flash')
+
 # Pydantic 모델
 class ETFInfo(BaseModel):
     symbol: str
@@ -77,6 +83,7 @@ async def health_check():
 @app.post("/api/etf/info", response_model=ETFInfo)
 async def get_etf_info(symbol: str):
     """단일 ETF 정보 조회"""
+    import yfinance as yf
     try:
         ticker = yf.Ticker(symbol)
         info = ticker.info
@@ -106,6 +113,7 @@ async def get_etf_info(symbol: str):
 @app.post("/api/etf/compare", response_model=ETFComparison)
 async def compare_etfs(request: ETFSearchRequest):
     """여러 ETF 비교 분석"""
+    import yfinance as yf
     try:
         etf_data = []
         
@@ -140,7 +148,8 @@ async def compare_etfs(request: ETFSearchRequest):
         
         # Gemini AI를 사용한 분석
         analysis = ""
-        if GEMINI_API_KEY and model:
+        model = get_gemini_model()
+        if model:
             try:
                 etf_summary = "\n".join([
                     f"- {etf.symbol}: {etf.name}, 가격: ${etf.price}, 변동률: {etf.change_percent}%"
@@ -175,6 +184,7 @@ async def get_popular_etfs():
     popular_symbols = [
         "SPY", "QQQ", "VTI", "VEA", "VWO", "AGG", "BND", "GLD", "SLV", "IWM"
     ]
+    import yfinance as yf
     
     try:
         etf_data = []
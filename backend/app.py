@@ -1,39 +1,48 @@
 from flask import Flask, jsonify, request
 import logging
-import traceback
-import yfinance as yf
+import csv
 import os
 from dotenv import load_dotenv
 import pathlib
-import google.generativeai as genai
+import time
+from datetime import datetime, timezone
 import pandas as pd
 
-# .env는 반드시 최상단에서 로드하고 키 존재여부를 출력
+# .env는 반드시 최상단에서 로드 (로깅 설정도 환경변수를 읽음)
 env_path = pathlib.Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
-key = os.getenv("GEMINI_API_KEY")
-print("Gemini key present?", bool(key))
-print("Gemini key raw value:", repr(key))
 
-# Gemini API 설정 (전역 1회 설정)
+from log_config import configure_app_logger, setup_logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# yfinance / Gemini SDK는 처음 사용할 때(또는 백그라운드 워밍업에서) 불러오고 설정함
+# (업스트림 주소 재정의 YF_BASE_URL / GEMINI_BASE_URL도 이때 적용, warmup.py)
+from upstream_config import gemini_configure_kwargs
+from warmup import genai, yf
+import warmup
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+logger.info("Gemini key present? %s", bool(GEMINI_API_KEY))
 from flask_cors import CORS
+import concurrency
+import metrics
+import holdings
+import price_panel
+import profiling
+import quotes
+import resilience
+from cache import SWRCache, TTLCache
+from cache_snapshot import CacheSnapshot
+from holdings_store import holdings_store
+from master_data import MasterData
+from ticker_resolver import UnknownTicker, normalize, resolver
 
 app = Flask(__name__)
-CORS(app)
-# 로깅을 앱 생성 직후 초기화 (force로 기존 핸들러도 재설정)
-logging.basicConfig(level=logging.DEBUG, force=True)
-app.logger.setLevel(logging.DEBUG)
-# 기존 핸들러 레벨도 상향
-for _h in app.logger.handlers:
-    try:
-        _h.setLevel(logging.DEBUG)
-    except Exception:
-        pass
-# werkzeug 로거도 정렬
-logging.getLogger('werkzeug').setLevel(logging.DEBUG)
+CORS(app, expose_headers=['Age', 'X-Data-Fetched-At', 'X-Data-Stale'])
+metrics.init_app(app)
+profiling.init_app(app)
+configure_app_logger(app)
 
 # 안전한 JSON 파서 유틸리티
 def safe_parse_json(text: str, fallback_key: str = "common"):
@@ -50,77 +59,81 @@ def safe_parse_json(text: str, fallback_key: str = "common"):
                 return {fallback_key: (text or "모델 응답 파싱 실패")[:500]}
         return {fallback_key: (text or "모델 응답 없음")[:500]}
 
-# 파일 로그 핸들러 추가 (백업 경로)
-try:
-    import os
-    os.makedirs(os.path.join(os.path.dirname(__file__), 'logs'), exist_ok=True)
-    _fh = logging.FileHandler(os.path.join(os.path.dirname(__file__), 'logs', 'app.log'), encoding='utf-8')
-    _fh.setLevel(logging.DEBUG)
-    _fmt = logging.Formatter('%(asctime)s %(levelname)s %(name)s - %(message)s')
-    _fh.setFormatter(_fmt)
-    app.logger.addHandler(_fh)
-except Exception:
-    pass
-
-# 1. CSV 파일에서 국내 ETF 데이터 로드
-try:
-    # 여러 인코딩을 시도하여 CSV 파일 로드
-    encodings = ['utf-8', 'cp949', 'euc-kr', 'latin-1']
-    korean_etf_df = None
-    
-    for encoding in encodings:
+# 1. CSV 파일에서 국내/해외 ETF 데이터 로드
+CSV_ENCODINGS = ['utf-8', 'cp949', 'euc-kr', 'latin-1']
+KOREAN_CSV_COLUMNS = ['Name', 'Ticker/Code', 'Type', 'Market', 'Category', 'SubCategory', 'Country', 'Status', 'NetAssets', 'TradingVolume']
+OVERSEAS_CSV_COLUMNS = ['Ticker/Code', 'Name', 'Market']
+
+
+def load_korean_etf_csv(path: str = 'k-etf_etfs.csv.csv') -> pd.DataFrame:
+    """국내 ETF CSV를 여러 인코딩으로 시도하여 로드합니다."""
+    for encoding in CSV_ENCODINGS:
         try:
             # CSV 파일의 첫 번째 줄을 건너뛰고 로드 (헤더가 잘못된 형식)
-            korean_etf_df = pd.read_csv('k-etf_etfs.csv.csv', encoding=encoding, skiprows=1, 
-                                       names=['Name', 'Ticker/Code', 'Type', 'Market', 'Category', 'SubCategory', 'Country', 'Status', 'NetAssets', 'TradingVolume'])
-            print(f"✅ 국내 ETF 데이터 로드 완료 ({encoding}): {len(korean_etf_df)}개 ETF")
-            break
+            # 각 행 전체가 따옴표로 감싸져 있으므로 따옴표 처리를 끄고 읽은 뒤 양끝 따옴표를 제거
+            df = pd.read_csv(path, encoding=encoding, skiprows=1, names=KOREAN_CSV_COLUMNS,
+                             quoting=csv.QUOTE_NONE, dtype={'Ticker/Code': str})
         except UnicodeDecodeError:
             continue
-    
-    if korean_etf_df is None:
-        raise Exception("모든 인코딩 시도 실패")
-        
-    # Ticker/Code 컬럼을 문자열로 변환하여 검색 오류 방지
-    korean_etf_df['Ticker/Code'] = korean_etf_df['Ticker/Code'].astype(str)
-    
-except FileNotFoundError:
-    print("!!! WARNING: k-etf_etfs.csv.csv not found. Domestic search will not work.")
-    korean_etf_df = pd.DataFrame()
-except Exception as e:
-    print(f"!!! ERROR: 국내 CSV 파일 로드 실패: {e}")
-    korean_etf_df = pd.DataFrame()
-
-# 2. CSV 파일에서 해외 ETF 데이터 로드
-try:
-    # 여러 인코딩을 시도하여 해외 ETF CSV 파일 로드
-    encodings = ['utf-8', 'cp949', 'euc-kr', 'latin-1']
-    overseas_etf_df = None
-    
-    for encoding in encodings:
+        df['Name'] = df['Name'].str.lstrip('"')
+        df['TradingVolume'] = pd.to_numeric(df['TradingVolume'].astype(str).str.rstrip('"'), errors='coerce')
+        # Ticker/Code 컬럼을 문자열로 변환하여 검색 오류 방지
+        df['Ticker/Code'] = df['Ticker/Code'].astype(str)
+        app.logger.info("✅ 국내 ETF 데이터 로드 완료 (%s): %s개 ETF", encoding, len(df))
+        return df
+    raise Exception("모든 인코딩 시도 실패")
+
+
+def load_overseas_etf_csv(path: str = 'i-etf_etfs.csv') -> pd.DataFrame:
+    """해외 ETF CSV를 여러 인코딩으로 시도하여 로드합니다."""
+    for encoding in CSV_ENCODINGS:
         try:
             # CSV 파일의 첫 번째 줄을 건너뛰고 로드 (헤더가 잘못된 형식)
-            overseas_etf_df = pd.read_csv('i-etf_etfs.csv', encoding=encoding, skiprows=1, 
-                                         names=['Name', 'Ticker/Code', 'Type', 'Market', 'Category', 'SubCategory', 'Country', 'Status', 'NetAssets', 'TradingVolume'])
-            print(f"✅ 해외 ETF 데이터 로드 완료 ({encoding}): {len(overseas_etf_df)}개 ETF")
-            break
+            # 해외 CSV 컬럼 순서: Ticker/Code, Name, 거래소
+            df = pd.read_csv(path, encoding=encoding, skiprows=1, names=OVERSEAS_CSV_COLUMNS, dtype=str)
         except UnicodeDecodeError:
             continue
-    
-    if overseas_etf_df is None:
-        raise Exception("모든 인코딩 시도 실패")
-        
-    # Ticker/Code 컬럼을 문자열로 변환하여 검색 오류 방지
-    overseas_etf_df['Ticker/Code'] = overseas_etf_df['Ticker/Code'].astype(str)
-    
-except FileNotFoundError:
-    print("!!! WARNING: i-etf_etfs.csv not found. Overseas search will not work.")
-    overseas_etf_df = pd.DataFrame()
-except Exception as e:
-    print(f"!!! ERROR: 해외 CSV 파일 로드 실패: {e}")
-    overseas_etf_df = pd.DataFrame()
+        df['Ticker/Code'] = df['Ticker/Code'].astype(str)
+        app.logger.info("✅ 해외 ETF 데이터 로드 완료 (%s): %s개 ETF", encoding, len(df))
+        return df
+    raise Exception("모든 인코딩 시도 실패")
+
+
+KOREAN_CSV_PATH = 'k-etf_etfs.csv.csv'
+OVERSEAS_CSV_PATH = 'i-etf_etfs.csv'
+
+
+def load_master_frames():
+    """국내/해외 ETF CSV를 읽어 (국내, 해외) 프레임 반환 (실패한 쪽은 빈 프레임)"""
+    try:
+        korean_etf_df = load_korean_etf_csv(KOREAN_CSV_PATH)
+    except FileNotFoundError:
+        app.logger.warning("!!! WARNING: k-etf_etfs.csv.csv not found. Domestic search will not work.")
+        korean_etf_df = pd.DataFrame()
+    except Exception as e:
+        app.logger.error("!!! ERROR: 국내 CSV 파일 로드 실패: %s", e)
+        korean_etf_df = pd.DataFrame()
+
+    # 2. CSV 파일에서 해외 ETF 데이터 로드
+    try:
+        overseas_etf_df = load_overseas_etf_csv(OVERSEAS_CSV_PATH)
+    except FileNotFoundError:
+        app.logger.warning("!!! WARNING: i-etf_etfs.csv not found. Overseas search will not work.")
+        overseas_etf_df = pd.DataFrame()
+    except Exception as e:
+        app.logger.error("!!! ERROR: 해외 CSV 파일 로드 실패: %s", e)
+        overseas_etf_df = pd.DataFrame()
+
+    return korean_etf_df, overseas_etf_df
+
 
 # 하드코딩된 OVERSEAS_ETF_LIST 제거됨 - 이제 i-etf_etfs.csv 파일을 사용
+# 요청은 master.current 스냅샷을 읽고, 재적재는 스냅샷을 통째로 교체 (master_data.py)
+master = MasterData(load_master_frames, paths=[KOREAN_CSV_PATH, OVERSEAS_CSV_PATH])
+
+# 티커 해석기 색인 (입력 -> yfinance / KIS 심볼)
+resolver.load_master(master.current.korean, master.current.overseas)
+
 
 # 2. 새로운 API 엔드포인트: ETF 검색
 @app.route('/api/search', methods=['GET'])
@@ -133,21 +146,17 @@ def search_etfs():
         return jsonify([])  # 검색어가 없으면 빈 리스트 반환
 
     results = []
+    snapshot = master.current
     
     if market == 'domestic':
-        # DataFrame에서 검색 (Name 또는 Ticker/Code 컬럼)
-        if not korean_etf_df.empty:
+        # 마스터 검색 색인에서 검색 (Name 또는 Ticker/Code 부분 문자열)
+        if not snapshot.korean.empty:
             try:
-                mask = (korean_etf_df['Name'].str.lower().str.contains(keyword, na=False)) | \
-                       (korean_etf_df['Ticker/Code'].str.lower().str.contains(keyword, na=False))
-                
-                # 컬럼명을 프론트엔드가 기대하는 형식으로 변경 ('ticker', 'name')
-                filtered_df = korean_etf_df[mask].rename(columns={'Ticker/Code': 'ticker', 'Name': 'name'})
-                results = filtered_df[['ticker', 'name']].to_dict('records')
-                
-                print(f"[SEARCH] 국내 ETF 검색 (CSV): '{keyword}' -> {len(results)}개 결과")
+                results = snapshot.search['domestic'].search(keyword)
+
+                app.logger.debug("[SEARCH] 국내 ETF 검색 (CSV): '%s' -> %s개 결과", keyword, len(results))
             except Exception as e:
-                print(f"[ERROR] 국내 ETF 검색 오류: {e}")
+                app.logger.error("[ERROR] 국내 ETF 검색 오류: %s", e)
                 results = []
         else:
             # CSV 로드 실패 시 fallback 데이터 사용
@@ -172,22 +181,17 @@ def search_etfs():
                 etf for etf in fallback_korean_etfs 
                 if keyword in etf['ticker'].lower() or keyword in etf['name'].lower()
             ]
-            print(f"[SEARCH] 국내 ETF 검색 (Fallback): '{keyword}' -> {len(results)}개 결과")
+            app.logger.debug("[SEARCH] 국내 ETF 검색 (Fallback): '%s' -> %s개 결과", keyword, len(results))
             
     elif market == 'overseas':
-        # 해외 ETF는 DataFrame에서 검색
-        if not overseas_etf_df.empty:
+        # 해외 ETF도 마스터 검색 색인에서 검색
+        if not snapshot.overseas.empty:
             try:
-                mask = (overseas_etf_df['Name'].str.lower().str.contains(keyword, na=False)) | \
-                       (overseas_etf_df['Ticker/Code'].str.lower().str.contains(keyword, na=False))
-                
-                # 컬럼명을 프론트엔드가 기대하는 형식으로 변경 ('ticker', 'name')
-                filtered_df = overseas_etf_df[mask].rename(columns={'Ticker/Code': 'ticker', 'Name': 'name'})
-                results = filtered_df[['ticker', 'name']].to_dict('records')
-                
-                print(f"[SEARCH] 해외 ETF 검색 (CSV): '{keyword}' -> {len(results)}개 결과")
+                results = snapshot.search['overseas'].search(keyword)
+
+                app.logger.debug("[SEARCH] 해외 ETF 검색 (CSV): '%s' -> %s개 결과", keyword, len(results))
             except Exception as e:
-                print(f"[ERROR] 해외 ETF 검색 오류: {e}")
+                app.logger.error("[ERROR] 해외 ETF 검색 오류: %s", e)
                 results = []
         else:
             # CSV 로드 실패 시 fallback 데이터 사용
@@ -208,10 +212,10 @@ def search_etfs():
                 etf for etf in fallback_overseas_etfs 
                 if keyword in etf['ticker'].lower() or keyword in etf['name'].lower()
             ]
-            print(f"[SEARCH] 해외 ETF 검색 (Fallback): '{keyword}' -> {len(results)}개 결과")
+            app.logger.debug("[SEARCH] 해외 ETF 검색 (Fallback): '%s' -> %s개 결과", keyword, len(results))
     else:
         # 잘못된 market 파라미터인 경우 빈 결과 반환
-        print(f"[WARNING] 잘못된 market 파라미터: {market}")
+        app.logger.warning("[WARNING] 잘못된 market 파라미터: %s", market)
         results = []
 
     return jsonify(results)
@@ -220,6 +224,115 @@ def search_etfs():
 def test_connection():
     return jsonify({"message": "Success! Backend server is running."})
 
+# 조회 결과 캐시 (stale-while-revalidate: fresh_ttl이 지나면 즉시 응답 후 백그라운드 갱신)
+info_cache = SWRCache('etf_info', fresh_ttl=300, ttl=24 * 3600, maxsize=2048)
+history_response_cache = SWRCache('etf_history', fresh_ttl=600, ttl=24 * 3600, maxsize=2048, cacheable=bool)
+# 같은 ETF 조합의 AI 요약 재사용 (키: 정렬한 (티커, 이름) 목록)
+ai_summary_cache = TTLCache('ai_summary', ttl=float(os.getenv('AI_SUMMARY_TTL', 6 * 3600)), maxsize=1024)
+
+# 재시작 후에도 자주 쓰는 캐시를 디스크 스냅샷에서 복원 (원래 만료 시각 유지)
+cache_snapshot = CacheSnapshot([quotes.quote_cache, info_cache, holdings.holdings_cache, ai_summary_cache])
+cache_snapshot.restore()
+
+
+def universe() -> list:
+    """현재 마스터 스냅샷의 국내+해외 ETF yfinance 티커 목록 (스캐너 / 종가 패널 공용)"""
+    from scanner import universe_tickers
+
+    snapshot = master.current
+    return universe_tickers(snapshot.korean, snapshot.overseas)
+
+
+def start_worker_tasks() -> None:
+    """워커 프로세스당 한 번: CSV 감시, 캐시 스냅샷 주기 저장, SDK/라우트 모듈 백그라운드 워밍업(/readyz),
+    공유 종가 패널 갱신 (쓰기는 lock을 잡은 워커 하나만), 워커 간 메트릭 합산용 파일 기록"""
+    metrics.start()
+    master.start_watcher()
+    cache_snapshot.start()
+    warmup.start()
+    price_panel.panel.start(universe)
+
+
+if os.getenv('SERVER_PRELOAD') == '1':
+    # gunicorn --preload: 이 모듈은 arbiter에서 한 번 불러오고 워커는 fork로 메모리를 공유
+    # SDK/라우트 모듈도 여기서 불러 두고, 스레드는 fork 후 따라오지 않으므로
+    # 워커마다 post_worker_init 훅(gunicorn.conf.py)에서 start_worker_tasks()를 호출
+    warmup.warm_up()
+    if os.getenv('PRELOAD_UNIVERSE', 'false').lower() == 'true':
+        from scanner import refresh_universe
+        refresh_universe(universe())
+else:
+    start_worker_tasks()
+
+
+@master.on_change
+def refresh_master_indexes(snapshot, changes):
+    """마스터 변경 시 해석기 색인을 교체하고 바뀐 티커의 캐시만 무효화"""
+    from scanner import universe_scanner
+
+    resolver.load_master(snapshot.korean, snapshot.overseas)
+    tickers = changes.tickers
+    dropped = resolver.forget(tickers)
+    for cache in (info_cache, holdings.holdings_cache, quotes.quote_cache):
+        dropped += cache.discard(lambda key: normalize(key) in tickers)
+    dropped += history_response_cache.discard(lambda key: normalize(key[0]) in tickers)
+    app.logger.info("[master] invalidated %d cache entries for %d changed tickers", dropped, len(tickers))
+
+    if changes.added or changes.removed:
+        price_panel.panel.wake()
+        if universe_scanner.ready:
+            _start_universe_refresh()
+
+
+def with_freshness(response, age: float, stale: bool):
+    """응답 데이터의 나이(Age), 적재 시각, stale 여부를 헤더로 표시"""
+    fetched_at = datetime.fromtimestamp(time.time() - age, tz=timezone.utc)
+    response.headers['Age'] = str(int(age))
+    response.headers['X-Data-Fetched-At'] = fetched_at.isoformat(timespec='seconds')
+    if stale:
+        response.headers['X-Data-Stale'] = 'true'
+    return response
+
+
+def load_cached(cache: SWRCache, key, loader):
+    """SWR 캐시 조회. 적재가 업스트림 장애로 실패하면 만료된 값이라도 반환. (값, 나이, stale 여부)"""
+    try:
+        value, age = cache.get_or_load(key, loader)
+        return value, age, age > cache.fresh_ttl
+    except resilience.UpstreamUnavailable:
+        value = cache.get_stale(key)
+        if value is None:
+            raise
+        return value, cache.age(key), True
+
+
+def get_holdings(symbol) -> tuple:
+    """정규화된 보유종목 (Holdings, 나이, stale 여부). 정보/보유종목/AI 분석 라우트가 같은 캐시를 사용"""
+    return load_cached(holdings.holdings_cache, symbol.display, lambda: holdings.load(symbol))
+
+
+def load_etf_info(symbol) -> dict:
+    """yfinance에서 ETF 이름을 읽고 보유종목 서비스의 상위 10개와 합쳐 응답 형태로 구성
+
+    캐시 키가 정규화된 심볼이므로 응답의 ticker도 입력 철자가 아닌 symbol.display
+    """
+    etf = yf.Ticker(symbol.yf)
+    info = resilience.call('yfinance', 'info', lambda: etf.info)
+    if not info or not (info.get('quoteType') or info.get('longName') or info.get('shortName')):
+        # 없는 심볼 (yfinance가 빈 info를 돌려줌)
+        return None
+    try:
+        top = get_holdings(symbol)[0].top(10)
+    except resilience.UpstreamUnavailable:
+        top = []  # 보유종목 출처 장애는 이름 조회까지 실패시키지 않음
+    return {
+        "ticker": symbol.display,
+        "name": info.get('longName', symbol.display),
+        # 일부 종목은 holdings가 없을 수 있음
+        "holdings": top
+    }
+
+
 @app.route('/api/etf/info', methods=['GET'])
 def get_etf_info():
     """쿼리 파라미터로 받은 티커의 상세 정보를 yfinance로 조회하여 반환합니다."""
@@ -227,48 +340,21 @@ def get_etf_info():
     if not ticker_code:
         return jsonify({"error": "Ticker is required"}), 400
 
-    full_ticker = f"{ticker_code}.KS"
-
+    full_ticker = ticker_code  # 해석 전 실패 시 오류 메시지용
     try:
-        etf = yf.Ticker(full_ticker)
-
-        # 보유 종목 정보 가져오기
-        holdings_df = getattr(etf, 'holdings', None)
-        if holdings_df is None:
-            # 일부 종목은 holdings가 없을 수 있음
-            return jsonify({
-                "ticker": ticker_code,
-                "name": etf.info.get('longName', ticker_code),
-                "holdings": []
-            })
-
-        holdings_df = holdings_df.reset_index()
-        # 예상 컬럼명에 맞춰 매핑 시도
-        rename_map = {}
-        if 'Stock' in holdings_df.columns:
-            rename_map['Stock'] = 'name'
-        if 'Holdings' in holdings_df.columns:
-            rename_map['Holdings'] = 'name'
-        if 'Weight' in holdings_df.columns:
-            rename_map['Weight'] = 'weight'
-        if rename_map:
-            holdings_df = holdings_df.rename(columns=rename_map)
-
-        if 'weight' in holdings_df.columns:
-            try:
-                holdings_df['weight'] = holdings_df['weight'].astype(float) * 100
-            except Exception:
-                pass
-
-        records = holdings_df.to_dict('records')
-
-        response_data = {
-            "ticker": ticker_code,
-            "name": etf.info.get('longName', ticker_code),
-            "holdings": records[:10]
-        }
-        return jsonify(response_data)
+        # 마스터에 없는 국내 코드는 .KS -> .KQ 순으로 시도, 없는 티커는 일정 시간 바로 404
+        symbol = resolver.resolve(ticker_code)
+        full_ticker = symbol.yf
+        response_data, age, stale = load_cached(
+            info_cache, symbol.display, lambda: resolver.lookup(ticker_code, load_etf_info)[1])
+        if response_data is None:
+            return jsonify({"error": f"Unknown ticker: {ticker_code}"}), 404
+        return with_freshness(jsonify(response_data), age, stale)
 
+    except UnknownTicker:
+        return jsonify({"error": f"Unknown ticker: {ticker_code}"}), 404
+    except resilience.UpstreamUnavailable as e:
+        return jsonify({"error": f"Data source temporarily unavailable for {full_ticker}: {e.reason}"}), 503
     except Exception as e:
         return jsonify({"error": f"Failed to fetch data for {full_ticker}: {str(e)}"}), 404
 
@@ -289,9 +375,26 @@ def get_featured_etfs():
 @app.route('/ping', methods=['GET'])
 def ping():
     app.logger.debug("Ping endpoint hit")
-    print("Ping print() hit", flush=True)
     return "pong"
 
+def serialize_history(hist: pd.DataFrame) -> list:
+    """OHLCV 히스토리를 [{date, open, close, volume}] 목록으로 변환합니다."""
+    history_data = []
+    for date, row in hist.iterrows():
+        history_data.append({
+            "date": date.strftime('%Y-%m-%d'),
+            "open": round(float(row['Open']), 2),
+            "close": round(float(row['Close']), 2),
+            "volume": int(row['Volume'])
+        })
+    return history_data
+
+
+def load_etf_history(ticker: str, period: str) -> list:
+    hist = resilience.call('yfinance', 'history', yf.Ticker(ticker).history, period=period)
+    return serialize_history(hist)
+
+
 # ETF 히스토리 데이터 API 엔드포인트
 @app.route('/api/etf/history', methods=['GET'])
 def get_etf_history():
@@ -303,44 +406,48 @@ def get_etf_history():
         if not ticker:
             return jsonify({"error": "Ticker parameter is required"}), 400
         
-        app.logger.debug(f"[etf_history] Fetching history for ticker: {ticker}, period: {period}")
+        app.logger.debug("[etf_history] Fetching history for ticker: %s, period: %s", ticker, period)
         
-        # yFinance로 히스토리 데이터 가져오기
-        etf = yf.Ticker(ticker)
-        hist = etf.history(period=period)
+        # 최근에 데이터가 없었던 티커는 업스트림 호출 없이 바로 응답
+        symbol = resolver.resolve(ticker)
+
+        # yFinance 히스토리 (캐시가 오래됐으면 즉시 응답하고 백그라운드 갱신)
+        # 069500 / 069500.KS / A069500이 한 항목을 쓰도록 해석한 심볼로 키를 만듦
+        history_data, age, stale = load_cached(
+            history_response_cache, (symbol.display, period),
+            lambda: resolver.lookup(ticker, lambda s: load_etf_history(s.yf, period) or None)[1])
         
-        if hist.empty:
-            app.logger.warning(f"[etf_history] No history data for ticker: {ticker}, period: {period}")
+        if not history_data:
+            app.logger.warning("[etf_history] No history data for ticker: %s, period: %s", ticker, period)
             return jsonify({"error": "No data found"}), 400
         
-        # DataFrame을 JSON 배열로 변환
-        history_data = []
-        for date, row in hist.iterrows():
-            history_data.append({
-                "date": date.strftime('%Y-%m-%d'),
-                "open": round(float(row['Open']), 2),
-                "close": round(float(row['Close']), 2),
-                "volume": int(row['Volume'])
-            })
-        
-        app.logger.debug(f"[etf_history] Successfully fetched {len(history_data)} records for {ticker}")
+        app.logger.debug("[etf_history] Serving %s records for %s (age %.0fs)", len(history_data), ticker, age)
         
-        return jsonify(history_data)
+        return with_freshness(jsonify(history_data), age, stale)
         
+    except UnknownTicker as e:
+        app.logger.debug("[etf_history] %s", e)
+        return jsonify({"error": "No data found"}), 400
+    except resilience.UpstreamUnavailable as e:
+        app.logger.warning("[etf_history] %s", e)
+        return jsonify({"error": "Data source temporarily unavailable"}), 503
     except Exception as e:
-        app.logger.error(f"[etf_history] Error fetching ETF history: {e}\n{traceback.format_exc()}")
+        if resilience.is_data_error(e):
+            app.logger.warning("[etf_history] No history data for ticker: %s, period: %s (%s)", ticker, period, e)
+            return jsonify({"error": "No data found"}), 400
+        app.logger.error("[etf_history] Error fetching ETF history: %s", e, exc_info=True)
         return jsonify({"error": "Failed to fetch ETF history"}), 500
 
     """yFinance를 이용해 ETF의 실시간 데이터를 반환합니다."""
     try:
         data = request.get_json(silent=True) or {}
-        app.logger.debug(f"[etf_data] incoming payload: {data}")
+        app.logger.debug("[etf_data] incoming payload: %s", data)
         
         ticker = data.get('ticker', '').strip().upper()
         if not ticker:
             return jsonify({"error": "Ticker is required"}), 400
         
-        app.logger.debug(f"[etf_data] Fetching data for ticker: {ticker}")
+        app.logger.debug("[etf_data] Fetching data for ticker: %s", ticker)
         
         # yFinance로 데이터 가져오기
         etf = yf.Ticker(ticker)
@@ -348,13 +455,13 @@ def get_etf_history():
         # 기본 정보 가져오기
         info = etf.info
         if not info or 'symbol' not in info:
-            app.logger.warning(f"[etf_data] Invalid ticker: {ticker}")
+            app.logger.warning("[etf_data] Invalid ticker: %s", ticker)
             return jsonify({"error": "Invalid ticker"}), 400
         
         # 최근 1개월 히스토리 가져오기
         hist = etf.history(period="1mo")
         if hist.empty:
-            app.logger.warning(f"[etf_data] No history data for ticker: {ticker}")
+            app.logger.warning("[etf_data] No history data for ticker: %s", ticker)
             return jsonify({"error": "No historical data available"}), 400
         
         # 히스토리를 날짜: 종가 형태의 dict로 변환
@@ -373,18 +480,18 @@ def get_etf_history():
             "history": history_dict
         }
         
-        app.logger.debug(f"[etf_data] Successfully fetched data for {ticker}, history_length={len(history_dict)}, price={response_data['price']}")
+        app.logger.debug("[etf_data] Successfully fetched data for %s, history_length=%s, price=%s", ticker, len(history_dict), response_data['price'])
         
         return jsonify(response_data)
         
     except Exception as e:
-        app.logger.error(f"[etf_data] Error fetching ETF data: {e}\n{traceback.format_exc()}")
+        app.logger.error("[etf_data] Error fetching ETF data: %s", e, exc_info=True)
         return jsonify({"error": "Failed to fetch ETF data"}), 500
 
     """입력된 ETF와 같은 섹터를 추종하는 다른 대표 ETF들을 Gemini API로 추천합니다."""
     try:
         data = request.get_json(silent=True) or {}
-        app.logger.debug(f"[etf_recommend] incoming payload: {data}")
+        app.logger.debug("[etf_recommend] incoming payload: %s", data)
         
         etf_info = data.get('etf', {})
         ticker = etf_info.get('ticker', '')
@@ -399,20 +506,20 @@ def get_etf_history():
             return jsonify({"recommendations": []})
         
         # 최신 키로 매 호출 구성
-        genai.configure(api_key=api_key)
+        genai.configure(api_key=api_key, **gemini_configure_kwargs())
         
         # 모델은 공통으로 지원되는 'gemini-2.5-flash' 사용
         model = genai.GenerativeModel('gemini-2.5-flash')
         prompt = f"다음 ETF와 같은 섹터를 추종하는 다른 대표 ETF들의 ticker만 JSON 배열로 반환해줘. ETF: {ticker} {name}"
         
         try:
-            app.logger.debug(f"[etf_recommend] Sending prompt to GEMINI... prompt_len={len(prompt)}; head={prompt[:200]}")
+            app.logger.debug("[etf_recommend] Sending prompt to GEMINI... prompt_len=%s; head=%.200s", len(prompt), prompt)
             resp = model.generate_content(
                 prompt,
                 generation_config={"response_mime_type": "application/json"}
             )
             text = (getattr(resp, 'text', '') or '').strip()
-            app.logger.debug(f"[etf_recommend] GEMINI response received, text_len={len(text)}; head={text[:300]}")
+            app.logger.debug("[etf_recommend] GEMINI response received, text_len=%s; head=%.300s", len(text), text)
             
             # JSON 파싱 시도
             import json, re
@@ -437,11 +544,11 @@ def get_etf_history():
                 return jsonify({"recommendations": []})
                 
         except Exception as call_err:
-            app.logger.error(f"[etf_recommend] GEMINI API 호출 실패: {call_err}\n{traceback.format_exc()}")
+            app.logger.error("[etf_recommend] GEMINI API 호출 실패: %s", call_err, exc_info=True)
             return jsonify({"recommendations": []})
             
     except Exception as e:
-        app.logger.error(f"[etf_recommend] 처리 중 예외: {e}\n{traceback.format_exc()}")
+        app.logger.error("[etf_recommend] 처리 중 예외: %s", e, exc_info=True)
         return jsonify({"recommendations": []})
 
     """GEMINI API 키 로드 상태를 반환합니다."""
@@ -455,7 +562,7 @@ def get_etf_history():
             "message": "API key loaded successfully" if key_present else "API key not found"
         })
     except Exception as e:
-        app.logger.error(f"Key status check failed: {e}")
+        app.logger.error("Key status check failed: %s", e)
         return jsonify({
             "key_present": False,
             "key_length": 0,
@@ -464,13 +571,14 @@ def get_etf_history():
 
 # 5. Gemini API를 사용한 AI 요약 생성
 @app.route('/api/ai/summary', methods=['POST'])
+@concurrency.limit('ai')
 def ai_summary():
     """선택된 ETF 배열을 받아 공통점/차이점/성장성/안정성을 요약한다.
     실패 시에도 프론트가 멈추지 않도록 친화적인 fallback을 반환한다.
     """
     try:
         data = request.get_json(silent=True) or {}
-        app.logger.debug(f"[ai_summary] incoming payload: {data}")
+        app.logger.debug("[ai_summary] incoming payload: %s", data)
         # 허용하는 페이로드 형태: { tickers: ["VOO", ...] } 또는 { etfs: [{ticker, name}, ...] }
         tickers = data.get('tickers')
         if isinstance(tickers, list) and len(tickers) > 0:
@@ -482,7 +590,7 @@ def ai_summary():
             return jsonify({"error": "No tickers/etfs provided"}), 400
 
         api_key = os.getenv('GEMINI_API_KEY')
-        app.logger.debug(f"[ai_summary] GEMINI key present? {bool(api_key)}")
+        app.logger.debug("[ai_summary] GEMINI key present? %s", bool(api_key))
         if not api_key:
             # 키가 없으면 간단한 fallback 반환 (200)
             names = ", ".join([e.get('ticker') or e.get('name','') for e in etfs])
@@ -493,8 +601,13 @@ def ai_summary():
                 "pros_cons": []
             })
 
+        summary_key = tuple(sorted((str(e.get('ticker', '')).upper(), str(e.get('name', ''))) for e in etfs))
+        cached = ai_summary_cache.get(summary_key)
+        if cached is not None:
+            return jsonify(cached)
+
         # 최신 키로 매 호출 구성
-        genai.configure(api_key=api_key)
+        genai.configure(api_key=api_key, **gemini_configure_kwargs())
 
         # 모델은 공통으로 지원되는 'gemini-2.5-flash' 사용
         model = genai.GenerativeModel('gemini-2.5-flash')
@@ -510,19 +623,21 @@ def ai_summary():
         )
 
         try:
-            app.logger.debug(f"[ai_summary] Sending prompt to GEMINI... prompt_len={len(prompt)}; head={prompt[:200]}")
-            resp = model.generate_content(
+            app.logger.debug("[ai_summary] Sending prompt to GEMINI... prompt_len=%s; head=%.200s", len(prompt), prompt)
+            resp = resilience.call(
+                'gemini', 'summary', model.generate_content,
                 prompt,
                 generation_config={"response_mime_type": "application/json"}
             )
             text = (getattr(resp, 'text', '') or '').strip()
-            app.logger.debug(f"[ai_summary] GEMINI response received, text_len={len(text)}; head={text[:300]}")
+            app.logger.debug("[ai_summary] GEMINI response received, text_len=%s; head=%.300s", len(text), text)
             parsed = safe_parse_json(text, fallback_key="common")
+            # 파싱에 실패한 응답(common만 있는 폴백)은 캐시하지 않음
+            if isinstance(parsed, dict) and 'differences' in parsed:
+                ai_summary_cache.set(summary_key, parsed)
             return jsonify(parsed)
         except Exception as call_err:
-            app.logger.error(
-                f"[ai_summary] GEMINI API 호출 실패: {call_err}\n{traceback.format_exc()}"
-            )
+            app.logger.error("[ai_summary] GEMINI API 호출 실패: %s", call_err, exc_info=True)
             names = ", ".join([e.get('ticker') or e.get('name','') for e in etfs])
             return jsonify({
                 "common": f"선택: {names}. 모델 호출 실패로 간단 요약을 제공합니다.",
@@ -534,21 +649,19 @@ def ai_summary():
         return jsonify(parsed)
     except Exception as e:
         # 전체 핸들러 예외도 상세 추적 로그 남김
-        traceback.print_exc()
-        app.logger.error(
-            f"[ai_summary] 처리 중 예외: {e}\n{traceback.format_exc()}"
-        )
+        app.logger.error("[ai_summary] 처리 중 예외: %s", e, exc_info=True)
         # 최종 안전 fallback
         return jsonify({"common": "AI 요약 생성 중 오류 발생. 잠시 후 다시 시도해주세요.", "differences": [], "pros_cons": []}), 200
 
 # 5. 새로운 API 엔드포인트: Gemini를 이용한 ETF 비교 분석
 @app.route('/api/etf/analyze', methods=['POST'])
+@concurrency.limit('ai')
 def analyze_etfs():
     """요청 본문으로 받은 ETF 티커 목록을 yfinance로 조회하고,
     그 정보를 바탕으로 Gemini API를 호출하여 비교 분석 결과를 반환합니다."""
 
     payload = request.get_json(silent=True) or {}
-    app.logger.debug(f"[etf_analyze] incoming payload: {payload}")
+    app.logger.debug("[etf_analyze] incoming payload: %s", payload)
     # tickers 또는 etfs 허용
     tickers = payload.get('tickers')
     if isinstance(tickers, list) and len(tickers) > 0:
@@ -563,37 +676,33 @@ def analyze_etfs():
     try:
         summaries = []
         for ticker_code in etf_tickers:
-            full_ticker = f"{ticker_code}.KS" if str(ticker_code).isdigit() else str(ticker_code)
-            etf = yf.Ticker(full_ticker)
-
-            info = getattr(etf, 'info', {}) or {}
+            info, etf = {}, None
+            try:
+                # 최근에 없었던 티커는 yfinance를 건너뛰고 티커만으로 분석
+                full_ticker = resolver.resolve(ticker_code).yf
+                etf = yf.Ticker(full_ticker)
+                info, _ = resilience.call_with_fallback('yfinance', 'info', full_ticker, lambda: etf.info)
+                info = info or {}
+            except (UnknownTicker, resilience.UpstreamUnavailable):
+                # 정보 없이도 Gemini 분석은 진행
+                pass
+            except Exception as e:
+                if not resilience.is_data_error(e):
+                    raise
+                resolver.record_miss(ticker_code)
             long_name = info.get('longName') or info.get('shortName') or str(ticker_code)
             expense = info.get('annualReportExpenseRatio')
             try:
-                holdings_df = getattr(etf, 'holdings', None)
-                if holdings_df is not None:
-                    holdings_df = holdings_df.head(5)
-                else:
-                    holdings_df = None
+                top = get_holdings(resolver.resolve(ticker_code))[0].top(5)
             except Exception:
-                holdings_df = None
+                top = []
 
             summary = [f"--- ETF: {long_name} ({ticker_code}) ---"]
             summary.append(f"  - 운용 보수: {expense if expense is not None else 'N/A'}")
             summary.append("  - 상위 5개 보유 종목:")
-            if holdings_df is not None and not holdings_df.empty:
-                # 컬럼명이 환경에 따라 다를 수 있어 안전 매핑
-                stock_col = 'Stock' if 'Stock' in holdings_df.columns else ('Company' if 'Company' in holdings_df.columns else holdings_df.columns[0])
-                weight_col = 'Weight' if 'Weight' in holdings_df.columns else ('% of assets' if '% of assets' in holdings_df.columns else (holdings_df.columns[1] if len(holdings_df.columns) > 1 else None))
-                for _, row in holdings_df.iterrows():
-                    name = str(row.get(stock_col, 'N/A'))
-                    weight = row.get(weight_col, None)
-                    try:
-                        weight = float(weight) * (100.0 if float(weight) < 1 else 1.0)
-                    except Exception:
-                        weight = None
-                    summary.append(f"    - {name}: {weight:.2f}%" if isinstance(weight, float) else f"    - {name}")
-            else:
+            for h in top:
+                summary.append(f"    - {h['stockName'] or h['stockCode']}: {h['weight']:.2f}%")
+            if not top:
                 summary.append("    - (데이터 없음)")
 
             summaries.append("\n".join(summary))
@@ -610,90 +719,75 @@ def analyze_etfs():
         # 모델 호출 (JSON 강제)
         model = genai.GenerativeModel('gemini-2.5-flash')
         try:
-            app.logger.debug(f"[etf_analyze] Sending prompt to GEMINI... prompt_len={len(prompt)}; head={prompt[:200]}")
-            resp = model.generate_content(
+            app.logger.debug("[etf_analyze] Sending prompt to GEMINI... prompt_len=%s; head=%.200s", len(prompt), prompt)
+            resp = resilience.call(
+                'gemini', 'analyze', model.generate_content,
                 prompt + "\n\n응답을 JSON으로: {analysis: string}",
                 generation_config={"response_mime_type": "application/json"}
             )
             text = (getattr(resp, 'text', '') or '').strip()
-            app.logger.debug(f"[etf_analyze] GEMINI response received, text_len={len(text)}; head={text[:300]}")
+            app.logger.debug("[etf_analyze] GEMINI response received, text_len=%s; head=%.300s", len(text), text)
             parsed = safe_parse_json(text, fallback_key="analysis")
             return jsonify(parsed)
         except Exception as call_err:
-            app.logger.error(f"[etf_analyze] GEMINI API 호출 실패: {call_err}\n{traceback.format_exc()}")
+            app.logger.error("[etf_analyze] GEMINI API 호출 실패: %s", call_err, exc_info=True)
             names = ", ".join(etf_tickers)
             return jsonify({"analysis": f"모델 호출 실패. 선택된 ETF: {names}"})
 
     except Exception as e:
         # 에러 내용을 서버 콘솔과 로거에 남깁니다.
-        print(f"!!! GEMINI API ERROR in /api/etf/analyze: {e}")
-        app.logger.error(
-            f"[etf_analyze] 처리 중 예외: {e}\n{traceback.format_exc()}"
-        )
+        app.logger.error("!!! GEMINI API ERROR in /api/etf/analyze: %s", e)
+        app.logger.error("[etf_analyze] 처리 중 예외: %s", e, exc_info=True)
         return jsonify({"analysis": "AI 분석 처리 중 오류가 발생했습니다."})
 
-# 6. KIS API를 이용한 ETF 보유 종목 조회
+# 6. ETF 보유 종목 조회 (국내: KIS 우선, 해외: yfinance) - ?limit=N (기본 10), ?cursor=로 전체 목록 페이지 조회
 @app.route('/api/etf/<ticker>/holdings', methods=['GET'])
 def get_etf_holdings(ticker):
-    """KIS API를 통해 특정 ETF의 보유 종목 정보를 조회합니다."""
+    """보유종목 서비스의 정규화 결과에서 비중 상위 limit개(또는 cursor 이후 limit개)를 반환합니다."""
     try:
-        app.logger.debug(f"[etf_holdings] Fetching holdings for ticker: {ticker}")
-        
-        # KIS API 호출을 위한 모듈 import
-        try:
-            from kis_api import KoreaInvestmentAPI
-            kis_api = KoreaInvestmentAPI()
-            
-            # ETF 보유 종목 조회
-            holdings_data = kis_api.getETFHoldings(ticker)
-            
-            if not holdings_data or not holdings_data.get('holdings'):
-                app.logger.warning(f"[etf_holdings] No holdings data for ticker: {ticker}")
-                return jsonify({"error": "No holdings data found"}), 404
-            
-            # 응답 데이터 구성
-            response_data = {
-                "ticker": ticker,
-                "etfName": holdings_data.get('etfName', ticker),
-                "nav": holdings_data.get('nav'),
-                "totalHoldings": holdings_data.get('totalHoldings'),
-                "updateDate": holdings_data.get('updateDate'),
-                "holdings": holdings_data['holdings'][:10]  # 상위 10개만 반환
-            }
-            
-            app.logger.debug(f"[etf_holdings] Successfully fetched {len(response_data['holdings'])} holdings for {ticker}")
-            return jsonify(response_data)
-            
-        except ImportError:
-            app.logger.warning("[etf_holdings] KIS API module not available, using mock data")
-            # KIS API 모듈이 없을 경우 Mock 데이터 반환
-            mock_holdings = [
-                {"stockCode": "005930", "stockName": "삼성전자", "weight": 12.1, "shares": 12345, "value": 892345000},
-                {"stockCode": "000660", "stockName": "SK하이닉스", "weight": 10.8, "shares": 54321, "value": 789012000},
-                {"stockCode": "035420", "stockName": "NAVER", "weight": 9.5, "shares": 23456, "value": 567890000},
-                {"stockCode": "207940", "stockName": "삼성바이오로직스", "weight": 8.2, "shares": 34567, "value": 456789000},
-                {"stockCode": "006400", "stockName": "삼성SDI", "weight": 6.3, "shares": 45678, "value": 345678000}
-            ]
-            
-            response_data = {
-                "ticker": ticker,
-                "etfName": f"KODEX {ticker}",
-                "nav": 32150.50,
-                "totalHoldings": 200,
-                "updateDate": "20251001",
-                "holdings": mock_holdings
-            }
-            
-            return jsonify(response_data)
-            
-        except Exception as e:
-            app.logger.error(f"[etf_holdings] Error fetching ETF holdings: {e}\n{traceback.format_exc()}")
-            return jsonify({"error": "Failed to fetch ETF holdings"}), 500
-            
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        symbol = resolver.resolve(ticker)
+        data, age, stale = get_holdings(symbol)
+        if not len(data):
+            app.logger.warning("[etf_holdings] No holdings data for ticker: %s", ticker)
+            return jsonify({"error": "No holdings data found"}), 404
+        page, next_cursor = data.page(request.args.get('cursor'), limit)
+    except holdings.InvalidCursor as e:
+        return jsonify({"error": str(e)}), 409 if e.expired else 400
+    except UnknownTicker:
+        return jsonify({"error": f"Unknown ticker: {ticker}"}), 404
+    except ImportError:
+        app.logger.warning("[etf_holdings] KIS API module not available, using mock data")
+        # KIS API 모듈이 없을 경우 Mock 데이터 반환
+        mock_holdings = [
+            {"stockCode": "005930", "stockName": "삼성전자", "weight": 12.1, "shares": 12345, "value": 892345000},
+            {"stockCode": "000660", "stockName": "SK하이닉스", "weight": 10.8, "shares": 54321, "value": 789012000},
+            {"stockCode": "035420", "stockName": "NAVER", "weight": 9.5, "shares": 23456, "value": 567890000},
+            {"stockCode": "207940", "stockName": "삼성바이오로직스", "weight": 8.2, "shares": 34567, "value": 456789000},
+            {"stockCode": "006400", "stockName": "삼성SDI", "weight": 6.3, "shares": 45678, "value": 345678000}
+        ]
+        return jsonify({
+            "ticker": ticker,
+            "etfName": f"KODEX {ticker}",
+            "nav": 32150.50,
+            "totalHoldings": 200,
+            "updateDate": "20251001",
+            "holdings": mock_holdings,
+            "nextCursor": None
+        })
     except Exception as e:
-        app.logger.error(f"[etf_holdings] Outer error: {e}\n{traceback.format_exc()}")
+        app.logger.error("[etf_holdings] Error fetching ETF holdings: %s", e, exc_info=True)
         return jsonify({"error": "Failed to fetch ETF holdings"}), 500
 
+    response_data = {**data.meta(), "ticker": ticker, "etfName": data.etf_name or ticker,
+                     "holdings": page, "nextCursor": next_cursor}
+    app.logger.debug("[etf_holdings] Serving %s holdings for %s (age %.0fs)", len(page), ticker, age)
+    return with_freshness(jsonify(response_data), age, stale)
+
 # 7. KIS API를 이용한 ETF 주가 히스토리 조회
 @app.route('/api/etf/<ticker>/price-history', methods=['GET'])
 def get_etf_price_history(ticker):
@@ -701,7 +795,7 @@ def get_etf_price_history(ticker):
     try:
         period = request.args.get('period', '3m')  # 기본 3개월
         
-        app.logger.debug(f"[price_history] Fetching price history for ticker: {ticker}, period: {period}")
+        app.logger.debug("[price_history] Fetching price history for ticker: %s, period: %s", ticker, period)
         
         # Mock 데이터 반환 (ETF별로 다른 데이터)
         import random
@@ -754,97 +848,520 @@ def get_etf_price_history(ticker):
             "priceHistory": price_history
         }
         
-        app.logger.debug(f"[price_history] Returning mock data for {ticker}")
+        app.logger.debug("[price_history] Returning mock data for %s", ticker)
         return jsonify(mock_data)
             
     except Exception as e:
-        app.logger.error(f"[price_history] Error fetching ETF price history: {e}\n{traceback.format_exc()}")
+        app.logger.error("[price_history] Error fetching ETF price history: %s", e, exc_info=True)
         return jsonify({"error": "Failed to fetch ETF price history"}), 500
 
-# 8. KIS API를 이용한 ETF 수수료 및 배당금 정보 조회
+# 8. ETF 총보수 / 분배금(최근 12개월 수익률, 주기, 다음 분배일 추정) / 기간 수익률 (유니버스 일괄 계산 결과에서 조회)
 @app.route('/api/etf/<ticker>/fees-dividend', methods=['GET'])
 def get_etf_fees_dividend(ticker):
-    """KIS API를 통해 특정 ETF의 수수료 및 배당금 정보를 조회합니다."""
+    """공유 종가 패널과 분배금 저장소로 계산한 ETF 총보수, 분배금, 기간 수익률을 조회합니다."""
+    import fund_metrics
+
     try:
-        app.logger.debug(f"[fees_dividend] Fetching fees and dividend info for ticker: {ticker}")
-        
-        # Mock 데이터 반환 (ETF별로 다른 수수료 및 배당금 정보)
-        fees_dividend_data = {
-            "ticker": ticker,
-            "etfName": f"ETF {ticker}",
-            "fees": {
-                "managementFee": 0.05,  # 연간 관리비 (0.05%)
-                "custodyFee": 0.01,    # 보관비 (0.01%)
-                "totalExpenseRatio": 0.06,  # 총 비용 비율 (0.06%)
-                "tradingFee": 0.015,   # 거래 수수료 (0.015%)
-                "redemptionFee": 0.0   # 환매 수수료 (0%)
-            },
-            "dividend": {
-                "dividendYield": 2.5,  # 배당 수익률 (2.5%)
-                "lastDividend": 150,   # 최근 배당금 (원)
-                "dividendDate": "2025-09-30",  # 배당일
-                "paymentFrequency": "quarterly",  # 배당 주기 (분기별)
-                "nextDividendDate": "2025-12-31"  # 다음 배당일
-            },
-            "performance": {
-                "ytdReturn": 8.5,      # 연초 대비 수익률 (8.5%)
-                "oneYearReturn": 12.3,  # 1년 수익률 (12.3%)
-                "threeYearReturn": 15.7,  # 3년 수익률 (15.7%)
-                "fiveYearReturn": 18.2   # 5년 수익률 (18.2%)
-            },
-            "updateDate": "2025-10-01"
-        }
-        
-        # ETF별로 다른 데이터 설정
-        etf_specific_data = {
-            '069500': {  # KODEX 200
-                "etfName": "KODEX 200",
-                "fees": {"managementFee": 0.05, "custodyFee": 0.01, "totalExpenseRatio": 0.06, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 2.8, "lastDividend": 180, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 7.2, "oneYearReturn": 11.5, "threeYearReturn": 14.8, "fiveYearReturn": 17.3}
-            },
-            '360750': {  # TIGER 미국S&P500
-                "etfName": "TIGER 미국S&P500",
-                "fees": {"managementFee": 0.08, "custodyFee": 0.02, "totalExpenseRatio": 0.10, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 1.8, "lastDividend": 120, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 9.1, "oneYearReturn": 13.2, "threeYearReturn": 16.5, "fiveYearReturn": 19.1}
-            },
-            '379800': {  # KODEX 미국S&P500TR
-                "etfName": "KODEX 미국S&P500TR",
-                "fees": {"managementFee": 0.06, "custodyFee": 0.015, "totalExpenseRatio": 0.075, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 2.1, "lastDividend": 140, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 8.7, "oneYearReturn": 12.8, "threeYearReturn": 15.9, "fiveYearReturn": 18.4}
-            },
-            '448630': {  # SOL 미국S&P500
-                "etfName": "SOL 미국S&P500",
-                "fees": {"managementFee": 0.07, "custodyFee": 0.018, "totalExpenseRatio": 0.088, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 1.9, "lastDividend": 125, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 8.9, "oneYearReturn": 13.0, "threeYearReturn": 16.2, "fiveYearReturn": 18.7}
-            },
-            '371460': {  # TIGER 미국필라델피아반도체나스닥
-                "etfName": "TIGER 미국필라델피아반도체나스닥",
-                "fees": {"managementFee": 0.10, "custodyFee": 0.025, "totalExpenseRatio": 0.125, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 0.8, "lastDividend": 50, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 15.2, "oneYearReturn": 22.1, "threeYearReturn": 28.5, "fiveYearReturn": 35.2}
-            },
-            '272580': {  # KODEX 2차전지산업
-                "etfName": "KODEX 2차전지산업",
-                "fees": {"managementFee": 0.09, "custodyFee": 0.02, "totalExpenseRatio": 0.11, "tradingFee": 0.015, "redemptionFee": 0.0},
-                "dividend": {"dividendYield": 1.2, "lastDividend": 80, "dividendDate": "2025-09-30", "paymentFrequency": "quarterly", "nextDividendDate": "2025-12-31"},
-                "performance": {"ytdReturn": 12.5, "oneYearReturn": 18.7, "threeYearReturn": 25.3, "fiveYearReturn": 32.1}
-            }
-        }
-        
-        # 특정 ETF 데이터가 있으면 사용, 없으면 기본값 사용
-        if ticker in etf_specific_data:
-            fees_dividend_data.update(etf_specific_data[ticker])
-        
-        app.logger.debug(f"[fees_dividend] Returning fees and dividend data for {ticker}")
-        return jsonify(fees_dividend_data)
-            
+        symbol, result = resolver.lookup(ticker, fund_metrics.get)
+    except UnknownTicker as e:
+        return jsonify({"error": f"Unknown ticker: {e.ticker}"}), 404
+    except resilience.UpstreamUnavailable as e:
+        return jsonify({"error": f"Data source temporarily unavailable: {e.reason}"}), 503
     except Exception as e:
-        app.logger.error(f"[fees_dividend] Error fetching ETF fees and dividend: {e}\n{traceback.format_exc()}")
+        app.logger.error("[fees_dividend] Error computing fees and dividend for %s: %s", ticker, e, exc_info=True)
         return jsonify({"error": "Failed to fetch ETF fees and dividend"}), 500
+    if result is None:
+        return jsonify({"error": f"No price data for ticker: {ticker}"}), 404
+
+    return jsonify({
+        "ticker": symbol.display,
+        "etfName": symbol.name or symbol.display,
+        "currency": 'KRW' if symbol.market == 'domestic' else 'USD',
+        **result,
+    })
+
+# 9. 기술적 지표 계산 (여러 티커 x 여러 지표 일괄 처리)
+@app.route('/api/indicators', methods=['POST'])
+def get_indicators():
+    """요청 본문 { tickers: [...], indicators: ['sma', {name: 'rsi', window: 14}, ...], period: '1y' }
+    에 대해 실제 히스토리 기반 지표를 계산하여 티커별로 반환합니다."""
+    from indicators import get_ticker_indicators, parse_spec, MAX_TICKERS, MAX_INDICATORS
+
+    payload = request.get_json(silent=True) or {}
+    tickers = payload.get('tickers') or []
+    raw_specs = payload.get('indicators') or []
+    period = str(payload.get('period', '1y')).strip()
+
+    if not isinstance(tickers, list) or not tickers:
+        return jsonify({"error": "No tickers provided"}), 400
+    if not isinstance(raw_specs, list) or not raw_specs:
+        return jsonify({"error": "No indicators provided"}), 400
+    if len(tickers) > MAX_TICKERS or len(raw_specs) > MAX_INDICATORS:
+        return jsonify({"error": f"Too many tickers (max {MAX_TICKERS}) or indicators (max {MAX_INDICATORS})"}), 400
+
+    try:
+        specs = [parse_spec(s) for s in raw_specs]
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = {}
+    for ticker in tickers:
+        ticker = str(ticker).strip().upper()
+        try:
+            results[ticker] = get_ticker_indicators(ticker, specs, period)
+        except Exception as e:
+            app.logger.error("[indicators] Error computing indicators for %s: %s", ticker, e, exc_info=True)
+            results[ticker] = {"error": "Failed to compute indicators"}
+
+    return jsonify({"period": period, "results": results})
+
+# 10. ETF 유니버스 전체 전략 신호 스캔
+@app.route('/api/scan', methods=['GET'])
+def scan_universe():
+    """국내+해외 ETF 전체에서 최신 일봉 기준 신호(골든크로스, 52주 돌파 등)가 발생한 티커를 반환합니다."""
+    from scanner import universe_scanner, RULES
+
+    rules = [r.strip() for r in request.args.get('rules', ','.join(RULES)).split(',') if r.strip()]
+    unknown = [r for r in rules if r not in RULES]
+    if unknown:
+        return jsonify({"error": f"Unknown rules: {unknown}", "available": list(RULES)}), 400
+
+    if not universe_scanner.ready:
+        _start_universe_refresh()
+        return jsonify({"status": "building", "message": "유니버스 데이터를 준비 중입니다. 잠시 후 다시 시도해주세요."}), 503
+    panel_as_of = price_panel.panel.as_of
+    if panel_as_of is not None and universe_scanner.as_of is not None and panel_as_of > universe_scanner.as_of:
+        _start_universe_refresh()  # 다른 워커가 패널에 새 일봉을 추가함
+
+    results = universe_scanner.scan(rules)
+    return jsonify({
+        "asOf": universe_scanner.as_of.strftime('%Y-%m-%d') if universe_scanner.as_of is not None else None,
+        "universeSize": len(universe_scanner.tickers),
+        "results": results
+    })
+
+@app.route('/api/scan/refresh', methods=['POST'])
+def refresh_scan_universe():
+    """유니버스 스캐너를 백그라운드에서 빌드하거나 새 일봉으로 증분 갱신합니다."""
+    token = os.getenv('ADMIN_TOKEN')
+    if token and request.headers.get('X-Admin-Token') != token:
+        return jsonify({"error": "Forbidden"}), 403
+    started = _start_universe_refresh()
+    return jsonify({"status": "refreshing" if started else "already refreshing"}), 202
+
+_universe_thread = None
+
+def _start_universe_refresh() -> bool:
+    """갱신 스레드가 이미 돌고 있으면 새로 만들지 않음"""
+    global _universe_thread
+    import threading
+    from scanner import refresh_universe
+
+    if _universe_thread is not None and _universe_thread.is_alive():
+        return False
+    _universe_thread = threading.Thread(target=refresh_universe, args=(universe(),), daemon=True)
+    _universe_thread.start()
+    return True
+
+# 11. 투자 계획 몬테카를로 시뮬레이션
+@app.route('/api/simulate', methods=['POST'])
+@concurrency.limit('compute')
+def simulate_plan():
+    """요청 본문 { plan: {method, totalSeed, dcaAmount, dcaIntervalDays, dcaYears, years},
+    assets: [{ticker, value}], goal, paths, seed, model } 에 대해 자산 경로를 시뮬레이션하여
+    백분위 밴드와 목표 달성 확률을 반환합니다."""
+    from history_store import load_log_returns
+    from simulation import (run_simulation, MAX_ASSETS, MAX_PATH_MONTHS, MAX_WORKERS, MIN_PATHS, MAX_PATHS,
+                            MAX_YEARS, MODELS)
+
+    payload = request.get_json(silent=True) or {}
+    plan = payload.get('plan') or {}
+    assets = [a for a in (payload.get('assets') or []) if isinstance(a, dict) and a.get('ticker')]
+    if not assets:
+        return jsonify({"error": "No assets provided"}), 400
+    if len(assets) > MAX_ASSETS:
+        return jsonify({"error": f"Too many assets (max {MAX_ASSETS})"}), 400
+
+    try:
+        tickers = [str(a['ticker']).strip().upper() for a in assets]
+        weights = [float(a.get('value') or 0) for a in assets]
+        if sum(weights) <= 0:
+            weights = [1.0] * len(assets)
+        years = float(plan.get('years') or plan.get('dcaYears') or 10)
+        n_paths = int(payload.get('paths', 10000))
+        seed = payload.get('seed')
+        seed = int(seed) if seed is not None else None
+        goal = payload.get('goal')
+        goal = float(goal) if goal not in (None, '') else None
+        workers = int(payload.get('workers', 1))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid parameters: {e}"}), 400
+
+    model = payload.get('model', 'bootstrap')
+    if model not in MODELS:
+        return jsonify({"error": f"Unknown model: {model}", "available": list(MODELS)}), 400
+    if not (0 < years <= MAX_YEARS):
+        return jsonify({"error": f"years must be between 0 and {MAX_YEARS}"}), 400
+    # 경로 x 개월이 상한을 넘지 않게 긴 기간일수록 경로 수를 줄임
+    months = max(int(round(years * 12)), 1)
+    n_paths = min(max(n_paths, MIN_PATHS), MAX_PATHS, MAX_PATH_MONTHS // months)
+    workers = min(max(workers, 1), MAX_WORKERS)
+
+    try:
+        returns = load_log_returns(tickers, period=payload.get('historyPeriod', '5y'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error("[simulate] Error loading history: %s", e, exc_info=True)
+        return jsonify({"error": "Failed to load price history"}), 500
+
+    try:
+        result = run_simulation(returns, weights, plan, years, n_paths=n_paths, model=model,
+                                seed=seed, goal=goal, workers=workers)
+        result["tickers"] = tickers
+        return jsonify(result)
+    except Exception as e:
+        app.logger.error("[simulate] Simulation failed: %s", e, exc_info=True)
+        return jsonify({"error": "Simulation failed"}), 500
+
+# 12. 나만의 인덱스 비중 최적화 (최소분산 / 최대샤프 / 리스크 패리티 + 효율적 투자선)
+@app.route('/api/optimize', methods=['POST'])
+@concurrency.limit('compute')
+def optimize_portfolio():
+    """요청 본문 { tickers: [...], bounds: {min, max} | {ticker: [min, max]}, riskFree, period, frontierPoints }
+    에 대해 최적 비중과 효율적 투자선을 반환합니다."""
+    from optimizer import optimize, parse_bounds, MAX_TICKERS, DEFAULT_FRONTIER_POINTS
+
+    payload = request.get_json(silent=True) or {}
+    tickers = list(dict.fromkeys(str(t).strip().upper() for t in (payload.get('tickers') or []) if str(t).strip()))
+    if len(tickers) < 2:
+        return jsonify({"error": "At least two tickers are required"}), 400
+    if len(tickers) > MAX_TICKERS:
+        return jsonify({"error": f"Too many tickers (max {MAX_TICKERS})"}), 400
+
+    try:
+        lower, upper = parse_bounds(tickers, payload.get('bounds'))
+        risk_free = float(payload.get('riskFree', 0.03))
+        frontier_points = min(max(int(payload.get('frontierPoints', DEFAULT_FRONTIER_POINTS)), 2), 100)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid parameters: {e}"}), 400
+
+    try:
+        result = optimize(tickers, lower, upper, period=payload.get('period', '3y'),
+                          risk_free=risk_free, frontier_points=frontier_points)
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error("[optimize] Optimization failed: %s", e, exc_info=True)
+        return jsonify({"error": "Failed to optimize portfolio"}), 500
+
+# 13. 포트폴리오 룩스루 노출도 (ETF 보유종목 기준 종목/섹터/국가 집계)
+@app.route('/api/portfolio/lookthrough', methods=['POST'])
+def portfolio_lookthrough():
+    """요청 본문 { assets: [{ticker, value}], top } 에 대해 ETF 보유종목을 펼쳐
+    개별 종목/섹터/국가 노출도를 반환합니다."""
+    from lookthrough import look_through, MAX_ASSETS
+
+    payload = request.get_json(silent=True) or {}
+    assets = [a for a in (payload.get('assets') or []) if isinstance(a, dict) and a.get('ticker')]
+    if not assets:
+        return jsonify({"error": "No assets provided"}), 400
+    if len(assets) > MAX_ASSETS:
+        return jsonify({"error": f"Too many assets (max {MAX_ASSETS})"}), 400
+
+    try:
+        portfolio = {}
+        for a in assets:
+            ticker = str(a['ticker']).strip().upper()
+            portfolio[ticker] = portfolio.get(ticker, 0.0) + float(a.get('value') or 0)
+        if sum(portfolio.values()) <= 0:
+            portfolio = {t: 1.0 for t in portfolio}
+        top = int(payload.get('top', 50))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid parameters: {e}"}), 400
+
+    try:
+        return jsonify(look_through(portfolio, top=top))
+    except Exception as e:
+        app.logger.error("[lookthrough] Aggregation failed: %s", e, exc_info=True)
+        return jsonify({"error": "Failed to aggregate look-through exposure"}), 500
+
+# 14. 업스트림(yfinance / KIS / Gemini) 서킷 브레이커 / bulkhead 상태
+@app.route('/api/upstreams/status', methods=['GET'])
+def upstreams_status():
+    """업스트림별 브레이커 상태, 진행 중 호출 수, 거절 수와 폴백 캐시 크기를 반환합니다."""
+    return jsonify({
+        "upstreams": resilience.status(),
+        "fallbackEntries": len(resilience.last_good),
+        "tickerResolver": resolver.status(),
+    })
+
+# 15. 실시간 시세 스트림 (KIS 체결가 웹소켓 -> SSE)
+STREAM_MAX_TICKERS = int(os.getenv('STREAM_MAX_TICKERS', 20))
+STREAM_KEEPALIVE_SECONDS = 15
+
+@app.route('/api/stream/quotes', methods=['GET'])
+def stream_quotes():
+    """?tickers=069500,229200 종목의 체결가를 Server-Sent Events로 전달합니다.
+
+    이벤트 `quote`의 data는 마지막 전송 이후 종목별 최신 체결 목록(JSON 배열)이며,
+    체결이 없으면 15초마다 keepalive 주석을 보냅니다.
+    """
+    import json
+    from kis_api import RealtimeSubscriptionLimit
+    from quote_stream import hub, limit_write_time
+
+    tickers = sorted({t.strip() for t in request.args.get('tickers', '').split(',') if t.strip()})
+    if not tickers:
+        return jsonify({"error": "Query parameter 'tickers' is required"}), 400
+    if len(tickers) > STREAM_MAX_TICKERS:
+        return jsonify({"error": f"At most {STREAM_MAX_TICKERS} tickers per stream"}), 400
+    if not all(t.isdigit() and len(t) == 6 for t in tickers):
+        return jsonify({"error": "Real-time quotes are only available for 6-digit domestic tickers"}), 400
+    if not hub.available:
+        return jsonify({"error": "Real-time quotes require KIS API credentials"}), 503
+
+    pool = concurrency.pools['stream']
+    if not pool.acquire():
+        response = jsonify({"error": "Too many open streams, please retry shortly"})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+    try:
+        subscriber = hub.subscribe(tickers)
+    except RealtimeSubscriptionLimit:
+        pool.release()
+        return jsonify({"error": "Real-time subscription limit reached, please retry later"}), 429
+    except Exception:
+        pool.release()
+        raise
+
+    limit_write_time(request.environ)
+
+    def events():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                batch = subscriber.next_batch(STREAM_KEEPALIVE_SECONDS)
+                if batch is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: quote\ndata: {json.dumps(batch)}\n\n"
+        except ConnectionAbortedError:
+            pass
+        finally:
+            hub.unsubscribe(subscriber)
+            pool.release()
+
+    return app.response_class(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # 프록시(nginx 등)가 버퍼링하지 않도록
+    })
+
+# 16. 실시간 시세 팬아웃 상태 (구독자 수, 업스트림 웹소켓 연결/등록 종목)
+@app.route('/api/stream/status', methods=['GET'])
+def stream_status():
+    from quote_stream import hub
+    return jsonify(hub.status())
+
+# 17. 관심종목 현재가 일괄 조회 (국내: KIS 멀티종목 시세, 그 외: yfinance 일괄 다운로드)
+QUOTES_MAX_TICKERS = int(os.getenv('QUOTES_MAX_TICKERS', 100))
+
+@app.route('/api/etf/quotes', methods=['GET'])
+def get_etf_quotes():
+    """?tickers=069500,SPY,QQQ 종목들의 현재가를 한 번에 반환합니다.
+
+    종목별로 QUOTE_TTL초 캐시하며, 조회하지 못한 종목은 missing에 담깁니다.
+    Age 헤더는 응답에 포함된 시세 중 가장 오래된 것 기준입니다.
+    """
+
+    tickers = list(dict.fromkeys(t.strip().upper() for t in request.args.get('tickers', '').split(',') if t.strip()))
+    if not tickers:
+        return jsonify({"error": "Query parameter 'tickers' is required"}), 400
+    if len(tickers) > QUOTES_MAX_TICKERS:
+        return jsonify({"error": f"At most {QUOTES_MAX_TICKERS} tickers per request"}), 400
+
+    found = quotes.get_quotes(tickers)
+    payload = {
+        "quotes": {ticker: {**quote, "age": int(age)} for ticker, (quote, age) in found.items()},
+        "missing": [ticker for ticker in tickers if ticker not in found],
+    }
+    oldest = max((age for _, age in found.values()), default=0.0)
+    return with_freshness(jsonify(payload), oldest, oldest > quotes.QUOTE_TTL)
+
+# 18. ETF 마스터 데이터(CSV) 재적재 - 새 스냅샷을 만든 뒤 교체, 바뀐 티커의 캐시만 무효화
+@app.route('/api/admin/master', methods=['GET'])
+def master_status():
+    return jsonify(master.status())
+
+@app.route('/api/admin/master/reload', methods=['POST'])
+def reload_master():
+    """?wait=true면 재적재가 끝날 때까지 기다려 변경 내역을 반환, 아니면 백그라운드로 시작 (202)"""
+    token = os.getenv('ADMIN_TOKEN')
+    if token and request.headers.get('X-Admin-Token') != token:
+        return jsonify({"error": "Forbidden"}), 403
+
+    if request.args.get('wait', '').lower() == 'true':
+        try:
+            changes = master.reload()
+        except Exception as e:
+            app.logger.error("[master] reload failed: %s", e, exc_info=True)
+            return jsonify({"error": "Failed to reload master data"}), 500
+        return jsonify({"version": master.current.version, "changes": changes._asdict()})
+
+    started = master.reload_async()
+    return jsonify({"status": "reloading" if started else "already reloading",
+                    "version": master.current.version}), 202
+
+# 19. 캐시 디스크 스냅샷 상태 (시작 시 복원한 항목 수 / 복원 시간, 마지막 저장) 및 즉시 저장
+@app.route('/api/admin/cache-snapshot', methods=['GET'])
+def cache_snapshot_status():
+    return jsonify(cache_snapshot.status())
+
+@app.route('/api/admin/cache-snapshot', methods=['POST'])
+def save_cache_snapshot():
+    token = os.getenv('ADMIN_TOKEN')
+    if token and request.headers.get('X-Admin-Token') != token:
+        return jsonify({"error": "Forbidden"}), 403
+    if not cache_snapshot.enabled:
+        return jsonify({"error": "Cache snapshot is disabled (CACHE_SNAPSHOT_PATH)"}), 409
+    try:
+        saved = cache_snapshot.save()
+    except Exception as e:
+        app.logger.error("[snapshot] save failed: %s", e, exc_info=True)
+        return jsonify({"error": "Failed to save cache snapshot"}), 500
+    return jsonify({"saved": saved, **cache_snapshot.status()})
+
+# 20. 헬스 체크: alive(프로세스가 요청을 받음)와 ready(마스터 데이터 적재 + 무거운 의존성 워밍업 완료) 구분
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({"status": "alive", "uptimeSeconds": warmup.status()['uptimeSeconds']})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """워밍업이 끝나기 전에는 503 (로드 밸런서 / 배포 헬스체크가 트래픽을 보내기 전에 확인)"""
+    snapshot = master.current
+    checks = {
+        "warm": warmup.is_warm(),
+        "masterData": not (snapshot.korean.empty and snapshot.overseas.empty),
+    }
+    ready = all(checks.values())
+    payload = {"status": "ready" if ready else "warming", "checks": checks, "warmup": warmup.status(),
+               "restoredCacheEntries": sum(cache_snapshot.restored.values())}
+    return jsonify(payload), 200 if ready else 503
+
+# 21. 공유 종가 패널 상태 (세대, 티커/일봉 수, 기준일, 이 워커가 쓰기 담당인지) 및 즉시 갱신
+@app.route('/api/admin/price-panel', methods=['GET'])
+def price_panel_status():
+    return jsonify(price_panel.panel.status())
+
+@app.route('/api/admin/price-panel/refresh', methods=['POST'])
+def refresh_price_panel():
+    """쓰기 담당 워커면 갱신 (?wait=true면 끝날 때까지 대기, 아니면 202), 다른 워커가 담당 중이면 409"""
+    token = os.getenv('ADMIN_TOKEN')
+    if token and request.headers.get('X-Admin-Token') != token:
+        return jsonify({"error": "Forbidden"}), 403
+
+    panel = price_panel.panel
+    if request.args.get('wait', '').lower() == 'true':
+        try:
+            result = panel.refresh()
+        except Exception as e:
+            app.logger.error("[panel] refresh failed: %s", e, exc_info=True)
+            return jsonify({"error": "Failed to refresh price panel"}), 500
+    else:
+        result = 'refreshing' if panel.refresh_async() else 'not writer'
+    if result == 'not writer':
+        return jsonify({"error": "Another worker maintains the price panel", **panel.status()}), 409
+    return jsonify({"result": result, **panel.status()}), 200 if result != 'refreshing' else 202
+
+# 22. ETF 보유종목 공시일별 이력 / 두 공시일 사이 편입·편출·비중 변경
+@app.route('/api/etf/<ticker>/holdings/history', methods=['GET'])
+def get_etf_holdings_history(ticker):
+    """저장된 공시일 목록. ?date=YYYYMMDD면 그날의 보유종목 전체"""
+    try:
+        symbol = resolver.resolve(ticker)
+    except UnknownTicker:
+        return jsonify({"error": f"Unknown ticker: {ticker}"}), 404
+    code = symbol.kis or symbol.display  # /holdings가 저장한 키 (069500.KS -> 069500)
+    date = request.args.get('date')
+    if date:
+        try:
+            return jsonify(holdings_store.snapshot(code, date))
+        except KeyError:
+            return jsonify({"error": f"No holdings snapshot for {code} on {date}"}), 404
+    return jsonify({"ticker": code, "dates": holdings_store.dates(code)})
+
+@app.route('/api/etf/<ticker>/holdings/diff', methods=['GET'])
+def get_etf_holdings_diff(ticker):
+    """?from=&to=YYYYMMDD (기본: 직전 공시일 -> 최신), ?threshold= 비중 변화 최소 %p (기본 0)"""
+    try:
+        threshold = float(request.args.get('threshold', 0))
+    except ValueError:
+        return jsonify({"error": "threshold must be a number"}), 400
+    try:
+        symbol = resolver.resolve(ticker)
+    except UnknownTicker:
+        return jsonify({"error": f"Unknown ticker: {ticker}"}), 404
+    code = symbol.kis or symbol.display
+    try:
+        diff = holdings_store.diff(code, request.args.get('from'), request.args.get('to'), threshold)
+    except KeyError as e:
+        return jsonify({"error": f"No holdings snapshot for {e.args[0]}", "dates": holdings_store.dates(code)}), 404
+    return jsonify(diff)
+
+# 23. 비교 차트용 총수익(분배금 재투자) 지수 - 기준 통화로 환산해 공통 시작일에서 100으로 맞춤
+@app.route('/api/etf/compare-series', methods=['GET'])
+def get_compare_series():
+    """?tickers=SPY,360750&currency=KRW|USD|LOCAL&period=1y (또는 start=YYYY-MM-DD)&mode=total|price"""
+    import total_return
+    from price_panel import period_start
+
+    tickers = list(dict.fromkeys(t.strip().upper() for t in request.args.get('tickers', '').split(',') if t.strip()))
+    currency = request.args.get('currency', 'KRW').strip().upper()
+    mode = request.args.get('mode', 'total').strip().lower()
+    if not tickers or len(tickers) > 10:
+        return jsonify({"error": "Provide 1-10 comma-separated tickers"}), 400
+    if currency not in total_return.CURRENCIES or mode not in total_return.MODES:
+        return jsonify({"error": f"currency must be one of {total_return.CURRENCIES}, mode one of {total_return.MODES}"}), 400
+    try:
+        start = (pd.Timestamp(request.args['start']) if request.args.get('start')
+                 else period_start(request.args.get('period', '1y').strip()))
+    except ValueError:
+        return jsonify({"error": "start must be YYYY-MM-DD"}), 400
+    if start is None:
+        return jsonify({"error": "Unsupported period"}), 400
+    if start.tz is not None:
+        start = start.tz_convert(None)  # 일봉 날짜는 타임존 없는 날짜
+    start = start.normalize()
+
+    # 티커 하나를 찾지 못해도 나머지는 그림: 입력 티커 -> 시계열 이름(symbols) / 오류(errors)
+    columns, currencies, symbols, errors = [], {}, {}, {}
+    try:
+        for ticker in tickers:
+            try:
+                symbol, column = resolver.lookup(ticker, lambda s: total_return.series(s, currency, start, mode))
+            except UnknownTicker:
+                errors[ticker] = "Unknown ticker"
+                continue
+            if column is None:
+                errors[ticker] = "No price data"
+                continue
+            columns.append(column)
+            symbols[ticker] = column.name
+            currencies[column.name] = total_return.currency_of(symbol)
+    except (resilience.UpstreamUnavailable, total_return.RatesUnavailable) as e:
+        app.logger.warning("[compare_series] %s", e)
+        return jsonify({"error": "Data source temporarily unavailable"}), 503
+    except Exception as e:
+        app.logger.error("[compare_series] Failed to build series for %s: %s", tickers, e, exc_info=True)
+        return jsonify({"error": "Failed to build comparison series"}), 500
+
+    if not columns:
+        return jsonify({"error": "No price data for any ticker", "errors": errors}), 404
+    return jsonify({"currency": currency, "mode": mode, "currencies": currencies, "symbols": symbols,
+                    "errors": errors, **total_return.compare(columns)})
 
 if __name__ == '__main__':
     # 배포 환경에서는 debug=False로 설정
@@ -0,0 +1,102 @@
+"""
+공유 종가 패널 벤치마크 (네트워크 불필요)
+
+실행: python benchmarks/bench_price_panel.py [--tickers 3400] [--days 1260] [--readers 3]
+합성 종가 행렬로 임시 디렉터리에 패널을 만든 뒤
+- 새 세대 빌드, 다른 프로세스에서 열기, 열 선택(최적화 입력), 일봉 1개 제자리 추가 시간
+- 스캐너 빌드: DataFrame(float64) 입력 vs 패널 뷰 입력
+- 별도 프로세스 readers개가 전체 패널을 읽은 뒤의 Private(USS) / Shared 메모리 (Linux)
+를 출력합니다. 패널 페이지는 공유 페이지로 잡혀야 하고 USS는 패널 크기만큼 늘지 않아야 합니다.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scanner import make_closes, timeit  # noqa: E402
+from price_panel import PricePanel  # noqa: E402
+from scanner import UniverseScanner  # noqa: E402
+
+
+def smaps_kb() -> dict:
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values
+
+
+def reader(directory: str, queue) -> None:
+    before = smaps_kb()
+    panel = PricePanel(directory)  # 측정이 끝날 때까지 매핑 유지
+    total = float(np.nansum(panel.frame().to_numpy()))
+    after = smaps_kb()
+    queue.put({
+        'uss_mb': (after['Private_Clean'] + after['Private_Dirty']
+                   - before['Private_Clean'] - before['Private_Dirty']) / 1024,
+        'shared_mb': (after['Shared_Clean'] + after['Shared_Dirty']
+                      - before['Shared_Clean'] - before['Shared_Dirty']) / 1024,
+        'checksum': round(total, 1),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=3400)
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--readers', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    closes = make_closes(args.tickers, args.days + 1)
+    history, last_bar = closes.iloc[:-1], closes.iloc[-1:]
+    picked = list(closes.columns[::max(1, args.tickers // 10)][:10])
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = PricePanel(directory)
+        writer._acquire_writer()
+        build_s = timeit(lambda: writer.build(history), 1)
+        open_s = timeit(lambda: PricePanel(directory).frame(), args.repeat)
+        reader_panel = PricePanel(directory)
+        select_s = timeit(lambda: reader_panel.frame(picked), args.repeat)
+        append_s = timeit(lambda: writer.upsert(last_bar), 1)
+        assert reader_panel.as_of == last_bar.index[-1], 'reader did not see the appended bar'
+
+        scanner = UniverseScanner()
+        from_frame_s = timeit(lambda: scanner.build(history), args.repeat)
+        from_panel_s = timeit(lambda: scanner.build(reader_panel.frame()), args.repeat)
+
+        size_mb = reader_panel.status()['sizeBytes'] / 1024 / 1024
+        print(f"panel {args.days + 1} days x {args.tickers} tickers = {size_mb:.1f} MB (float32)")
+        print(f"  build new generation    : {build_s * 1000:8.1f} ms")
+        print(f"  open + full frame view  : {open_s * 1000:8.2f} ms")
+        print(f"  select {len(picked)} columns       : {select_s * 1000:8.2f} ms")
+        print(f"  append 1 bar in place   : {append_s * 1000:8.2f} ms")
+        print(f"  scanner build (frame)   : {from_frame_s * 1000:8.1f} ms")
+        print(f"  scanner build (panel)   : {from_panel_s * 1000:8.1f} ms")
+
+        if os.path.exists('/proc/self/smaps_rollup'):
+            context = multiprocessing.get_context('spawn')
+            queue = context.Queue()
+            processes = [context.Process(target=reader, args=(directory, queue)) for _ in range(args.readers)]
+            for process in processes:
+                process.start()
+            results = [queue.get(timeout=120) for _ in processes]
+            for process in processes:
+                process.join()
+            print(f"\n{args.readers} reader processes after reading the whole panel:")
+            for i, result in enumerate(results, 1):
+                print(f"  reader{i}: private +{result['uss_mb']:6.1f} MB  shared +{result['shared_mb']:6.1f} MB"
+                      f"  (checksum {result['checksum']})")
+
+
+if __name__ == '__main__':
+    main()
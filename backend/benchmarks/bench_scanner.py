@@ -0,0 +1,72 @@
+"""
+유니버스 스캐너 벤치마크 (네트워크 불필요)
+
+실행: python benchmarks/bench_scanner.py [--tickers 3400] [--days 504]
+합성 종가 행렬로 전체 빌드(full scan)와 일봉 1개 증분 갱신 시간을 측정합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import UniverseScanner  # noqa: E402
+
+
+def make_closes(n_tickers: int, n_days: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.015, size=(n_days, n_tickers))
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    # 상장일이 다른 종목을 흉내내기 위해 일부 앞부분을 NaN 처리
+    listed = rng.integers(0, n_days // 2, size=n_tickers)
+    prices[np.arange(n_days)[:, None] < listed[None, :] * (rng.random(n_tickers) < 0.2)] = np.nan
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    return pd.DataFrame(prices, index=dates, columns=[f"T{i:04d}" for i in range(n_tickers)])
+
+
+def timeit(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=3400)
+    parser.add_argument('--days', type=int, default=504)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    closes = make_closes(args.tickers, args.days + 1)
+    history, last_bar = closes.iloc[:-1], closes.iloc[-1]
+
+    scanner = UniverseScanner()
+    build_time = timeit(lambda: scanner.build(history), args.repeat)
+
+    def incremental():
+        scanner.build(history)
+        started = time.perf_counter()
+        scanner.append_bar(last_bar.name, last_bar)
+        return time.perf_counter() - started
+
+    append_time = min(incremental() for _ in range(args.repeat))
+    scan_time = timeit(lambda: scanner.scan(), args.repeat)
+    hits = {rule: len(t) for rule, t in scanner.scan().items()}
+
+    print(f"universe: {args.tickers} tickers x {args.days} days")
+    print(f"full build (history -> signals): {build_time * 1000:8.2f} ms")
+    print(f"incremental append_bar:          {append_time * 1000:8.2f} ms")
+    print(f"scan (all rules):                {scan_time * 1000:8.2f} ms")
+    print(f"signals on last bar: {hits}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+몬테카를로 시뮬레이터 벤치마크 (네트워크 불필요)
+
+실행: SIMULATION_WORKERS=4 python benchmarks/bench_simulation.py [--paths 100000] [--years 10] [--assets 5]
+합성 수익률로 초당 처리 경로 수(paths/s)를 모델/워커 수별로 측정합니다 (워커 수 기본값: CPU 수).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SIMULATION_WORKERS', str(os.cpu_count() or 1))
+
+from simulation import MAX_WORKERS, run_simulation  # noqa: E402
+
+
+def make_returns(n_assets: int, n_days: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(0.0003, 0.01, size=(n_days, 1))
+    noise = rng.normal(0.0, 0.008, size=(n_days, n_assets))
+    return pd.DataFrame(base + noise, columns=[f"A{i}" for i in range(n_assets)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paths', type=int, default=100000)
+    parser.add_argument('--years', type=float, default=10)
+    parser.add_argument('--assets', type=int, default=5)
+    args = parser.parse_args()
+
+    returns = make_returns(args.assets, 252 * 5)
+    weights = np.ones(args.assets)
+    plan = {'method': 'dca', 'totalSeed': 10_000_000, 'dcaAmount': 500_000, 'dcaIntervalDays': 30}
+
+    print(f"{args.paths} paths x {int(args.years * 12)} months x {args.assets} assets")
+    for model in ('bootstrap', 'normal'):
+        for workers in sorted({1, MAX_WORKERS}):
+            started = time.perf_counter()
+            result = run_simulation(returns, weights, plan, args.years, n_paths=args.paths,
+                                    model=model, seed=1, goal=80_000_000, workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"{model:9s} workers={workers:<2d} {elapsed:6.2f}s  {args.paths / elapsed:12,.0f} paths/s"
+                  f"  p50={result['final']['p50']:,.0f}  P(goal)={result['goal']['probability']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+워커 시작(콜드 스타트) 벤치마크 (네트워크 불필요)
+
+실행: python benchmarks/bench_startup.py [--repeat 5] [--top 15] [--budget-ms 1200]
+새 인터프리터에서 `python -X importtime -c "import app"`을 반복 실행해
+- import app: 워커가 요청을 받을 수 있게 될 때까지 (alive)
+- warm: 백그라운드 워밍업(yfinance / Gemini SDK / 라우트 모듈)까지 끝날 때까지 (ready)
+시간과, import 누적 시간이 큰 모듈 목록을 출력합니다.
+--budget-ms를 주면 import app 중앙값이 그보다 크면 종료 코드 1 (CI 회귀 확인용)
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 캐시 스냅샷 / 파일 감시 / 파일 로그처럼 import 외 부수 작업은 끄고 측정
+ENV = {
+    'LOG_FILE': '',
+    'LOG_CONSOLE': 'false',
+    'LOG_LEVEL': 'WARNING',
+    'CACHE_SNAPSHOT_PATH': '',
+    'MASTER_WATCH_SECONDS': '0',
+    'PRICE_PANEL_REFRESH_SECONDS': '0',
+}
+
+SCRIPT = """
+import time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+import warmup
+warmup.wait(60)
+print(f"{(imported - started) * 1000:.1f} {(time.perf_counter() - started) * 1000:.1f}")
+"""
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def run_once(warmup_on_start: bool = True):
+    """(import ms, warm ms, {모듈: (자체 us, 누적 us, 깊이)})"""
+    env = {**os.environ, **ENV, 'WARMUP_ON_START': 'true' if warmup_on_start else 'false'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', SCRIPT], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    imported_ms, warm_ms = (float(v) for v in result.stdout.split()[-2:])
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return imported_ms, warm_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.repeat)]
+    import_ms = statistics.median(r[0] for r in runs)
+    warm_ms = statistics.median(r[1] for r in runs)
+    # 워밍업 스레드의 import가 섞이지 않도록 import 트리는 워밍업을 끄고 한 번 더 측정
+    modules = run_once(warmup_on_start=False)[2]
+
+    print(f"import app (alive): median {import_ms:8.1f} ms  (min {min(r[0] for r in runs):.1f})")
+    print(f"warm       (ready): median {warm_ms:8.1f} ms  (min {min(r[1] for r in runs):.1f})")
+    print(f"\napp이 직접 import하는 모듈 누적 시간 상위 {args.top}개 (app 전체 {modules['app'][1] / 1000:.1f} ms)")
+    direct = sorted(((cum, name) for name, (_, cum, depth) in modules.items() if depth == 1), reverse=True)
+    for cumulative_us, name in direct[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        print(f"\nFAIL: import app {import_ms:.1f} ms > budget {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+gunicorn 워커별 메모리 비교: 일반 vs --preload (GUNICORN_PRELOAD=true)
+
+실행: python benchmarks/bench_worker_memory.py [--workers 3] [--requests 300] [--port 5990]
+각 모드로 gunicorn을 띄워 /readyz가 준비되면 검색/정보 요청으로 마스터 데이터를 건드린 뒤
+/proc/<pid>/smaps_rollup에서 워커별 RSS, PSS(공유 페이지를 나눠 계산), USS(워커 전용 페이지)를 읽습니다.
+preload의 효과는 RSS보다 USS/PSS에서 보입니다 (RSS는 공유 페이지도 워커마다 전부 셈). Linux 전용.
+"""
+
+import argparse
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENV = {
+    'LOG_FILE': '',
+    'LOG_CONSOLE': 'false',
+    'LOG_LEVEL': 'WARNING',
+    'CACHE_SNAPSHOT_PATH': '',
+    'MASTER_WATCH_SECONDS': '0',
+    'PRICE_PANEL_REFRESH_SECONDS': '0',
+    'GUNICORN_MAX_REQUESTS': '0',
+}
+
+KEYWORDS = ['kodex', 'tiger', '200', '미국', '반도체', 'spy', 'ishares', 'vanguard', 'bond', 'qqq']
+
+
+def get(url: str, timeout: float = 5) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def smaps_kb(pid: int) -> dict:
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+    }
+
+
+def children(pid: int) -> list:
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+
+def measure(preload: bool, workers: int, requests: int, port: int) -> dict:
+    env = {**os.environ, **ENV, 'PORT': str(port), 'WEB_CONCURRENCY': str(workers),
+           'GUNICORN_PRELOAD': 'true' if preload else 'false'}
+    arbiter = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.time() + 120
+        ready = 0
+        while ready < workers * 5:
+            if time.time() > deadline:
+                raise RuntimeError('gunicorn did not become ready')
+            ready = ready + 1 if get(f'{base}/readyz') == 200 else 0
+            time.sleep(0.05)
+
+        rng = random.Random(0)
+        for _ in range(requests):
+            market = rng.choice(['domestic', 'overseas'])
+            get(f'{base}/api/search?keyword={urllib.request.quote(rng.choice(KEYWORDS))}&market={market}')
+        time.sleep(1)
+
+        pids = children(arbiter.pid)
+        return {'arbiter': smaps_kb(arbiter.pid), 'workers': [smaps_kb(pid) for pid in pids]}
+    finally:
+        arbiter.send_signal(signal.SIGTERM)
+        arbiter.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--port', type=int, default=5990)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'process':<10} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8}")
+    for preload in (False, True):
+        mode = 'preload' if preload else 'default'
+        result = measure(preload, args.workers, args.requests, args.port + int(preload))
+        rows = [('arbiter', result['arbiter'])] + [(f'worker{i}', w) for i, w in enumerate(result['workers'], 1)]
+        for name, kb in rows:
+            print(f"{mode:<10} {name:<10} {kb['rss'] / 1024:8.1f} {kb['pss'] / 1024:8.1f} {kb['uss'] / 1024:8.1f}")
+        total_pss = sum(kb['pss'] for _, kb in rows) / 1024
+        print(f"{mode:<10} {'total PSS':<10} {total_pss:8.1f} MB\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+백엔드 핫 패스 벤치마크 (pytest-benchmark)
+
+실행: cd backend/benchmarks && pytest
+결과는 .benchmarks/에 자동 저장되며, 이전 실행과 비교하려면
+    pytest --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BACKEND_DIR
+
+
+# ---- ETF 검색 ----
+
+@pytest.mark.parametrize('keyword', ['kodex', '200', '미국', 'zzzz'])
+def test_filter_etfs_domestic(benchmark, app_module, keyword):
+    results = benchmark(app_module.master.current.search['domestic'].search, keyword)
+    assert isinstance(results, list)
+
+
+@pytest.mark.parametrize('keyword', ['spy', 'ishares', 'zzzz'])
+def test_filter_etfs_overseas(benchmark, app_module, keyword):
+    results = benchmark(app_module.master.current.search['overseas'].search, keyword)
+    assert isinstance(results, list)
+
+
+@pytest.mark.parametrize('market,keyword', [('domestic', 'kodex'), ('overseas', 'vanguard')])
+def test_search_endpoint(benchmark, client, market, keyword):
+    response = benchmark(client.get, f'/api/search?keyword={keyword}&market={market}')
+    assert response.status_code == 200
+
+
+# ---- 히스토리 직렬화 ----
+
+def test_serialize_history_1y(benchmark, app_module, history_1y):
+    records = benchmark(app_module.serialize_history, history_1y)
+    assert len(records) == len(history_1y)
+
+
+def test_serialize_history_5y(benchmark, app_module, history_5y):
+    records = benchmark(app_module.serialize_history, history_5y)
+    assert len(records) == len(history_5y)
+
+
+# ---- 보유종목 정규화 ----
+
+def test_normalize_yf_holdings(benchmark, yf_holdings):
+    import holdings
+
+    records = benchmark(lambda: holdings.from_yfinance('SPY', yf_holdings).top(10))
+    assert len(records) == 10 and records[0]['weight'] >= records[-1]['weight']
+
+
+def test_holdings_page_cached(benchmark, kis_holdings_response):
+    # 캐시된 정규화 결과에서 커서 페이지 하나만 직렬화 (요청마다 전체 목록을 다시 파싱하지 않음)
+    import holdings
+    from kis_api import parse_holdings_response
+
+    data = holdings.from_kis('069500', parse_holdings_response('069500', kis_holdings_response))
+    _, cursor = data.page(None, 50)
+    page, _ = benchmark(data.page, cursor, 50)
+    assert len(page) == 50
+
+
+def test_parse_kis_holdings(benchmark, kis_holdings_response):
+    from kis_api import parse_holdings_response
+
+    result = benchmark(parse_holdings_response, '069500', kis_holdings_response)
+    assert len(result['holdings']) == len(kis_holdings_response['output1'])
+
+
+# ---- CSV 로딩 ----
+
+def test_load_korean_csv(benchmark, app_module):
+    import os
+
+    df = benchmark(app_module.load_korean_etf_csv, os.path.join(BACKEND_DIR, 'k-etf_etfs.csv.csv'))
+    assert not df.empty
+
+
+def test_load_overseas_csv(benchmark, app_module):
+    import os
+
+    df = benchmark(app_module.load_overseas_etf_csv, os.path.join(BACKEND_DIR, 'i-etf_etfs.csv'))
+    assert not df.empty
+
+
+# ---- Gemini 응답 파싱 ----
+
+@pytest.mark.parametrize('kind', ['summary', 'fenced', 'garbage'])
+def test_safe_parse_json(benchmark, app_module, gemini_texts, kind):
+    parsed = benchmark(app_module.safe_parse_json, gemini_texts[kind])
+    assert isinstance(parsed, dict)
+
+
+# ---- stale-while-revalidate 캐시 ----
+
+@pytest.mark.parametrize('state', ['fresh', 'stale'])
+def test_history_endpoint_cached(benchmark, app_module, client, history_1y, state):
+    from concurrent.futures import Future
+
+    cache = app_module.history_response_cache
+    key = ('BENCH', '1y')
+    ttl = cache.ttl if state == 'fresh' else cache.ttl - cache.fresh_ttl - 60
+    cache.set(key, app_module.serialize_history(history_1y), ttl=ttl)
+    # 갱신이 이미 진행 중인 것으로 두어 stale 응답 시 네트워크 호출이 예약되지 않게 함
+    cache._inflight[key] = Future()
+    try:
+        response = benchmark(client.get, '/api/etf/history?ticker=BENCH&period=1y')
+    finally:
+        cache._inflight.pop(key, None)
+        cache.delete(key)
+    assert response.status_code == 200
+    assert (response.headers.get('X-Data-Stale') == 'true') == (state == 'stale')
+
+
+# ---- 티커 해석 ----
+
+@pytest.mark.parametrize('ticker', ['069500', 'A069500', 'spy'])
+def test_resolve_master_ticker(benchmark, app_module, ticker):
+    symbol = benchmark(app_module.resolver.resolve, ticker)
+    assert symbol.listed
+
+
+def test_history_endpoint_known_miss(benchmark, app_module, client):
+    # 최근 데이터가 없었던 티커는 업스트림 호출 없이 바로 400
+    app_module.resolver.record_miss('NOSUCHETF')
+    try:
+        response = benchmark(client.get, '/api/etf/history?ticker=NOSUCHETF&period=1y')
+    finally:
+        app_module.resolver.misses.delete('NOSUCHETF')
+    assert response.status_code == 400
+
+
+# ---- 캐시 디스크 스냅샷 ----
+
+def test_cache_snapshot_restore(benchmark, app_module, yf_holdings, tmp_path):
+    # ETF 정보 2000건 규모 스냅샷을 빈 캐시로 복원 (워커 시작 시 비용)
+    from cache import TTLCache
+    from cache_snapshot import CacheSnapshot
+
+    info = {'symbol': 'BENCH', 'longName': 'Bench ETF', 'holdings': yf_holdings}
+    source = TTLCache('bench_info', ttl=3600, maxsize=2048)
+    for i in range(2000):
+        source.set(f'T{i:04d}', {**info, 'symbol': f'T{i:04d}'})
+    path = str(tmp_path / 'caches.bin')
+    CacheSnapshot([source], path=path).save()
+
+    def restore():
+        target = TTLCache('bench_info', ttl=3600, maxsize=2048)
+        return CacheSnapshot([target], path=path).restore()
+
+    restored = benchmark(restore)
+    assert restored == {'bench_info': 2000}
+
+
+# ---- 보유종목 이력 ----
+
+@pytest.fixture
+def holdings_store_60d(kis_holdings_response, tmp_path):
+    # 같은 ETF의 공시일 60개 (매일 일부 종목 비중 변경, 열흘마다 한 종목 교체)
+    from kis_api import parse_holdings_response
+    from holdings_store import HoldingsStore
+
+    store = HoldingsStore(str(tmp_path))
+    data = parse_holdings_response('069500', kis_holdings_response)
+    holdings = data['holdings']
+    for day in range(60):
+        holdings = [{**h, 'weight': h['weight'] * (1 + 0.01 * ((i + day) % 5 - 2))} for i, h in enumerate(holdings)]
+        if day % 10 == 9:
+            holdings = holdings[1:] + [{**holdings[0], 'stockCode': f'9{day:05d}'}]
+        store.record('069500', {**data, 'updateDate': f'2025{1 + day // 28:02d}{1 + day % 28:02d}',
+                                'holdings': holdings})
+    return store
+
+
+def test_holdings_diff(benchmark, holdings_store_60d):
+    dates = holdings_store_60d.dates('069500')
+    diff = benchmark(holdings_store_60d.diff, '069500', dates[0], dates[-1], 0.05)
+    assert len(diff['added']) == 6 and len(diff['removed']) == 6
+
+
+def test_holdings_latest_unchanged(benchmark, holdings_store_60d):
+    # 공시일이 그대로일 때 KIS 응답 대신 저장된 최신 스냅샷을 돌려주는 비용
+    latest = benchmark(holdings_store_60d.latest, '069500')
+    assert latest['updateDate'] == holdings_store_60d.dates('069500')[-1]
+
+
+# ---- 총보수 / 분배금 / 수익률 지표 ----
+
+@pytest.fixture(scope='module')
+def universe_5y():
+    # 3400 티커 x 5년여 수정종가 (float32, 패널과 같은 형식) + 분기 분배금 이벤트
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range(end='2025-10-17', periods=1310)
+    closes = (100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(index), 3400)), axis=0))).astype(np.float32)
+    closes[:400, ::50] = np.nan  # 상장 3년 미만 티커
+    dividends = pd.DataFrame(0.0, index=index, columns=[f'T{i:04d}' for i in range(3400)])
+    dividends.iloc[::63, ::2] = 0.5
+    days = (index.values.astype('datetime64[D]') - np.datetime64('1970-01-01', 'D')).astype(np.int64)
+    return days, closes, dividends
+
+
+def test_fund_metrics_universe(benchmark, universe_5y, tmp_path):
+    # 새 일봉/분배금이 들어왔을 때 유니버스 전체 재계산 비용 (요청 경로에서는 계산된 배열만 읽음)
+    import fund_metrics
+    from distribution_store import DistributionStore
+
+    days, closes, dividends = universe_5y
+    store = DistributionStore(str(tmp_path))
+    store.record(dividends)
+    symbols = list(dividends.columns)
+
+    def compute():
+        return fund_metrics.compute(days, closes, symbols, *store.distributions().columns(symbols))
+
+    metrics = benchmark(compute)
+    paying = metrics.get('T0002')
+    assert paying['dividend']['paymentFrequency'] == 'quarterly' and paying['performance']['fiveYearReturn'] is not None
+    assert metrics.get('T0050')['performance']['fiveYearReturn'] is None
+
+
+# ---- 비교 차트 총수익 지수 ----
+
+def test_compare_series_rebase(benchmark, history_5y):
+    # 캐시된 티커별 환산 지수 5개를 날짜 합집합에 맞추고 공통 시작일 기준 100으로 다시 맞추는 비용
+    import total_return
+
+    close = history_5y['Close'].to_numpy()
+    dividends = history_5y['Dividends'].to_numpy() if 'Dividends' in history_5y else None
+    index = pd.DatetimeIndex(history_5y.index).tz_localize(None).normalize()
+    columns = [pd.Series(total_return.total_return_index(close * (1 + i / 10), dividends) * 100,
+                         index=index + pd.Timedelta(days=i % 2), name=f'T{i}') for i in range(5)]
+    result = benchmark(total_return.compare, columns)
+    assert all(values[0] == 100 for values in result['series'].values())
@@ -0,0 +1,58 @@
+"""
+벤치마크 공통 픽스처 (fixtures/ 파일만 사용, 네트워크 불필요)
+
+환경 변수와 app_module / client 픽스처는 tests/와 함께 쓰는 backend/testing_env.py에 있습니다.
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+sys.path.insert(0, BACKEND_DIR)
+
+from testing_env import app_module, client, configure  # noqa: E402,F401
+
+configure(price_panel_dir=os.path.join(FIXTURES_DIR, 'no_price_panel'))
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES_DIR, name)
+
+
+@pytest.fixture(scope='session')
+def history_5y() -> pd.DataFrame:
+    hist = pd.read_csv(fixture_path('yf_history_SPY_5y.csv'), index_col='Date')
+    hist.index = pd.to_datetime(hist.index, utc=True).tz_convert('America/New_York')
+    return hist
+
+
+@pytest.fixture(scope='session')
+def history_1y(history_5y) -> pd.DataFrame:
+    return history_5y.iloc[-252:]
+
+
+@pytest.fixture(scope='session')
+def yf_holdings() -> pd.DataFrame:
+    return pd.read_csv(fixture_path('yf_holdings_SPY.csv'), index_col='Symbol')
+
+
+@pytest.fixture(scope='session')
+def kis_holdings_response() -> dict:
+    with open(fixture_path('kis_holdings_069500.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def gemini_texts() -> dict:
+    texts = {}
+    for name in ('summary', 'fenced', 'garbage'):
+        with open(fixture_path(f'gemini_{name}.txt'), encoding='utf-8') as f:
+            texts[name] = f.read()
+    return texts
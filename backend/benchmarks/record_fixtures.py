@@ -0,0 +1,124 @@
+"""
+벤치마크용 오프라인 픽스처 기록
+
+실행: python benchmarks/record_fixtures.py [--synthetic]
+기본은 yfinance / KIS / Gemini에서 실제 응답을 받아 fixtures/에 저장하고,
+--synthetic은 네트워크 없이 같은 형식의 결정적(seed 고정) 데이터를 생성합니다.
+벤치마크는 이 파일들만 읽으므로 외부 서비스 없이 실행됩니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, BACKEND_DIR)
+
+HISTORY_FILE = 'yf_history_SPY_5y.csv'
+HOLDINGS_FILE = 'yf_holdings_SPY.csv'
+KIS_HOLDINGS_FILE = 'kis_holdings_069500.json'
+GEMINI_FILES = ('gemini_summary.txt', 'gemini_fenced.txt', 'gemini_garbage.txt')
+
+
+def synthetic_history(days: int = 1260, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end='2025-10-17', periods=days, tz='America/New_York', name='Date')
+    close = 400 * np.exp(np.cumsum(rng.normal(0.0004, 0.011, days)))
+    open_ = close * (1 + rng.normal(0, 0.003, days))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + rng.uniform(0, 0.006, days)),
+        'Low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.006, days)),
+        'Close': close,
+        'Volume': rng.integers(30_000_000, 120_000_000, days),
+        'Dividends': np.where(np.arange(days) % 63 == 62, 1.75, 0.0),
+        'Stock Splits': 0.0,
+        'Capital Gains': 0.0,
+    }, index=index)
+
+
+def synthetic_holdings(n: int = 50, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    weights = np.sort(rng.dirichlet(np.full(n, 0.6)) * 0.6)[::-1]
+    symbols = [f"SYM{i:02d}" for i in range(n)]
+    return pd.DataFrame({'Name': [f"Company {s} Inc." for s in symbols], 'Holding Percent': weights},
+                        index=pd.Index(symbols, name='Symbol'))
+
+
+def synthetic_kis_holdings(n: int = 200, seed: int = 7) -> dict:
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.full(n, 0.5)) * 100
+    return {
+        'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.',
+        'output': {'hts_kor_isnm': 'KODEX 200', 'nav': '35210.55', 'tot_cnt': str(n), 'updt_dt': '20251017'},
+        'output1': [{
+            'stock_code': f"{100000 + i * 37:06d}",
+            'stock_name': f"종목{i:03d}",
+            'weight': f"{w:.4f}",
+            'shares': str(int(rng.integers(10, 50000))),
+            'value': str(int(rng.integers(1_000_000, 5_000_000_000))),
+        } for i, w in enumerate(weights)],
+    }
+
+
+def synthetic_gemini() -> dict:
+    summary = {
+        'common': '선택한 ETF들은 모두 미국 대형주 지수를 추종하며 보수가 낮습니다.',
+        'differences': [{'ticker': t, 'point': f'{t}는 운용 규모와 거래량이 다릅니다.'} for t in ('SPY', 'VOO', 'IVV')],
+        'pros_cons': [{'ticker': t, 'pros': ['낮은 보수', '높은 유동성'], 'cons': ['환율 변동 위험']}
+                      for t in ('SPY', 'VOO', 'IVV')],
+    }
+    body = json.dumps(summary, ensure_ascii=False, indent=2)
+    return {
+        'gemini_summary.txt': body,
+        'gemini_fenced.txt': '다음은 요청하신 비교 요약입니다.\n\n```json\n' + body + '\n```\n\n참고용 정보입니다.',
+        'gemini_garbage.txt': '죄송합니다. 지금은 요약을 생성할 수 없습니다. ' * 40,
+    }
+
+
+def record_live() -> None:
+    import yfinance as yf
+
+    from kis_api import get_client
+
+    yf.Ticker('SPY').history(period='5y').to_csv(os.path.join(FIXTURES_DIR, HISTORY_FILE))
+    top = yf.Ticker('SPY').funds_data.top_holdings
+    top.to_csv(os.path.join(FIXTURES_DIR, HOLDINGS_FILE))
+    client = get_client()
+    if client.api_available and not client.mock_mode:
+        url = f"{client.base_url}/uapi/domestic-stock/v1/quotations/inquire-basic-price"
+        raw = client._make_request(url, client._get_headers('FHKST03030100'),
+                                   {'FID_COND_MRKT_DIV_CODE': 'J', 'FID_INPUT_ISCD': '069500'})
+        with open(os.path.join(FIXTURES_DIR, KIS_HOLDINGS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(raw, f, ensure_ascii=False, indent=1)
+    else:
+        print("KIS 키가 없어 KIS 픽스처는 기존 파일을 유지합니다.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--synthetic', action='store_true', help='네트워크 없이 결정적 데이터 생성')
+    args = parser.parse_args()
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+
+    if not args.synthetic:
+        record_live()
+        return
+
+    synthetic_history().to_csv(os.path.join(FIXTURES_DIR, HISTORY_FILE))
+    synthetic_holdings().to_csv(os.path.join(FIXTURES_DIR, HOLDINGS_FILE))
+    with open(os.path.join(FIXTURES_DIR, KIS_HOLDINGS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(synthetic_kis_holdings(), f, ensure_ascii=False, indent=1)
+    for name, text in synthetic_gemini().items():
+        with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(f"픽스처 생성 완료: {FIXTURES_DIR}")
+
+
+if __name__ == '__main__':
+    main()
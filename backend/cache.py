@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_caches: List["TTLCache"] = []
+
+
+def all_caches() -> List["TTLCache"]:
+    """생성된 모든 캐시 (메트릭 수집용)"""
+    return list(_caches)
+
+
+class TTLCache:
+    """TTL 기반 인메모리 캐시 (스레드 안전)"""
+
+    def __init__(self, name: str, ttl: float = 300, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        _caches.append(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """만료되지 않은 값을 반환하고, 없으면 None"""
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.time():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """만료 여부와 관계없이 아직 남아 있는 값을 반환 (업스트림 장애 시 폴백용)"""
+        entry = self._data.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """값 저장 (용량 초과 시 가장 먼저 만료되는 항목부터 제거)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (expires_at, value)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """predicate(key)가 참인 항목을 모두 삭제하고 삭제한 개수를 반환"""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+        return len(keys)
+
+    def export(self) -> List[Tuple[Hashable, float, Any]]:
+        """만료되지 않은 항목의 (키, 만료 시각, 값) 목록 (디스크 스냅샷용)"""
+        now = time.time()
+        with self._lock:
+            return [(k, exp, v) for k, (exp, v) in self._data.items() if exp > now]
+
+    def restore(self, entries: Iterable[Tuple[Hashable, float, Any]]) -> int:
+        """export() 항목을 원래 만료 시각 그대로 넣음 (만료된 항목, 이미 있는 키, maxsize 초과분은 건너뜀)"""
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, expires_at, value in entries:
+                if expires_at <= now or key in self._data or len(self._data) >= self.maxsize:
+                    continue
+                self._data[key] = (expires_at, value)
+                restored += 1
+        return restored
+
+    def _evict(self) -> None:
+        now = time.time()
+        expired = [k for k, (exp, _) in self._data.items() if exp <= now]
+        for k in expired:
+            del self._data[k]
+        if len(self._data) >= self.maxsize:
+            oldest = min(self._data, key=lambda k: self._data[k][0])
+            del self._data[oldest]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# 백그라운드 재검증 전용 풀 (요청 스레드는 갱신을 기다리지 않음)
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='swr-refresh')
+
+
+class SWRCache(TTLCache):
+    """stale-while-revalidate 캐시
+
+    - fresh_ttl 이내: 그대로 반환
+    - fresh_ttl ~ ttl: 즉시 반환하고 키당 한 번만 백그라운드 갱신
+    - ttl 초과/없음: 호출 스레드에서 적재 (같은 키 동시 요청은 한 번만 적재하고 결과 공유)
+    cacheable(value)가 False인 값(예: Mock 폴백)은 반환만 하고 저장하지 않음
+    """
+
+    def __init__(self, name: str, fresh_ttl: float, ttl: float, maxsize: int = 1024,
+                 cacheable: Optional[Callable[[Any], bool]] = None):
+        super().__init__(name, ttl=ttl, maxsize=maxsize)
+        self.fresh_ttl = fresh_ttl
+        self.cacheable = cacheable
+        self.revalidations = 0
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, float]:
+        """(값, 적재 후 경과 초) 반환. 값이 stale이면 갱신을 예약만 하고 바로 반환"""
+        entry = self._data.get(key)
+        now = time.time()
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            age = now - (entry[0] - self.ttl)
+            if age > self.fresh_ttl:
+                future, owner = self._claim(key)
+                if owner:
+                    self.revalidations += 1
+                    _refresh_pool.submit(self._load, key, loader, future)
+            return entry[1], age
+        self.misses += 1
+        future, owner = self._claim(key)
+        if owner:
+            self._load(key, loader, future)
+        return future.result(), 0.0
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """저장된 값의 경과 초 (만료된 값 포함, 없으면 None)"""
+        entry = self._data.get(key)
+        return None if entry is None else time.time() - (entry[0] - self.ttl)
+
+    def _claim(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future) -> None:
+        try:
+            value = loader()
+            if self.cacheable is None or self.cacheable(value):
+                self.set(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            logger.warning("[cache] %s load failed for %s: %s", self.name, key, e)
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
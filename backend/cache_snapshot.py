@@ -0,0 +1,166 @@
+"""
+자주 쓰는 캐시를 디스크에 주기적으로 저장하고, 시작할 때 복원 (재배포/워커 재시작 직후 업스트림 폭주 방지)
+
+- 대상: 현재가, ETF 정보, 보유종목, AI 요약 캐시 (app.py에서 등록)
+- 형식: 헤더(매직 + 버전) + zlib 압축한 pickle {캐시 이름: [(키, 만료 시각, 값), ...]}
+  만료 시각은 절대 시각(time.time())이므로 복원해도 원래 TTL이 그대로 유지되고, 이미 만료된 항목은 버림
+- 저장: CACHE_SNAPSHOT_SECONDS(기본 300, 0이면 주기 저장 끔)마다 + 프로세스 종료 시
+  gunicorn 워커들이 같은 파일을 쓰므로 파일 잠금 아래에서 기존 스냅샷과 병합(키마다 늦게 만료되는 값)한 뒤
+  임시 파일 -> os.replace로 교체
+- 경로: CACHE_SNAPSHOT_PATH (기본 snapshots/caches.bin, 빈 값이면 기능 끔)
+  Railway처럼 재배포 시 파일시스템이 초기화되는 환경에서는 볼륨 경로를 지정해야 함
+- pickle을 쓰므로 이 프로세스만 쓰는 경로에 두어야 함 (외부에서 받은 파일을 복원하지 말 것)
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from cache import TTLCache
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발: 워커가 하나이므로 잠금 없이 저장
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'snapshots', 'caches.bin')
+SNAPSHOT_PATH = os.getenv('CACHE_SNAPSHOT_PATH', DEFAULT_PATH)
+SNAPSHOT_SECONDS = float(os.getenv('CACHE_SNAPSHOT_SECONDS', 300))
+
+_MAGIC = b'ETFCACHE'
+_VERSION = 1
+
+
+def _read(path: str) -> Dict[str, List[tuple]]:
+    with open(path, 'rb') as f:
+        header = f.read(len(_MAGIC) + 1)
+        if header[:len(_MAGIC)] != _MAGIC or header[-1] != _VERSION:
+            raise ValueError(f"not a cache snapshot (version {_VERSION})")
+        return pickle.loads(zlib.decompress(f.read()))
+
+
+def _write(path: str, caches: Dict[str, List[tuple]]) -> int:
+    payload = zlib.compress(pickle.dumps(caches, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC + bytes([_VERSION]))
+        f.write(payload)
+    os.replace(tmp, path)
+    return len(payload)
+
+
+class CacheSnapshot:
+    """등록된 캐시들의 디스크 스냅샷 저장/복원"""
+
+    def __init__(self, caches: Iterable[TTLCache], path: str = SNAPSHOT_PATH):
+        self.caches = {cache.name: cache for cache in caches}
+        self.path = path
+        self.restored: Dict[str, int] = {}
+        self.restore_ms: Optional[float] = None
+        self.last_saved: Optional[float] = None
+        self.last_size = 0
+        self.last_error: Optional[str] = None
+        self._saver: Optional[threading.Thread] = None
+        self._started = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def restore(self) -> Dict[str, int]:
+        """스냅샷에서 아직 만료되지 않은 항목을 복원. 캐시별 복원 개수 반환"""
+        if not self.enabled or not os.path.exists(self.path):
+            return {}
+        started = time.perf_counter()
+        try:
+            saved = _read(self.path)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"[:300]
+            logger.warning("[snapshot] could not read %s: %s", self.path, self.last_error)
+            return {}
+        self.restored = {name: cache.restore(saved.get(name, ())) for name, cache in self.caches.items()}
+        self.restore_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("[snapshot] restored %d entries in %.1fms from %s: %s",
+                    sum(self.restored.values()), self.restore_ms, self.path, self.restored)
+        return self.restored
+
+    def save(self) -> int:
+        """현재 캐시를 기존 스냅샷과 병합해 저장. 저장한 항목 수 반환"""
+        if not self.enabled:
+            return 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                merged = self._merge_with_disk()
+                self.last_size = _write(self.path, merged)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        self.last_saved = time.time()
+        self.last_error = None
+        return sum(len(entries) for entries in merged.values())
+
+    def _merge_with_disk(self) -> Dict[str, List[tuple]]:
+        now = time.time()
+        try:
+            on_disk = _read(self.path) if os.path.exists(self.path) else {}
+        except Exception as e:
+            logger.warning("[snapshot] discarding unreadable snapshot %s: %s", self.path, e)
+            on_disk = {}
+        merged = {}
+        for name, cache in self.caches.items():
+            entries = {key: (expires_at, value) for key, expires_at, value in on_disk.get(name, ())
+                       if expires_at > now}
+            for key, expires_at, value in cache.export():
+                if key not in entries or entries[key][0] <= expires_at:
+                    entries[key] = (expires_at, value)
+            # 가장 늦게 만료되는 항목부터 maxsize개만 유지
+            newest = sorted(entries.items(), key=lambda item: item[1][0], reverse=True)[:cache.maxsize]
+            merged[name] = [(key, expires_at, value) for key, (expires_at, value) in newest]
+        return merged
+
+    def _save_safely(self) -> None:
+        try:
+            count = self.save()
+            logger.debug("[snapshot] saved %d entries (%d bytes)", count, self.last_size)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"[:300]
+            logger.error("[snapshot] save failed: %s", self.last_error)
+
+    def start(self, interval: float = SNAPSHOT_SECONDS) -> None:
+        """interval초마다 저장하는 스레드 시작 + 종료 시 저장 등록 (프로세스당 한 번)"""
+        if not self.enabled or self._started:
+            return
+        self._started = True
+        atexit.register(self._save_safely)
+        if interval <= 0:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self._save_safely()
+
+        self._saver = threading.Thread(target=loop, name='cache-snapshot', daemon=True)
+        self._saver.start()
+
+    def status(self) -> Dict:
+        return {
+            'path': self.path or None,
+            'restored': self.restored,
+            'restoreMs': self.restore_ms,
+            'lastSaved': self.last_saved,
+            'lastSizeBytes': self.last_size,
+            'lastError': self.last_error,
+            'intervalSeconds': SNAPSHOT_SECONDS if self._saver is not None else 0,
+            'entries': {name: len(cache) for name, cache in self.caches.items()},
+        }
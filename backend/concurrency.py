@@ -0,0 +1,85 @@
+"""
+라우트 그룹별 동시 실행 제한 (bulkhead)
+
+Gemini를 호출하는 AI 경로는 요청 하나가 10초 이상 워커 스레드를 붙잡고,
+시뮬레이션/최적화는 GIL을 오래 잡는 CPU 작업입니다. 이런 경로가 워커의
+스레드를 모두 차지하면 검색/히스토리 같은 빠른 요청까지 줄을 서게 되므로
+그룹별로 동시에 실행될 수 있는 요청 수를 워커 스레드의 일부로 묶어 둡니다.
+
+- ai: POOL_AI_LIMIT (기본: 워커 스레드 수의 1/4, 최소 1)
+- compute: POOL_COMPUTE_LIMIT (기본 2)
+- stream: POOL_STREAM_LIMIT (기본: 워커 스레드 수의 1/2) - 실시간 시세 SSE 연결은
+  열려 있는 동안 스레드 하나를 계속 쓰므로 동시 연결 수를 따로 제한
+- 자리가 POOL_QUEUE_TIMEOUT초(기본 0.25) 안에 나지 않으면 503 + Retry-After로 바로 응답
+  (대기 중인 요청도 워커 스레드를 점유하므로 오래 기다리게 두지 않음)
+
+워커 스레드 수는 gunicorn.conf.py가 SERVER_THREADS로 넘겨줍니다.
+"""
+
+import functools
+import logging
+import os
+import threading
+
+from flask import jsonify
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _server_threads() -> int:
+    return max(1, int(os.getenv('SERVER_THREADS', 8)))
+
+
+class RoutePool:
+    """세마포어 기반 동시 실행 슬롯"""
+
+    def __init__(self, name: str, limit: int, queue_timeout: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.limit)
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            metrics.inc('route_pool_rejected_total', (self.name,))
+            return False
+        metrics.gauge_add('route_pool_in_use', (self.name,), 1)
+        return True
+
+    def release(self) -> None:
+        metrics.gauge_add('route_pool_in_use', (self.name,), -1)
+        self._slots.release()
+
+
+_queue_timeout = float(os.getenv('POOL_QUEUE_TIMEOUT', 0.25))
+
+pools = {
+    'ai': RoutePool('ai', int(os.getenv('POOL_AI_LIMIT', _server_threads() // 4)), _queue_timeout),
+    'compute': RoutePool('compute', int(os.getenv('POOL_COMPUTE_LIMIT', 2)), _queue_timeout),
+    'stream': RoutePool('stream', int(os.getenv('POOL_STREAM_LIMIT', _server_threads() // 2)), _queue_timeout),
+}
+
+
+def limit(pool_name: str):
+    """라우트 함수를 지정한 풀의 슬롯 안에서만 실행 (@app.route 아래에 적용)"""
+    pool = pools[pool_name]
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not pool.acquire():
+                logger.warning("[pool] %s pool saturated (limit=%s), rejecting %s", pool.name, pool.limit, fn.__name__)
+                response = jsonify({"error": "Server is busy, please retry shortly"})
+                response.status_code = 503
+                response.headers['Retry-After'] = '5'
+                return response
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                pool.release()
+
+        return wrapper
+
+    return decorator
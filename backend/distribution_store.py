@@ -0,0 +1,217 @@
+"""
+ETF 분배금(배당) 이력 + 총보수 저장소
+
+- 분배금: 공유 종가 패널을 갱신하는 워커가 종가와 같은 일괄 다운로드(actions)로 받은 분배금 행렬을 기록
+  패널 밖 티커는 티커별 히스토리(history_store)의 Dividends로 기록 (fund_metrics)
+  패널은 실제 종가만 보관하므로 분배금 재투자 수익률은 읽을 때 reinvestment()로 이벤트를 행에 맞춰 곱함
+- 형식: distributions.npz 하나 (np.savez_compressed, pickle 없음)
+  symbols: 한 번이라도 분배 이력을 받은 yfinance 심볼 (분배가 없는 ETF 포함 -> '분배 없음'과 '아직 모름' 구분)
+  ticker(int32, symbols 번호), days(int32, 1970-01-01 기준 일수), amounts(float64): (티커, 날짜) 순 정렬
+- 총보수: expense.json {심볼: [총보수 %(없으면 null), 조회 시각]} (티커별 조회만 가능하므로 요청 시 채움)
+- 경로: DISTRIBUTION_STORE_DIR (기본 snapshots/distributions, 빈 값이면 기능 끔)
+  gunicorn 워커들이 같은 파일을 쓰므로 파일 잠금 아래에서 디스크의 최신 내용과 합친 뒤 os.replace로 교체
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발: 워커가 하나이므로 잠금 없이 저장
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), 'snapshots', 'distributions')
+STORE_DIR = os.getenv('DISTRIBUTION_STORE_DIR', DEFAULT_DIR)
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+class Distributions(NamedTuple):
+    """유니버스 전체 분배금 이벤트 (긴 형식 배열)"""
+    symbols: np.ndarray   # (U)
+    ticker: np.ndarray    # symbols 번호 (int32)
+    days: np.ndarray      # 지급 기준일 (int32, 1970-01-01 기준 일수)
+    amounts: np.ndarray   # 주당 분배금 (float64, 해당 통화)
+
+    def columns(self, symbols: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """주어진 열 순서로 다시 번호를 매긴 (열 번호, 날짜, 금액) 이벤트와 열별 이력 보유 여부"""
+        position = {s: i for i, s in enumerate(symbols)}
+        lookup = np.asarray([position.get(s, -1) for s in self.symbols.tolist()], dtype=np.int64)
+        known = np.zeros(len(symbols), dtype=bool)
+        known[lookup[lookup >= 0]] = True
+        column = lookup[self.ticker] if len(self.ticker) else np.array([], dtype=np.int64)
+        mask = column >= 0
+        return column[mask], self.days[mask], self.amounts[mask], known
+
+
+def _empty() -> Distributions:
+    return Distributions(np.array([], dtype='U1'), np.array([], dtype=np.int32), np.array([], dtype=np.int32),
+                         np.array([], dtype=np.float64))
+
+
+def _events(dividends: pd.DataFrame) -> pd.DataFrame:
+    """(날짜 x 심볼) 분배금 행렬 -> 0이 아닌 칸만 (symbol, day, amount) 긴 형식"""
+    values = dividends.to_numpy(dtype=np.float64)
+    rows, cols = np.nonzero(np.nan_to_num(values) > 0)
+    days = (pd.DatetimeIndex(dividends.index).values.astype('datetime64[D]') - _EPOCH).astype(np.int32)
+    return pd.DataFrame({'symbol': np.asarray(dividends.columns, dtype=str)[cols],
+                         'day': days[rows], 'amount': values[rows, cols]})
+
+
+def _frame(distributions: Distributions) -> pd.DataFrame:
+    return pd.DataFrame({'symbol': distributions.symbols[distributions.ticker], 'day': distributions.days,
+                         'amount': distributions.amounts})
+
+
+def reinvestment(dates: np.ndarray, closes: np.ndarray, column: np.ndarray, days: np.ndarray,
+                 amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """분배 이벤트를 (T) 일수 + (T x N) 실제 종가 행렬의 행에 맞춰 (행, 열, log(1 + 분배금 / 그날 종가)) 반환
+
+    총수익 TR_t = TR_{t-1} * (P_t + D_t) / P_{t-1} 에서 가격 변화를 뺀 분배금 몫 (행 범위 밖 / 종가 없는 이벤트는 버림)
+    """
+    rows = np.searchsorted(dates, days)
+    inside = (rows < len(dates)) & (days >= dates[0]) if len(dates) else np.zeros(len(days), dtype=bool)
+    rows, column, amounts = rows[inside], column[inside], amounts[inside]
+    price = closes[rows, column].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.log1p(amounts / price)
+    ok = np.isfinite(factor) & (price > 0)
+    return rows[ok], column[ok], factor[ok]
+
+
+class DistributionStore:
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        self._loaded: Optional[Tuple[int, Distributions]] = None
+        self._expense: Optional[Tuple[int, Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _mtime(self, name: str) -> Optional[int]:
+        if not self.enabled:
+            return None
+        try:
+            return os.stat(self._path(name)).st_mtime_ns
+        except OSError:
+            return None
+
+    @property
+    def version(self) -> int:
+        """분배금 파일이 바뀔 때마다 달라지는 값 (지표 재계산 판단용, 없으면 0)"""
+        return self._mtime('distributions.npz') or 0
+
+    def distributions(self) -> Distributions:
+        """저장된 분배금 이벤트 (파일이 바뀌었으면 다시 읽음)"""
+        mtime = self._mtime('distributions.npz')
+        if mtime is None:
+            return _empty()
+        loaded = self._loaded
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        with np.load(self._path('distributions.npz'), allow_pickle=False) as npz:
+            distributions = Distributions(**{field: npz[field] for field in Distributions._fields})
+        with self._lock:
+            self._loaded = (mtime, distributions)
+        return distributions
+
+    def covers(self, symbols: List[str]) -> bool:
+        """모든 심볼의 분배 이력을 받은 적이 있는지 (저장소를 끄면 항상 True)"""
+        if not self.enabled:
+            return True
+        return set(symbols) <= set(self.distributions().symbols.tolist())
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path('distributions.lock'), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def record(self, dividends: pd.DataFrame) -> int:
+        """(날짜 x 심볼) 분배금 행렬(0 = 분배 없음)을 합쳐 저장. 새로 생기거나 바뀐 이벤트 수 반환
+
+        행렬의 모든 열은 '이력을 받은 심볼'로 표시. 바뀐 것이 없으면 파일을 다시 쓰지 않음
+        """
+        if not self.enabled or dividends is None or dividends.shape[1] == 0:
+            return 0
+        incoming = _events(dividends)
+        symbols = [str(s) for s in dividends.columns]
+        if not self._changes(self.distributions(), incoming, symbols):
+            return 0
+        with self._locked():
+            current = self.distributions()
+            changed = self._changes(current, incoming, symbols)
+            merged = pd.concat([_frame(current), incoming], ignore_index=True)
+            merged = merged.drop_duplicates(['symbol', 'day'], keep='last')
+            all_symbols = np.asarray(sorted(set(current.symbols.tolist()) | set(symbols)), dtype=str)
+            ticker = np.searchsorted(all_symbols, merged['symbol'].to_numpy(dtype=str)).astype(np.int32)
+            order = np.lexsort((merged['day'].to_numpy(), ticker))
+            distributions = Distributions(all_symbols, ticker[order],
+                                          merged['day'].to_numpy(dtype=np.int32)[order],
+                                          merged['amount'].to_numpy(dtype=np.float64)[order])
+            tmp = self._path(f"distributions.npz.{os.getpid()}.tmp.npz")
+            np.savez_compressed(tmp, **distributions._asdict())
+            os.replace(tmp, self._path('distributions.npz'))
+        logger.info("[distributions] stored %d new/changed events (%d symbols, %d events)",
+                    changed, len(all_symbols), len(distributions.days))
+        return changed
+
+    @staticmethod
+    def _changes(current: Distributions, incoming: pd.DataFrame, symbols: List[str]) -> int:
+        """저장된 것과 다른(새로 생겼거나 금액이 바뀐) 이벤트 수. 처음 보는 심볼만 있어도 1 이상"""
+        joined = incoming.merge(_frame(current), on=['symbol', 'day'], how='left', suffixes=('', '_stored'))
+        changed = int((~np.isclose(joined['amount'], joined['amount_stored'])).sum())
+        new_symbols = not set(symbols) <= set(current.symbols.tolist())
+        return max(changed, int(new_symbols))
+
+    # ---- 총보수 ----
+
+    def _expenses(self) -> Dict:
+        mtime = self._mtime('expense.json')
+        if mtime is None:
+            return {}
+        loaded = self._expense
+        if loaded is None or loaded[0] != mtime:
+            with open(self._path('expense.json'), encoding='utf-8') as f:
+                loaded = self._expense = (mtime, json.load(f))
+        return loaded[1]
+
+    def expense(self, symbol: str) -> Optional[Tuple[Optional[float], float]]:
+        """(총보수 %, 조회 시각) - 조회한 적이 없으면 None (조회했는데 값이 없으면 (None, 시각))"""
+        entry = self._expenses().get(symbol)
+        return None if entry is None else (entry[0], entry[1])
+
+    def record_expense(self, symbol: str, ratio: Optional[float]) -> None:
+        if not self.enabled:
+            return
+        with self._locked():
+            expenses = dict(self._expenses())
+            expenses[symbol] = [ratio, time.time()]
+            tmp = self._path(f"expense.json.{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(expenses, f)
+            os.replace(tmp, self._path('expense.json'))
+
+
+distribution_store = DistributionStore()
@@ -0,0 +1,288 @@
+"""
+ETF 총보수 / 분배금 / 기간 수익률 지표 (/api/etf/<ticker>/fees-dividend)
+
+- 유니버스 전체를 한 번에 계산: 공유 종가 패널(날짜 x 티커 실제 종가) + 분배금 저장소(긴 형식 이벤트)를
+  배열 연산으로 묶어 티커별 최근 12개월 분배금/수익률, 분배 주기, 다음 분배일 추정, YTD/1/3/5년 수익률을 구함
+- 재계산은 새 일봉(패널 세대/행 수)이나 새 분배금(저장소 파일)이 들어왔을 때만. 그 외에는 계산된 배열에서 읽기만 함
+- 패널에 없는 티커는 티커별 히스토리(실제 종가 + Dividends)로 같은 계산을 열 하나에 적용
+- 수익률은 실제 종가 변화에 기간 안 분배금 재투자(지급일 종가로 재매수)를 곱한 값, 3/5년은 연환산
+  (저장된 분배금으로 계산하므로 새 분배가 생겨도 과거 값 기준이 바뀌지 않음)
+- 총보수는 yfinance funds_data에서 티커별로 받아 저장(30일)
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from warmup import yf
+
+import resilience
+from cache import TTLCache
+from distribution_store import distribution_store, reinvestment
+from history_store import get_history
+from metrics import upstream_timer
+from price_panel import panel
+from ticker_resolver import Symbol
+
+logger = logging.getLogger(__name__)
+
+EXPENSE_MAX_AGE = 30 * 24 * 3600   # 총보수는 거의 바뀌지 않음
+TTM_DAYS = 365
+HORIZONS = (('ytdReturn', None), ('oneYearReturn', 1), ('threeYearReturn', 3), ('fiveYearReturn', 5))
+
+# 패널 밖 티커의 열 하나짜리 지표 (히스토리 캐시와 같은 10분)
+single_cache = TTLCache('fund_metrics', ttl=600, maxsize=1024)
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _day(timestamp) -> int:
+    return int((np.datetime64(pd.Timestamp(timestamp).date(), 'D') - _EPOCH).astype(np.int64))
+
+
+def _frequency(gap: float) -> Optional[str]:
+    if not np.isfinite(gap):
+        return None
+    if gap <= 45:
+        return 'monthly'
+    if gap <= 135:
+        return 'quarterly'
+    if gap <= 250:
+        return 'semiannual'
+    return 'annual'
+
+
+class FundMetrics(NamedTuple):
+    """유니버스 지표 배열 (열 = symbols 순서)"""
+    version: Tuple
+    as_of: Optional[int]          # 마지막 일봉 (1970-01-01 기준 일수)
+    symbols: Dict[str, int]
+    last_price: np.ndarray
+    returns: Dict[str, np.ndarray]  # % (YTD/1년 누적, 3/5년 연환산)
+    known: np.ndarray             # 분배 이력을 받은 열인지 (False면 분배 지표 None)
+    ttm_dividend: np.ndarray
+    ttm_count: np.ndarray
+    last_day: np.ndarray          # 최근 분배일 (없으면 -1)
+    last_amount: np.ndarray
+    gap: np.ndarray               # 최근 3년 분배 간격 중앙값 (일, 없으면 NaN)
+    next_day: np.ndarray          # 다음 분배일 추정 (없으면 -1)
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        i = self.symbols.get(symbol)
+        if i is None or not np.isfinite(self.last_price[i]):
+            return None  # 패널에 값이 없는 티커는 티커별 경로에서 다시 확인
+        price = float(self.last_price[i])
+
+        def number(value, digits):
+            return round(float(value), digits) if np.isfinite(value) else None
+
+        def date(day):
+            return str(_EPOCH + int(day)) if day >= 0 else None
+
+        dividend = {'dividendYield': None, 'ttmDividend': None, 'ttmCount': None, 'lastDividend': None,
+                    'dividendDate': None, 'paymentFrequency': None, 'nextDividendDate': None}
+        if self.known[i]:
+            ttm = float(self.ttm_dividend[i])
+            dividend.update({
+                'dividendYield': number(ttm / price * 100, 2) if price > 0 else None,
+                'ttmDividend': number(ttm, 4),
+                'ttmCount': int(self.ttm_count[i]),
+                'lastDividend': number(self.last_amount[i], 4) if self.last_day[i] >= 0 else None,
+                'dividendDate': date(self.last_day[i]),
+                'paymentFrequency': _frequency(self.gap[i]),
+                'nextDividendDate': date(self.next_day[i]),
+            })
+        return {
+            'dividend': dividend,
+            'performance': {key: number(values[i], 2) for key, values in self.returns.items()},
+            'lastPrice': round(price, 4),
+            'updateDate': date(self.as_of) if self.as_of is not None else None,
+        }
+
+
+def compute(dates: np.ndarray, closes: np.ndarray, symbols: List[str], column: np.ndarray, days: np.ndarray,
+            amounts: np.ndarray, known: np.ndarray, version: Tuple = ()) -> FundMetrics:
+    """(T) 일수 + (T x N) 실제 종가 + 분배 이벤트(열 번호, 일수, 금액)로 N개 티커 지표를 한 번에 계산"""
+    n = len(symbols)
+    rows = len(dates)
+    as_of = int(dates[-1]) if rows else None
+
+    # 열마다 각 행까지의 마지막 유효 행 (휴장/상장 전 NaN 건너뜀)
+    valid = ~np.isnan(closes)
+    filled = np.where(valid, np.arange(rows, dtype=np.int32)[:, None], -1)
+    np.maximum.accumulate(filled, axis=0, out=filled)
+
+    def price_at(row: int) -> np.ndarray:
+        if row < 0 or row >= rows:
+            return np.full(n, np.nan)
+        at = filled[row]
+        price = closes[np.maximum(at, 0), np.arange(n)].astype(np.float64)
+        return np.where(at >= 0, price, np.nan)
+
+    last_price = price_at(rows - 1)
+    paid_row, paid_column, paid_log = reinvestment(dates, closes, column, days, amounts)
+    returns = {}
+    if as_of is not None:
+        end = pd.Timestamp(_EPOCH + as_of)
+        for key, years in HORIZONS:
+            start = pd.Timestamp(end.year - 1, 12, 31) if years is None else end - pd.DateOffset(years=years)
+            row = int(np.searchsorted(dates, _day(start), side='right')) - 1
+            # 시작일 이전 데이터가 없으면(상장 전) 기간 수익률 없음. 주말/휴장일로 첫 거래일이 며칠 늦는 것은 허용
+            base = price_at(max(row, 0)) if dates[0] <= _day(start) + 7 else np.full(n, np.nan)
+            # 시작 행 이후 분배금은 지급일 종가로 재투자
+            after = paid_row > row
+            reinvested = np.exp(np.bincount(paid_column[after], weights=paid_log[after], minlength=n))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                growth = last_price / base * reinvested
+                growth = growth ** (1 / years) if years and years > 1 else growth
+            returns[key] = (growth - 1) * 100
+    else:
+        returns = {key: np.full(n, np.nan) for key, _ in HORIZONS}
+
+    # 분배금: (열, 날짜) 순 정렬 후 열별 구간으로 집계
+    order = np.lexsort((days, column))
+    column, days, amounts = column[order], days[order], amounts[order]
+    reference = as_of if as_of is not None else (int(days.max()) if len(days) else 0)
+    recent = (days > reference - TTM_DAYS) & (days <= reference)
+    ttm_dividend = np.bincount(column[recent], weights=amounts[recent], minlength=n)
+    ttm_count = np.bincount(column[recent], minlength=n)
+
+    last_day = np.full(n, -1, dtype=np.int64)
+    last_amount = np.full(n, np.nan)
+    if len(column):
+        tail = np.flatnonzero(np.r_[column[1:] != column[:-1], True])
+        last_day[column[tail]] = days[tail]
+        last_amount[column[tail]] = amounts[tail]
+
+    # 분배 간격: 같은 열 안에서 최근 3년 이벤트끼리의 간격 중앙값
+    gap = np.full(n, np.nan)
+    window = days > reference - 3 * TTM_DAYS
+    same = (column[1:] == column[:-1]) & window[1:] & window[:-1]
+    if same.any():
+        gaps, owner = np.diff(days)[same].astype(np.float64), column[1:][same]
+        by = np.lexsort((gaps, owner))
+        gaps, owner = gaps[by], owner[by]
+        counts = np.bincount(owner, minlength=n)
+        starts = np.cumsum(counts) - counts
+        has = counts > 0
+        lo = starts[has] + (counts[has] - 1) // 2
+        hi = starts[has] + counts[has] // 2
+        gap[has] = (gaps[lo] + gaps[hi]) / 2
+
+    # 다음 분배일: 최근 분배일 + 간격 (기준일을 지났으면 간격만큼 넘김), 간격 두 번 넘게 끊겼으면 추정하지 않음
+    next_day = np.full(n, -1, dtype=np.int64)
+    active = np.isfinite(gap) & (last_day >= 0)
+    active[active] &= (reference - last_day[active]) <= 2 * gap[active]
+    if active.any():
+        steps = np.maximum(1, np.ceil((reference - last_day[active] + 1) / gap[active]))
+        next_day[active] = last_day[active] + np.round(steps * gap[active]).astype(np.int64)
+
+    return FundMetrics(
+        version=version, as_of=as_of, symbols={s: i for i, s in enumerate(symbols)}, last_price=last_price,
+        returns=returns, known=known, ttm_dividend=ttm_dividend, ttm_count=ttm_count, last_day=last_day,
+        last_amount=last_amount, gap=gap, next_day=next_day,
+    )
+
+
+class MetricsEngine:
+    """유니버스 지표를 새 일봉 / 새 분배금이 들어왔을 때만 다시 계산"""
+
+    def __init__(self):
+        self._metrics: Optional[FundMetrics] = None
+        self._lock = threading.Lock()
+        self.last_compute_ms: Optional[float] = None
+
+    @staticmethod
+    def _version() -> Optional[Tuple]:
+        status = panel.status()
+        if not status['ready']:
+            return None
+        return status['generation'], status['rows'], distribution_store.version
+
+    def universe(self) -> Optional[FundMetrics]:
+        """패널 전체 지표 (패널이 없으면 None)"""
+        version = self._version()
+        if version is None:
+            return None
+        metrics = self._metrics
+        if metrics is not None and metrics.version == version:
+            return metrics
+        with self._lock:
+            metrics = self._metrics
+            if metrics is None or metrics.version != version:
+                started = time.perf_counter()
+                index, block, symbols = panel.closes()
+                dates = (index.values.astype('datetime64[D]') - _EPOCH).astype(np.int64)
+                column, days, amounts, known = distribution_store.distributions().columns(symbols)
+                metrics = self._metrics = compute(dates, block, symbols, column, days, amounts, known, version)
+                self.last_compute_ms = (time.perf_counter() - started) * 1000
+                logger.info("[fund_metrics] computed %d tickers in %.1f ms", len(symbols), self.last_compute_ms)
+        return metrics
+
+
+engine = MetricsEngine()
+
+
+def _single(symbol: Symbol) -> Optional[Dict]:
+    """패널에 없는 티커: 티커별 히스토리(실제 종가 + Dividends)로 열 하나 계산, 분배금은 저장소에도 기록"""
+    cached = single_cache.get(symbol.yf)
+    if cached is not None:
+        return cached
+    hist = get_history(symbol.display, '5y', adjusted=False)
+    if hist.empty:
+        return None
+    close = hist['Close']
+    index = pd.DatetimeIndex(close.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    index = index.normalize()
+    dividends = pd.DataFrame({symbol.yf: hist['Dividends'].to_numpy() if 'Dividends' in hist else 0.0}, index=index)
+    distribution_store.record(dividends)
+
+    dates = (index.values.astype('datetime64[D]') - _EPOCH).astype(np.int64)
+    paid = dividends[symbol.yf].to_numpy() > 0
+    result = compute(dates, close.to_numpy(dtype=np.float64)[:, None], [symbol.yf],
+                     np.zeros(int(paid.sum()), dtype=np.int64), dates[paid],
+                     dividends[symbol.yf].to_numpy()[paid], np.ones(1, dtype=bool)).get(symbol.yf)
+    single_cache.set(symbol.yf, result)
+    return result
+
+
+def expense_ratio(symbol: Symbol) -> Optional[float]:
+    """총보수 % (yfinance funds_data.fund_operations, 저장 후 30일 재사용). 모르면 None"""
+    stored = distribution_store.expense(symbol.yf)
+    if stored is not None and time.time() - stored[1] < EXPENSE_MAX_AGE:
+        return stored[0]
+
+    def fetch():
+        with upstream_timer('yfinance', 'fund_operations'):
+            return yf.Ticker(symbol.yf).funds_data.fund_operations
+
+    try:
+        operations = resilience.call('yfinance', 'fund_operations', fetch)
+    except resilience.UpstreamUnavailable:
+        return stored[0] if stored is not None else None
+    except Exception as e:
+        if not resilience.is_data_error(e):
+            raise
+        operations = None  # 펀드 데이터가 없는 종목
+    ratio = None
+    if operations is not None and symbol.yf in getattr(operations, 'columns', ()):
+        value = pd.to_numeric(operations[symbol.yf].get('Annual Report Expense Ratio'), errors='coerce')
+        ratio = round(float(value) * 100, 4) if pd.notna(value) else None
+    distribution_store.record_expense(symbol.yf, ratio)
+    return ratio
+
+
+def get(symbol: Symbol) -> Optional[Dict]:
+    """티커 하나의 총보수 / 분배금 / 수익률 (가격 데이터가 없으면 None)"""
+    metrics = engine.universe()
+    result = metrics.get(symbol.yf) if metrics is not None else None
+    if result is None:
+        result = _single(symbol)
+    if result is None:
+        return None
+    return {**result, 'fees': {'totalExpenseRatio': expense_ratio(symbol)}}
@@ -0,0 +1,126 @@
+"""
+gunicorn 설정 (Procfile / railway.toml에서 `-c gunicorn.conf.py`로 사용)
+
+요청 대부분이 yfinance / KIS / Gemini 응답을 기다리는 I/O 대기이므로
+sync 워커 대신 gthread(기본) 또는 gevent 워커를 씁니다.
+
+- 워커 수: 컨테이너가 실제로 쓸 수 있는 CPU 수(cgroup 할당량 / CPU affinity), 최대 GUNICORN_MAX_WORKERS(기본 4)
+  (GIL 때문에 CPU 작업은 프로세스로만 병렬화. 호스트 전체 코어 수를 쓰면 pandas를 올린 워커가 과하게 뜸)
+- 스레드 수: 코어당 1 + 대기/계산 비율 (WEB_IO_RATIO, 기본 8)
+- gevent: 워커당 동시 연결 수 GUNICORN_WORKER_CONNECTIONS (기본 200)
+- 느린 AI 경로는 워커 스레드의 일부만 점유하도록 concurrency.py에서 별도 제한
+
+- GUNICORN_PRELOAD=true: 앱(마스터 CSV, 검색 색인, 캐시 스냅샷, SDK)을 arbiter에서 한 번만 불러오고
+  워커는 fork로 공유 (copy-on-write). 백그라운드 스레드는 fork 후 따라오지 않으므로 post_worker_init에서 다시 시작
+  (gevent 워커는 init_process에서 monkey patch한 뒤 post_worker_init을 부르므로 스레드가 greenlet으로 뜸.
+  preload면 arbiter가 앱을 불러오기 전에 여기서 먼저 patch해서 import 시 만든 잠금도 gevent용이 되게 함)
+
+- 메트릭: 워커별 값을 METRICS_MULTIPROC_DIR(기본 임시 디렉터리)의 파일로 모아 /metrics에서 합산 (metrics.py)
+
+환경변수로 모두 덮어쓸 수 있습니다: WEB_CONCURRENCY, GUNICORN_MAX_WORKERS, GUNICORN_WORKER_CLASS,
+GUNICORN_THREADS, WEB_IO_RATIO, GUNICORN_TIMEOUT, GUNICORN_PRELOAD
+"""
+
+import gc
+import glob
+import math
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+if preload_app and 'gevent' in worker_class:
+    from gevent import monkey
+
+    monkey.patch_all()
+
+
+def available_cpus() -> int:
+    """이 프로세스가 쓸 수 있는 CPU 수 (cgroup v2/v1 할당량과 affinity 중 작은 값)"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    quota = None
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:  # cgroup v2: "<quota> <period>" 또는 "max <period>"
+            limit, period = f.read().split()[:2]
+            if limit != 'max':
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:  # cgroup v1 (-1 = 제한 없음)
+                limit = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if limit > 0 and period > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(cpus, 1)
+
+
+_cpus = available_cpus()
+_io_ratio = float(os.getenv('WEB_IO_RATIO', 8))
+
+workers = int(os.getenv('WEB_CONCURRENCY', min(_cpus, int(os.getenv('GUNICORN_MAX_WORKERS', 4)))))
+threads = int(os.getenv('GUNICORN_THREADS', min(32, math.ceil(1 + _io_ratio))))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 200))
+
+# Gemini 호출은 10초 이상 걸릴 수 있으므로 기본 30초보다 넉넉하게
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누수 대비 워커 주기적 재시작 (동시 재시작 방지용 jitter)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# 앱(concurrency.py)이 워커 형태에 맞춰 풀 크기를 정하도록 환경변수로 전달
+os.environ['SERVER_WORKER_CLASS'] = worker_class
+if 'gevent' in worker_class:
+    os.environ['SERVER_THREADS'] = str(worker_connections)
+elif worker_class == 'sync':
+    os.environ['SERVER_THREADS'] = '1'
+else:
+    os.environ['SERVER_THREADS'] = str(threads)
+if preload_app:
+    os.environ['SERVER_PRELOAD'] = '1'
+# /metrics가 어느 워커에 가도 전체 합계를 주도록 워커들이 값을 모으는 디렉터리 (빈 값이면 워커별 값)
+os.environ.setdefault('METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), f'etf-metrics-{bind.rsplit(":", 1)[-1]}'))
+
+
+def on_starting(server):
+    metrics_dir = os.environ['METRICS_MULTIPROC_DIR']
+    if metrics_dir:
+        # 이전 실행의 워커 파일이 남아 있으면 pid가 겹치거나 영원히 합산되므로 시작할 때 비움
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+            os.remove(path)
+    server.log.info("gunicorn %s workers=%s threads=%s preload=%s (cpus=%s, io_ratio=%s)",
+                    worker_class, workers, os.environ['SERVER_THREADS'], preload_app, _cpus, _io_ratio)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # arbiter에서 만든 객체를 영구 세대로 옮겨 워커의 GC가 건드리지(= 페이지를 복사하지) 않게 함
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # post_fork는 gevent의 monkey patch 전에 불리므로, 스레드는 워커 초기화가 끝난 뒤 시작
+    if preload_app:
+        import app as application  # arbiter에서 이미 불러온 모듈
+        from log_config import restart_after_fork
+
+        restart_after_fork()
+        application.start_worker_tasks()
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 카운터/히스토그램은 보존하고 게이지(진행 중 요청 수 등)는 버림
+    import metrics
+
+    metrics.mark_process_dead(worker.pid)
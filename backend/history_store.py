@@ -0,0 +1,106 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+from warmup import yf
+
+import resilience
+from cache import TTLCache
+from distribution_store import distribution_store, reinvestment
+from price_panel import panel, period_start
+from ticker_resolver import resolver
+
+# 일봉 히스토리 캐시 (장중에도 일봉은 자주 바뀌지 않으므로 10분)
+history_cache = TTLCache('history', ttl=600, maxsize=4096)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+MIN_OVERLAP_DAYS = 126  # 약 6개월
+
+
+def to_yf_ticker(ticker: str) -> str:
+    """yfinance 티커로 변환 (마스터/학습된 심볼은 해석기 결과, 그 외 국내 6자리 코드는 .KS)"""
+    symbol = resolver.known(ticker)
+    if symbol is not None:
+        return symbol.yf
+    ticker = str(ticker).strip().upper()
+    return f"{ticker}.KS" if ticker.isdigit() else ticker
+
+
+def get_history(ticker: str, period: str = '1y', adjusted: bool = True) -> pd.DataFrame:
+    """yfinance 일봉 OHLCV 히스토리를 캐시와 함께 반환합니다.
+
+    adjusted=False면 분배금/분할을 반영하지 않은 실제 종가 (총수익 지수를 분배금으로 직접 계산할 때)
+    """
+    key = (to_yf_ticker(ticker), period) if adjusted else (to_yf_ticker(ticker), period, 'raw')
+    hist = history_cache.get(key)
+    if hist is not None:
+        return hist
+
+    try:
+        hist = resilience.call('yfinance', 'history', yf.Ticker(key[0]).history, period=period,
+                               auto_adjust=adjusted)
+    except Exception as e:
+        if resilience.is_data_error(e):
+            hist = None
+        else:
+            # 업스트림 장애: 만료됐더라도 남아 있는 값이 있으면 그대로 사용
+            stale = history_cache.get_stale(key)
+            if stale is None:
+                raise
+            return stale
+    if hist is None or hist.empty:
+        hist = pd.DataFrame(columns=OHLCV_COLUMNS)
+    else:
+        # 분배금(Dividends)은 지표 엔진(fund_metrics)이 패널 밖 티커의 분배 이력으로 사용
+        hist = hist[[c for c in OHLCV_COLUMNS + ['Dividends'] if c in hist.columns]].astype(float)
+    history_cache.set(key, hist)
+    return hist
+
+
+def load_log_returns(tickers: List[str], period: str = '5y') -> pd.DataFrame:
+    """티커별 일간 로그수익률을 공통 거래일 기준으로 정렬하여 반환
+
+    공유 종가 패널에 모든 티커와 기간, 분배 이력이 있으면 패널 열(분배금 재투자)에서 읽고, 아니면 티커별 히스토리(수정종가)로 구성
+    """
+    frame = _panel_closes(tickers, period)
+    if frame is None:
+        frame = _history_closes(tickers, period)
+    frame = frame.sort_index().ffill().dropna()
+    returns = np.log(frame).diff().dropna()
+    if len(returns) < MIN_OVERLAP_DAYS:
+        raise ValueError("Not enough overlapping history (need at least 6 months)")
+    return returns
+
+
+def _panel_closes(tickers: List[str], period: str):
+    symbols = [to_yf_ticker(t) for t in tickers]
+    start = period_start(period)
+    if not panel.covers(symbols, start):
+        return None
+    # 패널은 실제 종가이므로 분배 이력을 모두 받은 티커만 분배금 재투자 종가로 바꿔 사용
+    if not distribution_store.enabled or not distribution_store.covers(symbols):
+        return None
+    index, block, _ = panel.closes(symbols, start)
+    if np.isnan(block).all(axis=0).any():
+        return None  # 패널에 값이 없는 티커는 티커별 경로에서 다시 확인
+    closes = block.astype(np.float64)
+    dates = (index.values.astype('datetime64[D]') - np.datetime64('1970-01-01', 'D')).astype(np.int64)
+    rows, columns, factor = reinvestment(dates, closes, *distribution_store.distributions().columns(symbols)[:3])
+    reinvested = np.zeros_like(closes)
+    np.add.at(reinvested, (rows, columns), factor)
+    closes *= np.exp(np.cumsum(reinvested, axis=0))
+    return pd.DataFrame(closes, index=index, columns=list(tickers))
+
+
+def _history_closes(tickers: List[str], period: str) -> pd.DataFrame:
+    closes = {}
+    for ticker in tickers:
+        hist = get_history(ticker, period)
+        if hist.empty:
+            raise ValueError(f"No history for {ticker}")
+        close = hist['Close']
+        if getattr(close.index, 'tz', None) is not None:
+            # 거래소별 타임존이 달라도 같은 날짜로 정렬되도록 날짜만 남김
+            close = close.set_axis(close.index.tz_localize(None).normalize())
+        closes[ticker] = close
+    return pd.DataFrame(closes)
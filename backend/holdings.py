@@ -0,0 +1,187 @@
+"""
+ETF 보유종목 단일 서비스 (KIS / yfinance 출처 통합 + 정규화 결과 캐시)
+
+- 출처 우선순위: 국내 ETF는 KIS 보유종목(PDF 전체, 공시일별 저장소 경유) -> 없으면 yfinance 상위 보유종목
+  해외 ETF는 yfinance funds_data (상위 보유종목 + 섹터 비중)
+- 스키마: Holdings 하나로 정규화하고 비중 내림차순으로 한 번 정렬해 배열로 보관
+  응답은 필요한 구간(top-N / 커서 페이지)만 레코드 {stockCode, stockName, weight(%), shares, value}로 만듦
+- holdings_cache(SWR)를 /api/etf/info, /api/etf/<ticker>/holdings, /api/etf/analyze, 룩스루가 공유
+  (Mock 폴백 결과는 캐시하지 않음)
+"""
+
+import base64
+import binascii
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from warmup import yf
+
+import resilience
+from cache import SWRCache
+from holdings_store import holdings_store
+from metrics import upstream_timer
+from ticker_resolver import Symbol
+
+logger = logging.getLogger(__name__)
+
+# 키: 티커 표시 코드 (069500, SPY)
+holdings_cache = SWRCache('holdings', fresh_ttl=600, ttl=24 * 3600, maxsize=1024,
+                          cacheable=lambda h: h is not None and not h.is_mock)
+
+MAX_PAGE = 500
+
+
+class InvalidCursor(ValueError):
+    """형식이 잘못됐거나 (expired=True) 그 사이 공시일이 바뀐 커서"""
+
+    def __init__(self, message: str, expired: bool = False):
+        super().__init__(message)
+        self.expired = expired
+
+
+class Holdings(NamedTuple):
+    ticker: str
+    source: str                  # 'kis' | 'yfinance'
+    etf_name: Optional[str]
+    nav: Optional[float]
+    total: int                   # 전체 구성종목 수 (yfinance는 상위 종목만 제공하므로 len과 같음)
+    update_date: Optional[str]   # KIS 공시일 (YYYYMMDD)
+    is_mock: bool
+    codes: List[str]             # 이하 비중 내림차순
+    names: List[str]
+    weights: np.ndarray          # % (float64)
+    shares: Optional[np.ndarray]  # KIS만 (int64)
+    values: Optional[np.ndarray]
+    sectors: Dict[str, float]    # 섹터 비중 0~1 (yfinance만)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """[start:stop] 구간만 응답 레코드로 변환"""
+        stop = len(self.codes) if stop is None else min(stop, len(self.codes))
+        weights = np.round(self.weights[start:stop], 4).tolist()
+        shares = self.shares[start:stop].tolist() if self.shares is not None else [None] * len(weights)
+        values = self.values[start:stop].tolist() if self.values is not None else [None] * len(weights)
+        return [{'stockCode': code, 'stockName': name, 'weight': weight, 'shares': n, 'value': value}
+                for code, name, weight, n, value in zip(self.codes[start:stop], self.names[start:stop],
+                                                        weights, shares, values)]
+
+    def top(self, n: int) -> List[Dict]:
+        return self.records(0, n)
+
+    def page(self, cursor: Optional[str], limit: int) -> Tuple[List[Dict], Optional[str]]:
+        """(레코드, 다음 커서) 반환. 커서는 공시일을 담고 있어 그 사이 보유종목이 바뀌면 InvalidCursor(expired)"""
+        offset = 0
+        if cursor:
+            try:
+                version, offset = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit(':', 1)
+                offset = int(offset)
+            except (binascii.Error, UnicodeDecodeError, ValueError):
+                raise InvalidCursor('invalid cursor')
+            if version != (self.update_date or '') or offset < 0:
+                raise InvalidCursor('holdings changed since the cursor was issued', expired=True)
+        end = offset + max(1, min(limit, MAX_PAGE))
+        next_cursor = None
+        if end < len(self.codes):
+            next_cursor = base64.urlsafe_b64encode(f"{self.update_date or ''}:{end}".encode()).decode()
+        return self.records(offset, end), next_cursor
+
+    def meta(self) -> Dict:
+        return {'ticker': self.ticker, 'etfName': self.etf_name, 'nav': self.nav, 'totalHoldings': self.total,
+                'updateDate': self.update_date, 'source': self.source}
+
+
+def _build(ticker: str, source: str, codes, names, weights, shares=None, values=None, **meta) -> Holdings:
+    weights = np.asarray(weights, dtype=np.float64)
+    order = np.argsort(-weights, kind='stable')
+    return Holdings(
+        ticker=ticker, source=source,
+        etf_name=meta.get('etf_name'), nav=meta.get('nav'), total=meta.get('total') or len(codes),
+        update_date=meta.get('update_date'), is_mock=meta.get('is_mock', False),
+        codes=[codes[i] for i in order], names=[names[i] for i in order], weights=weights[order],
+        shares=None if shares is None else np.asarray(shares, dtype=np.int64)[order],
+        values=None if values is None else np.asarray(values, dtype=np.int64)[order],
+        sectors=meta.get('sectors') or {},
+    )
+
+
+def from_kis(ticker: str, data: Dict) -> Holdings:
+    """KIS 보유종목 응답(parse_holdings_response 형식) 정규화"""
+    items = [h for h in data.get('holdings', []) if h.get('stockCode') or h.get('stockName')]
+    return _build(
+        ticker, 'kis',
+        codes=[str(h.get('stockCode') or '') for h in items],
+        names=[str(h.get('stockName') or '') for h in items],
+        weights=[float(h.get('weight') or 0) for h in items],
+        shares=[int(h.get('shares') or 0) for h in items],
+        values=[int(h.get('value') or 0) for h in items],
+        etf_name=data.get('etfName'), nav=data.get('nav'), total=data.get('totalHoldings'),
+        update_date=data.get('updateDate') or None, is_mock=bool(data.get('isMock')),
+    )
+
+
+def from_yfinance(ticker: str, top_holdings, sector_weightings: Optional[Dict] = None,
+                  etf_name: Optional[str] = None) -> Holdings:
+    """yfinance funds_data.top_holdings (index=Symbol, Name, Holding Percent 0~1) 정규화"""
+    if top_holdings is None or top_holdings.empty:
+        codes, names, weights = [], [], []
+    else:
+        codes = [str(s) for s in top_holdings.index]
+        names = top_holdings['Name'].astype(str).tolist() if 'Name' in top_holdings.columns else list(codes)
+        weights = (top_holdings['Holding Percent'].astype(float).to_numpy() * 100
+                   if 'Holding Percent' in top_holdings.columns else np.zeros(len(codes)))
+    sectors = {str(k): float(v) for k, v in (sector_weightings or {}).items()}
+    return _build(ticker, 'yfinance', codes, names, weights, etf_name=etf_name, sectors=sectors)
+
+
+def _load_kis(code: str) -> Dict:
+    """KIS 보유종목 조회 + 공시일별 스냅샷 저장
+
+    오늘(KST)자 공시가 이미 저장돼 있으면 KIS를 부르지 않고, 응답의 공시일이 저장된 것과 같으면
+    보유종목을 다시 파싱하지 않고 저장된 스냅샷을 반환
+    """
+    from kis_api import get_client
+
+    stored = holdings_store.latest(code)
+    if stored is not None and holdings_store.is_current(stored['updateDate']):
+        return stored
+    data = get_client().getETFHoldings(code, known_update=stored['updateDate'] if stored else None)
+    if data.get('unchanged'):
+        return stored
+    holdings_store.record(code, data)
+    return data
+
+
+def _load_yfinance(symbol: Symbol) -> Holdings:
+    def fetch():
+        with upstream_timer('yfinance', 'holdings'):
+            funds = yf.Ticker(symbol.yf).funds_data
+            return funds.top_holdings, funds.sector_weightings
+
+    try:
+        (top, sectors), _ = resilience.call_with_fallback('yfinance', 'funds_data', symbol.yf, fetch)
+    except Exception as e:
+        if not resilience.is_data_error(e):
+            raise
+        top, sectors = None, {}  # 펀드 데이터가 없는 종목
+    return from_yfinance(symbol.display, top, sectors, etf_name=symbol.name)
+
+
+def load(symbol: Symbol) -> Holdings:
+    """출처 우선순위에 따라 보유종목 적재 (캐시를 거치지 않음, holdings_cache 적재 함수)"""
+    if symbol.kis:
+        kis = from_kis(symbol.display, _load_kis(symbol.kis))
+        if len(kis) and not kis.is_mock:
+            return kis
+        fallback = _load_yfinance(symbol)
+        if len(fallback):
+            return fallback._replace(etf_name=kis.etf_name or fallback.etf_name)
+        return kis  # 둘 다 없으면 KIS 결과(Mock 포함) 그대로
+    return _load_yfinance(symbol)
+
+
+def get(symbol: Symbol) -> Tuple[Holdings, float]:
+    """holdings_cache를 거친 보유종목 (Holdings, 적재 후 경과 초)"""
+    return holdings_cache.get_or_load(symbol.display, lambda: load(symbol))
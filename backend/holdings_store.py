@@ -0,0 +1,268 @@
+"""
+ETF 보유종목(PDF) 일자별 스냅샷 저장소 + 변경 내역(diff)
+
+- KIS 보유종목 조회는 공시일(updateDate)이 바뀔 때만 내용이 바뀌므로 공시일마다 한 번만 저장
+  오늘(KST)자 공시가 이미 저장돼 있으면 KIS를 다시 부르지 않고, 응답의 공시일이 저장된 것과 같으면
+  보유종목 목록을 다시 파싱/저장하지 않음 (holdings._load_kis)
+- 형식: ETF마다 {티커}.npz 하나 (np.savez_compressed, pickle 없음)
+  codes/names: 구성종목 사전 (모든 날짜 공통, 한 번만 저장. 보관 중인 날짜에 남아 있는 종목만)
+  dates, offsets: 날짜별 구성종목 구간 (CSR) / members: 사전 번호(int32), weights(float32), shares, values
+- diff(): 두 날짜의 (사전 번호, 비중) 배열만 비교해 편입/편출/비중 변경 종목 계산 (레코드 목록을 다시 만들지 않음)
+- 경로: HOLDINGS_STORE_DIR (기본 snapshots/holdings, 빈 값이면 기능 끔)
+  gunicorn 워커들이 같은 파일을 쓰므로 파일 잠금 아래에서 디스크의 최신 내용에 추가한 뒤 os.replace로 교체
+"""
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발: 워커가 하나이므로 잠금 없이 저장
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), 'snapshots', 'holdings')
+STORE_DIR = os.getenv('HOLDINGS_STORE_DIR', DEFAULT_DIR)
+MAX_SNAPSHOTS = int(os.getenv('HOLDINGS_MAX_SNAPSHOTS', 400))  # ETF별 보관 일수 (오래된 것부터 삭제)
+
+_KST = ZoneInfo('Asia/Seoul')
+_TICKER = re.compile(r'[0-9A-Za-z]{1,12}')
+
+
+def today_kst() -> str:
+    return datetime.now(_KST).strftime('%Y%m%d')
+
+
+class HoldingsHistory(NamedTuple):
+    """ETF 하나의 일자별 보유종목 (구성종목 사전 + 날짜별 구간)"""
+    etf_name: str
+    codes: np.ndarray     # 구성종목 코드 사전 (U)
+    names: np.ndarray     # 구성종목 이름 사전 (U)
+    dates: np.ndarray     # 공시일 오름차순 (U8, YYYYMMDD)
+    navs: np.ndarray      # 날짜별 NAV (float64)
+    totals: np.ndarray    # 날짜별 전체 구성종목 수 (int32)
+    offsets: np.ndarray   # 날짜 i의 구성종목은 members[offsets[i]:offsets[i + 1]] (int64)
+    members: np.ndarray   # 사전 번호 (int32)
+    weights: np.ndarray   # 비중 % (float32)
+    shares: np.ndarray    # 보유 수량 (int64)
+    values: np.ndarray    # 평가 금액 (int64)
+
+    def position(self, date: str) -> int:
+        i = int(np.searchsorted(self.dates, date))
+        if i >= len(self.dates) or self.dates[i] != date:
+            raise KeyError(date)
+        return i
+
+    def members_at(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.members[start:end], self.weights[start:end]
+
+    def snapshot(self, i: int) -> Dict:
+        """KIS 보유종목 응답과 같은 형식으로 복원"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        members = self.members[start:end]
+        holdings = [
+            {'stockCode': code, 'stockName': name, 'weight': round(weight, 4), 'shares': shares, 'value': value}
+            for code, name, weight, shares, value in zip(self.codes[members].tolist(), self.names[members].tolist(),
+                                                         self.weights[start:end].tolist(),
+                                                         self.shares[start:end].tolist(),
+                                                         self.values[start:end].tolist())
+        ]
+        return {
+            'etfName': self.etf_name,
+            'nav': float(self.navs[i]),
+            'totalHoldings': int(self.totals[i]),
+            'updateDate': str(self.dates[i]),
+            'holdings': holdings,
+        }
+
+
+def _empty(etf_name: str) -> HoldingsHistory:
+    return HoldingsHistory(etf_name, np.array([], dtype='U1'), np.array([], dtype='U1'), np.array([], dtype='U8'),
+                           np.array([], dtype=np.float64), np.array([], dtype=np.int32),
+                           np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32),
+                           np.array([], dtype=np.float32), np.array([], dtype=np.int64),
+                           np.array([], dtype=np.int64))
+
+
+def _append(history: HoldingsHistory, data: Dict) -> HoldingsHistory:
+    """새 공시일 스냅샷을 날짜 순서에 맞게 끼워 넣은 새 HoldingsHistory (MAX_SNAPSHOTS 초과분은 오래된 것부터 삭제)"""
+    lookup = {str(code): i for i, code in enumerate(history.codes)}
+    codes, names = list(history.codes), list(history.names)
+    rows, seen = [], set()
+    for item in data.get('holdings', []):
+        code = str(item.get('stockCode') or item.get('stockName') or '').strip()
+        if not code:
+            continue
+        i = lookup.get(code)
+        if i is None:
+            i = lookup[code] = len(codes)
+            codes.append(code)
+            names.append(str(item.get('stockName', '')))
+        elif i in seen:
+            continue  # 같은 종목이 두 번 오면 첫 행만 사용
+        seen.add(i)
+        rows.append((i, float(item.get('weight') or 0), int(item.get('shares') or 0), int(item.get('value') or 0)))
+    members, weights, shares, values = (list(column) for column in zip(*rows)) if rows else ([], [], [], [])
+
+    # 날짜별 (공시일, NAV, 전체 종목 수, 구간) 목록에 새 스냅샷을 끼워 넣음. 구간 None = 새 스냅샷
+    days = [(str(d), history.navs[i], history.totals[i], (history.offsets[i], history.offsets[i + 1]))
+            for i, d in enumerate(history.dates)]
+    date = str(data['updateDate'])
+    days.insert(int(np.searchsorted(history.dates, date)),
+                (date, float(data.get('nav') or 0), int(data.get('totalHoldings') or 0), None))
+    days = days[-MAX_SNAPSHOTS:]
+
+    def gather(array, new, dtype):
+        return np.concatenate([np.asarray(new, dtype=dtype) if span is None else array[span[0]:span[1]]
+                               for _, _, _, span in days]).astype(dtype)
+
+    lengths = [len(members) if span is None else int(span[1] - span[0]) for _, _, _, span in days]
+    # 보관 기간 밖으로 밀려난 날짜에만 있던 종목은 사전에서 빼고 번호를 다시 매김
+    members = gather(history.members, members, np.int32)
+    used = np.unique(members)
+    renumber = np.zeros(len(codes), dtype=np.int32)
+    renumber[used] = np.arange(len(used), dtype=np.int32)
+    return HoldingsHistory(
+        etf_name=str(data.get('etfName') or history.etf_name),
+        codes=np.asarray(codes, dtype=str)[used],
+        names=np.asarray(names, dtype=str)[used],
+        dates=np.asarray([d for d, _, _, _ in days], dtype='U8'),
+        navs=np.asarray([nav for _, nav, _, _ in days], dtype=np.float64),
+        totals=np.asarray([total for _, _, total, _ in days], dtype=np.int32),
+        offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        members=renumber[members],
+        weights=gather(history.weights, weights, np.float32),
+        shares=gather(history.shares, shares, np.int64),
+        values=gather(history.values, values, np.int64),
+    )
+
+
+class HoldingsStore:
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        self._loaded: Dict[str, Tuple[int, HoldingsHistory]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def _path(self, ticker: str) -> Optional[str]:
+        if not self.enabled or not _TICKER.fullmatch(ticker):
+            return None
+        return os.path.join(self.directory, f"{ticker}.npz")
+
+    def history(self, ticker: str) -> Optional[HoldingsHistory]:
+        """저장된 일자별 보유종목 (파일이 바뀌었으면 다시 읽음, 없으면 None)"""
+        path = self._path(ticker)
+        if path is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        loaded = self._loaded.get(ticker)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        with np.load(path, allow_pickle=False) as npz:
+            history = HoldingsHistory(**{field: npz[field] for field in HoldingsHistory._fields if field != 'etf_name'},
+                                      etf_name=str(npz['etf_name']))
+        with self._lock:
+            self._loaded[ticker] = (mtime, history)
+        return history
+
+    def dates(self, ticker: str) -> List[str]:
+        history = self.history(ticker)
+        return [] if history is None else history.dates.tolist()
+
+    def latest(self, ticker: str) -> Optional[Dict]:
+        history = self.history(ticker)
+        if history is None or not len(history.dates):
+            return None
+        return {'ticker': ticker, **history.snapshot(len(history.dates) - 1)}
+
+    def snapshot(self, ticker: str, date: str) -> Dict:
+        """해당 공시일 스냅샷 (없으면 KeyError)"""
+        history = self.history(ticker)
+        if history is None:
+            raise KeyError(ticker)
+        return {'ticker': ticker, **history.snapshot(history.position(date))}
+
+    @staticmethod
+    def is_current(update_date: Optional[str]) -> bool:
+        """오늘(KST)자 공시면 같은 날 다시 바뀌지 않으므로 조회 생략 가능"""
+        return bool(update_date) and str(update_date) >= today_kst()
+
+    def record(self, ticker: str, data: Dict) -> bool:
+        """새 공시일이면 스냅샷 추가. 이미 있는 공시일이면 저장하지 않고 False"""
+        path = self._path(ticker)
+        if path is None or not data or data.get('isMock') or not data.get('updateDate') or not data.get('holdings'):
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, 'holdings.lock'), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                history = self.history(ticker) or _empty(str(data.get('etfName', ticker)))
+                if str(data['updateDate']) in history.dates:
+                    return False
+                history = _append(history, data)
+                tmp = f"{path}.{os.getpid()}.tmp.npz"
+                np.savez_compressed(tmp, **history._asdict())
+                os.replace(tmp, path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        logger.info("[holdings] stored %s snapshot %s (%d constituents, %d dates)",
+                    ticker, data['updateDate'], len(data['holdings']), len(history.dates))
+        return True
+
+    def diff(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None,
+             threshold: float = 0.0) -> Dict:
+        """두 공시일 사이 편입(added) / 편출(removed) / 비중 변경(reweighted, |변화| > threshold %p)
+
+        end 기본값은 최신 공시일, start 기본값은 end 직전 공시일. 없는 티커/날짜는 KeyError
+        """
+        history = self.history(ticker)
+        if history is None or not len(history.dates):
+            raise KeyError(ticker)
+        j = history.position(end) if end else len(history.dates) - 1
+        i = history.position(start) if start else max(j - 1, 0)
+        before, before_w = history.members_at(i)
+        after, after_w = history.members_at(j)
+
+        added = ~np.isin(after, before)
+        removed = ~np.isin(before, after)
+        _, ia, ib = np.intersect1d(before, after, assume_unique=True, return_indices=True)
+        change = after_w[ib] - before_w[ia]
+        moved = np.abs(change) > threshold
+        by_size = np.argsort(-np.abs(change[moved]), kind='stable')
+        common = after[ib][moved][by_size]
+
+        def entries(members, weights):
+            order = np.argsort(-weights, kind='stable')
+            return [{'stockCode': str(history.codes[m]), 'stockName': str(history.names[m]),
+                     'weight': round(float(w), 4)} for m, w in zip(members[order], weights[order])]
+
+        return {
+            'ticker': ticker,
+            'from': str(history.dates[i]),
+            'to': str(history.dates[j]),
+            'added': entries(after[added], after_w[added]),
+            'removed': entries(before[removed], before_w[removed]),
+            'reweighted': [{'stockCode': str(history.codes[m]), 'stockName': str(history.names[m]),
+                            'from': round(float(a), 4), 'to': round(float(b), 4), 'change': round(float(b - a), 4)}
+                           for m, a, b in zip(common, before_w[ia][moved][by_size], after_w[ib][moved][by_size])],
+        }
+
+
+holdings_store = HoldingsStore()
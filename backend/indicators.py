@@ -0,0 +1,172 @@
+"""
+기술적 지표 엔진
+
+모든 지표는 누적합(cumsum) 또는 pandas rolling/ewm 커널로 계산하여
+시계열 길이 n, 윈도우 w에 대해 O(n)으로 동작합니다.
+"""
+
+import math
+from inspect import signature
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache
+from history_store import get_history, to_yf_ticker
+
+indicator_cache = TTLCache('indicators', ttl=600, maxsize=2048)
+
+MAX_TICKERS = 20
+MAX_INDICATORS = 10
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """누적합 기반 단순 이동평균 (앞쪽 window-1개와 NaN이 들어간 윈도우만 NaN, pandas rolling과 동일)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    # NaN은 0으로 더하고 유효 개수를 따로 세어, NaN이 이후 모든 값으로 번지지 않게 함
+    valid = ~np.isnan(values)
+    csum = np.cumsum(np.insert(np.where(valid, values, 0.0), 0, 0.0))
+    count = np.cumsum(np.insert(valid, 0, False).astype(np.int64))
+    full = (count[window:] - count[:-window]) == window
+    out[window - 1:] = np.where(full, (csum[window:] - csum[:-window]) / window, np.nan)
+    return out
+
+
+def sma(hist: pd.DataFrame, window: int = 20) -> Dict[str, np.ndarray]:
+    return {f"sma_{window}": rolling_mean(hist['Close'].to_numpy(), window)}
+
+
+def ema(hist: pd.DataFrame, window: int = 20) -> Dict[str, np.ndarray]:
+    close = hist['Close']
+    return {f"ema_{window}": close.ewm(span=window, adjust=False).mean().to_numpy()}
+
+
+def bollinger(hist: pd.DataFrame, window: int = 20, k: float = 2.0) -> Dict[str, np.ndarray]:
+    close = hist['Close']
+    mid = rolling_mean(close.to_numpy(), window)
+    std = close.rolling(window).std(ddof=0).to_numpy()
+    return {
+        f"bb_mid_{window}": mid,
+        f"bb_upper_{window}": mid + k * std,
+        f"bb_lower_{window}": mid - k * std,
+    }
+
+
+def rsi(hist: pd.DataFrame, window: int = 14) -> Dict[str, np.ndarray]:
+    """Wilder 평활 RSI"""
+    delta = hist['Close'].diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    rs = gain / loss.replace(0, np.nan)
+    value = 100 - 100 / (1 + rs)
+    value = value.where(loss != 0, 100.0).where(gain.notna())
+    return {f"rsi_{window}": value.to_numpy()}
+
+
+def macd(hist: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    close = hist['Close']
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    signal_line = line.ewm(span=signal, adjust=False).mean()
+    return {
+        "macd": line.to_numpy(),
+        "macd_signal": signal_line.to_numpy(),
+        "macd_hist": (line - signal_line).to_numpy(),
+    }
+
+
+def atr(hist: pd.DataFrame, window: int = 14) -> Dict[str, np.ndarray]:
+    """Wilder 평활 ATR"""
+    prev_close = hist['Close'].shift(1)
+    true_range = pd.concat([
+        hist['High'] - hist['Low'],
+        (hist['High'] - prev_close).abs(),
+        (hist['Low'] - prev_close).abs(),
+    ], axis=1).max(axis=1)
+    value = true_range.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    return {f"atr_{window}": value.to_numpy()}
+
+
+def breakout(hist: pd.DataFrame, window: int = 20) -> Dict[str, np.ndarray]:
+    """직전 N일 고가/저가 채널과 돌파 여부"""
+    upper = hist['High'].rolling(window).max().shift(1)
+    lower = hist['Low'].rolling(window).min().shift(1)
+    close = hist['Close']
+    return {
+        f"breakout_high_{window}": upper.to_numpy(),
+        f"breakout_low_{window}": lower.to_numpy(),
+        f"breakout_signal_{window}": np.where(close > upper, 1.0, np.where(close < lower, -1.0, 0.0)),
+    }
+
+
+INDICATORS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    'sma': sma,
+    'ema': ema,
+    'bollinger': bollinger,
+    'rsi': rsi,
+    'macd': macd,
+    'atr': atr,
+    'breakout': breakout,
+}
+
+
+def parse_spec(spec) -> Tuple[str, Tuple[Tuple[str, float], ...]]:
+    """'sma' 또는 {'name': 'sma', 'window': 20} 형태의 지표 명세를 정규화.
+    지표 함수에 없는 파라미터, 0 이하 / NaN / inf 값은 ValueError"""
+    if isinstance(spec, str):
+        spec = {'name': spec}
+    if not isinstance(spec, dict) or spec.get('name') not in INDICATORS:
+        raise ValueError(f"Unknown indicator: {spec}")
+    name = spec['name']
+    defaults = {key: param.default for key, param in list(signature(INDICATORS[name]).parameters.items())[1:]}
+    params = []
+    for key, value in sorted(spec.items()):
+        if key == 'name':
+            continue
+        if key not in defaults:
+            raise ValueError(f"Unknown parameter '{key}' for {name} (allowed: {', '.join(defaults)})")
+        try:
+            value = float(value) if isinstance(defaults[key], float) else int(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{key} must be a number: {spec}")
+        if not math.isfinite(value) or value <= 0:
+            raise ValueError(f"{key} must be a positive number: {spec}")
+        params.append((key, value))
+    return name, tuple(params)
+
+
+def compute_indicators(hist: pd.DataFrame, specs: List[Tuple[str, Tuple]]) -> Dict[str, np.ndarray]:
+    """하나의 히스토리에 여러 지표를 계산"""
+    result = {}
+    for name, params in specs:
+        result.update(INDICATORS[name](hist, **dict(params)))
+    return result
+
+
+def _to_json_list(values: np.ndarray) -> list:
+    values = np.round(np.asarray(values, dtype=float), 4)
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def get_ticker_indicators(ticker: str, specs: List[Tuple[str, Tuple]], period: str = '1y') -> Dict:
+    """티커 하나의 지표 결과를 캐시와 함께 반환 (JSON 직렬화 가능한 형태)"""
+    key = (to_yf_ticker(ticker), period, tuple(specs))
+    cached = indicator_cache.get(key)
+    if cached is not None:
+        return cached
+
+    hist = get_history(ticker, period)
+    if hist.empty:
+        result = {"error": "No data found"}
+    else:
+        series = compute_indicators(hist, specs)
+        result = {
+            "dates": [d.strftime('%Y-%m-%d') for d in hist.index],
+            "close": _to_json_list(hist['Close'].to_numpy()),
+            "indicators": {name: _to_json_list(values) for name, values in series.items()},
+        }
+    indicator_cache.set(key, result)
+    return result
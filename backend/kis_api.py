@@ -1,11 +1,80 @@
 import requests
 import json
+import logging
 import hashlib
 import time
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import resilience
+
+logger = logging.getLogger(__name__)
+
+def parse_holdings_response(ticker: str, response: Dict) -> Dict:
+    """KIS 보유종목 조회 응답(output/output1)을 화면용 형식으로 정규화"""
+    output = response.get('output', {})
+    holdings = []
+    for item in response.get('output1', []):
+        holdings.append({
+            'stockCode': item.get('stock_code', ''),
+            'stockName': item.get('stock_name', ''),
+            'weight': float(item.get('weight', 0)),
+            'shares': int(item.get('shares', 0)),
+            'value': int(item.get('value', 0))
+        })
+
+    return {
+        'ticker': ticker,
+        'etfName': output.get('hts_kor_isnm', f'ETF {ticker}'),
+        'nav': float(output.get('nav', 0)),
+        'totalHoldings': int(output.get('tot_cnt', 0)),
+        'updateDate': output.get('updt_dt', ''),
+        'holdings': holdings
+    }
+
+
+def parse_price_response(ticker: str, response: Dict) -> Dict:
+    """KIS 주식현재가 시세(inquire-price) 응답을 화면용 형식으로 정규화"""
+    output = response.get('output', {})
+    return {
+        'ticker': ticker,
+        'name': output.get('hts_kor_isnm', f'ETF {ticker}'),
+        'currentPrice': int(output.get('stck_prpr', 0)),
+        'changePrice': int(output.get('prdy_vrss', 0)),
+        'changeRate': float(output.get('prdy_ctrt', 0)),
+        'volume': int(output.get('acml_vol', 0)),
+        'tradingValue': int(output.get('acml_tr_pbmn', 0)),
+        'high': int(output.get('stck_hgpr', 0)),
+        'low': int(output.get('stck_lwpr', 0)),
+        'open': int(output.get('stck_oprc', 0)),
+        'previousClose': int(output.get('stck_sdpr', 0))
+    }
+
+
+# 관심종목(멀티종목) 시세조회 한 번에 넣을 수 있는 종목 수
+MULTI_PRICE_MAX = 30
+
+
+def parse_multi_price_item(item: Dict) -> Dict:
+    """KIS 관심종목(멀티종목) 시세조회 응답 output의 한 항목을 parse_price_response와 같은 형식으로 변환"""
+    ticker = item.get('inter_shrn_iscd', '')
+    return {
+        'ticker': ticker,
+        'name': item.get('inter_kor_isnm', f'ETF {ticker}'),
+        'currentPrice': int(item.get('inter2_prpr', 0)),
+        'changePrice': int(item.get('inter2_prdy_vrss', 0)),
+        'changeRate': float(item.get('prdy_ctrt', 0)),
+        'volume': int(item.get('acml_vol', 0)),
+        'tradingValue': int(item.get('acml_tr_pbmn', 0)),
+        'high': int(item.get('inter2_hgpr', 0)),
+        'low': int(item.get('inter2_lwpr', 0)),
+        'open': int(item.get('inter2_oprc', 0)),
+        'previousClose': int(item.get('inter2_prdy_clpr', 0))
+    }
+
+
 class KoreaInvestmentAPI:
     """한국투자증권 Open API 클라이언트"""
     
@@ -16,6 +85,8 @@ class KoreaInvestmentAPI:
         self.base_url = os.getenv('KIS_BASE_URL', 'https://openapi.koreainvestment.com:9443')
         self.mock_mode = os.getenv('KIS_MOCK_MODE', 'false').lower() == 'true'  # 기본값을 false로 변경
         self.mock_base_url = os.getenv('KIS_MOCK_BASE_URL', 'http://localhost:3001')
+        # 소켓 수준 타임아웃 (resilience의 호출 타임아웃과 같은 값을 기본으로 사용)
+        self.timeout = resilience.upstreams['kis'].timeout
         
         # 액세스 토큰 및 만료 시간
         self.access_token = None
@@ -51,12 +122,10 @@ class KoreaInvestmentAPI:
         if (self.app_key == 'your_app_key_here' or 
             self.app_secret == 'your_app_secret_here' or
             not self.app_key or not self.app_secret):
-            print("KIS API 키가 설정되지 않았습니다. Mock 모드로 실행됩니다.")
-            print("실제 KIS API를 사용하려면 환경변수를 설정하세요:")
-            print("  KIS_APP_KEY=your_actual_app_key")
-            print("  KIS_APP_SECRET=your_actual_app_secret")
-            print("  KIS_ACCOUNT_NO=your_actual_account_no")
-            print("  KIS_MOCK_MODE=false")
+            logger.warning(
+                "KIS API 키가 설정되지 않았습니다. Mock 모드로 실행됩니다. "
+                "실제 KIS API를 사용하려면 KIS_APP_KEY, KIS_APP_SECRET, KIS_ACCOUNT_NO, KIS_MOCK_MODE=false 환경변수를 설정하세요."
+            )
             return False
         return True
     
@@ -70,8 +139,7 @@ class KoreaInvestmentAPI:
                 'appsecret': self.app_secret
             }
             
-            response = requests.post(url, data=data)
-            response.raise_for_status()
+            response = resilience.call('kis', 'token', self._send, 'POST', url, data=data)
             
             result = response.json()
             if 'access_token' in result:
@@ -79,14 +147,14 @@ class KoreaInvestmentAPI:
                 # 토큰 만료 시간 설정 (보통 24시간)
                 expires_in = result.get('expires_in', 86400)
                 self.token_expired_at = time.time() + expires_in
-                print("KIS API 인증 성공")
+                logger.info("KIS API 인증 성공")
                 return True
             else:
-                print(f"KIS API 인증 실패: {result}")
+                logger.warning("KIS API 인증 실패: %s", result)
                 return False
                 
         except Exception as e:
-            print(f"KIS API 인증 오류: {e}")
+            logger.warning("KIS API 인증 오류: %s", e)
             return False
     
     def _is_token_valid(self) -> bool:
@@ -98,40 +166,59 @@ class KoreaInvestmentAPI:
     def _refresh_token_if_needed(self) -> bool:
         """토큰 갱신 (필요시)"""
         if not self._is_token_valid():
-            print("KIS API 토큰 갱신 중...")
+            logger.info("KIS API 토큰 갱신 중...")
             return self._authenticate()
         return True
     
+    def get_approval_key(self) -> str:
+        """실시간(웹소켓) 접속키 발급"""
+        url = f"{self.base_url}/oauth2/Approval"
+        data = {
+            'grant_type': 'client_credentials',
+            'appkey': self.app_key,
+            'secretkey': self.app_secret
+        }
+        response = resilience.call('kis', 'approval', self._send, 'POST', url, json=data)
+        return response.json()['approval_key']
+
     def _get_timestamp(self) -> str:
         """현재 타임스탬프 생성"""
         return datetime.now().strftime('%Y%m%d%H%M%S')
     
-    def _make_request(self, url: str, headers: Dict[str, str], data: Dict = None) -> Dict:
-        """API 요청 실행"""
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """HTTP 요청 (5xx/4xx는 예외로 올려 브레이커 실패로 집계)"""
+        response = requests.request(method, url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _make_request(self, url: str, headers: Dict[str, str], params: Dict = None) -> Dict:
+        """시세 조회(quotations) API 요청 실행 - KIS 조회 API는 GET + 쿼리 파라미터
+
+        브레이커가 열려 있으면 왕복 없이 바로 UpstreamUnavailable
+        """
         try:
-            if data:
-                response = requests.post(url, headers=headers, json=data)
-            else:
-                response = requests.get(url, headers=headers)
-            
-            response.raise_for_status()
+            response = resilience.call('kis', 'request', self._send, 'GET', url, headers=headers, params=params)
             return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"API 요청 실패: {e}")
+
+        except (requests.exceptions.RequestException, resilience.UpstreamUnavailable) as e:
+            logger.warning("API 요청 실패: %s", e)
             raise e
     
-    def getETFHoldings(self, ticker: str) -> Dict:
-        """ETF 보유 종목 정보 조회"""
+    def getETFHoldings(self, ticker: str, known_update: Optional[str] = None) -> Dict:
+        """ETF 보유 종목 정보 조회
+
+        known_update: 이미 저장한 공시일. 응답의 공시일이 같으면 보유종목을 파싱하지 않고
+        {'ticker', 'updateDate', 'unchanged': True}만 반환
+        """
         if self.mock_mode or not self.api_available:
-            print(f"Mock mode: Returning mock holdings for {ticker}")
+            logger.debug("Mock mode: Returning mock holdings for %s", ticker)
             return self._get_mock_holdings(ticker)
         
         # 실제 KIS API 호출
         try:
             # 토큰 유효성 확인 및 갱신
             if not self._refresh_token_if_needed():
-                print("❌ 토큰 갱신 실패, Mock 데이터 반환")
+                logger.warning("❌ 토큰 갱신 실패, Mock 데이터 반환")
                 return self._get_mock_holdings(ticker)
             
             # ETF 보유종목 조회 API 호출
@@ -139,59 +226,100 @@ class KoreaInvestmentAPI:
             tr_id = "FHKST03030100"
             
             headers = self._get_headers(tr_id)
-            data = {
+            params = {
                 "FID_COND_MRKT_DIV_CODE": "J",
                 "FID_INPUT_ISCD": ticker
             }
             
-            print(f"KIS API 호출: ETF {ticker} 보유종목 조회")
-            response = self._make_request(url, headers, data)
+            logger.debug("KIS API 호출: ETF %s 보유종목 조회", ticker)
+            response = self._make_request(url, headers, params)
             
             # 응답 데이터 파싱
             if response.get('rt_cd') == '0':  # 성공
-                output = response.get('output', {})
-                output1 = response.get('output1', [])
-                
-                holdings = []
-                for item in output1:
-                    holdings.append({
-                        'stockCode': item.get('stock_code', ''),
-                        'stockName': item.get('stock_name', ''),
-                        'weight': float(item.get('weight', 0)),
-                        'shares': int(item.get('shares', 0)),
-                        'value': int(item.get('value', 0))
-                    })
-                
-                result = {
-                    'ticker': ticker,
-                    'etfName': output.get('hts_kor_isnm', f'ETF {ticker}'),
-                    'nav': float(output.get('nav', 0)),
-                    'totalHoldings': int(output.get('tot_cnt', 0)),
-                    'updateDate': output.get('updt_dt', ''),
-                    'holdings': holdings
-                }
-                
-                print(f"KIS API 성공: {len(holdings)}개 보유종목 조회")
+                update_date = response.get('output', {}).get('updt_dt', '')
+                if known_update and update_date == known_update:
+                    logger.debug("KIS API: %s 보유종목 공시일(%s) 변경 없음", ticker, update_date)
+                    return {'ticker': ticker, 'updateDate': update_date, 'unchanged': True}
+                result = parse_holdings_response(ticker, response)
+                logger.debug("KIS API 성공: %s개 보유종목 조회", len(result['holdings']))
                 return result
             else:
-                print(f"KIS API 오류: {response.get('msg1', 'Unknown error')}")
+                logger.warning("KIS API 오류: %s", response.get('msg1', 'Unknown error'))
                 return self._get_mock_holdings(ticker)
                 
         except Exception as e:
-            print(f"KIS API 호출 실패: {e}")
+            logger.warning("KIS API 호출 실패: %s", e)
             return self._get_mock_holdings(ticker)
     
+    def getETFPrice(self, ticker: str) -> Dict:
+        """ETF 현재가 조회 (단일 종목)"""
+        if self.mock_mode or not self.api_available:
+            return self._get_mock_price(ticker)
+
+        try:
+            if not self._refresh_token_if_needed():
+                logger.warning("토큰 갱신 실패, Mock 데이터 반환")
+                return self._get_mock_price(ticker)
+
+            url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
+            headers = self._get_headers("FHKST01010100")
+            params = {
+                "FID_COND_MRKT_DIV_CODE": "J",
+                "FID_INPUT_ISCD": ticker
+            }
+            response = self._make_request(url, headers, params)
+            if response.get('rt_cd') != '0':
+                raise Exception(f"API 오류: {response.get('msg1', 'Unknown error')}")
+            return parse_price_response(ticker, response)
+
+        except Exception as e:
+            logger.warning("ETF 가격 조회 실패: %s", e)
+            return self._get_mock_price(ticker)
+
+    def get_prices(self, tickers: List[str]) -> Dict[str, Dict]:
+        """여러 종목 현재가 일괄 조회 (관심종목 멀티종목 시세, 요청당 MULTI_PRICE_MAX종목)
+
+        조회하지 못한 종목은 Mock 가격('isMock': True)으로 채워 반환합니다.
+        """
+        if self.mock_mode or not self.api_available:
+            return {ticker: self._get_mock_price(ticker) for ticker in tickers}
+
+        prices = {}
+        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/intstock-multprice"
+        for i in range(0, len(tickers), MULTI_PRICE_MAX):
+            chunk = tickers[i:i + MULTI_PRICE_MAX]
+            try:
+                if not self._refresh_token_if_needed():
+                    raise Exception("토큰 갱신 실패")
+                params = {}
+                for n, ticker in enumerate(chunk, 1):
+                    params[f"FID_COND_MRKT_DIV_CODE_{n}"] = "J"
+                    params[f"FID_INPUT_ISCD_{n}"] = ticker
+                response = self._make_request(url, self._get_headers("FHKST11300006"), params)
+                if response.get('rt_cd') != '0':
+                    raise Exception(f"API 오류: {response.get('msg1', 'Unknown error')}")
+                for item in response.get('output', []):
+                    price = parse_multi_price_item(item)
+                    prices[price['ticker']] = price
+            except Exception as e:
+                logger.warning("멀티종목 시세 조회 실패 (%s): %s", ','.join(chunk), e)
+
+        for ticker in tickers:
+            if ticker not in prices:
+                prices[ticker] = self._get_mock_price(ticker)
+        return prices
+
     def getETFPriceHistory(self, ticker: str, period: str = '3m') -> Dict:
         """ETF 주가 히스토리 조회 (3개월 기본)"""
         if self.mock_mode or not self.api_available:
-            print(f"Mock mode: Returning mock price history for {ticker}")
+            logger.debug("Mock mode: Returning mock price history for %s", ticker)
             return self._get_mock_price_history(ticker, period)
         
         # 실제 KIS API 호출
         try:
             # 토큰 유효성 확인 및 갱신
             if not self._refresh_token_if_needed():
-                print("토큰 갱신 실패, Mock 데이터 반환")
+                logger.warning("토큰 갱신 실패, Mock 데이터 반환")
                 return self._get_mock_price_history(ticker, period)
             
             # ETF 주가 히스토리 조회 API 호출
@@ -199,7 +327,7 @@ class KoreaInvestmentAPI:
             tr_id = "FHKST03010100"  # 일봉 차트 조회 TR ID
             
             headers = self._get_headers(tr_id)
-            data = {
+            params = {
                 "FID_COND_MRKT_DIV_CODE": "J",
                 "FID_INPUT_ISCD": ticker,
                 "FID_INPUT_DATE_1": self._get_start_date(period),
@@ -207,8 +335,8 @@ class KoreaInvestmentAPI:
                 "FID_PERIOD_DIV_CODE": "D"  # 일봉
             }
             
-            print(f"KIS API 호출: ETF {ticker} 주가 히스토리 조회")
-            response = self._make_request(url, headers, data)
+            logger.debug("KIS API 호출: ETF %s 주가 히스토리 조회", ticker)
+            response = self._make_request(url, headers, params)
             
             if response.get('rt_cd') == '0':  # 성공
                 output1 = response.get('output1', [])
@@ -230,14 +358,14 @@ class KoreaInvestmentAPI:
                     'priceHistory': price_history
                 }
                 
-                print(f"KIS API 성공: {len(price_history)}개 일봉 데이터 조회")
+                logger.debug("KIS API 성공: %s개 일봉 데이터 조회", len(price_history))
                 return result
             else:
-                print(f"KIS API 오류: {response.get('msg1', 'Unknown error')}")
+                logger.warning("KIS API 오류: %s", response.get('msg1', 'Unknown error'))
                 return self._get_mock_price_history(ticker, period)
                 
         except Exception as e:
-            print(f"KIS API 호출 실패: {e}")
+            logger.warning("KIS API 호출 실패: %s", e)
             return self._get_mock_price_history(ticker, period)
     
     def _get_start_date(self, period: str) -> str:
@@ -315,42 +443,6 @@ class KoreaInvestmentAPI:
             'period': period,
             'priceHistory': price_history
         }
-        
-        # 실제 KIS API 호출
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
-        tr_id = "FHKST01010100"
-        
-        headers = self._get_headers(tr_id)
-        data = {
-            "FID_COND_MRKT_DIV_CODE": "J",
-            "FID_INPUT_ISCD": ticker
-        }
-        
-        try:
-            response = self._make_request(url, headers, data)
-            
-            if response.get('rt_cd') == '0':
-                output = response.get('output', {})
-                
-                return {
-                    'ticker': ticker,
-                    'name': output.get('hts_kor_isnm', f'ETF {ticker}'),
-                    'currentPrice': int(output.get('stck_prpr', 0)),
-                    'changePrice': int(output.get('prdy_vrss', 0)),
-                    'changeRate': float(output.get('prdy_ctrt', 0)),
-                    'volume': int(output.get('acml_vol', 0)),
-                    'tradingValue': int(output.get('acml_tr_pbmn', 0)),
-                    'high': int(output.get('stck_hgpr', 0)),
-                    'low': int(output.get('stck_lwpr', 0)),
-                    'open': int(output.get('stck_oprc', 0)),
-                    'previousClose': int(output.get('stck_sdpr', 0))
-                }
-            else:
-                raise Exception(f"API 오류: {response.get('msg1', 'Unknown error')}")
-                
-        except Exception as e:
-            print(f"ETF 가격 조회 실패: {e}")
-            return self._get_mock_price(ticker)
     
     def _get_mock_holdings(self, ticker: str) -> Dict:
         """Mock 보유 종목 데이터"""
@@ -512,7 +604,8 @@ class KoreaInvestmentAPI:
             'nav': 32150.50,
             'totalHoldings': 200,
             'updateDate': datetime.now().strftime('%Y%m%d'),
-            'holdings': ticker_data['holdings']
+            'holdings': ticker_data['holdings'],
+            'isMock': True
         }
     
     def _get_mock_price(self, ticker: str) -> Dict:
@@ -530,9 +623,251 @@ class KoreaInvestmentAPI:
             'high': base_price + 500,
             'low': base_price - 500,
             'open': base_price - 100,
-            'previousClose': base_price - 500
+            'previousClose': base_price - 500,
+            'isMock': True
         }
 
+_client: Optional[KoreaInvestmentAPI] = None
+
+
+def get_client() -> KoreaInvestmentAPI:
+    """프로세스 전역 KIS 클라이언트 (토큰 발급을 요청마다 반복하지 않도록 재사용)"""
+    global _client
+    if _client is None:
+        _client = KoreaInvestmentAPI()
+    return _client
+
+
+# ---- 실시간 체결가 (H0STCNT0) ----
+
+REALTIME_TR_ID = 'H0STCNT0'
+
+# H0STCNT0 응답 필드 중 사용하는 것 (^ 구분 순서 기준 위치)
+REALTIME_FIELDS = {
+    'ticker': 0, 'time': 1, 'price': 2, 'changeSign': 3, 'change': 4, 'changeRate': 5,
+    'open': 7, 'high': 8, 'low': 9, 'tradeVolume': 12, 'volume': 13,
+}
+REALTIME_FIELD_COUNT = 46
+
+
+def parse_realtime_frame(text: str) -> List[Dict]:
+    """실시간 체결 데이터 "0|H0STCNT0|건수|필드^필드^..." 를 체결 목록으로 변환
+
+    건수가 2 이상이면 필드가 건수만큼 이어서 붙어 옵니다. 암호화(1|...) 프레임과
+    다른 TR은 빈 목록.
+    """
+    parts = text.split('|', 3)
+    if len(parts) != 4 or parts[0] != '0' or parts[1] != REALTIME_TR_ID:
+        return []
+    fields = parts[3].split('^')
+    try:
+        count = int(parts[2])
+    except ValueError:
+        return []
+    width = len(fields) // count if count > 0 else 0
+    if width < REALTIME_FIELDS['volume'] + 1:
+        return []
+
+    ticks = []
+    for n in range(count):
+        row = fields[n * width:(n + 1) * width]
+        try:
+            ticks.append({
+                'ticker': row[REALTIME_FIELDS['ticker']],
+                'time': row[REALTIME_FIELDS['time']],
+                'price': float(row[REALTIME_FIELDS['price']]),
+                # 전일 대비 부호: 1 상한, 2 상승, 3 보합, 4 하한, 5 하락
+                'change': float(row[REALTIME_FIELDS['change']]) * (-1 if row[REALTIME_FIELDS['changeSign']] in ('4', '5') else 1),
+                'changeRate': float(row[REALTIME_FIELDS['changeRate']]),
+                'open': float(row[REALTIME_FIELDS['open']]),
+                'high': float(row[REALTIME_FIELDS['high']]),
+                'low': float(row[REALTIME_FIELDS['low']]),
+                'tradeVolume': int(row[REALTIME_FIELDS['tradeVolume']]),
+                'volume': int(row[REALTIME_FIELDS['volume']]),
+            })
+        except (ValueError, IndexError):
+            logger.debug("실시간 체결 필드 파싱 실패: %s", row[:3])
+    return ticks
+
+
+class RealtimeSubscriptionLimit(Exception):
+    """KIS 세션당 실시간 등록 한도 초과"""
+
+
+class KISRealtimeClient:
+    """KIS 실시간 체결가 웹소켓 클라이언트
+
+    프로세스당 연결 하나로 감시 중인 종목 전체(합집합)를 구독합니다.
+    set_tickers()로 원하는 종목 집합을 넘기면 현재 등록과의 차이만큼 등록/해제하고,
+    연결이 끊기면 지수 백오프로 다시 연결해 같은 집합을 다시 등록합니다.
+    체결이 들어오면 on_tick(tick)을 웹소켓 수신 스레드에서 호출합니다.
+    """
+
+    def __init__(self, on_tick, api: Optional[KoreaInvestmentAPI] = None):
+        self.on_tick = on_tick
+        self.api = api or get_client()
+        self.ws_url = os.getenv('KIS_WS_URL', 'ws://ops.koreainvestment.com:21000')
+        # KIS는 세션당 실시간 등록 41건까지 허용
+        self.max_subscriptions = int(os.getenv('KIS_WS_MAX_SUBSCRIPTIONS', 41))
+        # 구독이 모두 빠진 뒤 연결을 닫기까지 기다리는 시간
+        self.idle_seconds = float(os.getenv('KIS_WS_IDLE_SECONDS', 60))
+
+        self.connected = False
+        self.reconnects = 0
+        self.ticks = 0
+        self.last_tick_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._wanted: set = set()
+        self._registered: set = set()
+        self._approval_key: Optional[str] = None
+        self._ws = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    @property
+    def available(self) -> bool:
+        return not self.api.mock_mode and self.api.api_available
+
+    def set_tickers(self, tickers) -> None:
+        """구독할 종목 집합 갱신 (한도를 넘으면 RealtimeSubscriptionLimit)"""
+        tickers = set(tickers)
+        if len(tickers) > self.max_subscriptions:
+            raise RealtimeSubscriptionLimit(f"{len(tickers)} > {self.max_subscriptions}")
+        with self._lock:
+            self._wanted = tickers
+            if tickers and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='kis-realtime', daemon=True)
+                self._thread.start()
+            if self.connected:
+                try:
+                    self._sync_registrations()
+                except Exception as e:
+                    # 끊긴 연결이면 수신 스레드가 재연결하면서 다시 등록함
+                    logger.warning("[realtime] subscription update failed: %s", e)
+        self._wake.set()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+
+    def status(self) -> Dict:
+        return {
+            'connected': self.connected,
+            'subscriptions': sorted(self._registered),
+            'maxSubscriptions': self.max_subscriptions,
+            'reconnects': self.reconnects,
+            'ticks': self.ticks,
+            'lastTickAt': self.last_tick_at,
+            'lastError': self.last_error,
+        }
+
+    # ---- 웹소켓 스레드 ----
+
+    def _message(self, tr_type: str, ticker: str) -> str:
+        return json.dumps({
+            'header': {'approval_key': self._approval_key, 'custtype': 'P', 'tr_type': tr_type,
+                       'content-type': 'utf-8'},
+            'body': {'input': {'tr_id': REALTIME_TR_ID, 'tr_key': ticker}},
+        })
+
+    def _sync_registrations(self) -> None:
+        """원하는 집합과 등록된 집합의 차이만 등록(1)/해제(2) (self._lock 안에서 호출)"""
+        for ticker in sorted(self._registered - self._wanted):
+            self._ws.send(self._message('2', ticker))
+            self._registered.discard(ticker)
+        for ticker in sorted(self._wanted - self._registered):
+            self._ws.send(self._message('1', ticker))
+            self._registered.add(ticker)
+
+    def _run(self) -> None:
+        import websocket
+
+        backoff = 1.0
+        while not self._stop.is_set():
+            if not self._wanted:
+                # 구독자가 없으면 연결 없이 대기
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            idle_since = None
+            try:
+                if self._approval_key is None:
+                    self._approval_key = self.api.get_approval_key()
+                self._ws = websocket.create_connection(self.ws_url, timeout=10)
+                with self._lock:
+                    self.connected = True
+                    self._registered = set()
+                    self._sync_registrations()
+                logger.info("[realtime] connected to %s (%d tickers)", self.ws_url, len(self._registered))
+                backoff = 1.0
+                self.last_error = None
+
+                while not self._stop.is_set():
+                    try:
+                        message = self._ws.recv()
+                    except websocket.WebSocketTimeoutException:
+                        message = None
+                    if message:
+                        self._handle(message)
+                    if self._wanted:
+                        idle_since = None
+                    elif idle_since is None:
+                        idle_since = time.time()
+                    elif time.time() - idle_since > self.idle_seconds:
+                        logger.info("[realtime] no subscribers for %ss, closing", self.idle_seconds)
+                        break
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"[:300]
+                if isinstance(e, (requests.exceptions.HTTPError, KeyError)):
+                    # 접속키가 만료/거부된 경우 다시 발급
+                    self._approval_key = None
+                logger.warning("[realtime] connection error: %s (retry in %.0fs)", self.last_error, backoff)
+            finally:
+                with self._lock:
+                    self.connected = False
+                    self._registered = set()
+                if self._ws is not None:
+                    self._ws.close()
+                    self._ws = None
+
+            if not self._wanted or self.last_error is None:
+                continue
+            if self._stop.wait(backoff):
+                break
+            self.reconnects += 1
+            backoff = min(backoff * 2, 60.0)
+
+    def _handle(self, message: str) -> None:
+        if message[0] in '01':
+            for tick in parse_realtime_frame(message):
+                self.ticks += 1
+                self.last_tick_at = time.time()
+                try:
+                    self.on_tick(tick)
+                except Exception:
+                    logger.exception("[realtime] tick handler failed")
+            return
+
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+        header = payload.get('header', {})
+        if header.get('tr_id') == 'PINGPONG':
+            # 서버 keepalive: 받은 그대로 pong으로 응답
+            self._ws.pong(message)
+            return
+        body = payload.get('body', {})
+        if body.get('rt_cd') not in (None, '0'):
+            logger.warning("[realtime] %s %s: %s", header.get('tr_id'), header.get('tr_key'), body.get('msg1'))
+
+
 # 사용 예시
 if __name__ == "__main__":
     api = KoreaInvestmentAPI()
@@ -0,0 +1,506 @@
+"""
+yfinance(Yahoo) / KIS / Gemini 대역 서버 (부하 테스트용)
+
+실행: python loadtest/fake_upstream.py --port 3001
+백엔드 연결 (backend/.env 또는 환경변수):
+    YF_BASE_URL=http://localhost:3001/yahoo
+    GEMINI_BASE_URL=http://localhost:3001/gemini   (GEMINI_API_KEY는 아무 값)
+    KIS_BASE_URL=http://localhost:3001/kis        (KIS_APP_KEY/SECRET은 아무 값, KIS_MOCK_MODE=false)
+
+benchmarks/fixtures/에 기록된 응답을 재생합니다. 히스토리는 기록된 SPY 일봉을
+티커별 시드로 가격 수준과 수익률을 조금씩 바꿔 돌려주므로 티커마다 다른 시계열이 됩니다.
+
+업스트림별 지연/오류율/초당 요청 제한:
+    --latency yfinance=150,kis=80,gemini=3000   (ms)
+    --jitter yfinance=50                        (ms, 균등분포)
+    --error-rate yfinance=0.02                  (5xx 비율)
+    --rps yfinance=20                           (초과 시 429)
+실행 중 변경: POST /__admin/config {"yfinance": {"latency_ms": 500, "error_rate": 0.1}}
+
+없는 심볼(--unknown, 기본 INVALID_TICKER)과 .KS로 조회한 코스닥 코드(--kosdaq)는 Yahoo처럼 404를 돌려줍니다.
+
+KIS 실시간 체결가(H0STCNT0) 웹소켓 대역: --ws-port 3002 (websockets 패키지 필요)
+    KIS_WS_URL=ws://localhost:3002
+등록한 종목마다 초당 --ws-rate건씩 랜덤워크 체결을 보내고 10초마다 PINGPONG을 보냅니다.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from flask import Flask, Response, jsonify, request
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+UPSTREAMS = ('yfinance', 'kis', 'gemini')
+
+RANGE_DAYS = {'1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504, '3y': 756, '5y': 1260,
+              '10y': 2520, 'max': 100000}
+
+
+class UpstreamBehavior:
+    """업스트림 하나의 지연/오류/스로틀링 설정 (토큰 버킷)"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0, rps: float = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rps = rps
+        self._tokens = rps
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, **values) -> None:
+        for key in ('latency_ms', 'jitter_ms', 'error_rate', 'rps'):
+            if key in values:
+                setattr(self, key, float(values[key]))
+        self._tokens = self.rps
+
+    def admit(self) -> bool:
+        if self.rps <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rps, self._tokens + (now - self._last) * self.rps)
+            self._last = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def delay(self) -> None:
+        wait = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if wait > 0:
+            time.sleep(wait / 1000)
+
+    def to_dict(self) -> Dict:
+        return {'latency_ms': self.latency_ms, 'jitter_ms': self.jitter_ms,
+                'error_rate': self.error_rate, 'rps': self.rps}
+
+
+behaviors: Dict[str, UpstreamBehavior] = {name: UpstreamBehavior() for name in UPSTREAMS}
+counters: Dict[str, Dict[str, int]] = {name: {'ok': 0, 'error': 0, 'throttled': 0} for name in UPSTREAMS}
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def _load_base_history() -> pd.DataFrame:
+    hist = pd.read_csv(os.path.join(FIXTURES_DIR, 'yf_history_SPY_5y.csv'), index_col='Date')
+    hist.index = pd.to_datetime(hist.index, utc=True)
+    return hist
+
+
+BASE_HISTORY = _load_base_history()
+KIS_HOLDINGS = json.loads(_fixture('kis_holdings_069500.json'))
+YF_HOLDINGS = pd.read_csv(os.path.join(FIXTURES_DIR, 'yf_holdings_SPY.csv'))
+GEMINI_SUMMARY = _fixture('gemini_summary.txt')
+
+
+def symbol_history(symbol: str) -> pd.DataFrame:
+    """기록된 일봉을 티커별로 결정적으로 변형 (가격 수준 + 수익률 잡음)"""
+    seed = zlib.crc32(symbol.upper().encode())
+    rng = np.random.default_rng(seed)
+    korean = symbol.upper().endswith(('.KS', '.KQ')) or symbol.isdigit()
+    level = (rng.uniform(5_000, 60_000) if korean else rng.uniform(20, 500)) / BASE_HISTORY['Close'].iloc[0]
+    drift = np.exp(np.cumsum(rng.normal(0, 0.006, len(BASE_HISTORY))))
+    hist = BASE_HISTORY.copy()
+    for col in ('Open', 'High', 'Low', 'Close'):
+        hist[col] = hist[col] * level * drift
+    return hist
+
+
+# Yahoo에서 404가 나는 심볼 (--unknown / --kosdaq로 변경)
+UNKNOWN_SYMBOLS = {'INVALID_TICKER'}
+KOSDAQ_CODES = {'247540', '086520'}
+
+
+def not_listed(symbol: str) -> bool:
+    code, _, suffix = symbol.upper().partition('.')
+    if code in UNKNOWN_SYMBOLS:
+        return True
+    if suffix in ('KS', 'KQ'):
+        return (suffix == 'KQ') != (code in KOSDAQ_CODES)
+    return False
+
+
+def not_found(kind: str, symbol: str):
+    return jsonify({kind: {'result': None, 'error': {
+        'code': 'Not Found', 'description': f"Quote not found for symbol: {symbol}"}}}), 404
+
+
+def guarded(upstream: str):
+    """지연 주입 + 스로틀(429) + 오류(5xx) 주입 데코레이터"""
+    def decorator(fn):
+        def wrapper(*args, **kwargs):
+            behavior = behaviors[upstream]
+            if not behavior.admit():
+                counters[upstream]['throttled'] += 1
+                return Response('Too Many Requests', status=429)
+            behavior.delay()
+            if behavior.error_rate and random.random() < behavior.error_rate:
+                counters[upstream]['error'] += 1
+                return Response('Service Unavailable (injected failure)', status=503, mimetype='text/plain')
+            counters[upstream]['ok'] += 1
+            return fn(*args, **kwargs)
+        wrapper.__name__ = f"{upstream}_{fn.__name__}"
+        return wrapper
+    return decorator
+
+
+app = Flask(__name__)
+
+
+# ---- Yahoo Finance (yfinance) ----
+
+def _raw(value):
+    # yfinance는 formatted=false로 요청하므로 {raw, fmt} 대신 값을 그대로 돌려줌
+    return value
+
+
+def _chart_payload(symbol: str) -> Dict:
+    hist = symbol_history(symbol)
+    if 'period1' in request.args:
+        start = pd.Timestamp(int(float(request.args['period1'])), unit='s', tz='UTC')
+        end = pd.Timestamp(int(float(request.args.get('period2', time.time()))), unit='s', tz='UTC')
+        hist = hist[(hist.index >= start) & (hist.index < end)]
+    else:
+        hist = hist.iloc[-RANGE_DAYS.get(request.args.get('range', '1mo'), 21):]
+
+    korean = symbol.upper().endswith(('.KS', '.KQ'))
+    timezone = 'Asia/Seoul' if korean else 'America/New_York'
+    timestamps = [int(ts.timestamp()) for ts in hist.index]
+    last = float(hist['Close'].iloc[-1]) if len(hist) else 0.0
+    dividends = {str(ts): {'amount': float(v), 'date': ts}
+                 for ts, v in zip(timestamps, hist['Dividends']) if v > 0}
+    return {'chart': {'result': [{
+        'meta': {
+            'currency': 'KRW' if korean else 'USD', 'symbol': symbol, 'exchangeName': 'KSC' if korean else 'PCX',
+            'fullExchangeName': 'KSE' if korean else 'NYSEArca', 'instrumentType': 'ETF',
+            'firstTradeDate': timestamps[0] if timestamps else 0,
+            'regularMarketTime': timestamps[-1] if timestamps else 0,
+            'hasPrePostMarketData': False, 'gmtoffset': 32400 if korean else -14400,
+            'timezone': 'KST' if korean else 'EDT', 'exchangeTimezoneName': timezone,
+            'regularMarketPrice': last, 'chartPreviousClose': float(hist['Close'].iloc[0]) if len(hist) else 0.0,
+            'priceHint': 2, 'dataGranularity': request.args.get('interval', '1d'),
+            'range': request.args.get('range', ''),
+            'validRanges': list(RANGE_DAYS),
+        },
+        'timestamp': timestamps,
+        'events': {'dividends': dividends} if dividends else {},
+        'indicators': {
+            'quote': [{
+                'open': hist['Open'].round(4).tolist(), 'high': hist['High'].round(4).tolist(),
+                'low': hist['Low'].round(4).tolist(), 'close': hist['Close'].round(4).tolist(),
+                'volume': hist['Volume'].astype(int).tolist(),
+            }],
+            'adjclose': [{'adjclose': hist['Close'].round(4).tolist()}],
+        },
+    }], 'error': None}}
+
+
+def _quote_summary(symbol: str) -> Dict:
+    hist = symbol_history(symbol)
+    last, prev = float(hist['Close'].iloc[-1]), float(hist['Close'].iloc[-2])
+    korean = symbol.upper().endswith(('.KS', '.KQ'))
+    holdings = [{'symbol': row['Symbol'], 'holdingName': row['Stock'], 'holdingPercent': _raw(float(row['Weight']))}
+                for _, row in YF_HOLDINGS.iterrows()]
+    modules = {
+        'quoteType': {'symbol': symbol, 'quoteType': 'ETF', 'longName': f"{symbol} Fake ETF",
+                      'shortName': f"{symbol} ETF", 'exchange': 'KSC' if korean else 'PCX',
+                      'timeZoneFullName': 'Asia/Seoul' if korean else 'America/New_York'},
+        'price': {'regularMarketPrice': _raw(last), 'regularMarketPreviousClose': _raw(prev),
+                  'currency': 'KRW' if korean else 'USD', 'longName': f"{symbol} Fake ETF"},
+        'summaryDetail': {'previousClose': _raw(prev), 'volume': _raw(int(hist['Volume'].iloc[-1])),
+                          'yield': _raw(0.0132), 'totalAssets': _raw(5.2e11), 'navPrice': _raw(last),
+                          'currency': 'KRW' if korean else 'USD'},
+        'defaultKeyStatistics': {'annualReportExpenseRatio': _raw(0.0009), 'ytdReturn': _raw(0.12),
+                                 'threeYearAverageReturn': _raw(0.09), 'fiveYearAverageReturn': _raw(0.11)},
+        'fundProfile': {'family': 'Fake Asset Management', 'categoryName': 'Large Blend', 'legalType': 'Exchange Traded Fund',
+                        'feesExpensesInvestment': {'annualReportExpenseRatio': _raw(0.0009)}},
+        'topHoldings': {'holdings': holdings, 'stockPosition': _raw(0.995), 'bondPosition': _raw(0.0),
+                        'sectorWeightings': [{'technology': _raw(0.31)}, {'healthcare': _raw(0.12)},
+                                             {'financial_services': _raw(0.13)}, {'consumer_cyclical': _raw(0.1)}],
+                        'equityHoldings': {}, 'bondHoldings': {}, 'bondRatings': []},
+        'assetProfile': {'longBusinessSummary': f"{symbol} tracks a broad equity index."},
+        'summaryProfile': {'longBusinessSummary': f"{symbol} tracks a broad equity index."},
+        'financialData': {'currentPrice': _raw(last)},
+    }
+    wanted = [m for m in request.args.get('modules', ','.join(modules)).split(',') if m in modules]
+    return {'quoteSummary': {'result': [{m: modules[m] for m in wanted}], 'error': None}}
+
+
+@app.route('/yahoo/<host>/', methods=['GET'])
+@app.route('/yahoo/<host>', methods=['GET'])
+@guarded('yfinance')
+def yahoo_root(host):
+    response = Response('')
+    response.set_cookie('A3', 'fake-cookie', max_age=365 * 24 * 3600)
+    return response
+
+
+@app.route('/yahoo/<host>/v1/test/getcrumb', methods=['GET'])
+def yahoo_crumb(host):
+    return Response('fake-crumb', mimetype='text/plain')
+
+
+@app.route('/yahoo/<host>/v8/finance/chart/<symbol>', methods=['GET'])
+@guarded('yfinance')
+def yahoo_chart(host, symbol):
+    if not_listed(symbol):
+        return not_found('chart', symbol)
+    return jsonify(_chart_payload(symbol))
+
+
+@app.route('/yahoo/<host>/v10/finance/quoteSummary/<symbol>', methods=['GET'])
+@guarded('yfinance')
+def yahoo_quote_summary(host, symbol):
+    if not_listed(symbol):
+        return not_found('quoteSummary', symbol)
+    return jsonify(_quote_summary(symbol))
+
+
+@app.route('/yahoo/<host>/v7/finance/quote', methods=['GET'])
+@guarded('yfinance')
+def yahoo_quote(host):
+    results = []
+    for symbol in request.args.get('symbols', '').split(','):
+        if symbol and not not_listed(symbol):
+            hist = symbol_history(symbol)
+            results.append({'symbol': symbol, 'quoteType': 'ETF', 'longName': f"{symbol} Fake ETF",
+                            'shortName': f"{symbol} ETF", 'regularMarketPrice': float(hist['Close'].iloc[-1]),
+                            'regularMarketPreviousClose': float(hist['Close'].iloc[-2]),
+                            'regularMarketVolume': int(hist['Volume'].iloc[-1])})
+    return jsonify({'quoteResponse': {'result': results, 'error': None}})
+
+
+@app.route('/yahoo/<host>/ws/fundamentals-timeseries/v1/finance/timeseries/<symbol>', methods=['GET'])
+@guarded('yfinance')
+def yahoo_timeseries(host, symbol):
+    return jsonify({'timeseries': {'result': [], 'error': None}})
+
+
+@app.route('/yahoo/<host>/<path:rest>', methods=['GET', 'POST'])
+def yahoo_other(host, rest):
+    return jsonify({'finance': {'result': None, 'error': {'code': 'Not Found', 'description': rest}}}), 404
+
+
+# ---- 한국투자증권 KIS ----
+
+def _kis_ticker() -> str:
+    return request.args.get('FID_INPUT_ISCD', '069500')
+
+
+@app.route('/kis/oauth2/tokenP', methods=['POST'])
+@guarded('kis')
+def kis_token():
+    return jsonify({'access_token': 'fake-access-token', 'token_type': 'Bearer', 'expires_in': 86400})
+
+
+@app.route('/kis/oauth2/Approval', methods=['POST'])
+@guarded('kis')
+def kis_approval():
+    return jsonify({'approval_key': 'fake-approval-key'})
+
+
+@app.route('/kis/uapi/domestic-stock/v1/quotations/inquire-basic-price', methods=['GET'])
+@guarded('kis')
+def kis_holdings():
+    response = dict(KIS_HOLDINGS)
+    response['output'] = {**KIS_HOLDINGS['output'], 'hts_kor_isnm': f"ETF {_kis_ticker()}"}
+    return jsonify(response)
+
+
+@app.route('/kis/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice', methods=['GET'])
+@guarded('kis')
+def kis_daily():
+    hist = symbol_history(f"{_kis_ticker()}.KS").iloc[-100:]
+    rows = [{
+        'stck_bsop_date': ts.strftime('%Y%m%d'), 'stck_oprc': f"{row.Open:.0f}", 'stck_hgpr': f"{row.High:.0f}",
+        'stck_lwpr': f"{row.Low:.0f}", 'stck_clpr': f"{row.Close:.0f}", 'acml_vol': str(int(row.Volume)),
+    } for ts, row in hist[::-1].iterrows()]
+    return jsonify({'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output1': rows})
+
+
+@app.route('/kis/uapi/domestic-stock/v1/quotations/inquire-price', methods=['GET'])
+@guarded('kis')
+def kis_price():
+    ticker = _kis_ticker()
+    hist = symbol_history(f"{ticker}.KS")
+    last, prev = hist.iloc[-1], hist.iloc[-2]
+    return jsonify({'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output': {
+        'hts_kor_isnm': f"ETF {ticker}", 'stck_prpr': f"{last.Close:.0f}",
+        'prdy_vrss': f"{last.Close - prev.Close:.0f}", 'prdy_ctrt': f"{(last.Close / prev.Close - 1) * 100:.2f}",
+        'acml_vol': str(int(last.Volume)), 'acml_tr_pbmn': str(int(last.Volume * last.Close)),
+        'stck_hgpr': f"{last.High:.0f}", 'stck_lwpr': f"{last.Low:.0f}", 'stck_oprc': f"{last.Open:.0f}",
+        'stck_sdpr': f"{prev.Close:.0f}",
+    }})
+
+
+@app.route('/kis/uapi/domestic-stock/v1/quotations/intstock-multprice', methods=['GET'])
+@guarded('kis')
+def kis_multi_price():
+    payload = request.args
+    output = []
+    for n in range(1, 31):
+        ticker = payload.get(f'FID_INPUT_ISCD_{n}')
+        if not ticker:
+            break
+        hist = symbol_history(f"{ticker}.KS")
+        last, prev = hist.iloc[-1], hist.iloc[-2]
+        output.append({
+            'inter_shrn_iscd': ticker, 'inter_kor_isnm': f"ETF {ticker}", 'inter2_prpr': f"{last.Close:.0f}",
+            'inter2_prdy_vrss': f"{last.Close - prev.Close:.0f}", 'prdy_ctrt': f"{(last.Close / prev.Close - 1) * 100:.2f}",
+            'acml_vol': str(int(last.Volume)), 'acml_tr_pbmn': str(int(last.Volume * last.Close)),
+            'inter2_oprc': f"{last.Open:.0f}", 'inter2_hgpr': f"{last.High:.0f}", 'inter2_lwpr': f"{last.Low:.0f}",
+            'inter2_prdy_clpr': f"{prev.Close:.0f}",
+        })
+    return jsonify({'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': '정상처리 되었습니다.', 'output': output})
+
+
+def _realtime_row(ticker: str, price: float, prev_close: float, open_: float, high: float, low: float,
+                  trade_volume: int, volume: int) -> str:
+    """H0STCNT0 체결 레코드 한 건 (46개 필드 중 앞쪽 14개만 채움)"""
+    change = price - prev_close
+    sign = '2' if change > 0 else '5' if change < 0 else '3'
+    fields = [ticker, time.strftime('%H%M%S'), f"{price:.0f}", sign, f"{abs(change):.0f}",
+              f"{change / prev_close * 100:.2f}", f"{price:.0f}", f"{open_:.0f}", f"{high:.0f}", f"{low:.0f}",
+              f"{price + 5:.0f}", f"{price - 5:.0f}", str(trade_volume), str(volume)]
+    return '^'.join(fields + ['0'] * (46 - len(fields)))
+
+
+def serve_realtime(connection, rate: float) -> None:
+    """웹소켓 연결 하나: 등록/해제 메시지를 처리하며 등록 종목의 체결을 흘려보냄"""
+    quotes: Dict[str, Dict] = {}
+    interval = 1 / rate if rate > 0 else 1.0
+    next_ping = time.time() + 10
+    while True:
+        try:
+            message = connection.recv(timeout=interval)
+        except TimeoutError:
+            message = None
+        except Exception:
+            return
+        if message:
+            payload = json.loads(message)
+            if payload.get('header', {}).get('tr_id') == 'PINGPONG':
+                continue
+            tr_type = payload['header']['tr_type']
+            ticker = payload['body']['input']['tr_key']
+            if tr_type == '1':
+                last = symbol_history(f"{ticker}.KS").iloc[-1]
+                quotes[ticker] = {'prev': float(last.Close), 'price': float(last.Close), 'open': float(last.Close),
+                                  'high': float(last.Close), 'low': float(last.Close), 'volume': 0}
+            else:
+                quotes.pop(ticker, None)
+            connection.send(json.dumps({
+                'header': {'tr_id': 'H0STCNT0', 'tr_key': ticker, 'encrypt': 'N'},
+                'body': {'rt_cd': '0', 'msg_cd': 'OPSP0000',
+                         'msg1': 'SUBSCRIBE SUCCESS' if tr_type == '1' else 'UNSUBSCRIBE SUCCESS'},
+            }))
+            continue
+
+        for ticker, q in list(quotes.items()):
+            q['price'] = max(5.0, round(q['price'] * (1 + random.gauss(0, 0.0005)) / 5) * 5)
+            q['high'], q['low'] = max(q['high'], q['price']), min(q['low'], q['price'])
+            trade_volume = random.randint(1, 500)
+            q['volume'] += trade_volume
+            row = _realtime_row(ticker, q['price'], q['prev'], q['open'], q['high'], q['low'],
+                                trade_volume, q['volume'])
+            connection.send(f"0|H0STCNT0|001|{row}")
+        if time.time() >= next_ping:
+            connection.send(json.dumps({'header': {'tr_id': 'PINGPONG', 'datetime': time.strftime('%Y%m%d%H%M%S')}}))
+            next_ping = time.time() + 10
+
+
+def start_realtime_server(host: str, port: int, rate: float) -> None:
+    from websockets.sync.server import serve
+
+    server = serve(lambda connection: serve_realtime(connection, rate), host, port)
+    threading.Thread(target=server.serve_forever, name='fake-kis-ws', daemon=True).start()
+
+
+# ---- Gemini (generativelanguage REST) ----
+
+@app.route('/gemini/<version>/models/<model>:generateContent', methods=['POST'])
+@guarded('gemini')
+def gemini_generate(version, model):
+    payload = request.get_json(silent=True) or {}
+    prompt = ' '.join(part.get('text', '') for content in payload.get('contents', [])
+                      for part in content.get('parts', []))
+    if 'analysis' in prompt:
+        text = json.dumps({'analysis': '기록된 응답: 선택한 ETF들은 분산 효과가 크고 보수가 낮은 편입니다.'}, ensure_ascii=False)
+    else:
+        text = GEMINI_SUMMARY
+    return jsonify({
+        'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP', 'index': 0}],
+        'usageMetadata': {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': len(text) // 4,
+                          'totalTokenCount': (len(prompt) + len(text)) // 4},
+        'modelVersion': model,
+    })
+
+
+# ---- 관리 ----
+
+@app.route('/__admin/config', methods=['GET', 'POST'])
+def admin_config():
+    if request.method == 'POST':
+        for name, values in (request.get_json(silent=True) or {}).items():
+            if name in behaviors and isinstance(values, dict):
+                behaviors[name].update(**values)
+    return jsonify({name: b.to_dict() for name, b in behaviors.items()})
+
+
+@app.route('/__admin/stats', methods=['GET'])
+def admin_stats():
+    return jsonify(counters)
+
+
+def _parse_pairs(spec: str) -> Dict[str, float]:
+    values = {}
+    for part in (spec or '').split(','):
+        name, sep, value = part.partition('=')
+        if sep and name.strip() in behaviors:
+            values[name.strip()] = float(value)
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    parser.add_argument('--latency', default='yfinance=150,kis=80,gemini=3000')
+    parser.add_argument('--jitter', default='yfinance=100,kis=40,gemini=2000')
+    parser.add_argument('--error-rate', default='')
+    parser.add_argument('--rps', default='')
+    parser.add_argument('--unknown', default=','.join(sorted(UNKNOWN_SYMBOLS)), help='404를 돌려줄 심볼')
+    parser.add_argument('--kosdaq', default=','.join(sorted(KOSDAQ_CODES)), help='.KQ로만 조회되는 국내 코드')
+    parser.add_argument('--ws-port', type=int, default=0, help='KIS 실시간 웹소켓 대역 포트 (0이면 끔)')
+    parser.add_argument('--ws-rate', type=float, default=5, help='종목당 초당 체결 수')
+    args = parser.parse_args()
+
+    for option, key in ((args.latency, 'latency_ms'), (args.jitter, 'jitter_ms'),
+                        (args.error_rate, 'error_rate'), (args.rps, 'rps')):
+        for name, value in _parse_pairs(option).items():
+            behaviors[name].update(**{key: value})
+    print(json.dumps({name: b.to_dict() for name, b in behaviors.items()}), file=sys.stderr)
+    UNKNOWN_SYMBOLS.clear()
+    UNKNOWN_SYMBOLS.update(s.strip().upper() for s in args.unknown.split(',') if s.strip())
+    KOSDAQ_CODES.clear()
+    KOSDAQ_CODES.update(s.strip() for s in args.kosdaq.split(',') if s.strip())
+    if args.ws_port:
+        start_realtime_server(args.host, args.ws_port, args.ws_rate)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+느린 AI 요청이 빠른 데이터 요청을 막는지(head-of-line blocking) 확인하는 부하 테스트
+
+1) 기준: 빠른 경로(검색/히스토리)만 호출하며 지연시간 측정
+2) 부하: AI 클라이언트 N개가 /api/ai/summary를 계속 호출하는 동안 같은 측정을 반복
+
+대역 서버의 Gemini 지연을 10초로 두고 실행하면 sync 워커와 gthread + 라우트 풀의 차이가 드러납니다.
+
+    python loadtest/fake_upstream.py --port 3001 --latency gemini=10000 --jitter gemini=0
+    gunicorn -c gunicorn.conf.py app:app                  # 비교: gunicorn -c /dev/null app:app (sync 1개)
+    python loadtest/head_of_line.py --host http://localhost:5000 --ai-clients 16 --duration 30
+
+부하 구간 빠른 경로 p99가 --max-p99-ms를 넘으면 종료 코드 1.
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+import requests
+
+FAST_ROUTES = [
+    ('GET', '/api/search', {'params': {'keyword': 'kodex', 'market': 'domestic'}}),
+    ('GET', '/api/etf/history', {'params': {'ticker': 'SPY', 'period': '1mo'}}),
+    ('GET', '/api/etf/featured', {}),
+]
+AI_ROUTE = ('POST', '/api/ai/summary', {'json': {'tickers': ['SPY', 'QQQ', 'VOO']}})
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def probe(host: str, duration: float, clients: int):
+    """빠른 경로를 duration초 동안 돌려가며 호출하고 지연시간(ms) 목록 반환"""
+    latencies, errors = [], Counter()
+    deadline = time.time() + duration
+    lock = threading.Lock()
+
+    def run(offset):
+        session = requests.Session()
+        i = offset
+        while time.time() < deadline:
+            method, path, kwargs = FAST_ROUTES[i % len(FAST_ROUTES)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                resp = session.request(method, host + path, timeout=60, **kwargs)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    if resp.status_code >= 400:
+                        errors[resp.status_code] += 1
+            except requests.RequestException as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=run, args=(n,), daemon=True) for n in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors
+
+
+def ai_load(host: str, clients: int, stop: threading.Event, outcomes: Counter):
+    method, path, kwargs = AI_ROUTE
+
+    def run():
+        while not stop.is_set():
+            try:
+                # 503 후 쉬는 동안 서버 keep-alive가 끊기므로 매번 새 연결 사용
+                resp = requests.request(method, host + path, timeout=120, **kwargs)
+                outcomes[resp.status_code] += 1
+                if resp.status_code == 503:
+                    # 브라우저처럼 Retry-After만큼 쉬었다 재시도
+                    stop.wait(float(resp.headers.get('Retry-After', 1)))
+            except requests.RequestException as e:
+                outcomes[type(e).__name__] += 1
+
+    for _ in range(clients):
+        threading.Thread(target=run, daemon=True).start()
+
+
+def report(label, latencies, errors):
+    print(f"{label:<10} n={len(latencies):<5} p50={percentile(latencies, 50):8.1f}ms "
+          f"p95={percentile(latencies, 95):8.1f}ms p99={percentile(latencies, 99):8.1f}ms "
+          f"max={max(latencies, default=float('nan')):8.1f}ms "
+          f"mean={statistics.fmean(latencies) if latencies else float('nan'):8.1f}ms errors={dict(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='http://localhost:5000')
+    parser.add_argument('--ai-clients', type=int, default=16)
+    parser.add_argument('--probe-clients', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=3, help='AI 부하 시작 후 측정 전 대기(초)')
+    parser.add_argument('--max-p99-ms', type=float, default=1000)
+    args = parser.parse_args()
+
+    base, base_errors = probe(args.host, args.duration / 2, args.probe_clients)
+    report('baseline', base, base_errors)
+
+    stop, outcomes = threading.Event(), Counter()
+    ai_load(args.host, args.ai_clients, stop, outcomes)
+    time.sleep(args.warmup)
+    loaded, loaded_errors = probe(args.host, args.duration, args.probe_clients)
+    stop.set()
+    report('ai-load', loaded, loaded_errors)
+    print(f"ai requests: {dict(outcomes)}")
+
+    p99 = percentile(loaded, 99)
+    if not loaded or p99 > args.max_p99_ms:
+        print(f"FAIL: fast-path p99 {p99:.1f}ms under AI load exceeds {args.max_p99_ms:.0f}ms")
+        sys.exit(1)
+    print(f"OK: fast-path p99 {p99:.1f}ms under AI load")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+대시보드 / 비교 화면 트래픽 부하 테스트 (locust)
+
+1) 대역 서버:   python loadtest/fake_upstream.py --port 3001
+2) 백엔드:      YF_BASE_URL=http://localhost:3001/yahoo GEMINI_BASE_URL=http://localhost:3001/gemini \
+                GEMINI_API_KEY=fake KIS_BASE_URL=http://localhost:3001/kis KIS_APP_KEY=fake \
+                KIS_APP_SECRET=fake KIS_MOCK_MODE=false gunicorn -c gunicorn.conf.py app:app
+3) 부하:        locust -f loadtest/locustfile.py --host http://localhost:5000 \
+                --headless -u 50 -r 10 -t 2m --csv logs/loadtest
+
+사용자 비율은 대시보드:비교 = 4:1 이며, 비교 사용자는 AI 요약/분석(느린 Gemini 경로)을 호출합니다.
+"""
+
+import random
+
+from locust import HttpUser, between, task
+
+DOMESTIC = ['069500', '360750', '133690', '379800', '091160', '272580', '381170', '371460']
+OVERSEAS = ['SPY', 'QQQ', 'VOO', 'IVV', 'VTI', 'VEA', 'VWO', 'EFA', 'IWM', 'EEM']
+KEYWORDS = [('domestic', 'kodex'), ('domestic', 'tiger'), ('domestic', '미국'), ('domestic', '200'),
+            ('overseas', 'spy'), ('overseas', 'vanguard'), ('overseas', 'ishares')]
+PERIODS = ['1mo', '3mo', '6mo', '1y']
+
+
+class DashboardUser(HttpUser):
+    """메인 대시보드: 주요 ETF 목록, 검색, 차트, 상세 정보"""
+
+    weight = 4
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        self.client.get('/api/etf/featured')
+
+    @task(5)
+    def search(self):
+        market, keyword = random.choice(KEYWORDS)
+        self.client.get('/api/search', params={'keyword': keyword, 'market': market}, name='/api/search')
+
+    @task(4)
+    def history(self):
+        ticker = random.choice(DOMESTIC + OVERSEAS)
+        self.client.get('/api/etf/history', params={'ticker': ticker if not ticker.isdigit() else f"{ticker}.KS",
+                                                    'period': random.choice(PERIODS)}, name='/api/etf/history')
+
+    @task(2)
+    def info(self):
+        self.client.get('/api/etf/info', params={'ticker': random.choice(DOMESTIC)}, name='/api/etf/info')
+
+    @task(2)
+    def holdings(self):
+        self.client.get(f"/api/etf/{random.choice(DOMESTIC)}/holdings", name='/api/etf/[ticker]/holdings')
+
+    @task(3)
+    def watchlist(self):
+        tickers = random.sample(DOMESTIC, 4) + random.sample(OVERSEAS, 4)
+        self.client.get('/api/etf/quotes', params={'tickers': ','.join(tickers)}, name='/api/etf/quotes')
+
+    @task(1)
+    def indicators(self):
+        tickers = random.sample(OVERSEAS, 3)
+        self.client.post('/api/indicators', json={
+            'tickers': tickers, 'indicators': [{'name': 'sma', 'window': 20}, 'rsi'], 'period': '1y'})
+
+
+class CompareUser(HttpUser):
+    """비교 화면: ETF 2~4개 선택 -> 차트 -> AI 요약/분석"""
+
+    weight = 1
+    wait_time = between(3, 8)
+
+    @task
+    def compare(self):
+        picks = random.sample(OVERSEAS, random.randint(2, 4))
+        self.client.get('/api/search', params={'keyword': picks[0].lower(), 'market': 'overseas'},
+                        name='/api/search')
+        for ticker in picks:
+            self.client.get('/api/etf/history', params={'ticker': ticker, 'period': '1y'}, name='/api/etf/history')
+        self.client.post('/api/ai/summary', json={'tickers': picks})
+        self.client.post('/api/etf/analyze', json={'tickers': picks})
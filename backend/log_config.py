@@ -0,0 +1,135 @@
+"""
+환경변수 기반 로깅 설정
+
+- LOG_LEVEL: 루트 레벨 (기본 INFO)
+- LOG_LEVELS: 모듈별 레벨, 예) "werkzeug=WARNING,kis_api=DEBUG"
+- LOG_FORMAT: json(기본) 또는 text
+- LOG_FILE: 로그 파일 경로 (기본 logs/app.log, 빈 값이면 파일 로그 끔)
+- LOG_MAX_BYTES / LOG_BACKUP_COUNT: 크기 기반 로테이션 (기본 10MB x 5)
+- LOG_CONSOLE: 콘솔 출력 여부 (기본 true)
+
+요청 스레드는 QueueHandler로 레코드를 큐에 넣기만 하고,
+포맷팅과 파일 I/O는 QueueListener 스레드에서 처리합니다.
+레벨이 꺼진 로그는 %-스타일 인자를 포맷하지 않으므로 거의 비용이 없습니다.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+DEFAULT_LOG_FILE = os.path.join(os.path.dirname(__file__), 'logs', 'app.log')
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 JSON에 추가하기 위해 제외)
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 로그를 기록"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """같은 프로세스 안의 리스너로만 넘기므로 메시지/예외 포맷팅을 리스너 스레드로 미룸"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"a=DEBUG,b.c=WARNING" 형식을 {logger 이름: 레벨}로 변환"""
+    levels = {}
+    for part in (spec or '').split(','):
+        name, sep, level = part.partition('=')
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
+
+def setup_logging() -> None:
+    """루트 로거에 QueueHandler를 달고 리스너 스레드를 시작 (여러 번 호출해도 한 번만 적용)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+    if os.getenv('LOG_FORMAT', 'json').lower() == 'text':
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s - %(message)s')
+    else:
+        formatter = JsonFormatter()
+
+    handlers = []
+    log_file = os.getenv('LOG_FILE', DEFAULT_LOG_FILE)
+    if log_file:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+                backupCount=int(os.getenv('LOG_BACKUP_COUNT', 5)),
+                encoding='utf-8',
+            ))
+        except OSError:
+            pass
+    if _env_bool('LOG_CONSOLE', True):
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    root.setLevel(level)
+
+    # 기본은 werkzeug 요청 로그를 줄이고, LOG_LEVELS로 덮어쓸 수 있음
+    levels = {'werkzeug': logging.WARNING, **parse_levels(os.getenv('LOG_LEVELS', ''))}
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def restart_after_fork() -> None:
+    """fork된 자식(gunicorn --preload 워커)에서 리스너 스레드를 다시 시작 (부모의 스레드는 따라오지 않음)"""
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
+
+
+def configure_app_logger(app) -> None:
+    """Flask app.logger가 자체 핸들러 대신 루트(큐)로 전달하도록 정리"""
+    from flask.logging import default_handler
+
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(parse_levels(os.getenv('LOG_LEVELS', '')).get(app.logger.name, logging.NOTSET))
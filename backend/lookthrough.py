@@ -0,0 +1,237 @@
+"""
+ETF 포트폴리오 룩스루(look-through) 노출도 집계
+
+ETF x 구성종목 보유비중을 CSR 형태(indptr/indices/data) 희소행렬로 미리 만들어 두고,
+포트폴리오 ETF 비중 벡터와의 희소 행렬-벡터 곱(np.bincount)으로
+개별 종목/섹터/국가 노출도를 집계합니다.
+
+보유종목 출처: holdings 서비스 (국내 ETF는 KIS 우선, 해외 ETF는 yfinance funds_data)
+행렬은 해석된 심볼(069500.KS -> 069500)로 ETF당 한 행, 최근 사용한 LOOKTHROUGH_MAX_ETFS개(기본 512)만 보관.
+보유종목 캐시/갱신은 holdings 서비스에 맡기고, 서비스가 새로 적재한 결과(공시일이 바뀐 경우 등)만 행에 다시 반영
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOP_STOCKS = 50
+MAX_ETFS = int(os.getenv('LOOKTHROUGH_MAX_ETFS', 512))
+MAX_ASSETS = 20  # 요청 하나에서 보유종목을 순서대로 조회하므로 ETF 수 상한
+
+# yfinance 심볼 접미사 -> 국가 코드
+SUFFIX_COUNTRY = {
+    'KS': 'KR', 'KQ': 'KR', 'T': 'JP', 'HK': 'HK', 'TW': 'TW', 'SS': 'CN', 'SZ': 'CN',
+    'L': 'GB', 'DE': 'DE', 'PA': 'FR', 'AS': 'NL', 'SW': 'CH', 'TO': 'CA', 'AX': 'AU',
+}
+
+
+def infer_country(code: str) -> str:
+    """종목 코드 형태로 상장 국가를 추정 (6자리 숫자=한국, 접미사 없는 영문=미국)"""
+    code = str(code).strip().upper()
+    if code.isdigit() and len(code) == 6:
+        return 'KR'
+    if '.' in code:
+        suffix = code.rsplit('.', 1)[1]
+        if suffix in SUFFIX_COUNTRY:
+            return SUFFIX_COUNTRY[suffix]
+        if len(suffix) == 1:  # BRK.B 같은 미국 클래스 주식
+            return 'US'
+        return 'Unknown'
+    return 'US' if code.isalpha() else 'Unknown'
+
+
+def fetch_holdings(ticker: str):
+    """ETF 하나의 보유종목 (holdings 서비스 캐시 경유, holdings.Holdings)"""
+    import holdings
+    from ticker_resolver import resolver
+
+    return holdings.get(resolver.resolve(ticker))[0]
+
+
+def to_members(data) -> Tuple[List[Dict], Dict[str, float]]:
+    """Holdings -> (구성종목 [{code, name, weight(0~1)}], 섹터 비중 {sector: 0~1})"""
+    members = [{'code': code, 'name': name, 'weight': weight / 100}
+               for code, name, weight in zip(data.codes, data.names, data.weights.tolist()) if code]
+    return members, dict(data.sectors)
+
+
+def resolve_key(ticker: str) -> str:
+    """행렬 키: 해석된 표시 심볼 (해석할 수 없는 입력은 그대로 -> 조회 실패로 처리)"""
+    from ticker_resolver import UnknownTicker, resolver
+
+    try:
+        return resolver.resolve(ticker).display
+    except UnknownTicker:
+        return ticker
+
+
+class _Compiled:
+    """compile() 결과 스냅샷 (한 번에 교체되므로 읽는 쪽은 잠금이 필요 없음)"""
+
+    def __init__(self, etf_index, codes, names, countries, country_idx, sectors,
+                 indptr, indices, data, sector_indptr, sector_indices, sector_data):
+        self.etf_index: Dict[str, int] = etf_index
+        self.codes: List[str] = codes
+        self.names: List[str] = names
+        self.countries: List[str] = countries
+        self.country_idx = np.asarray(country_idx, dtype=np.int64)
+        self.sectors: List[str] = sectors
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=float)
+        self.sector_indptr = np.asarray(sector_indptr, dtype=np.int64)
+        self.sector_indices = np.asarray(sector_indices, dtype=np.int64)
+        self.sector_data = np.asarray(sector_data, dtype=float)
+
+
+class HoldingsMatrix:
+    """ETF x 종목 / ETF x 섹터 희소 보유비중 행렬"""
+
+    def __init__(self, max_etfs: int = MAX_ETFS):
+        self.lock = threading.Lock()
+        self.max_etfs = max_etfs
+        # 티커 -> (반영한 Holdings, 구성종목, 섹터 비중), 오래 쓰지 않은 것부터 삭제
+        self._raw: Dict[str, Tuple[Any, List[Dict], Dict[str, float]]] = OrderedDict()
+        self._dirty = True
+        self.compiled: Optional[_Compiled] = None
+
+    def is_current(self, ticker: str, source) -> bool:
+        """holdings 서비스가 준 결과를 이미 반영했는지 (같은 적재 결과이거나 같은 출처의 같은 공시일)"""
+        with self.lock:
+            entry = self._raw.get(ticker)
+            if entry is None:
+                return False
+            self._raw.move_to_end(ticker)
+        stored = entry[0]
+        return stored is source or (stored is not None and source.update_date is not None
+                                    and (stored.source, stored.update_date) == (source.source, source.update_date))
+
+    def put(self, ticker: str, holdings: List[Dict], sectors: Dict[str, float], source=None) -> None:
+        with self.lock:
+            self._raw[ticker] = (source, holdings, sectors)
+            self._raw.move_to_end(ticker)
+            while len(self._raw) > self.max_etfs:
+                self._raw.popitem(last=False)
+            self._dirty = True
+
+    def compile(self) -> _Compiled:
+        """원본 보유종목 목록을 CSR 배열로 재구성 (보유종목이 바뀐 경우에만)"""
+        with self.lock:
+            if not self._dirty and self.compiled is not None:
+                return self.compiled
+            etf_index, security_index, names = {}, {}, []
+            country_index, country_idx, sector_index = {}, [], {}
+            indptr, indices, data = [0], [], []
+            s_indptr, s_indices, s_data = [0], [], []
+            for ticker, (_, holdings, sectors) in self._raw.items():
+                etf_index[ticker] = len(etf_index)
+                for h in holdings:
+                    code = h['code'].upper()
+                    if code not in security_index:
+                        security_index[code] = len(names)
+                        names.append(h.get('name') or code)
+                        country_idx.append(country_index.setdefault(infer_country(code), len(country_index)))
+                    indices.append(security_index[code])
+                    data.append(h['weight'])
+                indptr.append(len(indices))
+                for sector, weight in sectors.items():
+                    s_indices.append(sector_index.setdefault(sector, len(sector_index)))
+                    s_data.append(weight)
+                s_indptr.append(len(s_indices))
+
+            self.compiled = _Compiled(etf_index, list(security_index), names, list(country_index), country_idx,
+                                      list(sector_index), indptr, indices, data, s_indptr, s_indices, s_data)
+            self._dirty = False
+            return self.compiled
+
+    @staticmethod
+    def _matvec_t(indptr, indices, data, rows: np.ndarray, weights: np.ndarray, n_cols: int) -> np.ndarray:
+        """선택된 행(ETF)에 대해 y = H[rows]^T w 를 계산"""
+        starts, ends = indptr[rows], indptr[rows + 1]
+        lengths = ends - starts
+        if lengths.sum() == 0:
+            return np.zeros(n_cols)
+        # 각 행의 [start, end) 구간을 하나의 위치 배열로 펼침
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        pos = np.arange(lengths.sum()) + offsets
+        return np.bincount(indices[pos], weights=data[pos] * np.repeat(weights, lengths), minlength=n_cols)
+
+    def aggregate(self, portfolio: Dict[str, float], top: int = TOP_STOCKS) -> Dict:
+        """포트폴리오 ETF 비중(합계 1로 정규화)을 종목/섹터/국가 노출도로 변환"""
+        c = self.compile()
+        known = [(t, w) for t, w in portfolio.items() if t in c.etf_index]
+        missing = [t for t in portfolio if t not in c.etf_index]
+        total = sum(portfolio.values()) or 1.0
+        rows = np.asarray([c.etf_index[t] for t, _ in known], dtype=np.int64)
+        weights = np.asarray([w / total for _, w in known], dtype=float)
+
+        exposure = self._matvec_t(c.indptr, c.indices, c.data, rows, weights, len(c.names))
+        overlap = self._matvec_t(c.indptr, c.indices, np.ones_like(c.data), rows, np.ones_like(weights), len(c.names))
+        sector_exposure = self._matvec_t(c.sector_indptr, c.sector_indices, c.sector_data, rows, weights,
+                                         len(c.sectors))
+        country_exposure = np.bincount(c.country_idx, weights=exposure, minlength=len(c.countries))
+
+        order = np.argsort(-exposure)[:top]
+        order = order[exposure[order] > 0]
+        stocks = [{
+            'code': c.codes[i],
+            'name': c.names[i],
+            'country': c.countries[c.country_idx[i]],
+            'weight': round(float(exposure[i]) * 100, 4),
+            'etfCount': int(overlap[i]),
+        } for i in order]
+
+        covered = float(exposure.sum())
+        countries = {c.countries[i]: float(v) for i, v in enumerate(country_exposure) if v > 0}
+        if covered < 1:
+            countries['Other'] = countries.get('Other', 0.0) + (1 - covered)
+        sectors = {c.sectors[i]: float(v) for i, v in enumerate(sector_exposure) if v > 0}
+        sector_covered = sum(sectors.values())
+        if sector_covered < 1:
+            sectors['Unknown'] = sectors.get('Unknown', 0.0) + (1 - sector_covered)
+
+        return {
+            'stocks': stocks,
+            'sectors': sorted(({'sector': k, 'weight': round(v * 100, 4)} for k, v in sectors.items()),
+                              key=lambda x: -x['weight']),
+            'countries': sorted(({'country': k, 'weight': round(v * 100, 4)} for k, v in countries.items()),
+                                key=lambda x: -x['weight']),
+            'coverage': round(covered * 100, 4),
+            'missing': missing,
+        }
+
+
+holdings_matrix = HoldingsMatrix()
+
+
+def ensure_holdings(tickers: List[str]) -> List[str]:
+    """holdings 서비스의 보유종목이 바뀐 ETF만 행렬에 다시 반영, 실패한 티커 목록 반환"""
+    failed = []
+    for ticker in tickers:
+        try:
+            data = fetch_holdings(ticker)
+        except Exception as e:
+            logger.warning("[LOOKTHROUGH] %s 보유종목 조회 실패: %s", ticker, e)
+            failed.append(ticker)
+            continue
+        if not holdings_matrix.is_current(ticker, data):
+            holdings_matrix.put(ticker, *to_members(data), source=data)
+    return failed
+
+
+def look_through(portfolio: Dict[str, float], top: Optional[int] = None) -> Dict:
+    # 같은 ETF를 다른 표기(069500 / 069500.KS)로 넣어도 한 행으로 합침
+    resolved: Dict[str, float] = {}
+    for ticker, weight in portfolio.items():
+        key = resolve_key(ticker)
+        resolved[key] = resolved.get(key, 0.0) + weight
+    failed = ensure_holdings(list(resolved))
+    result = holdings_matrix.aggregate(resolved, top=top or TOP_STOCKS)
+    result['failed'] = failed
+    return result
@@ -0,0 +1,212 @@
+"""
+ETF 마스터 데이터(국내/해외 CSV) 스냅샷과 무중단 재적재
+
+- 요청은 항상 `master.current` 스냅샷 하나(국내/해외 프레임 + 버전)를 읽음
+- reload(): 새 프레임을 만든 뒤 스냅샷 참조만 한 번에 교체 (읽는 쪽은 잠금 없음)
+  한쪽 CSV 적재에 실패하면 그 시장은 이전 프레임을 유지
+- 이전 스냅샷과 행 단위 해시를 비교해 추가/삭제/변경된 티커만 리스너에 전달하므로
+  하위 캐시는 바뀐 티커만 무효화
+- MASTER_WATCH_SECONDS(기본 60, 0이면 끔) 간격으로 CSV 수정 시각을 확인해 바뀌면 재적재
+  (gunicorn 워커마다 감시하므로 파일만 교체하면 모든 워커가 따라옴)
+- 검색 색인(SearchIndex)은 고정 폭 유니코드 NumPy 배열이라 문자열이 버퍼 하나에 모여 있음
+  gunicorn --preload로 마스터를 arbiter에서 만들면 워커가 검색해도 참조 카운트를 건드리지 않아
+  fork 후에도 페이지가 복사되지 않고 공유됨 (pandas object 컬럼은 문자열 객체마다 참조 카운트를 갱신)
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+WATCH_SECONDS = float(os.getenv('MASTER_WATCH_SECONDS', 60))
+
+
+class SearchIndex(NamedTuple):
+    """티커/이름 부분 문자열 검색용 NumPy 배열 (원본 + 소문자)"""
+    tickers: np.ndarray
+    names: np.ndarray
+    lower_tickers: np.ndarray
+    lower_names: np.ndarray
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'SearchIndex':
+        if df.empty:
+            tickers = names = np.array([], dtype=str)
+        else:
+            tickers = df['Ticker/Code'].fillna('').astype(str).to_numpy(dtype=str)
+            names = df['Name'].fillna('').astype(str).to_numpy(dtype=str)
+        return cls(tickers, names, np.char.lower(tickers), np.char.lower(names))
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def search(self, keyword: str) -> List[Dict[str, str]]:
+        """이름 또는 티커에 keyword(소문자)가 포함된 항목을 CSV 순서대로 [{ticker, name}]로 반환"""
+        hits = np.flatnonzero((np.char.find(self.lower_names, keyword) >= 0)
+                              | (np.char.find(self.lower_tickers, keyword) >= 0))
+        return [{'ticker': ticker, 'name': name}
+                for ticker, name in zip(self.tickers[hits].tolist(), self.names[hits].tolist())]
+
+
+class MasterSnapshot(NamedTuple):
+    korean: pd.DataFrame
+    overseas: pd.DataFrame
+    version: int
+    loaded_at: float
+    fingerprints: Dict[str, int]  # 티커 -> 행 해시
+    search: Dict[str, SearchIndex]  # 'domestic' / 'overseas'
+
+    @classmethod
+    def build(cls, korean: pd.DataFrame, overseas: pd.DataFrame, version: int,
+              fingerprints: Optional[Dict[str, int]] = None) -> 'MasterSnapshot':
+        return cls(korean, overseas, version, time.time(),
+                   fingerprint(korean, overseas) if fingerprints is None else fingerprints,
+                   {'domestic': SearchIndex.build(korean), 'overseas': SearchIndex.build(overseas)})
+
+
+class MasterDiff(NamedTuple):
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    @property
+    def tickers(self) -> set:
+        return set(self.added) | set(self.removed) | set(self.changed)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'added': len(self.added), 'removed': len(self.removed), 'changed': len(self.changed)}
+
+
+def fingerprint(*frames: pd.DataFrame) -> Dict[str, int]:
+    """티커별 행 해시 (Ticker/Code 컬럼 기준, 중복 티커는 마지막 행)"""
+    result: Dict[str, int] = {}
+    for df in frames:
+        if df.empty or 'Ticker/Code' not in df.columns:
+            continue
+        hashes = pd.util.hash_pandas_object(df, index=False)
+        tickers = df['Ticker/Code'].astype(str).str.strip().str.upper()
+        result.update(zip(map(sys.intern, tickers), hashes.tolist()))
+    return result
+
+
+def diff(old: Dict[str, int], new: Dict[str, int]) -> MasterDiff:
+    return MasterDiff(
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+        changed=sorted(t for t in new.keys() & old.keys() if new[t] != old[t]),
+    )
+
+
+class MasterData:
+    """마스터 스냅샷 보관 + 재적재 + 변경 리스너"""
+
+    def __init__(self, load: Callable[[], Tuple[pd.DataFrame, pd.DataFrame]], paths: Iterable[str] = ()):
+        self._load = load
+        self.paths = list(paths)
+        self.listeners: List[Callable[[MasterSnapshot, MasterDiff], None]] = []
+        self.last_diff: Optional[MasterDiff] = None
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._mtimes = self._stat()
+        korean, overseas = load()
+        self.current = MasterSnapshot.build(korean, overseas, 1)
+
+    def on_change(self, listener: Callable[[MasterSnapshot, MasterDiff], None]):
+        """스냅샷이 바뀔 때 호출할 함수 등록 (데코레이터로도 사용)"""
+        self.listeners.append(listener)
+        return listener
+
+    def reload(self) -> MasterDiff:
+        """CSV를 다시 읽어 스냅샷 교체. 동시에 들어온 재적재는 하나씩 처리"""
+        with self._reload_lock:
+            mtimes = self._stat()
+            previous = self.current
+            korean, overseas = self._load()
+            # 적재 실패(빈 프레임)한 시장은 이전 프레임 유지
+            if korean.empty and not previous.korean.empty:
+                logger.warning("[master] domestic CSV reload failed, keeping previous %d rows", len(previous.korean))
+                korean = previous.korean
+            if overseas.empty and not previous.overseas.empty:
+                logger.warning("[master] overseas CSV reload failed, keeping previous %d rows", len(previous.overseas))
+                overseas = previous.overseas
+
+            fingerprints = fingerprint(korean, overseas)
+            changes = diff(previous.fingerprints, fingerprints)
+            self._mtimes = mtimes
+            self.last_diff = changes
+            if not changes.tickers:
+                logger.info("[master] reload: no changes (version %d)", previous.version)
+                return changes
+
+            snapshot = MasterSnapshot.build(korean, overseas, previous.version + 1, fingerprints)
+            self.current = snapshot
+            logger.info("[master] version %d: +%d -%d ~%d tickers", snapshot.version,
+                        len(changes.added), len(changes.removed), len(changes.changed))
+            for listener in self.listeners:
+                try:
+                    listener(snapshot, changes)
+                except Exception:
+                    logger.exception("[master] change listener %s failed", getattr(listener, '__name__', listener))
+            return changes
+
+    def reload_async(self) -> bool:
+        """백그라운드 재적재 시작 (이미 진행 중이면 False)"""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self._reload_safely, name='master-reload', daemon=True).start()
+        return True
+
+    def _reload_safely(self) -> None:
+        try:
+            self.reload()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"[:300]
+            logger.error("[master] reload failed: %s", self.last_error)
+
+    # ---- 파일 감시 ----
+
+    def _stat(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def start_watcher(self, interval: float = WATCH_SECONDS) -> None:
+        """interval초마다 CSV 수정 시각을 확인해 바뀌었으면 재적재 (프로세스당 한 번)"""
+        if interval <= 0 or not self.paths or (self._watcher is not None and self._watcher.is_alive()):
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                if self._stat() != self._mtimes:
+                    logger.info("[master] CSV changed on disk, reloading")
+                    self._reload_safely()
+
+        self._watcher = threading.Thread(target=watch, name='master-watch', daemon=True)
+        self._watcher.start()
+
+    def status(self) -> Dict:
+        snapshot = self.current
+        return {
+            'version': snapshot.version,
+            'loadedAt': snapshot.loaded_at,
+            'domestic': len(snapshot.korean),
+            'overseas': len(snapshot.overseas),
+            'lastDiff': self.last_diff.to_dict() if self.last_diff else None,
+            'lastError': self.last_error,
+            'reloading': self._reload_lock.locked(),
+            'watchSeconds': WATCH_SECONDS if self._watcher is not None else 0,
+        }
@@ -0,0 +1,344 @@
+"""
+요청/업스트림 지연시간 계측과 Prometheus /metrics 노출
+
+핫 패스 비용을 줄이기 위해
+- 카운터는 OS 스레드별 샤드에만 기록하고 (잠금 없음) 수집 시점에 합산
+- 라벨은 이미 존재하는 문자열(url_rule.rule 등)로 만든 튜플 키를 그대로 사용
+- 문자열 포맷팅은 /metrics 수집 시점에만 수행
+
+gunicorn 워커가 여럿이면 각 워커가 METRICS_MULTIPROC_DIR/<pid>.json에 자기 값을 주기적으로 쓰고,
+/metrics를 받은 워커가 모든 파일을 합산해서 응답 (어느 워커가 받아도 같은 합계, 카운터가 줄지 않음).
+종료된 워커의 카운터/히스토그램은 arbiter가 archive.json에 합쳐 두고 게이지는 버림.
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# 초 단위 히스토그램 버킷 (Gemini 호출이 10초 이상 걸리므로 상단을 넉넉히)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+
+UPSTREAMS = ('yfinance', 'kis', 'gemini')
+
+# 워커 간 합산용 디렉터리 (gunicorn.conf.py가 설정, 빈 값이면 이 프로세스 값만 노출)
+MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+ARCHIVE_FILE = 'archive.json'
+
+KINDS = ('histograms', 'counters', 'gauges')
+
+logger = logging.getLogger(__name__)
+
+
+class _Shard:
+    __slots__ = ('histograms', 'counters', 'gauges')
+
+    def __init__(self):
+        # (metric, labels) -> [bucket counts..., +Inf count, sum]
+        self.histograms: Dict[Tuple[str, tuple], List[float]] = {}
+        self.counters: Dict[Tuple[str, tuple], int] = {}
+        self.gauges: Dict[Tuple[str, tuple], int] = {}
+
+
+_shards: Dict[int, _Shard] = {}
+_registry_lock = threading.Lock()
+_flusher = None
+_owner_pid = os.getpid()
+
+
+def _shard() -> _Shard:
+    tid = threading.get_native_id()
+    shard = _shards.get(tid)
+    if shard is None:
+        with _registry_lock:
+            shard = _shards.setdefault(tid, _Shard())
+    return shard
+
+
+def observe(metric: str, labels: tuple, seconds: float) -> None:
+    """히스토그램에 관측값 하나를 기록"""
+    hist = _shard().histograms
+    key = (metric, labels)
+    row = hist.get(key)
+    if row is None:
+        row = hist[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+    row[bisect_left(BUCKETS, seconds)] += 1
+    row[-1] += seconds
+
+
+def inc(metric: str, labels: tuple, value: int = 1) -> None:
+    counters = _shard().counters
+    key = (metric, labels)
+    counters[key] = counters.get(key, 0) + value
+
+
+def gauge_add(metric: str, labels: tuple, value: int) -> None:
+    gauges = _shard().gauges
+    key = (metric, labels)
+    gauges[key] = gauges.get(key, 0) + value
+
+
+@contextmanager
+def upstream_timer(upstream: str, operation: str = ''):
+    """업스트림(yfinance/KIS/Gemini) 호출 시간을 성공/실패별로 기록"""
+    gauge_add('upstream_in_flight', (upstream,), 1)
+    started = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except BaseException:
+        outcome = 'error'
+        raise
+    finally:
+        observe('upstream_request_duration_seconds', (upstream, operation, outcome), time.perf_counter() - started)
+        gauge_add('upstream_in_flight', (upstream,), -1)
+
+
+def start() -> None:
+    """워커 프로세스당 한 번: METRICS_MULTIPROC_DIR에 이 워커의 값을 주기적으로 기록"""
+    global _flusher, _owner_pid
+    if os.getpid() != _owner_pid:
+        # preload로 fork된 워커: arbiter에서 기록한 값을 물려받으면 워커 수만큼 중복 합산되므로 비움
+        with _registry_lock:
+            _shards.clear()
+        _owner_pid = os.getpid()
+        _flusher = None
+    if not MULTIPROC_DIR or (_flusher is not None and _flusher.is_alive()):
+        return
+
+    def run():
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            try:
+                flush()
+            except Exception as e:
+                logger.warning("[metrics] flush failed: %s", e)
+
+    _flusher = threading.Thread(target=run, name='metrics-flush', daemon=True)
+    _flusher.start()
+    atexit.register(flush)
+
+
+def init_app(app) -> None:
+    """Flask 앱에 요청 계측 훅과 /metrics 엔드포인트를 등록"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_started = time.perf_counter()
+        rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g._metrics_labels = (rule, request.method)
+        gauge_add('http_requests_in_flight', g._metrics_labels, 1)
+
+    @app.after_request
+    def _metrics_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return
+        labels = g.pop('_metrics_labels')
+        status = 500 if exc is not None else g.pop('_metrics_status', 500)
+        observe('http_request_duration_seconds', labels, time.perf_counter() - started)
+        inc('http_requests_total', labels + (status,))
+        gauge_add('http_requests_in_flight', labels, -1)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics_endpoint():
+        return Response(render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ---- 수집 (여기서만 문자열 포맷팅) ----
+
+LABEL_NAMES = {
+    'http_request_duration_seconds': ('route', 'method'),
+    'http_requests_total': ('route', 'method', 'status'),
+    'http_requests_in_flight': ('route', 'method'),
+    'upstream_request_duration_seconds': ('upstream', 'operation', 'outcome'),
+    'upstream_in_flight': ('upstream',),
+    'route_pool_in_use': ('pool',),
+    'upstream_breaker_trips_total': ('upstream',),
+    'upstream_rejected_total': ('upstream', 'reason'),
+    'route_pool_rejected_total': ('pool',),
+}
+
+HELP = {
+    'http_request_duration_seconds': 'HTTP request latency by route',
+    'http_requests_total': 'HTTP requests by route and status',
+    'http_requests_in_flight': 'HTTP requests currently being served',
+    'upstream_request_duration_seconds': 'Upstream call latency (yfinance, KIS, Gemini)',
+    'upstream_in_flight': 'Upstream calls currently in progress',
+    'upstream_breaker_trips_total': 'Times the upstream circuit breaker opened',
+    'upstream_rejected_total': 'Upstream calls short-circuited by bulkhead or timeout',
+    'route_pool_in_use': 'Requests running inside a concurrency-limited route pool',
+    'route_pool_rejected_total': 'Requests rejected because the route pool was saturated',
+    'cache_hits_total': 'Cache hits',
+    'cache_misses_total': 'Cache misses',
+    'cache_revalidations_total': 'Background refreshes started for stale entries (stale-while-revalidate)',
+    'cache_entries': 'Entries currently stored in cache',
+    'cache_hit_ratio': 'Cache hit ratio since start',
+}
+
+
+def _fmt_labels(names, values) -> str:
+    pairs = ','.join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return '{' + pairs + '}' if pairs else ''
+
+
+def _merge(kind: str) -> Dict[Tuple[str, tuple], object]:
+    merged: Dict[Tuple[str, tuple], object] = {}
+    for shard in list(_shards.values()):
+        for key, value in list(getattr(shard, kind).items()):
+            if kind == 'histograms':
+                acc = merged.setdefault(key, [0] * len(value))
+                for i, v in enumerate(value):
+                    acc[i] += v
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def snapshot() -> dict:
+    """이 프로세스의 값 (JSON으로 쓸 수 있는 형태). caches: 이름 -> [hits, misses, revalidations, entries]"""
+    from cache import all_caches
+
+    collected = {kind: _merge(kind) for kind in KINDS}
+    collected['caches'] = {c.name: [c.hits, c.misses, getattr(c, 'revalidations', 0), len(c)] for c in all_caches()}
+    return _to_json(collected)
+
+
+def _to_json(collected: dict) -> dict:
+    data = {kind: [[metric, list(labels), value] for (metric, labels), value in collected[kind].items()]
+            for kind in KINDS}
+    data['caches'] = collected['caches']
+    return data
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def flush(data: dict = None) -> None:
+    """이 워커의 값을 METRICS_MULTIPROC_DIR/<pid>.json에 기록 (원자적 교체)"""
+    if not MULTIPROC_DIR:
+        return
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    _write_json(os.path.join(MULTIPROC_DIR, f'{os.getpid()}.json'), data if data is not None else snapshot())
+
+
+def _combine(snapshots) -> dict:
+    """여러 프로세스의 snapshot()을 합산 (라벨은 튜플로 복원)"""
+    combined = {kind: {} for kind in KINDS + ('caches',)}
+    for data in snapshots:
+        for kind in KINDS:
+            merged = combined[kind]
+            for metric, labels, value in data.get(kind, ()):
+                key = (metric, tuple(labels))
+                if kind == 'histograms':
+                    acc = merged.setdefault(key, [0] * len(value))
+                    for i, v in enumerate(value):
+                        acc[i] += v
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        for name, values in data.get('caches', {}).items():
+            acc = combined['caches'].setdefault(name, [0] * len(values))
+            for i, v in enumerate(values):
+                acc[i] += v
+    return combined
+
+
+def _collect() -> dict:
+    local = snapshot()
+    if not MULTIPROC_DIR:
+        return _combine([local])
+    try:
+        flush(local)
+    except OSError as e:
+        logger.warning("[metrics] flush failed: %s", e)
+    own = os.path.join(MULTIPROC_DIR, f'{os.getpid()}.json')
+    others = [_read_json(path) for path in glob.glob(os.path.join(MULTIPROC_DIR, '*.json')) if path != own]
+    return _combine([local] + [data for data in others if data])
+
+
+def mark_process_dead(pid: int) -> None:
+    """종료된 워커의 파일을 archive.json에 합침 (카운터/히스토그램/캐시 적중 수는 유지, 게이지는 버림).
+    arbiter의 child_exit 훅에서 호출"""
+    if not MULTIPROC_DIR:
+        return
+    path = os.path.join(MULTIPROC_DIR, f'{pid}.json')
+    data = _read_json(path)
+    if data is not None:
+        archive_path = os.path.join(MULTIPROC_DIR, ARCHIVE_FILE)
+        data['gauges'] = []
+        data['caches'] = {name: values[:3] + [0] for name, values in data.get('caches', {}).items()}
+        _write_json(archive_path, _to_json(_combine([_read_json(archive_path) or {}, data])))
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def render() -> str:
+    """Prometheus 텍스트 포맷(0.0.4) 문자열 생성 (METRICS_MULTIPROC_DIR이 있으면 모든 워커 합산)"""
+    collected = _collect()
+
+    lines: List[str] = []
+    by_metric: Dict[str, list] = {}
+    for kind in KINDS:
+        for (metric, labels), value in collected[kind].items():
+            by_metric.setdefault(metric, []).append((kind, labels, value))
+
+    for metric in sorted(by_metric):
+        series = by_metric[metric]
+        kind = series[0][0]
+        names = LABEL_NAMES.get(metric, ())
+        prom_type = {'histograms': 'histogram', 'counters': 'counter', 'gauges': 'gauge'}[kind]
+        lines.append(f'# HELP {metric} {HELP.get(metric, metric)}')
+        lines.append(f'# TYPE {metric} {prom_type}')
+        for _, labels, value in sorted(series, key=lambda s: tuple(str(x) for x in s[1])):
+            if kind == 'histograms':
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{metric}_bucket{_fmt_labels(names + ("le",), labels + (le,))} {cumulative}')
+                lines.append(f'{metric}_sum{_fmt_labels(names, labels)} {value[-1]:.6f}')
+                lines.append(f'{metric}_count{_fmt_labels(names, labels)} {cumulative}')
+            else:
+                lines.append(f'{metric}{_fmt_labels(names, labels)} {value}')
+
+    caches = collected['caches']
+    for metric, getter in (
+        ('cache_hits_total', lambda c: c[0]),
+        ('cache_misses_total', lambda c: c[1]),
+        ('cache_revalidations_total', lambda c: c[2]),
+        ('cache_entries', lambda c: c[3]),
+        ('cache_hit_ratio', lambda c: round(c[0] / (c[0] + c[1]), 6) if c[0] + c[1] else 0),
+    ):
+        lines.append(f'# HELP {metric} {HELP[metric]}')
+        lines.append(f'# TYPE {metric} {"counter" if metric.endswith("_total") else "gauge"}')
+        for name, values in caches.items():
+            lines.append(f'{metric}{{cache="{name}"}} {getter(values)}')
+
+    return '\n'.join(lines) + '\n'
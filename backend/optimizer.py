@@ -0,0 +1,228 @@
+"""
+나만의 인덱스(MyIndexPage)용 포트폴리오 최적화
+
+- 공분산: Ledoit-Wolf 수축 추정 (단위행렬 목표), 티커 집합/날짜별 캐시
+- 최소분산 / 최대샤프 / 리스크 패리티 비중과 효율적 투자선
+- 비중 제약: lower <= w <= upper, sum(w) = 1
+
+제약 하의 2차 최적화는 구간 제약 심플렉스 투영을 사용하는
+가속 투영 경사법(FISTA)으로 풀기 때문에 scipy가 필요 없습니다.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache import TTLCache
+from history_store import load_log_returns
+
+TRADING_DAYS_PER_YEAR = 252
+MAX_TICKERS = 30
+DEFAULT_FRONTIER_POINTS = 20
+
+# 같은 날 같은 티커 집합이면 슬라이더 조작 중 재최적화 시 공분산을 다시 계산하지 않음
+covariance_cache = TTLCache('covariance', ttl=6 * 3600, maxsize=512)
+
+
+def ledoit_wolf(returns: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Ledoit-Wolf 수축 공분산과 수축 계수를 반환"""
+    n, p = returns.shape
+    x = returns - returns.mean(axis=0)
+    sample = x.T @ x / n
+    mu = np.trace(sample) / p
+    delta = np.sum((sample - mu * np.eye(p)) ** 2) / p
+    x2 = x ** 2
+    beta = np.sum(x2.T @ x2 / n - sample ** 2) / (p * n)
+    shrinkage = 0.0 if delta == 0 else float(min(beta, delta) / delta)
+    return shrinkage * mu * np.eye(p) + (1 - shrinkage) * sample, shrinkage
+
+
+def get_estimates(tickers: List[str], period: str = '3y') -> Dict:
+    """연율화 기대수익률/수축 공분산 (정렬된 티커 집합 + 날짜 기준 캐시)"""
+    ordered = sorted(set(tickers))
+    key = (tuple(ordered), period, date.today().isoformat())
+    cached = covariance_cache.get(key)
+    if cached is None:
+        returns = load_log_returns(ordered, period)
+        cov, shrinkage = ledoit_wolf(returns.to_numpy(dtype=float))
+        cached = {
+            'tickers': ordered,
+            'mu': returns.mean(axis=0).to_numpy() * TRADING_DAYS_PER_YEAR,
+            'cov': cov * TRADING_DAYS_PER_YEAR,
+            'shrinkage': shrinkage,
+            'observations': len(returns),
+        }
+        covariance_cache.set(key, cached)
+
+    idx = [cached['tickers'].index(t) for t in tickers]
+    return {
+        'mu': cached['mu'][idx],
+        'cov': cached['cov'][np.ix_(idx, idx)],
+        'shrinkage': cached['shrinkage'],
+        'observations': cached['observations'],
+    }
+
+
+def project_bounded_simplex(v: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """{lower <= w <= upper, sum(w) = 1} 위로의 유클리드 투영
+
+    sum(clip(v - tau, lower, upper))는 tau에 대해 구간별 선형인 감소함수이므로
+    꺾이는 점(v - lower, v - upper)에서 값을 구한 뒤 1이 되는 tau를 선형 보간합니다.
+    """
+    breakpoints = np.sort(np.concatenate([v - lower, v - upper]))
+    sums = np.clip(v[None, :] - breakpoints[:, None], lower, upper).sum(axis=1)
+    i = int(np.searchsorted(-sums, -1.0, side='right')) - 1  # sums[i] >= 1 > sums[i + 1]
+    if i < 0:
+        tau = breakpoints[0]
+    elif i >= len(breakpoints) - 1 or sums[i] == sums[i + 1]:
+        tau = breakpoints[i]
+    else:
+        tau = breakpoints[i] + (sums[i] - 1.0) * (breakpoints[i + 1] - breakpoints[i]) / (sums[i] - sums[i + 1])
+    return np.clip(v - tau, lower, upper)
+
+
+def solve_qp(cov: np.ndarray, mu: np.ndarray, risk_aversion: float, lower: np.ndarray, upper: np.ndarray,
+             start: Optional[np.ndarray] = None, step: Optional[float] = None, iters: int = 500) -> np.ndarray:
+    """min w'Σw - w'μ / risk_aversion  (구간 제약 심플렉스 위 FISTA)"""
+    if step is None:
+        step = 1.0 / (2 * np.linalg.eigvalsh(cov)[-1] + 1e-12)
+    tilt = mu / risk_aversion if risk_aversion > 0 else np.zeros_like(mu)
+    w = project_bounded_simplex(start if start is not None else np.full(len(mu), 1 / len(mu)), lower, upper)
+    y, t = w.copy(), 1.0
+    for _ in range(iters):
+        w_next = project_bounded_simplex(y - step * (2 * cov @ y - tilt), lower, upper)
+        if np.max(np.abs(w_next - w)) < 1e-7:
+            return w_next
+        if (y - w_next) @ (w_next - w) > 0:
+            t = 1.0  # 적응형 재시작 (진동 방지)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + (t - 1) / t_next * (w_next - w)
+        w, t = w_next, t_next
+    return w
+
+
+def risk_parity(cov: np.ndarray, lower: np.ndarray, upper: np.ndarray, iters: int = 500) -> np.ndarray:
+    """위험 기여도가 같아지도록 반복 갱신 (제약은 매 단계 투영)"""
+    w = project_bounded_simplex(1 / np.sqrt(np.diag(cov)), lower, upper)
+    for _ in range(iters):
+        contrib = w * (cov @ w)
+        target = contrib.sum() / len(w)
+        w_next = project_bounded_simplex(w * np.sqrt(target / np.maximum(contrib, 1e-16)), lower, upper)
+        if np.max(np.abs(w_next - w)) < 1e-7:
+            return w_next
+        w = w_next
+    return w
+
+
+def portfolio_stats(w: np.ndarray, mu: np.ndarray, cov: np.ndarray, risk_free: float) -> Dict:
+    ret = float(w @ mu)
+    vol = float(np.sqrt(max(w @ cov @ w, 0.0)))
+    return {
+        'expectedReturn': round(ret, 6),
+        'volatility': round(vol, 6),
+        'sharpe': round((ret - risk_free) / vol, 4) if vol > 0 else None,
+    }
+
+
+def _sharpe(w: np.ndarray, mu: np.ndarray, cov: np.ndarray, risk_free: float) -> float:
+    vol = np.sqrt(max(w @ cov @ w, 0.0))
+    return float((w @ mu - risk_free) / vol) if vol > 0 else -np.inf
+
+
+def max_sharpe(cov: np.ndarray, mu: np.ndarray, lower: np.ndarray, upper: np.ndarray, risk_free: float,
+               gammas: np.ndarray, sweep: List[np.ndarray], step: float, tol: float = 1e-4) -> np.ndarray:
+    """접점(최대샤프) 포트폴리오
+
+    투자선 위 샤프 비율은 위험회피계수에 대해 단봉이므로, 스윕에서 가장 좋은 점의 양옆 구간을
+    log(gamma)에 대한 황금분할 탐색으로 좁혀 격자 간격과 무관한 해를 구함
+    """
+    sharpes = [_sharpe(w, mu, cov, risk_free) for w in sweep]
+    i = int(np.argmax(sharpes))
+    best_w, best = sweep[i], sharpes[i]
+    lo = np.log(gammas[min(i + 1, len(gammas) - 1)])
+    hi = np.log(gammas[max(i - 1, 0)])
+    if i == len(gammas) - 1:
+        lo -= np.log(10)  # 격자 끝(최대 수익 쪽)이면 한 자리 더 넓혀 탐색
+
+    def evaluate(x: float) -> float:
+        nonlocal best_w, best
+        w = solve_qp(cov, mu, float(np.exp(x)), lower, upper, start=best_w, step=step)
+        value = _sharpe(w, mu, cov, risk_free)
+        if value > best:
+            best_w, best = w, value
+        return value
+
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = lo, hi
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc, fd = evaluate(c), evaluate(d)
+    while b - a > tol:
+        if fc > fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = evaluate(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = evaluate(d)
+    return best_w
+
+
+def optimize(tickers: List[str], lower: np.ndarray, upper: np.ndarray, period: str = '3y',
+             risk_free: float = 0.03, frontier_points: int = DEFAULT_FRONTIER_POINTS) -> Dict:
+    """최소분산/최대샤프/리스크 패리티 비중과 효율적 투자선을 계산"""
+    est = get_estimates(tickers, period)
+    mu, cov = est['mu'], est['cov']
+
+    def describe(w: np.ndarray) -> Dict:
+        return {
+            'weights': {t: round(float(x), 6) for t, x in zip(tickers, w)},
+            **portfolio_stats(w, mu, cov, risk_free),
+        }
+
+    step = 1.0 / (2 * np.linalg.eigvalsh(cov)[-1] + 1e-12)
+    w_min = solve_qp(cov, mu, 0.0, lower, upper, step=step)
+
+    # 위험회피계수를 크게->작게 스윕하며 warm start로 투자선을 추적
+    gammas = np.geomspace(1e3, 1e-2, max(frontier_points, 2))
+    frontier, sweep, w = [], [], w_min
+    for gamma in gammas:
+        w = solve_qp(cov, mu, gamma, lower, upper, start=w, step=step)
+        stats = portfolio_stats(w, mu, cov, risk_free)
+        if not frontier or abs(stats['volatility'] - frontier[-1]['volatility']) > 1e-6:
+            frontier.append(stats)
+        sweep.append(w)
+
+    return {
+        'tickers': tickers,
+        'minVariance': describe(w_min),
+        'maxSharpe': describe(max_sharpe(cov, mu, lower, upper, risk_free, gammas, sweep, step)),
+        'riskParity': describe(risk_parity(cov, lower, upper)),
+        'frontier': frontier,
+        'shrinkage': round(est['shrinkage'], 4),
+        'observations': est['observations'],
+        'riskFree': risk_free,
+    }
+
+
+def parse_bounds(tickers: List[str], bounds) -> Tuple[np.ndarray, np.ndarray]:
+    """{min, max} 또는 {ticker: [min, max]} 형식의 비중 제약을 배열로 변환"""
+    lower = np.zeros(len(tickers))
+    upper = np.ones(len(tickers))
+    bounds = bounds or {}
+    if not isinstance(bounds, dict):
+        raise ValueError("bounds must be an object: {min, max} or {ticker: [min, max]}")
+    if 'min' in bounds or 'max' in bounds:
+        lower[:] = float(bounds.get('min', 0))
+        upper[:] = float(bounds.get('max', 1))
+    else:
+        for i, t in enumerate(tickers):
+            if t in bounds:
+                pair = bounds[t]
+                if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                    raise ValueError(f"bounds for {t} must be [min, max]")
+                lower[i], upper[i] = float(pair[0]), float(pair[1])
+    if np.any(lower > upper) or lower.sum() > 1 + 1e-9 or upper.sum() < 1 - 1e-9:
+        raise ValueError("Infeasible weight bounds")
+    return lower, upper
@@ -0,0 +1,399 @@
+"""
+ETF 유니버스 전체 종가 패널 (날짜 x 티커 float32 행렬, 메모리 맵 파일)
+
+- 국내 + 해외 ETF 전체 종가를 행렬 하나로 보관하고 티커 -> 열 번호 색인을 함께 둠
+  스캐너 / 최적화 / 시뮬레이션이 요청마다 티커별 히스토리를 다시 모아 행렬을 만들지 않음
+- 파일: PRICE_PANEL_DIR(기본 snapshots/price_panel)에 세대(generation)별로
+  panel-{g}.f32 (capacity x N 종가), panel-{g}.dates (int32, 1970-01-01 기준 일수),
+  panel-{g}.hdr (int64 [행 수, capacity]), 그리고 현재 세대와 티커 목록을 담은 panel.json
+- 읽기: 모든 gunicorn 워커가 같은 파일을 읽기 전용으로 mmap -> 페이지 캐시를 공유하는 zero-copy 뷰
+  panel.json이 바뀌면(새 세대) 다음 접근 때 다시 엶
+- 값: 분할만 반영한 실제 종가 (분배금 조정 없음). 수정종가는 새 분배가 생길 때마다 과거 값 전체가 바뀌므로
+  증분으로 붙인 행과 기준이 섞임. 분배금은 같은 다운로드로 받아 distribution_store에 기록하고
+  재투자 수익률이 필요한 쪽(fund_metrics, history_store)이 읽을 때 곱함
+  새 분할이 보이면 해당 티커 열만 보관 기간 전체를 다시 받아 교체
+- 쓰기: panel.lock을 flock으로 잡은 워커 하나만 yfinance에서 받아 씀 (yfinance bulkhead / 브레이커 안에서)
+  새 일봉은 빈 행에 제자리로 쓰고 나서 행 수를 늘리므로 읽는 쪽은 늘 완성된 행만 봄
+  (같은 날짜 행은 제자리 갱신, 여유 행이 다 차거나 티커 구성이 바뀌면 새 세대로 다시 빌드)
+- 새 티커(처음 빌드 포함)는 갱신마다 PRICE_PANEL_BACKFILL_TICKERS개(기본 200)씩만 보관 기간 전체를 받아 열로 추가하고
+  남은 티커가 있으면 PRICE_PANEL_BACKFILL_SECONDS(기본 60) 뒤 다음 묶음을 받음. 빠진 티커는 받지 않고 열만 버림
+- PRICE_PANEL_REFRESH_SECONDS(기본 3600, 0이면 자동 갱신 끔)마다 갱신, PRICE_PANEL_PERIOD(기본 5y) 보관
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발: 워커가 하나이므로 항상 쓰기 담당
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), 'snapshots', 'price_panel')
+PANEL_DIR = os.getenv('PRICE_PANEL_DIR', DEFAULT_DIR)
+PANEL_PERIOD = os.getenv('PRICE_PANEL_PERIOD', '5y')
+REFRESH_SECONDS = float(os.getenv('PRICE_PANEL_REFRESH_SECONDS', 3600))
+HEADROOM_ROWS = int(os.getenv('PRICE_PANEL_HEADROOM_ROWS', 260))  # 다시 빌드하지 않고 붙일 수 있는 일봉 수
+BACKFILL_TICKERS = int(os.getenv('PRICE_PANEL_BACKFILL_TICKERS', 200))
+BACKFILL_SECONDS = float(os.getenv('PRICE_PANEL_BACKFILL_SECONDS', 60))
+# 패널 값의 기준. 다르면(예전 수정종가 패널) 없는 것으로 보고 다시 채움
+BASIS = 'close'
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+_PERIODS = {'5d': pd.DateOffset(days=5), '1mo': pd.DateOffset(months=1), '3mo': pd.DateOffset(months=3), '6mo': pd.DateOffset(months=6),
+            '1y': pd.DateOffset(years=1), '2y': pd.DateOffset(years=2), '5y': pd.DateOffset(years=5),
+            '10y': pd.DateOffset(years=10)}
+
+
+def period_start(period: str) -> Optional[pd.Timestamp]:
+    """'5y' 같은 yfinance 기간의 시작일 (모르는 기간이면 None)"""
+    offset = _PERIODS.get(period)
+    return None if offset is None else pd.Timestamp.today().normalize() - offset
+
+
+def covering_period(since: pd.Timestamp, longest: str = '10y') -> Optional[str]:
+    """since 이후 일봉을 모두 받을 수 있는 가장 짧은 yfinance 기간 (longest보다 길어야 하면 None -> 전체 다시 받기)
+
+    '5d'는 거래일 5일이지만 달력 5일로 비교하므로 항상 넉넉함
+    """
+    for period in _PERIODS:
+        if period_start(period) <= since:
+            return period
+        if period == longest:
+            break
+    return None
+
+
+def _to_days(index: pd.DatetimeIndex) -> np.ndarray:
+    return (index.values.astype('datetime64[D]') - _EPOCH).astype(np.int32)
+
+
+class _View(NamedTuple):
+    generation: int
+    tickers: List[str]
+    index: Dict[str, int]
+    closes: np.memmap   # capacity x N float32
+    dates: np.memmap    # capacity int32
+    header: np.memmap   # int64 [행 수, capacity]
+
+    @property
+    def rows(self) -> int:
+        return int(self.header[0])
+
+
+class PricePanel:
+    def __init__(self, directory: str = PANEL_DIR):
+        self.directory = directory
+        self.universe: Optional[Callable[[], List[str]]] = None
+        self.last_refresh: Optional[float] = None
+        self.last_result: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.pending = 0  # 아직 받지 않은 새 티커 수
+        self._view: Optional[_View] = None
+        self._meta_mtime: Optional[int] = None
+        self._open_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._writer_file = None
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- 읽기 ----
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _current(self) -> Optional[_View]:
+        try:
+            mtime = os.stat(self._path('panel.json')).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._meta_mtime:
+            with self._open_lock:
+                if mtime != self._meta_mtime:
+                    self._view = self._open('r+' if self.is_writer else 'r')
+                    self._meta_mtime = mtime
+        return self._view
+
+    def _meta(self) -> Dict:
+        try:
+            with open(self._path('panel.json')) as f:
+                return json.load(f)
+        except OSError:
+            return {}
+
+    def _open(self, mode: str) -> Optional[_View]:
+        meta = self._meta()
+        if meta.get('basis') != BASIS:
+            return None
+        generation, tickers = meta['generation'], meta['tickers']
+        header = np.memmap(self._path(f'panel-{generation}.hdr'), dtype=np.int64, mode=mode, shape=(2,))
+        capacity = int(header[1])
+        closes = np.memmap(self._path(f'panel-{generation}.f32'), dtype=np.float32, mode=mode,
+                           shape=(capacity, len(tickers)))
+        dates = np.memmap(self._path(f'panel-{generation}.dates'), dtype=np.int32, mode=mode, shape=(capacity,))
+        return _View(generation, tickers, {t: i for i, t in enumerate(tickers)}, closes, dates, header)
+
+    @property
+    def ready(self) -> bool:
+        view = self._current()
+        return view is not None and view.rows > 0
+
+    @property
+    def tickers(self) -> List[str]:
+        view = self._current()
+        return [] if view is None else view.tickers
+
+    @property
+    def as_of(self) -> Optional[pd.Timestamp]:
+        view = self._current()
+        if view is None or view.rows == 0:
+            return None
+        return pd.Timestamp(_EPOCH + int(view.dates[view.rows - 1]))
+
+    def covers(self, tickers: List[str], start: Optional[pd.Timestamp]) -> bool:
+        """모든 티커가 패널에 있고 start부터의 행이 있는지"""
+        view = self._current()
+        if view is None or view.rows == 0 or start is None:
+            return False
+        first = pd.Timestamp(_EPOCH + int(view.dates[0]))
+        # 주말/휴장일로 시작하는 기간도 첫 거래일이 며칠 늦을 수 있음
+        return first <= start + pd.Timedelta(days=7) and all(t in view.index for t in tickers)
+
+    def closes(self, tickers: Optional[List[str]] = None,
+               start: Optional[pd.Timestamp] = None) -> Tuple[pd.DatetimeIndex, np.ndarray, List[str]]:
+        """(날짜, 종가 행렬, 티커) 반환. tickers가 없으면 전체 열을 복사 없이 mmap 뷰로 반환
+
+        tickers를 주면 해당 열만 복사 (없는 티커는 KeyError).
+        """
+        view = self._current()
+        if view is None:
+            raise LookupError('price panel is not built')
+        rows = view.rows
+        dates = view.dates[:rows]
+        first = 0 if start is None else int(np.searchsorted(dates, _to_days(pd.DatetimeIndex([start]))[0]))
+        block = view.closes[first:rows]
+        if tickers is None:
+            columns = view.tickers
+        else:
+            columns = list(tickers)
+            block = block[:, [view.index[t] for t in columns]]
+        index = pd.DatetimeIndex((_EPOCH + np.asarray(dates[first:rows])).astype('datetime64[ns]'))
+        return index, block, columns
+
+    def frame(self, tickers: Optional[List[str]] = None, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        index, block, columns = self.closes(tickers, start)
+        return pd.DataFrame(block, index=index, columns=columns, copy=False)
+
+    # ---- 쓰기 (panel.lock을 잡은 프로세스만) ----
+
+    @property
+    def is_writer(self) -> bool:
+        return self._writer_file is not None
+
+    def _acquire_writer(self) -> bool:
+        if self._writer_file is not None:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(self._path('panel.lock'), 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        self._writer_file = lock_file
+        with self._open_lock:
+            self._view, self._meta_mtime = None, None  # 쓰기 모드로 다시 열도록
+        logger.info("[panel] this process (pid %d) maintains the price panel", os.getpid())
+        return True
+
+    def build(self, closes: pd.DataFrame) -> None:
+        """전체 종가 행렬로 새 세대 작성 후 panel.json 교체 (이전 세대 파일은 삭제)"""
+        closes = closes.sort_index()
+        closes = closes[~closes.index.duplicated(keep='last')]
+        rows, n_cols = closes.shape
+        capacity = rows + HEADROOM_ROWS
+        previous = self._meta().get('generation')
+        generation = (previous or 0) + 1
+
+        data = np.memmap(self._path(f'panel-{generation}.f32'), dtype=np.float32, mode='w+',
+                         shape=(capacity, n_cols))
+        data[:rows] = closes.to_numpy(dtype=np.float32)
+        data[rows:] = np.nan
+        dates = np.memmap(self._path(f'panel-{generation}.dates'), dtype=np.int32, mode='w+', shape=(capacity,))
+        dates[:rows] = _to_days(pd.DatetimeIndex(closes.index))
+        header = np.memmap(self._path(f'panel-{generation}.hdr'), dtype=np.int64, mode='w+', shape=(2,))
+        header[:] = (rows, capacity)
+        for array in (data, dates, header):
+            array.flush()
+
+        meta = {'generation': generation, 'basis': BASIS, 'tickers': [str(c) for c in closes.columns],
+                'builtAt': time.time()}
+        tmp = self._path(f'panel.json.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path('panel.json'))
+        if previous is not None:
+            # 이미 mmap한 프로세스는 파일이 지워져도 기존 매핑으로 계속 읽을 수 있음
+            for suffix in ('f32', 'dates', 'hdr'):
+                try:
+                    os.remove(self._path(f'panel-{previous}.{suffix}'))
+                except OSError:
+                    pass
+        logger.info("[panel] generation %d: %d days x %d tickers", generation, rows, n_cols)
+
+    def upsert(self, closes: pd.DataFrame) -> int:
+        """최근 일봉을 제자리 반영: 마지막 날짜는 값이 있는 칸만 갱신, 이후 날짜는 빈 행에 추가. 추가한 행 수 반환"""
+        view = self._current()
+        closes = closes.reindex(columns=view.tickers).sort_index()
+        closes = closes[~closes.index.duplicated(keep='last')]
+        rows = view.rows
+        last = int(view.dates[rows - 1]) if rows else -1
+        days = _to_days(pd.DatetimeIndex(closes.index))
+        appended = int((days > last).sum())
+
+        if rows + appended > len(view.dates):
+            # 여유 행이 다 찼으면 보관 기간 밖의 오래된 행을 버리고 새 세대로 다시 빌드
+            merged = closes.combine_first(self.frame())
+            start = period_start(PANEL_PERIOD)
+            self.build(merged if start is None else merged[merged.index >= start])
+            return appended
+
+        for day, values in zip(days, closes.to_numpy(dtype=np.float32)):
+            if day == last:
+                row = view.closes[rows - 1]
+                row[:] = np.where(np.isnan(values), row, values)
+            elif day > last:
+                view.closes[rows] = values
+                view.dates[rows] = day
+                rows += 1
+                view.header[0] = rows  # 행을 다 쓴 뒤에 행 수를 늘려 읽는 쪽이 반쯤 쓴 행을 보지 않게 함
+                last = day
+        for array in (view.closes, view.dates, view.header):
+            array.flush()
+        return appended
+
+    def refresh(self) -> str:
+        """쓰기 담당이면 yfinance에서 받아 증분 갱신 + 새 티커 한 묶음 추가. 결과 문자열 반환"""
+        from distribution_store import distribution_store
+        from scanner import download_closes
+
+        if not self._acquire_writer():
+            return 'not writer'
+        if self.universe is None:
+            return 'no universe'
+        with self._refresh_lock:
+            started = time.perf_counter()
+            tickers = self.universe()
+            view = self._current()
+            recorded = set(distribution_store.distributions().symbols.tolist()) if distribution_store.enabled else None
+            results, refetch = [], []
+            # 마지막 일봉 이후 공백이 보관 기간보다 길면 저장된 행을 버리고 처음부터 다시 채움
+            period = None if view is None or view.rows == 0 else covering_period(self.as_of, PANEL_PERIOD)
+            if period is None:
+                view = None
+            else:
+                stored = [t for t in tickers if t in view.index]
+                closes, dividends, splits = download_closes(stored, period=period, actions=True)
+                if recorded is not None:
+                    # 분배 이력 전체를 아직 받지 않은 티커는 아래에서 보관 기간 전체로 받아 기록
+                    distribution_store.record(dividends[[t for t in dividends.columns if t in recorded]])
+                results.append(f'appended {self.upsert(closes)}')
+                # 분할이 생긴 티커는 저장된 과거 종가의 기준이 달라졌으므로 열 전체를 다시 받음
+                refetch = [t for t in splits.columns if (splits[t] > 0).any()]
+                view = self._current()
+
+            # 분배 이력이 없는 티커는 종가가 있을 때만 다시 받음 (상장폐지 등 값이 없는 열은 계속 다시 받지 않음)
+            has_data = set()
+            if view is not None and recorded is not None:
+                empty = np.isnan(view.closes[:view.rows]).all(axis=0)
+                has_data = {t for t, blank in zip(view.tickers, empty) if not blank}
+            missing = [t for t in tickers if t not in refetch and (
+                view is None or t not in view.index or (recorded is not None and t not in recorded and t in has_data))]
+            batch = (refetch + missing)[:BACKFILL_TICKERS]
+            dropped = view is not None and not set(view.tickers) <= set(tickers)
+            if batch or dropped:
+                base = self.frame() if view is not None else pd.DataFrame()
+                base = base.drop(columns=[t for t in batch if t in base.columns])
+                if batch:
+                    closes, dividends, _ = download_closes(batch, PANEL_PERIOD, actions=True)
+                    distribution_store.record(dividends)
+                    base = pd.concat([base, closes], axis=1)
+                keep = set(base.columns)
+                merged = base.reindex(columns=[t for t in tickers if t in keep])
+                start = period_start(PANEL_PERIOD)
+                self.build(merged if start is None else merged[merged.index >= start])
+                results.append(f'added {len(batch)}')
+            self.pending = len(refetch) + len(missing) - len(batch)
+            if self.pending:
+                results.append(f'{self.pending} pending')
+            result = ', '.join(results) or 'up to date'
+            self.last_refresh = time.time()
+            self.last_result = result
+            self.last_error = None
+            logger.info("[panel] refresh: %s in %.1fs", result, time.perf_counter() - started)
+            return result
+
+    def _refresh_safely(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"[:300]
+            logger.error("[panel] refresh failed: %s", self.last_error)
+
+    def refresh_async(self) -> bool:
+        """쓰기 담당이면 백그라운드 갱신 시작 (False: 다른 워커가 담당 중)"""
+        if not self._acquire_writer():
+            return False
+        if self._thread is not None:
+            self._wake.set()
+        else:
+            threading.Thread(target=self._refresh_safely, name='price-panel-refresh', daemon=True).start()
+        return True
+
+    def wake(self) -> None:
+        """다음 갱신을 바로 실행 (티커 구성이 바뀌었을 때 등)"""
+        self._wake.set()
+
+    def start(self, universe: Callable[[], List[str]], interval: float = REFRESH_SECONDS) -> None:
+        """주기 갱신 스레드 시작 (워커마다 호출, 쓰기는 lock을 잡은 워커 하나만). interval<=0이면 끔"""
+        self.universe = universe
+        if interval <= 0 or self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                self._refresh_safely()
+                self._wake.wait(min(interval, BACKFILL_SECONDS) if self.pending else interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=loop, name='price-panel', daemon=True)
+        self._thread.start()
+
+    def status(self) -> Dict:
+        view = self._current()
+        return {
+            'ready': view is not None and view.rows > 0,
+            'role': 'writer' if self.is_writer else 'reader',
+            'generation': view.generation if view is not None else None,
+            'tickers': len(view.tickers) if view is not None else 0,
+            'rows': view.rows if view is not None else 0,
+            'capacity': len(view.dates) if view is not None else 0,
+            'asOf': self.as_of.strftime('%Y-%m-%d') if view is not None and view.rows else None,
+            'sizeBytes': int(view.closes.nbytes) if view is not None else 0,
+            'pending': self.pending,
+            'lastRefresh': self.last_refresh,
+            'lastResult': self.last_result,
+            'lastError': self.last_error,
+        }
+
+
+panel = PricePanel()
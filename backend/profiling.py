@@ -0,0 +1,266 @@
+"""
+요청 단위 프로파일 캡처와 상시 샘플링 프로파일러 (옵트인)
+
+- PROFILE_ENABLED=true 일 때만 동작 (기본 꺼짐)
+- 요청 헤더 `X-Profile: cprofile|sample` 또는 쿼리 `?__profile=cprofile|sample`로
+  해당 요청 하나의 프로파일을 logs/profiles/ 아래에 저장
+  (`X-Profile-Token` 헤더가 PROFILE_TOKEN과 일치해야 함. PROFILE_TOKEN이 없으면
+  Flask 디버그 모드에서 로컬(127.0.0.1 / ::1) 요청만 허용하고, 운영에서는 모두 거절)
+- PROFILE_SAMPLING=true 이면 백그라운드 스레드가 PROFILE_INTERVAL_MS 간격으로
+  요청 처리 중인 스레드의 스택을 샘플링하여 라우트별 collapsed stack으로 집계
+  (GET /debug/profile/stacks -> flamegraph.pl / speedscope에 바로 넣을 수 있는 텍스트)
+
+cProfile은 한 번에 하나의 요청에서만 켜지고, 샘플러는 대상 스레드를 멈추지 않고
+sys._current_frames()만 읽으므로 gunicorn 워커 하나에 켜 두어도 부담이 작습니다.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), 'logs', 'profiles')
+MODES = ('cprofile', 'sample')
+MAX_STACK_DEPTH = 64
+MAX_DISTINCT_STACKS = 20000
+PER_REQUEST_INTERVAL = 0.005
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def collapse_stack(frame, depth: int = MAX_STACK_DEPTH) -> str:
+    """프레임을 루트->리프 순서의 'a;b;c' 문자열로 변환"""
+    labels = []
+    while frame is not None and len(labels) < depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', text).strip('_') or 'root'
+
+
+class SamplingProfiler:
+    """요청을 처리 중인 스레드의 스택을 주기적으로 읽어 라우트별로 집계"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        # native thread id가 아닌 threading.get_ident() 기준 (sys._current_frames 키와 동일)
+        self.active: Dict[int, str] = {}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def ensure_started(self) -> None:
+        # gunicorn fork 이후 워커마다 한 번 시작 (fork 전 스레드는 자식에 없음)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            if not self.active:
+                continue
+            frames = sys._current_frames()
+            for ident, route in list(self.active.items()):
+                frame = frames.get(ident)
+                if frame is None or ident == me:
+                    continue
+                key = f"{route};{collapse_stack(frame)}"
+                if key in self.stacks or len(self.stacks) < MAX_DISTINCT_STACKS:
+                    self.stacks[key] += 1
+                else:
+                    self.dropped += 1
+                self.samples += 1
+
+    def folded(self, route: Optional[str] = None) -> str:
+        """flamegraph collapsed 형식 ('스택 개수' 줄 단위)"""
+        prefix = f"{route};" if route else ''
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(list(self.stacks.items()))
+                       if stack.startswith(prefix))
+
+    def reset(self) -> None:
+        self.stacks = Counter()
+        self.samples = 0
+        self.dropped = 0
+
+
+class _RequestSampler:
+    """요청 하나를 처리하는 스레드만 짧은 간격으로 샘플링"""
+
+    def __init__(self, ident: int):
+        self.ident = ident
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(PER_REQUEST_INTERVAL):
+            frame = sys._current_frames().get(self.ident)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+
+sampler = SamplingProfiler()
+
+# cProfile은 인터프리터 전역 훅이므로 동시에 하나의 요청만 캡처
+_capture_lock = threading.Lock()
+
+
+LOCAL_ADDRS = ('127.0.0.1', '::1')
+
+
+def authorized(request) -> bool:
+    """토큰이 있으면 토큰 일치, 없으면 디버그 모드의 로컬 요청만 (캡처는 디스크에 쓰므로 외부에 열지 않음).
+    같은 호스트의 nginx 같은 프록시 뒤에서는 외부 요청도 127.0.0.1로 보이므로 운영에서는 토큰이 필수"""
+    from flask import current_app
+
+    token = os.getenv('PROFILE_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token)
+    return current_app.debug and request.remote_addr in LOCAL_ADDRS
+
+
+def requested_mode(request) -> Optional[str]:
+    mode = request.headers.get('X-Profile') or request.args.get('__profile')
+    if not mode:
+        return None
+    mode = mode.strip().lower()
+    mode = 'cprofile' if mode in ('1', 'true', 'yes') else mode
+    if mode not in MODES or not authorized(request):
+        return None
+    return mode
+
+
+def _write_profile(route: str, mode: str, payload: Tuple[str, str]) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    base = os.path.join(PROFILE_DIR, f"{stamp}_{_safe_name(route)}_{os.getpid()}_{mode}")
+    suffix, text = payload
+    path = base + suffix
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def init_app(app) -> None:
+    """PROFILE_ENABLED일 때 요청 훅과 /debug/profile/* 엔드포인트를 등록"""
+    if not _env_bool('PROFILE_ENABLED'):
+        return
+
+    from flask import Response, g, jsonify, request
+
+    sampling = _env_bool('PROFILE_SAMPLING')
+    if not os.getenv('PROFILE_TOKEN'):
+        logger.warning("[profile] PROFILE_TOKEN is not set: profiling is only available to local requests in debug mode")
+    sampler.interval = float(os.getenv('PROFILE_INTERVAL_MS', 10)) / 1000
+
+    @app.before_request
+    def _profile_start():
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        if sampling:
+            sampler.ensure_started()
+            sampler.active[threading.get_ident()] = f"{request.method} {route}"
+
+        mode = requested_mode(request)
+        if mode is None:
+            return
+        if mode == 'cprofile':
+            if not _capture_lock.acquire(blocking=False):
+                logger.info("[profile] cProfile capture busy, skipping %s", route)
+                return
+            profile = cProfile.Profile()
+            profile.enable()
+            g._profile = ('cprofile', route, profile, time.perf_counter())
+        else:
+            request_sampler = _RequestSampler(threading.get_ident())
+            request_sampler.start()
+            g._profile = ('sample', route, request_sampler, time.perf_counter())
+
+    @app.teardown_request
+    def _profile_finish(exc):
+        sampler.active.pop(threading.get_ident(), None)
+        captured = g.pop('_profile', None)
+        if captured is None:
+            return
+        mode, route, profiler, started = captured
+        elapsed = time.perf_counter() - started
+        try:
+            if mode == 'cprofile':
+                profiler.disable()
+                out = io.StringIO()
+                stats = pstats.Stats(profiler, stream=out)
+                stats.sort_stats('cumulative').print_stats(60)
+                path = _write_profile(route, mode, ('.txt', out.getvalue()))
+                stats.dump_stats(path[:-len('.txt')] + '.prof')
+            else:
+                profiler.stop()
+                folded = ''.join(f"{stack} {count}\n" for stack, count in sorted(profiler.stacks.items()))
+                path = _write_profile(route, mode, ('.folded', folded))
+            logger.info("[profile] %s %s %.3fs -> %s", mode, route, elapsed, path)
+        except Exception as e:
+            logger.error("[profile] Failed to write profile for %s: %s", route, e, exc_info=True)
+        finally:
+            if mode == 'cprofile':
+                _capture_lock.release()
+
+    @app.before_request
+    def _profile_guard():
+        if request.path.startswith('/debug/profile/') and not authorized(request):
+            return jsonify({'error': 'Forbidden'}), 403
+
+    @app.route('/debug/profile/stacks', methods=['GET'])
+    def profile_stacks():
+        return Response(sampler.folded(request.args.get('route')), mimetype='text/plain; charset=utf-8')
+
+    @app.route('/debug/profile/status', methods=['GET'])
+    def profile_status():
+        return jsonify({
+            'sampling': sampling,
+            'intervalMs': sampler.interval * 1000,
+            'samples': sampler.samples,
+            'distinctStacks': len(sampler.stacks),
+            'dropped': sampler.dropped,
+            'profileDir': PROFILE_DIR,
+        })
+
+    @app.route('/debug/profile/reset', methods=['POST'])
+    def profile_reset():
+        sampler.reset()
+        return jsonify({'status': 'reset'})
@@ -0,0 +1,172 @@
+"""
+실시간 시세 팬아웃 (KIS 체결가 웹소켓 1개 -> 브라우저 SSE 여러 개)
+
+- 업스트림: 프로세스당 KISRealtimeClient 하나가 모든 구독자의 종목 합집합만 등록
+  (구독자가 추가/제거될 때마다 종목별 참조 수로 합집합을 다시 계산)
+- 구독자별 병합(coalescing): 전달 대기 중인 체결은 종목당 최신 1건만 보관하므로
+  느린 브라우저가 있어도 메모리는 종목 수만큼만 쓰고 중간 체결은 건너뜀
+- 백프레셔: 구독자별로 STREAM_MIN_INTERVAL_MS(기본 250ms)보다 자주 내보내지 않고,
+  STREAM_STALL_SECONDS(기본 30초) 동안 가져가지 않은 구독자는 끊음
+  소켓 쓰기에 STREAM_WRITE_TIMEOUT_SECONDS(기본 10초) 제한을 걸어, 받지 않는 브라우저 때문에
+  쓰기에서 멈춘 워커 스레드도 시간이 지나면 예외로 빠져나와 연결을 정리함
+- 새 구독자에게는 마지막으로 받은 체결을 바로 한 번 보내 빈 화면을 피함
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import metrics
+from kis_api import KISRealtimeClient
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = float(os.getenv('STREAM_MIN_INTERVAL_MS', 250)) / 1000
+STALL_SECONDS = float(os.getenv('STREAM_STALL_SECONDS', 30))
+WRITE_TIMEOUT = float(os.getenv('STREAM_WRITE_TIMEOUT_SECONDS', 10))
+
+
+def limit_write_time(environ: Dict, seconds: float = WRITE_TIMEOUT) -> bool:
+    """WSGI 서버의 클라이언트 소켓에 송신 제한 시간을 설정 (소켓을 알 수 없는 서버면 False)
+
+    close()는 쓰기에서 막힌 스레드를 깨우지 못하므로, 느린 연결은 sendall이 시간 초과로 실패하게 해서
+    응답 제너레이터가 닫히고(구독 해제 + 슬롯 반납) 워커 스레드가 돌아오게 함
+    """
+    sock = environ.get('gunicorn.socket') or environ.get('werkzeug.socket')
+    if sock is None or seconds <= 0:
+        return False
+    try:
+        sock.settimeout(seconds)
+    except OSError:
+        return False
+    return True
+
+
+class Subscriber:
+    """브라우저 연결 하나의 전달 대기열 (종목당 최신 체결 1건)"""
+
+    def __init__(self, tickers: Iterable[str]):
+        self.tickers = frozenset(tickers)
+        self.sent = 0
+        self.coalesced = 0
+        self.closed = False
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._last_flush = 0.0
+        self._last_drain = time.time()
+
+    def offer(self, tick: Dict) -> None:
+        with self._lock:
+            if tick['ticker'] in self._pending:
+                self.coalesced += 1
+            self._pending[tick['ticker']] = tick
+        self._ready.set()
+
+    def stalled(self, now: float) -> bool:
+        return bool(self._pending) and now - self._last_drain > STALL_SECONDS
+
+    def next_batch(self, timeout: float) -> Optional[List[Dict]]:
+        """체결이 오거나 timeout이 지날 때까지 대기. 보낼 체결 목록, 없으면 None (끊겼으면 예외)"""
+        wait = self._last_flush + MIN_INTERVAL - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        if not self._ready.wait(timeout):
+            self._last_drain = time.time()
+            return None
+        if self.closed:
+            raise ConnectionAbortedError('subscriber closed')
+        with self._lock:
+            batch, self._pending = list(self._pending.values()), {}
+            self._ready.clear()
+        self._last_flush = self._last_drain = time.time()
+        self.sent += len(batch)
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+
+class QuoteHub:
+    """종목별 구독자 색인과 업스트림 구독 합집합 관리"""
+
+    def __init__(self):
+        self._by_ticker: Dict[str, set] = {}
+        self._latest: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._client: Optional[KISRealtimeClient] = None
+        self.dropped = 0
+
+    @property
+    def client(self) -> KISRealtimeClient:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = KISRealtimeClient(self.publish)
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        return self.client.available
+
+    def subscribe(self, tickers: Iterable[str]) -> Subscriber:
+        """구독자 등록 (합집합이 KIS 등록 한도를 넘으면 RealtimeSubscriptionLimit)"""
+        subscriber = Subscriber(tickers)
+        with self._lock:
+            union = set(self._by_ticker) | subscriber.tickers
+            self.client.set_tickers(union)
+            for ticker in subscriber.tickers:
+                self._by_ticker.setdefault(ticker, set()).add(subscriber)
+                if ticker in self._latest:
+                    subscriber.offer(self._latest[ticker])
+        metrics.gauge_add('stream_subscribers', ('quotes',), 1)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            for ticker in subscriber.tickers:
+                subscribers = self._by_ticker.get(ticker)
+                if subscribers is None or subscriber not in subscribers:
+                    continue
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._by_ticker[ticker]
+            self.client.set_tickers(set(self._by_ticker))
+        subscriber.close()
+        metrics.gauge_add('stream_subscribers', ('quotes',), -1)
+
+    def publish(self, tick: Dict) -> None:
+        """웹소켓 수신 스레드에서 호출: 해당 종목 구독자들의 대기열에 넣기"""
+        now = time.time()
+        with self._lock:
+            self._latest[tick['ticker']] = tick
+            subscribers = list(self._by_ticker.get(tick['ticker'], ()))
+        for subscriber in subscribers:
+            if subscriber.closed:
+                continue
+            if subscriber.stalled(now):
+                # 30초 넘게 가져가지 않는 연결은 끊어서 워커 스레드를 돌려받음
+                logger.info("[stream] dropping stalled subscriber (%s)", ','.join(sorted(subscriber.tickers)))
+                self.dropped += 1
+                metrics.inc('stream_dropped_total', ('quotes',))
+                subscriber.close()
+                continue
+            subscriber.offer(tick)
+
+    def status(self) -> Dict:
+        with self._lock:
+            tickers = {ticker: len(subs) for ticker, subs in self._by_ticker.items()}
+            subscribers = len({s for subs in self._by_ticker.values() for s in subs})
+        return {
+            'subscribers': subscribers,
+            'tickers': tickers,
+            'dropped': self.dropped,
+            'upstream': self.client.status(),
+        }
+
+
+hub = QuoteHub()
@@ -0,0 +1,120 @@
+"""
+여러 종목 현재가 일괄 조회 (대시보드 관심종목 전체를 요청 한 번으로)
+
+- 국내 6자리 코드: KIS 관심종목(멀티종목) 시세로 30종목씩 조회 (KoreaInvestmentAPI.get_prices)
+  KIS 키가 없거나 Mock 모드, 또는 KIS에서 받지 못한 종목은 yfinance(.KS)로 조회
+- 그 외(.KS/.KQ, 해외): yf.download 한 번으로 최근 5일 일봉을 받아 현재가/전일 대비 계산
+- 종목별 캐시 QUOTE_TTL초(기본 15초): 캐시에 없는 종목만 업스트림으로 보내고,
+  업스트림이 실패하면 만료된 값이라도 남아 있으면 그대로 반환
+"""
+
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from warmup import yf
+
+import kis_api
+import resilience
+from cache import TTLCache
+from history_store import to_yf_ticker
+from upstream_config import yf_download_kwargs
+
+logger = logging.getLogger(__name__)
+
+QUOTE_TTL = float(os.getenv('QUOTE_TTL', 15))
+
+# 값: (조회 시각, 시세). 만료된 값도 폴백용으로 남겨 두므로 maxsize로만 정리됨
+quote_cache = TTLCache('quotes', ttl=QUOTE_TTL, maxsize=4096)
+
+
+def _is_domestic_code(ticker: str) -> bool:
+    return ticker.isdigit() and len(ticker) == 6
+
+
+def _yf_quotes(tickers: List[str]) -> Dict[str, Dict]:
+    """yf.download 한 번으로 여러 종목의 최근 일봉을 받아 시세 형식으로 변환"""
+    symbols = {to_yf_ticker(t): t for t in tickers}
+    data = resilience.call('yfinance', 'download', yf.download, list(symbols), period='5d', interval='1d',
+                           progress=False, threads=True, auto_adjust=False, **yf_download_kwargs())
+    if data is None or data.empty:
+        return {}
+
+    def column(field: str) -> pd.DataFrame:
+        frame = data[field]
+        return frame.to_frame(next(iter(symbols))) if isinstance(frame, pd.Series) else frame
+
+    close, open_, high, low, volume = (column(f) for f in ('Close', 'Open', 'High', 'Low', 'Volume'))
+    quotes = {}
+    for symbol, ticker in symbols.items():
+        if symbol not in close:
+            continue
+        closes = close[symbol].dropna()
+        if closes.empty:
+            continue
+        last = closes.index[-1]
+        price = round(float(closes.iloc[-1]), 4)
+        prev = round(float(closes.iloc[-2]), 4) if len(closes) > 1 else price
+        quotes[ticker] = {
+            'ticker': ticker,
+            'name': None,
+            'currentPrice': price,
+            'changePrice': round(price - prev, 4),
+            'changeRate': round((price / prev - 1) * 100, 2) if prev else 0.0,
+            'volume': int(volume[symbol].get(last, 0) or 0),
+            'tradingValue': None,
+            'high': round(float(high[symbol].get(last, price)), 4),
+            'low': round(float(low[symbol].get(last, price)), 4),
+            'open': round(float(open_[symbol].get(last, price)), 4),
+            'previousClose': prev,
+        }
+    return quotes
+
+
+def _fetch(tickers: List[str]) -> Dict[str, Dict]:
+    quotes = {}
+    domestic = [t for t in tickers if _is_domestic_code(t)]
+    client = kis_api.get_client()
+    if domestic and not client.mock_mode and client.api_available:
+        for ticker, quote in client.get_prices(domestic).items():
+            if not quote.get('isMock'):
+                quotes[ticker] = {**quote, 'source': 'kis'}
+
+    rest = [t for t in tickers if t not in quotes]
+    if rest:
+        try:
+            for ticker, quote in _yf_quotes(rest).items():
+                quotes[ticker] = {**quote, 'source': 'yfinance'}
+        except Exception as e:
+            logger.warning("[quotes] yfinance batch quote failed for %d tickers: %s", len(rest), e)
+    return quotes
+
+
+def get_quotes(tickers: List[str]) -> Dict[str, Tuple[Dict, float]]:
+    """종목별 (시세, 조회 후 경과 초). 조회하지 못한 종목은 결과에서 빠짐"""
+    result = {}
+    missing = []
+    now = time.time()
+    for ticker in tickers:
+        entry = quote_cache.get(ticker)
+        if entry is None:
+            missing.append(ticker)
+        else:
+            result[ticker] = (entry[1], now - entry[0])
+    if not missing:
+        return result
+
+    fetched = _fetch(missing)
+    now = time.time()
+    for ticker in missing:
+        quote = fetched.get(ticker)
+        if quote is not None:
+            quote_cache.set(ticker, (now, quote))
+            result[ticker] = (quote, 0.0)
+            continue
+        stale = quote_cache.get_stale(ticker)
+        if stale is not None:
+            result[ticker] = (stale[1], now - stale[0])
+    return result
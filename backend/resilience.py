@@ -0,0 +1,246 @@
+"""
+업스트림(yfinance / KIS / Gemini)별 bulkhead + 타임아웃 + 서킷 브레이커
+
+- bulkhead: 업스트림마다 전용 스레드 풀과 동시 호출 상한 (<NAME>_MAX_CONCURRENCY)
+  상한에 걸리면 BULKHEAD_WAIT초만 기다리고 포기 -> 요청 스레드가 묶이지 않음
+- 타임아웃: <NAME>_TIMEOUT초 안에 응답이 없으면 요청은 포기하고 바로 반환
+  (늦게 끝나는 호출은 풀 안에서 마저 끝나며 그동안 슬롯을 차지하므로 폭주가 제한됨)
+- 서킷 브레이커: 최근 BREAKER_WINDOW_SECONDS초 동안 실패가 BREAKER_FAILURE_THRESHOLD회 이상이고
+  실패율이 BREAKER_FAILURE_RATIO 이상이면 open (즉시 실패),
+  BREAKER_RESET_SECONDS 후 half-open에서 한 번만 시험 호출 -> 성공 시 close, 실패 시 다시 open
+- 폴백: call_with_fallback()은 성공 결과를 마지막 정상값으로 보관했다가
+  브레이커가 열렸거나 호출이 실패하면 그 값을 stale 표시와 함께 반환
+
+상태는 GET /api/upstreams/status 에서 확인합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from cache import TTLCache
+from metrics import inc, upstream_timer
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# (timeout 초, 동시 호출 상한)
+DEFAULTS = {
+    'yfinance': (10.0, 8),
+    'kis': (5.0, 4),
+    'gemini': (30.0, 4),
+}
+
+# 동시 호출 상한에 걸렸을 때 슬롯을 기다리는 최대 시간
+BULKHEAD_WAIT = float(os.getenv('BULKHEAD_WAIT', 0.5))
+
+# 브레이커가 열렸을 때 돌려줄 마지막 정상 응답 (원래 TTL과 무관하게 하루 보관)
+last_good = TTLCache('last_good', ttl=24 * 3600, maxsize=2048)
+
+
+class UpstreamUnavailable(Exception):
+    """브레이커 open / bulkhead 포화 / 타임아웃으로 호출하지 않았거나 포기함"""
+
+    def __init__(self, upstream: str, reason: str):
+        super().__init__(f"{upstream} unavailable: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+
+
+def is_data_error(exc: BaseException) -> bool:
+    """업스트림 장애가 아닌 '데이터 없음' 류 예외 (브레이커 실패로 세지 않음)"""
+    # 없는 심볼에 대한 HTTP 404 (Yahoo quoteSummary "Quote not found" 등)
+    if getattr(getattr(exc, 'response', None), 'status_code', None) == 404:
+        return True
+    if not type(exc).__module__.startswith('yfinance'):
+        return False
+    from yfinance.exceptions import YFDataException, YFInvalidPeriodError, YFTickerMissingError
+
+    if isinstance(exc, (YFTickerMissingError, YFInvalidPeriodError)):
+        return True
+    # "No Fund data found" 등은 데이터 없음, "YAHOO! FINANCE IS CURRENTLY DOWN"은 장애
+    return isinstance(exc, YFDataException) and 'DOWN' not in str(exc)
+
+
+class Upstream:
+    """업스트림 하나의 브레이커 상태와 전용 풀"""
+
+    def __init__(self, name: str, timeout: float, max_concurrency: int,
+                 failure_threshold: int, failure_ratio: float, window_seconds: float, reset_seconds: float):
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.failure_threshold = max(1, failure_threshold)
+        self.failure_ratio = failure_ratio
+        self.window_seconds = window_seconds
+        self.reset_seconds = reset_seconds
+
+        self.state = CLOSED
+        self.failures = 0
+        self._outcomes: deque = deque()  # (시각, 실패 여부) - 최근 window_seconds초
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.in_flight = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix=f"upstream-{name}")
+
+    # ---- 브레이커 ----
+
+    def _admit(self) -> bool:
+        """이번 호출을 보내도 되는지 (half-open이면 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+                logger.info("[breaker] %s half-open, probing", self.name)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def _record(self, failed: bool, now: float) -> None:
+        self._outcomes.append((now, failed))
+        self.failures += failed
+        while self._outcomes[0][0] < now - self.window_seconds:
+            self.failures -= self._outcomes.popleft()[1]
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._probing = False
+            if self.state == OPEN:
+                # open 이전에 나간 호출이 늦게 성공한 경우는 무시하고 half-open 시험을 기다림
+                return
+            if self.state == HALF_OPEN:
+                logger.info("[breaker] %s closed after successful probe", self.name)
+                self.state = CLOSED
+                self._outcomes.clear()
+                self.failures = 0
+            self._record(False, time.time())
+
+    def _record_failure(self, exc: BaseException) -> None:
+        with self._lock:
+            now = time.time()
+            self._record(True, now)
+            self.last_error = f"{type(exc).__name__}: {exc}"[:300]
+            self._probing = False
+            tripped = (self.failures >= self.failure_threshold
+                       and self.failures >= self.failure_ratio * len(self._outcomes))
+            if self.state == HALF_OPEN or (self.state == CLOSED and tripped):
+                logger.warning("[breaker] %s opened (%s/%s recent calls failed): %s",
+                               self.name, self.failures, len(self._outcomes), self.last_error)
+                inc('upstream_breaker_trips_total', (self.name,))
+                self.state = OPEN
+                self.opened_at = now
+
+    # ---- 호출 ----
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def call(self, operation: str, fn: Callable, *args, call_timeout: Optional[float] = None, **kwargs) -> Any:
+        if not self._admit():
+            raise UpstreamUnavailable(self.name, 'circuit open')
+        if not self._slots.acquire(timeout=BULKHEAD_WAIT):
+            with self._lock:
+                self.rejected += 1
+                self._probing = False
+            inc('upstream_rejected_total', (self.name, 'bulkhead'))
+            raise UpstreamUnavailable(self.name, 'bulkhead full')
+        with self._lock:
+            self.in_flight += 1
+
+        def run():
+            with upstream_timer(self.name, operation):
+                return fn(*args, **kwargs)
+
+        timeout = self.timeout if call_timeout is None else call_timeout
+        future = self._pool.submit(run)
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            error = UpstreamUnavailable(self.name, f"timeout after {timeout}s")
+            inc('upstream_rejected_total', (self.name, 'timeout'))
+            self._record_failure(error)
+            raise error from None
+        except Exception as e:
+            if is_data_error(e):
+                self._record_success()
+            else:
+                self._record_failure(e)
+            raise
+        self._record_success()
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_seconds - (time.time() - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'recentFailures': self.failures,
+                'recentCalls': len(self._outcomes),
+                'lastError': self.last_error,
+                'retryInSeconds': retry_in,
+                'inFlight': self.in_flight,
+                'maxConcurrency': self.max_concurrency,
+                'rejected': self.rejected,
+                'timeoutSeconds': self.timeout,
+            }
+
+
+def _build(name: str) -> Upstream:
+    timeout, concurrency = DEFAULTS[name]
+    prefix = name.upper()
+    return Upstream(
+        name,
+        timeout=float(os.getenv(f'{prefix}_TIMEOUT', timeout)),
+        max_concurrency=int(os.getenv(f'{prefix}_MAX_CONCURRENCY', concurrency)),
+        failure_threshold=int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5)),
+        failure_ratio=float(os.getenv('BREAKER_FAILURE_RATIO', 0.5)),
+        window_seconds=float(os.getenv('BREAKER_WINDOW_SECONDS', 60)),
+        reset_seconds=float(os.getenv('BREAKER_RESET_SECONDS', 30)),
+    )
+
+
+upstreams: Dict[str, Upstream] = {name: _build(name) for name in DEFAULTS}
+
+
+def call(upstream: str, operation: str, fn: Callable, *args, **kwargs) -> Any:
+    """업스트림 호출을 bulkhead/타임아웃/브레이커 안에서 실행"""
+    return upstreams[upstream].call(operation, fn, *args, **kwargs)
+
+
+def call_with_fallback(upstream: str, operation: str, key: Hashable, fn: Callable,
+                       *args, **kwargs) -> Tuple[Any, bool]:
+    """call()과 같으나 실패 시 마지막 정상값으로 대체. (값, stale 여부) 반환"""
+    cache_key = (upstream, operation, key)
+    try:
+        value = call(upstream, operation, fn, *args, **kwargs)
+    except Exception as e:
+        # None도 정상값일 수 있으므로 1-튜플로 감싸서 보관
+        stale = last_good.get(cache_key)
+        if stale is None or is_data_error(e):
+            raise
+        logger.warning("[breaker] %s %s %s failed (%s), serving last good value", upstream, operation, key, e)
+        return stale[0], True
+    last_good.set(cache_key, (value,))
+    return value, False
+
+
+def status() -> Dict[str, Dict[str, Any]]:
+    return {name: u.status() for name, u in upstreams.items()}
@@ -0,0 +1,244 @@
+"""
+ETF 유니버스 전략 신호 스캐너
+
+국내 + 해외 ETF 전체 종가를 (날짜 x 티커) 2차원 행렬 하나로 다루며,
+신호 계산은 모두 열 방향 벡터 연산으로 처리합니다.
+전체 히스토리로 한 번 build()한 뒤에는 새 일봉이 들어올 때
+append_bar()로 최근 윈도우 상태만 갱신합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from warmup import yf
+
+import resilience
+from history_store import to_yf_ticker
+from price_panel import covering_period, panel, period_start
+from upstream_config import yf_download_kwargs
+
+logger = logging.getLogger(__name__)
+
+FAST_WINDOW = 50
+SLOW_WINDOW = 200
+BREAKOUT_WINDOW = 252  # 52주
+
+RULES = ('golden_cross', 'dead_cross', 'breakout_52w', 'breakdown_52w')
+
+DOWNLOAD_CHUNK = 200
+# 묶음(200개) 하나를 받는 데 걸리는 시간 상한 (티커별 조회 타임아웃보다 길게)
+DOWNLOAD_TIMEOUT = float(os.getenv('YFINANCE_DOWNLOAD_TIMEOUT', 120))
+
+
+def universe_tickers(korean_df: pd.DataFrame, overseas_df: pd.DataFrame) -> List[str]:
+    """국내/해외 ETF 마스터 데이터에서 yfinance 티커 목록을 만듭니다 (중복 제거, 순서 유지)"""
+    tickers = []
+    for df in (korean_df, overseas_df):
+        if df is None or df.empty or 'Ticker/Code' not in df.columns:
+            continue
+        tickers.extend(to_yf_ticker(t) for t in df['Ticker/Code'].dropna() if str(t).strip() and str(t) != 'nan')
+    return list(dict.fromkeys(tickers))
+
+
+def download_closes(tickers: List[str], period: str = '2y', actions: bool = False):
+    """yfinance 일괄 다운로드로 (날짜 x 티커) 종가 행렬을 구성
+
+    종가는 분할만 반영한 실제 종가 (분배금 조정 없음 -> 이미 저장한 행과 새로 받은 행의 기준이 같음)
+    actions=True면 같은 요청으로 받은 분배금 / 주식 분할 행렬(0 = 없음)도 함께 (종가, 분배금, 분할)로 반환
+    (분배금 / 분할 행렬에는 종가를 받은 티커 열만 있음)
+    묶음마다 yfinance bulkhead / 브레이커 안에서 호출 (DOWNLOAD_TIMEOUT초)
+    """
+    frames, payouts, splits = [], [], []
+    for i in range(0, len(tickers), DOWNLOAD_CHUNK):
+        chunk = tickers[i:i + DOWNLOAD_CHUNK]
+        data = resilience.call('yfinance', 'download', yf.download, chunk, period=period, interval='1d',
+                               progress=False, threads=True, auto_adjust=False, actions=actions,
+                               call_timeout=DOWNLOAD_TIMEOUT, **yf_download_kwargs())
+        if data is None or data.empty:
+            continue
+        frames.append(_field(data, 'Close', chunk))
+        if actions:
+            payouts.append(_field(data, 'Dividends', chunk))
+            splits.append(_field(data, 'Stock Splits', chunk))
+    closes = _combine(frames, tickers)
+    if not actions:
+        return closes
+    # 종가를 하나도 받지 못한 티커(빈 묶음 / 조회 실패)는 분배 이력을 '받음(분배 없음)'으로 기록하지 않도록 뺌
+    fetched = closes.columns[closes.notna().any()]
+    return closes, _combine(payouts, tickers)[fetched].fillna(0.0), _combine(splits, tickers)[fetched].fillna(0.0)
+
+
+def _field(data: pd.DataFrame, column: str, chunk: List[str]) -> pd.DataFrame:
+    if column not in data.columns.get_level_values(0):
+        return pd.DataFrame(index=data.index)  # 분배/분할 이력이 하나도 없는 묶음
+    values = data[column]
+    return values.to_frame(chunk[0]) if isinstance(values, pd.Series) else values
+
+
+def _combine(frames: List[pd.DataFrame], tickers: List[str]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame(columns=tickers)
+    combined = pd.concat(frames, axis=1)
+    combined.index = pd.to_datetime(combined.index).tz_localize(None).normalize()
+    return combined.reindex(columns=tickers)
+
+
+class UniverseScanner:
+    """유니버스 전체에 대한 골든크로스/52주 돌파 신호 스캐너"""
+
+    def __init__(self, fast: int = FAST_WINDOW, slow: int = SLOW_WINDOW, breakout: int = BREAKOUT_WINDOW):
+        self.fast = fast
+        self.slow = slow
+        self.breakout = breakout
+        self.depth = max(slow, breakout) + 1
+
+        self.tickers: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.as_of: Optional[pd.Timestamp] = None
+        self.window: Optional[np.ndarray] = None  # 최근 depth개 종가 (depth x N)
+        self.signals: Dict[str, np.ndarray] = {}
+        self.built_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.window is not None
+
+    def build(self, closes: pd.DataFrame) -> None:
+        """전체 히스토리 행렬로부터 상태와 최신 신호를 계산"""
+        closes = closes.sort_index().ffill()
+        prices = closes.to_numpy(dtype=np.float64)
+        n_rows, n_cols = prices.shape
+
+        # 앞쪽을 NaN으로 채워 depth 행을 보장
+        if n_rows < self.depth:
+            pad = np.full((self.depth - n_rows, n_cols), np.nan)
+            prices = np.vstack([pad, prices])
+
+        fast_ma = self._rolling_mean_2d(prices, self.fast)
+        slow_ma = self._rolling_mean_2d(prices, self.slow)
+
+        with self.lock:
+            self.tickers = [str(c) for c in closes.columns]
+            self.index = {t: i for i, t in enumerate(self.tickers)}
+            self.as_of = closes.index[-1] if len(closes.index) else None
+            self.window = prices[-self.depth:].copy()
+            self.signals = self._signals(self.window, fast_ma[-2], slow_ma[-2], fast_ma[-1], slow_ma[-1])
+            self.built_at = time.time()
+
+    def append_bar(self, date, closes: pd.Series) -> bool:
+        """새 일봉 하나를 반영 (전체 히스토리 재계산 없이 윈도우 상태만 갱신). 새 행을 추가했으면 True
+
+        마지막 일봉과 같은 날짜면 값이 있는 칸만 덮어씀 (장중에 받은 종가를 이후 갱신의 확정 종가로 교체)
+        """
+        date = pd.Timestamp(date).normalize()
+        with self.lock:
+            if self.window is None or (self.as_of is not None and date < self.as_of):
+                return False
+
+            new = closes.reindex(self.tickers).to_numpy(dtype=np.float64)
+            replace = self.as_of is not None and date == self.as_of
+            if replace:
+                self.window[-1] = np.where(np.isnan(new), self.window[-1], new)
+            else:
+                new = np.where(np.isnan(new), self.window[-1], new)  # 휴장 종목은 직전 종가 유지
+                self.window = np.vstack([self.window[1:], new])
+
+            # 직전 이동평균은 마지막 행을 뺀 윈도우에서 (depth > slow이므로 항상 계산 가능)
+            prev_fast = self._tail_mean(self.window[:-1], self.fast)
+            prev_slow = self._tail_mean(self.window[:-1], self.slow)
+            cur_fast = self._tail_mean(self.window, self.fast)
+            cur_slow = self._tail_mean(self.window, self.slow)
+
+            self.signals = self._signals(self.window, prev_fast, prev_slow, cur_fast, cur_slow)
+            self.as_of = date
+            return not replace
+
+    def scan(self, rules: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """규칙별로 최신 일봉에서 신호가 발생한 티커 목록 반환"""
+        rules = rules or list(RULES)
+        tickers = np.asarray(self.tickers, dtype=object)
+        return {rule: tickers[self.signals[rule]].tolist() for rule in rules if rule in self.signals}
+
+    def _signals(self, window: np.ndarray, prev_fast, prev_slow, cur_fast, cur_slow) -> Dict[str, np.ndarray]:
+        close = window[-1]
+        prior = window[-(self.breakout + 1):-1]
+        with np.errstate(invalid='ignore'):
+            valid = ~np.isnan(prior).any(axis=0)
+            prior_high = np.where(valid, np.max(np.nan_to_num(prior, nan=-np.inf), axis=0), np.nan)
+            prior_low = np.where(valid, np.min(np.nan_to_num(prior, nan=np.inf), axis=0), np.nan)
+            return {
+                'golden_cross': (prev_fast <= prev_slow) & (cur_fast > cur_slow),
+                'dead_cross': (prev_fast >= prev_slow) & (cur_fast < cur_slow),
+                'breakout_52w': close > prior_high,
+                'breakdown_52w': close < prior_low,
+            }
+
+    @staticmethod
+    def _rolling_mean_2d(prices: np.ndarray, window: int) -> np.ndarray:
+        """열별 누적합 기반 이동평균 (윈도우에 NaN이 있으면 NaN)"""
+        valid = ~np.isnan(prices)
+        csum = np.cumsum(np.where(valid, prices, 0.0), axis=0)
+        ccnt = np.cumsum(valid, axis=0)
+        csum = np.vstack([np.zeros((1, prices.shape[1])), csum])
+        ccnt = np.vstack([np.zeros((1, prices.shape[1]), dtype=ccnt.dtype), ccnt])
+        out = np.full(prices.shape, np.nan)
+        sums = csum[window:] - csum[:-window]
+        counts = ccnt[window:] - ccnt[:-window]
+        out[window - 1:] = np.where(counts == window, sums / window, np.nan)
+        return out
+
+    @staticmethod
+    def _tail_mean(window: np.ndarray, n: int) -> np.ndarray:
+        tail = window[-n:]
+        return tail.sum(axis=0) / n  # NaN이 포함된 열은 NaN
+
+
+universe_scanner = UniverseScanner()
+_refresh_lock = threading.Lock()
+
+
+def refresh_universe(tickers: List[str], period: str = '2y') -> None:
+    """스캐너가 비어 있으면 전체 빌드, 이미 있으면 최근 일봉만 받아 증분 갱신
+
+    공유 종가 패널(price_panel)에 필요한 티커와 기간이 모두 있으면 다운로드 없이 패널에서 읽음
+    """
+    if not _refresh_lock.acquire(blocking=False):
+        return  # 이미 갱신 중
+    try:
+        started = time.perf_counter()
+        start = period_start(period)
+        if panel.covers(tickers, start):
+            closes = panel.frame(tickers, start)
+            if not universe_scanner.ready or universe_scanner.tickers != tickers:
+                universe_scanner.build(closes)
+                logger.info("[SCAN] 패널에서 유니버스 빌드: %s개 티커, %.2fs", len(tickers), time.perf_counter() - started)
+                return
+            appended = sum(universe_scanner.append_bar(date, row)
+                           for date, row in closes[closes.index >= universe_scanner.as_of].iterrows())
+            logger.info("[SCAN] 패널에서 증분 갱신: %s개 일봉 추가", appended)
+            return
+
+        # 마지막 일봉 이후 공백을 모두 덮는 기간으로 받고, 스캔 기간보다 길게 비었으면 다시 빌드
+        since = universe_scanner.as_of if universe_scanner.ready else None
+        recent_period = None if since is None else covering_period(since, period)
+        if recent_period is None or universe_scanner.tickers != tickers:
+            universe_scanner.build(download_closes(tickers, period))
+            logger.info("[SCAN] 유니버스 빌드 완료: %s개 티커, %.1fs", len(tickers), time.perf_counter() - started)
+            return
+
+        recent = download_closes(tickers, period=recent_period)
+        appended = 0
+        for date, row in recent.iterrows():
+            if universe_scanner.append_bar(date, row):
+                appended += 1
+        logger.info("[SCAN] 증분 갱신: %s개 일봉 추가, %.1fs", appended, time.perf_counter() - started)
+    except Exception as e:
+        logger.error("[ERROR] 유니버스 갱신 실패: %s", e)
+    finally:
+        _refresh_lock.release()
@@ -0,0 +1,159 @@
+"""
+투자 계획 몬테카를로 시뮬레이터
+
+포트폴리오 구성 ETF들의 과거 일간 수익률로부터 월간 수익률을
+(1) 과거 구간 부트스트랩 또는 (2) 공분산 기반 다변량 정규분포로 뽑아
+수만 개의 자산 경로를 NumPy 벡터 연산으로 한 번에 계산합니다.
+경로는 입력 크기로만 정해지는 청크로 나누어 계산하므로 시드가 같으면
+워커(프로세스) 수와 무관하게 같은 결과가 나옵니다.
+
+- 청크 하나의 중간 배열은 CHUNK_ELEMENTS(경로 x 개월 x 자산) 이하로 유지
+  부트스트랩은 표본 구간별 포트폴리오 수익률을 미리 구해 자산 수와 무관하게 (경로 x 개월)만 씀
+- 프로세스 풀은 SIMULATION_WORKERS(기본 1 = 요청 스레드에서 계산)로 서버가 상한을 정하고,
+  스레드가 도는 gunicorn 워커에서 fork하지 않도록 forkserver/spawn 컨텍스트 풀 하나를 모듈에서 공유
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_MONTH = 21
+CHUNK_PATHS = 5000
+CHUNK_ELEMENTS = 4_000_000     # 청크당 float64 중간 배열 약 32MB
+MIN_PATHS = 1000
+MAX_PATHS = 100000
+MAX_PATH_MONTHS = 24_000_000   # 경로 x 개월 상한 (결과 기록 배열과 전체 계산량 제한)
+MAX_ASSETS = 20
+MAX_YEARS = 40
+MAX_WORKERS = max(int(os.getenv('SIMULATION_WORKERS', 1)), 1)
+MAX_BAND_POINTS = 120
+PERCENTILES = (5, 25, 50, 75, 95)
+MODELS = ('bootstrap', 'normal')
+
+
+def monthly_blocks(daily_log_returns: np.ndarray) -> np.ndarray:
+    """겹치는 21거래일 구간의 누적 로그수익률 (부트스트랩 표본)"""
+    csum = np.vstack([np.zeros((1, daily_log_returns.shape[1])), np.cumsum(daily_log_returns, axis=0)])
+    return csum[TRADING_DAYS_PER_MONTH:] - csum[:-TRADING_DAYS_PER_MONTH]
+
+
+def contribution_schedule(plan: Dict, months: int) -> np.ndarray:
+    """투자 계획을 월별 납입액 배열로 변환 (index 0 = 시작 시점)
+
+    적립식 납입은 dcaYears 동안만 (없으면 전체 기간), 이후에는 납입 없이 years까지 운용
+    """
+    schedule = np.zeros(months)
+    seed = float(plan.get('totalSeed') or 0)
+    if plan.get('method') == 'dca':
+        amount = float(plan.get('dcaAmount') or 0)
+        interval_days = max(float(plan.get('dcaIntervalDays') or 30), 1.0)
+        dca_years = float(plan.get('dcaYears') or 0)
+        dca_months = min(max(int(round(dca_years * 12)), 1), months) if dca_years > 0 else months
+        schedule[:dca_months] = amount * (365.25 / 12) / interval_days
+    schedule[0] += seed
+    return schedule
+
+
+def chunk_paths(months: int, n_assets: int, model: str) -> int:
+    """청크당 경로 수 (중간 배열이 CHUNK_ELEMENTS를 넘지 않게, 입력 크기로만 정해짐)"""
+    width = months if model == 'bootstrap' else months * n_assets
+    return int(min(CHUNK_PATHS, max(1, CHUNK_ELEMENTS // width)))
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """워커 프로세스 풀 (처음 쓸 때 한 번 생성, 프로세스 안에서 공유)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=context)
+        return _pool
+
+
+def _simulate_chunk(args) -> np.ndarray:
+    """경로 청크 하나를 계산하여 (paths x 기록 시점) 자산 가치를 반환"""
+    (seed_seq, n_paths, model, weights, mu, chol, block_returns, contributions, record_idx) = args
+    rng = np.random.default_rng(seed_seq)
+    months = len(contributions)
+
+    # 월 단위 리밸런싱 가정: 포트폴리오 단순수익률 = sum(w * (exp(r) - 1))
+    if model == 'bootstrap':
+        picks = rng.integers(0, len(block_returns), size=(n_paths, months))
+        growth = 1.0 + block_returns[picks]  # 구간별 포트폴리오 수익률을 그대로 뽑음 (paths, months)
+    else:
+        z = rng.standard_normal((n_paths * months, len(weights)))
+        asset_log = z @ chol.T + mu  # (paths x months, K) 2차원 행렬곱 - chunk_paths로 크기 제한
+        growth = (1.0 + np.expm1(asset_log, out=asset_log) @ weights).reshape(n_paths, months)
+    cum_growth = np.cumprod(growth, axis=1)
+    prev_growth = np.hstack([np.ones((n_paths, 1)), cum_growth[:, :-1]])
+    # W_t = G_t * sum_{s<=t} c_s / G_{s-1}
+    wealth = cum_growth * np.cumsum(contributions / prev_growth, axis=1)
+    return wealth[:, record_idx].astype(np.float32)
+
+
+def run_simulation(returns: pd.DataFrame, weights: np.ndarray, plan: Dict, years: float,
+                   n_paths: int = 10000, model: str = 'bootstrap', seed: Optional[int] = None,
+                   goal: Optional[float] = None, workers: int = 1) -> Dict:
+    """경로 시뮬레이션 후 백분위 밴드와 목표 달성 확률을 계산"""
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    months = max(int(round(years * 12)), 1)
+    contributions = contribution_schedule(plan, months)
+
+    daily = returns.to_numpy(dtype=float)
+    block_returns = np.expm1(monthly_blocks(daily)) @ weights
+    mu = daily.mean(axis=0) * TRADING_DAYS_PER_MONTH
+    cov = np.cov(daily, rowvar=False).reshape(len(weights), len(weights)) * TRADING_DAYS_PER_MONTH
+    chol = np.linalg.cholesky(cov + np.eye(len(weights)) * 1e-12)
+
+    stride = max(1, int(np.ceil(months / MAX_BAND_POINTS)))
+    record_idx = np.unique(np.append(np.arange(stride - 1, months, stride), months - 1))
+
+    per_chunk = chunk_paths(months, len(weights), model)
+    n_chunks = int(np.ceil(n_paths / per_chunk))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [min(per_chunk, n_paths - i * per_chunk) for i in range(n_chunks)]
+    tasks = [(seeds[i], sizes[i], model, weights, mu, chol, block_returns, contributions, record_idx)
+             for i in range(n_chunks)]
+
+    if min(workers, MAX_WORKERS) > 1 and n_chunks > 1:
+        chunks = list(_get_pool().map(_simulate_chunk, tasks, chunksize=max(1, n_chunks // (4 * MAX_WORKERS))))
+    else:
+        chunks = [_simulate_chunk(t) for t in tasks]
+    wealth = np.vstack(chunks)
+
+    bands = np.percentile(wealth, PERCENTILES, axis=0)
+    final = wealth[:, -1]
+    invested = np.cumsum(contributions)
+
+    return {
+        "paths": int(n_paths),
+        "model": model,
+        "months": months,
+        "timeline": {
+            "month": (record_idx + 1).tolist(),
+            "invested": np.round(invested[record_idx], 0).tolist(),
+            "percentiles": {f"p{p}": np.round(bands[i], 0).tolist() for i, p in enumerate(PERCENTILES)},
+        },
+        "final": {
+            "invested": float(round(invested[-1], 0)),
+            "mean": float(round(final.mean(), 0)),
+            **{f"p{p}": float(round(bands[i, -1], 0)) for i, p in enumerate(PERCENTILES)},
+            "probabilityOfLoss": float((final < invested[-1]).mean()),
+        },
+        "goal": None if goal is None else {
+            "amount": float(goal),
+            "probability": float((final >= goal).mean()),
+        },
+        "historyDays": int(len(returns)),
+    }
@@ -0,0 +1,48 @@
+"""
+테스트 / 벤치마크 공통 환경 (tests/conftest.py, benchmarks/conftest.py에서 import)
+
+네트워크 / 디스크 저장소 없이 실행되도록 환경 변수로 저장소와 백그라운드 갱신을 끄고,
+app 모듈은 import 시 CSV를 상대 경로로 읽으므로 backend 디렉터리 기준으로 불러옵니다.
+"""
+
+import os
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENV = {
+    'LOG_FILE': '',
+    'LOG_CONSOLE': 'false',
+    'LOG_LEVEL': 'WARNING',
+    'CACHE_SNAPSHOT_PATH': '',
+    'MASTER_WATCH_SECONDS': '0',
+    'WARMUP_ON_START': 'false',
+    'PRICE_PANEL_REFRESH_SECONDS': '0',
+    'HOLDINGS_STORE_DIR': '',
+    'DISTRIBUTION_STORE_DIR': '',
+    'FX_STORE_PATH': '',
+}
+
+
+def configure(price_panel_dir: str) -> None:
+    """app을 불러오기 전에 호출 (이미 설정된 환경 변수는 그대로). price_panel_dir은 없는 경로로 두어 패널을 끔"""
+    for name, value in ENV.items():
+        os.environ.setdefault(name, value)
+    os.environ.setdefault('PRICE_PANEL_DIR', price_panel_dir)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    cwd = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    try:
+        import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+@pytest.fixture(scope='session')
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,17 @@
+"""
+동작 테스트 공통 설정 (네트워크 / 디스크 저장소 없이 실행)
+
+환경 변수와 app_module / client 픽스처는 benchmarks/와 함께 쓰는 backend/testing_env.py에 있습니다.
+"""
+
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTS_DIR)
+
+sys.path.insert(0, BACKEND_DIR)
+
+from testing_env import app_module, client, configure  # noqa: E402,F401
+
+configure(price_panel_dir=os.path.join(TESTS_DIR, 'no_price_panel'))
@@ -0,0 +1,26 @@
+import threading
+
+import scanner
+
+
+def test_scan_refresh_requires_admin_token(client, app_module, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_refresh(tickers):
+        calls.append(len(tickers))
+        release.wait(5)
+
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(scanner, 'refresh_universe', fake_refresh)
+    assert client.post('/api/scan/refresh').status_code == 403
+    assert client.post('/api/scan/refresh', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+    response = client.post('/api/scan/refresh', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 202 and response.get_json()['status'] == 'refreshing'
+    # 갱신 중에는 스레드를 새로 만들지 않음
+    response = client.post('/api/scan/refresh', headers={'X-Admin-Token': 'secret'})
+    assert response.get_json()['status'] == 'already refreshing'
+    release.set()
+    app_module._universe_thread.join(5)
+    assert len(calls) == 1
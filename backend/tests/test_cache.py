@@ -0,0 +1,94 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import cache
+from cache import SWRCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(time=clock.time))
+    return clock
+
+
+def _stale_cache(clock):
+    swr = SWRCache('test_swr', fresh_ttl=10, ttl=100)
+    assert swr.get_or_load('k', lambda: 'old') == ('old', 0.0)
+    clock.now += 20  # fresh_ttl은 지났지만 ttl 이내
+    return swr
+
+
+def _wait_idle(swr):
+    """백그라운드 갱신이 끝나 inflight에서 빠질 때까지 대기"""
+    for _ in range(500):
+        if not swr._inflight:
+            return
+        time.sleep(0.01)
+    raise AssertionError('refresh did not finish')
+
+
+def test_stale_reads_start_exactly_one_refresh(clock):
+    swr = _stale_cache(clock)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'new'
+
+    for _ in range(5):
+        value, age = swr.get_or_load('k', refresh)
+        assert (value, age) == ('old', 20)  # 갱신을 기다리지 않고 stale 값을 바로 반환
+    assert started.wait(5)
+    release.set()
+    _wait_idle(swr)
+    assert len(calls) == 1 and swr.revalidations == 1
+    assert swr.get_or_load('k', refresh) == ('new', 0.0)
+
+
+def test_failed_refresh_keeps_stale_value(clock):
+    swr = _stale_cache(clock)
+    done = threading.Event()
+
+    def refresh():
+        try:
+            raise ConnectionError('down')
+        finally:
+            done.set()
+
+    assert swr.get_or_load('k', refresh)[0] == 'old'
+    assert done.wait(5)
+    _wait_idle(swr)
+    value, age = swr.get_or_load('k', lambda: 'new')
+    assert (value, age) == ('old', 20)  # 값과 적재 시각은 그대로, 다음 stale 읽기에서 다시 갱신
+    assert swr.revalidations == 2
+
+
+def test_history_route_shares_cache_across_ticker_spellings(client, app_module, monkeypatch):
+    calls = []
+
+    def fake_history(yf_ticker, period):
+        calls.append((yf_ticker, period))
+        return [{'date': '2024-01-02', 'close': 1.0}]
+
+    monkeypatch.setattr(app_module, 'load_etf_history', fake_history)
+    app_module.history_response_cache.clear()
+    for ticker in ('069500', '069500.KS', 'A069500'):
+        response = client.get(f'/api/etf/history?ticker={ticker}&period=1mo')
+        assert response.status_code == 200
+    assert calls == [('069500.KS', '1mo')]
+    app_module.history_response_cache.clear()
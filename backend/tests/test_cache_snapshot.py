@@ -0,0 +1,70 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import cache
+import cache_snapshot
+from cache import TTLCache
+from cache_snapshot import CacheSnapshot
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    fake = SimpleNamespace(time=clock.time, perf_counter=time.perf_counter)
+    monkeypatch.setattr(cache, 'time', fake)
+    monkeypatch.setattr(cache_snapshot, 'time', fake)
+    return clock
+
+
+def test_restore_keeps_expiry_and_drops_expired_entries(clock, tmp_path):
+    path = str(tmp_path / 'caches.bin')
+    quotes = TTLCache('snap_quotes', ttl=100)
+    quotes.set('069500', {'price': 1})
+    quotes.set('SPY', {'price': 2}, ttl=10)
+    assert CacheSnapshot([quotes], path=path).save() == 2
+
+    clock.now += 50  # SPY는 만료, 069500은 50초 남음
+    restored = TTLCache('snap_quotes', ttl=100)
+    snapshot = CacheSnapshot([restored], path=path)
+    assert snapshot.restore() == {'snap_quotes': 1}
+    assert restored.get('069500') == {'price': 1}
+    assert restored.get('SPY') is None
+    assert restored.export() == [('069500', 1100.0, {'price': 1})]  # 원래 만료 시각 그대로
+
+    clock.now += 50
+    assert restored.get('069500') is None
+
+
+def test_save_merges_workers_and_keeps_later_expiry(clock, tmp_path):
+    path = str(tmp_path / 'caches.bin')
+    first, second = TTLCache('snap_info', ttl=100), TTLCache('snap_info', ttl=100)
+    first.set('A', 'first')
+    first.set('B', 'only-first')
+    CacheSnapshot([first], path=path).save()
+
+    clock.now += 10
+    second.set('A', 'second')  # 같은 키는 늦게 만료되는 값
+    assert CacheSnapshot([second], path=path).save() == 2
+
+    fresh = TTLCache('snap_info', ttl=100)
+    CacheSnapshot([fresh], path=path).restore()
+    assert fresh.get('A') == 'second' and fresh.get('B') == 'only-first'
+
+
+def test_unreadable_snapshot_is_ignored(clock, tmp_path):
+    path = tmp_path / 'caches.bin'
+    path.write_bytes(b'not a snapshot')
+    target = TTLCache('snap_bad', ttl=100)
+    snapshot = CacheSnapshot([target], path=str(path))
+    assert snapshot.restore() == {}
+    assert snapshot.last_error and len(target) == 0
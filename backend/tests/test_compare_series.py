@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import total_return
+
+
+def _index(name, start, growth):
+    dates = pd.bdate_range(start=start, periods=20)
+    return pd.Series(100 * growth ** np.arange(20), index=dates, name=name)
+
+
+def test_compare_rebases_at_common_start_and_dedupes():
+    first = _index('069500', '2025-01-01', 1.01)
+    late = _index('SPY', '2025-01-03', 1.02)
+    result = total_return.compare([first, late, first.copy()])
+    assert result['start'] == '2025-01-03'
+    assert list(result['series']) == ['069500', 'SPY']
+    assert result['series']['069500'][0] == 100 and result['series']['SPY'][0] == 100
+    assert result['series']['069500'][1] == pytest.approx(101.0)
+    assert len(result['dates']) == 20  # 늦게 끝나는 SPY까지 날짜 합집합 (069500은 앞 값 유지)
+    assert result['series']['069500'][-1] == result['series']['069500'][-3]
+
+
+def test_route_plots_known_tickers_and_reports_errors(client, monkeypatch):
+    starts = []
+
+    def fake_series(symbol, currency, start, mode='total'):
+        starts.append(start)
+        return _index(symbol.display, start, 1.01)
+
+    monkeypatch.setattr(total_return, 'series', fake_series)
+    response = client.get('/api/etf/compare-series',
+                          query_string={'tickers': '069500,069500.KS,@@@', 'currency': 'LOCAL',
+                                        'start': '2025-01-06T09:00:00+09:00'})
+    assert response.status_code == 200
+    body = response.get_json()
+    # 같은 심볼로 해석된 입력은 한 줄, 찾지 못한 티커는 errors로
+    assert list(body['series']) == ['069500']
+    assert body['symbols'] == {'069500': '069500', '069500.KS': '069500'}
+    assert list(body['errors']) == ['@@@']
+    assert starts[0] == pd.Timestamp('2025-01-06') and starts[0].tz is None
+
+
+def test_route_404_when_no_ticker_has_data(client, monkeypatch):
+    monkeypatch.setattr(total_return, 'series', lambda symbol, currency, start, mode='total': None)
+    response = client.get('/api/etf/compare-series?tickers=SPY&currency=LOCAL')
+    assert response.status_code == 404
+    assert response.get_json()['errors'] == {'SPY': 'No price data'}
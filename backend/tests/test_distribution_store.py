@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from distribution_store import DistributionStore
+
+
+def test_coverage_tracks_recorded_symbols(tmp_path):
+    store = DistributionStore(str(tmp_path))
+    dates = pd.bdate_range(end='2025-10-17', periods=3)
+    assert not store.covers(['SPY'])
+    assert store.record(pd.DataFrame({'SPY': [0.0, 1.8, 0.0], 'QQQ': 0.0}, index=dates)) == 1
+    # 분배가 없었던 QQQ도 '이력을 받음'으로 기록
+    assert store.covers(['SPY', 'QQQ']) and not store.covers(['SPY', 'TLT'])
+    assert store.record(pd.DataFrame({'SPY': [0.0, 1.8, 0.0]}, index=dates)) == 0  # 바뀐 것 없음
+
+    column, days, amounts, known = store.distributions().columns(['TLT', 'SPY', 'QQQ'])
+    assert known.tolist() == [False, True, True]
+    assert column.tolist() == [1] and amounts.tolist() == [1.8]
+    assert days.tolist() == [(np.datetime64('2025-10-16') - np.datetime64('1970-01-01')).astype(int)]
+
+
+def test_disabled_store_covers_everything():
+    store = DistributionStore('')
+    assert store.covers(['SPY'])
+    assert store.record(pd.DataFrame({'SPY': [1.0]}, index=pd.DatetimeIndex(['2025-10-17']))) == 0
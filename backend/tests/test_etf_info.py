@@ -0,0 +1,42 @@
+import pytest
+
+
+class _FakeTicker:
+    def __init__(self, symbol):
+        self.info = {'quoteType': 'ETF', 'longName': f"Fund {symbol}"}
+
+
+class _FakeYF:
+    Ticker = _FakeTicker
+
+
+class _NoHoldings:
+    def top(self, n):
+        return []
+
+
+@pytest.fixture
+def info_app(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'yf', _FakeYF)
+    monkeypatch.setattr(app_module, 'get_holdings', lambda symbol: (_NoHoldings(), 0.0, False))
+    app_module.info_cache.clear()
+    yield app_module
+    app_module.info_cache.clear()
+
+
+@pytest.mark.parametrize('first, second, display', [('spy', 'SPY', 'SPY'), ('069500.KS', '069500', '069500')])
+def test_cached_info_uses_resolved_ticker(info_app, client, first, second, display):
+    for text in (first, second):
+        response = client.get('/api/etf/info', query_string={'ticker': text})
+        assert response.status_code == 200
+        assert response.get_json()['ticker'] == display
+
+
+def test_resolver_failure_is_reported_with_input(info_app, client, monkeypatch):
+    def broken(text):
+        raise RuntimeError('index not loaded')
+
+    monkeypatch.setattr(info_app.resolver, 'resolve', broken)
+    response = client.get('/api/etf/info', query_string={'ticker': 'SPY'})
+    assert response.status_code == 404
+    assert 'SPY' in response.get_json()['error']
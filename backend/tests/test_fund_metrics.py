@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+import fund_metrics
+from total_return import total_return_index
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _raw(n_days=400, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=n_days)
+    closes = 40 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(n_days, 2)), axis=0))
+    days = (dates.values.astype('datetime64[D]') - _EPOCH).astype(np.int64)
+    return days, closes
+
+
+def test_returns_reinvest_stored_distributions():
+    days, closes = _raw()
+    paid = np.arange(20, len(days), 60)  # 첫 번째 열만 분기마다 분배
+    dividends = np.zeros(len(days))
+    dividends[paid] = 0.5
+    metrics = fund_metrics.compute(days, closes, ['DIV', 'NONE'], np.zeros(len(paid), dtype=np.int64), days[paid],
+                                   dividends[paid], np.ones(2, dtype=bool))
+
+    start = pd.Timestamp(_EPOCH + int(days[-1])) - pd.DateOffset(years=1)
+    row = int(np.searchsorted(days, fund_metrics._day(start), side='right')) - 1
+    expected = total_return_index(closes[row:, 0], dividends[row:])[-1] - 1
+    np.testing.assert_allclose(metrics.returns['oneYearReturn'][0], expected * 100, rtol=1e-9)
+    np.testing.assert_allclose(metrics.returns['oneYearReturn'][1], (closes[-1, 1] / closes[row, 1] - 1) * 100,
+                               rtol=1e-9)
+    # 최근 12개월 분배금 합
+    recent = int((days[paid] > days[-1] - 365).sum())
+    np.testing.assert_allclose(metrics.get('DIV')['dividend']['ttmDividend'], 0.5 * recent)
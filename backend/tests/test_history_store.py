@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import history_store
+from distribution_store import DistributionStore
+from price_panel import PricePanel
+from total_return import total_return_index
+
+
+def test_panel_closes_reinvest_distributions(tmp_path, monkeypatch):
+    rng = np.random.default_rng(4)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=300)
+    closes = pd.DataFrame(30 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(300, 2)), axis=0)), index=dates,
+                          columns=['AAA', 'BBB'])
+    dividends = pd.DataFrame(0.0, index=dates, columns=closes.columns)
+    dividends.iloc[[50, 150, 250], 0] = 0.4
+
+    panel = PricePanel(str(tmp_path / 'panel'))
+    store = DistributionStore(str(tmp_path / 'distributions'))
+    assert panel._acquire_writer()
+    panel.build(closes)
+    monkeypatch.setattr(history_store, 'panel', panel)
+    monkeypatch.setattr(history_store, 'distribution_store', store)
+    assert history_store._panel_closes(['AAA', 'BBB'], '1y') is None  # 분배 이력을 모르면 티커별 경로
+
+    store.record(dividends)
+    frame = history_store._panel_closes(['AAA', 'BBB'], '1y')
+    raw = closes[closes.index >= frame.index[0]].to_numpy(dtype=np.float32).astype(np.float64)
+    paid = dividends.loc[frame.index, 'AAA'].to_numpy()
+    np.testing.assert_allclose(frame['AAA'] / frame['AAA'].iloc[0], total_return_index(raw[:, 0], paid), rtol=1e-9)
+    np.testing.assert_allclose(frame['BBB'], raw[:, 1])
+    panel._writer_file.close()
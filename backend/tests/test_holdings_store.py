@@ -0,0 +1,50 @@
+import pytest
+
+import holdings_store as holdings_store_module
+from holdings_store import HoldingsStore
+
+
+def _snapshot(date, weights):
+    return {'etfName': 'KODEX 200', 'nav': 10000.0, 'updateDate': date, 'totalHoldings': len(weights),
+            'holdings': [{'stockCode': code, 'stockName': f'{code} name', 'weight': w, 'shares': 1, 'value': 1}
+                         for code, w in weights.items()]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HoldingsStore(str(tmp_path))
+
+
+def test_diff_added_removed_reweighted(store):
+    store.record('069500', _snapshot('20251001', {'A': 30.0, 'B': 20.0, 'C': 10.0}))
+    store.record('069500', _snapshot('20251017', {'A': 25.0, 'C': 10.05, 'D': 5.0}))
+    diff = store.diff('069500', threshold=0.1)
+    assert (diff['from'], diff['to']) == ('20251001', '20251017')
+    assert [h['stockCode'] for h in diff['added']] == ['D']
+    assert [h['stockCode'] for h in diff['removed']] == ['B']
+    assert [(h['stockCode'], h['change']) for h in diff['reweighted']] == [('A', -5.0)]
+
+
+def test_trimmed_dates_compact_dictionary(store, monkeypatch):
+    monkeypatch.setattr(holdings_store_module, 'MAX_SNAPSHOTS', 2)
+    for day, code in enumerate('ABCD', start=1):
+        store.record('069500', _snapshot(f'202510{day:02d}', {code: 50.0, 'Z': 50.0}))
+    history = store.history('069500')
+    assert history.dates.tolist() == ['20251003', '20251004']
+    assert sorted(history.codes.tolist()) == ['C', 'D', 'Z']
+    assert [h['stockCode'] for h in store.snapshot('069500', '20251003')['holdings']] == ['C', 'Z']
+    assert [h['stockCode'] for h in store.diff('069500')['added']] == ['D']
+
+
+def test_routes_resolve_ticker(client, app_module, store, monkeypatch):
+    monkeypatch.setattr(app_module, 'holdings_store', store)
+    store.record('069500', _snapshot('20251001', {'A': 60.0, 'B': 40.0}))
+    store.record('069500', _snapshot('20251017', {'A': 70.0, 'C': 30.0}))
+    # /holdings와 같은 키(KIS 코드)로 찾아야 함
+    response = client.get('/api/etf/069500.KS/holdings/history')
+    assert response.status_code == 200
+    assert response.get_json() == {'ticker': '069500', 'dates': ['20251001', '20251017']}
+    response = client.get('/api/etf/069500.ks/holdings/diff')
+    assert response.status_code == 200
+    assert [h['stockCode'] for h in response.get_json()['added']] == ['C']
+    assert client.get('/api/etf/@@@/holdings/diff').status_code == 404
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators
+
+
+def _hist(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.date_range('2024-01-01', periods=n, freq='B')
+    return pd.DataFrame({'Close': close, 'High': close * 1.01, 'Low': close * 0.99}, index=index)
+
+
+@pytest.mark.parametrize('window', [1, 5, 20])
+def test_rolling_mean_matches_pandas(window):
+    close = _hist()['Close']
+    np.testing.assert_allclose(indicators.rolling_mean(close.to_numpy(), window),
+                               close.rolling(window).mean().to_numpy(), equal_nan=True)
+
+
+def test_rolling_mean_nan_only_affects_windows_containing_it():
+    close = _hist()['Close'].copy()
+    close.iloc[30] = np.nan
+    got = indicators.rolling_mean(close.to_numpy(), 10)
+    np.testing.assert_allclose(got, close.rolling(10).mean().to_numpy(), equal_nan=True)
+    assert np.isnan(got[30:40]).all()
+    assert np.isfinite(got[40:]).all()
+
+
+def test_bollinger_and_rsi_match_pandas():
+    hist = _hist()
+    close = hist['Close']
+    bands = indicators.bollinger(hist, window=20, k=2)
+    std = close.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(bands['bb_upper_20'], (close.rolling(20).mean() + 2 * std).to_numpy(), equal_nan=True)
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    np.testing.assert_allclose(indicators.rsi(hist)['rsi_14'], (100 - 100 / (1 + gain / loss)).to_numpy(),
+                               equal_nan=True)
+
+
+@pytest.mark.parametrize('spec', [{'name': 'sma', 'window': 0}, {'name': 'rsi', 'window': -3},
+                                  {'name': 'macd', 'fast': 0}])
+def test_parse_spec_rejects_non_positive_windows(spec):
+    with pytest.raises(ValueError):
+        indicators.parse_spec(spec)
+
+
+@pytest.mark.parametrize('spec', [{'name': 'bollinger', 'k': 'nan'}, {'name': 'bollinger', 'k': 'inf'},
+                                  {'name': 'bollinger', 'k': 0}, {'name': 'sma', 'window': 'abc'},
+                                  {'name': 'sma', 'window': None}])
+def test_parse_spec_rejects_invalid_values(spec):
+    with pytest.raises(ValueError):
+        indicators.parse_spec(spec)
+
+
+@pytest.mark.parametrize('spec', [{'name': 'sma', 'span': 5}, {'name': 'rsi', 'k': 2}, {'name': 'macd', 'window': 3}])
+def test_parse_spec_rejects_unknown_params(spec):
+    with pytest.raises(ValueError, match='Unknown parameter'):
+        indicators.parse_spec(spec)
+
+
+def test_parse_spec_normalizes_types():
+    assert indicators.parse_spec({'name': 'bollinger', 'k': '1.5', 'window': '10'}) == \
+        ('bollinger', (('k', 1.5), ('window', 10)))
+    assert indicators.parse_spec('macd') == ('macd', ())
+
+
+@pytest.mark.parametrize('spec', [{'name': 'bollinger', 'k': 'nan'}, {'name': 'sma', 'span': 5}])
+def test_route_rejects_invalid_spec(client, spec):
+    response = client.post('/api/indicators', json={'tickers': ['SPY'], 'indicators': [spec]})
+    assert response.status_code == 400
+
+
+def test_route_rejects_non_positive_window(client):
+    response = client.post('/api/indicators', json={'tickers': ['SPY'], 'indicators': [{'name': 'sma', 'window': 0}]})
+    assert response.status_code == 400
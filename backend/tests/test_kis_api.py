@@ -0,0 +1,58 @@
+import pytest
+
+import kis_api
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def kis(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, timeout=None, **kwargs):
+        calls.append((method, url.rsplit('/', 1)[-1], kwargs))
+        if url.endswith('/oauth2/tokenP'):
+            return _Response({'access_token': 'token', 'expires_in': 86400})
+        if url.endswith('/inquire-price'):
+            return _Response({'rt_cd': '0', 'output': {'stck_prpr': '35000', 'stck_sdpr': '34500'}})
+        params = kwargs.get('params') or {}
+        return _Response({'rt_cd': '0', 'output': [
+            {'inter_shrn_iscd': params[f'FID_INPUT_ISCD_{n}'], 'inter2_prpr': '1000'}
+            for n in range(1, 31) if f'FID_INPUT_ISCD_{n}' in params]})
+
+    monkeypatch.setenv('KIS_APP_KEY', 'key')
+    monkeypatch.setenv('KIS_APP_SECRET', 'secret')
+    monkeypatch.setenv('KIS_MOCK_MODE', 'false')
+    monkeypatch.setattr(kis_api.requests, 'request', fake_request)
+    client = kis_api.KoreaInvestmentAPI()
+    calls.clear()
+    return client, calls
+
+
+def test_price_quotes_are_get_with_query_params(kis):
+    client, calls = kis
+    price = client.getETFPrice('069500')
+    assert not price.get('isMock')
+    assert price['currentPrice'] == 35000
+    method, endpoint, kwargs = calls[-1]
+    assert (method, endpoint) == ('GET', 'inquire-price')
+    assert kwargs['params'] == {'FID_COND_MRKT_DIV_CODE': 'J', 'FID_INPUT_ISCD': '069500'}
+    assert 'json' not in kwargs
+
+
+def test_multi_price_is_get_with_query_params(kis):
+    client, calls = kis
+    prices = client.get_prices(['069500', '229200'])
+    assert not any(p.get('isMock') for p in prices.values())
+    method, endpoint, kwargs = calls[-1]
+    assert (method, endpoint) == ('GET', 'intstock-multprice')
+    assert kwargs['params']['FID_INPUT_ISCD_2'] == '229200'
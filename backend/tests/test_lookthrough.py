@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import lookthrough
+
+
+def test_route_rejects_too_many_assets(client, monkeypatch):
+    monkeypatch.setattr(lookthrough, 'look_through', lambda portfolio, top=None: pytest.fail('fetched holdings'))
+    assets = [{'ticker': f'T{i}', 'value': 1} for i in range(lookthrough.MAX_ASSETS + 1)]
+    response = client.post('/api/portfolio/lookthrough', json={'assets': assets})
+    assert response.status_code == 400
+    assert 'max' in response.get_json()['error']
+
+
+def _holdings(codes, weights, update_date=None, sectors=None):
+    return SimpleNamespace(codes=codes, names=[f'{c} name' for c in codes], weights=np.asarray(weights, dtype=float),
+                           sectors=sectors or {}, update_date=update_date, source='kis')
+
+
+@pytest.fixture
+def matrix(monkeypatch):
+    matrix = lookthrough.HoldingsMatrix()
+    monkeypatch.setattr(lookthrough, 'holdings_matrix', matrix)
+    return matrix
+
+
+def test_aggregate_matches_dense_product(matrix, monkeypatch):
+    sources = {
+        '069500': _holdings(['005930', '000660', '035420'], [30.0, 10.0, 5.0], '20251017', {'Tech': 0.7}),
+        'SPY': _holdings(['AAPL', 'MSFT', '005930'], [7.0, 6.0, 1.0], sectors={'Tech': 0.3, 'Health': 0.1}),
+    }
+
+    def fake_fetch(ticker):
+        if ticker not in sources:
+            raise ValueError('no holdings')
+        return sources[ticker]
+
+    monkeypatch.setattr(lookthrough, 'fetch_holdings', fake_fetch)
+    # 같은 ETF 두 표기 + 조회 실패 티커
+    result = lookthrough.look_through({'069500': 2.0, '069500.KS': 1.0, 'SPY': 1.0, 'BAD': 1.0})
+    assert result['failed'] == ['BAD'] and result['missing'] == ['BAD']
+
+    codes = ['005930', '000660', '035420', 'AAPL', 'MSFT']
+    dense = np.zeros((2, len(codes)))
+    for row, source in enumerate(sources.values()):
+        for code, weight in zip(source.codes, source.weights):
+            dense[row, codes.index(code)] = weight / 100
+    expected = np.array([3.0, 1.0]) / 5 @ dense
+    got = {s['code']: s['weight'] for s in result['stocks']}
+    np.testing.assert_allclose([got[c] for c in codes], np.round(expected * 100, 4))
+    assert next(s['etfCount'] for s in result['stocks'] if s['code'] == '005930') == 2
+    np.testing.assert_allclose(result['coverage'], round(expected.sum() * 100, 4))
+    sectors = {s['sector']: s['weight'] for s in result['sectors']}
+    np.testing.assert_allclose(sectors['Tech'], round((0.6 * 0.7 + 0.2 * 0.3) * 100, 4))
+
+
+def test_rows_follow_holdings_update_date(matrix, monkeypatch):
+    current = {'source': _holdings(['A'], [50.0], '20251001')}
+    monkeypatch.setattr(lookthrough, 'fetch_holdings', lambda ticker: current['source'])
+    lookthrough.look_through({'069500': 1.0})
+    compiled = matrix.compile()
+    # 캐시가 다시 적재했어도 공시일이 같으면 행을 다시 만들지 않음
+    current['source'] = _holdings(['A'], [50.0], '20251001')
+    lookthrough.look_through({'069500': 1.0})
+    assert matrix.compile() is compiled
+    current['source'] = _holdings(['B'], [40.0], '20251017')
+    result = lookthrough.look_through({'069500': 1.0})
+    assert [s['code'] for s in result['stocks']] == ['B']
+
+
+def test_matrix_keeps_recent_etfs_only():
+    matrix = lookthrough.HoldingsMatrix(max_etfs=2)
+    for ticker in ('A', 'B', 'C'):
+        matrix.put(ticker, [{'code': ticker, 'weight': 1.0}], {})
+    assert list(matrix.compile().etf_index) == ['B', 'C']
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from master_data import MasterData
+
+
+def _write(path, rows, mtime):
+    pd.DataFrame(rows, columns=['Ticker/Code', 'Name']).to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))  # 같은 초 안에 다시 써도 감시 스레드가 알아채도록
+
+
+def _loader(korean_path, overseas_path):
+    def load():
+        frames = []
+        for path in (korean_path, overseas_path):
+            try:
+                frames.append(pd.read_csv(path, dtype=str))
+            except (OSError, ValueError):
+                frames.append(pd.DataFrame())
+        return frames[0], frames[1]
+    return load
+
+
+OLD_KOREAN = [('069500', 'KODEX 200'), ('229200', 'KODEX 코스닥150')]
+NEW_KOREAN = [('069500', 'KODEX 200 (renamed)'), ('102110', 'TIGER 200')]
+OVERSEAS = [('SPY', 'SPDR S&P 500')]
+
+
+def _consistent(snapshot):
+    """한 스냅샷 안의 프레임 / 검색 색인 / 행 해시가 모두 같은 세대인지"""
+    korean = snapshot.korean['Ticker/Code'].tolist()
+    names = snapshot.korean['Name'].tolist()
+    index = snapshot.search['domestic']
+    return (index.tickers.tolist() == korean and index.names.tolist() == names
+            and set(snapshot.fingerprints) == set(korean) | {'SPY'})
+
+
+def test_watcher_swaps_whole_snapshot_while_readers_run(tmp_path):
+    korean_path, overseas_path = str(tmp_path / 'korean.csv'), str(tmp_path / 'overseas.csv')
+    _write(korean_path, OLD_KOREAN, 1_000_000)
+    _write(overseas_path, OVERSEAS, 1_000_000)
+    master = MasterData(_loader(korean_path, overseas_path), paths=[korean_path, overseas_path])
+    changes = []
+    master.on_change(lambda snapshot, diff: changes.append(diff))
+
+    seen, errors = set(), []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            snapshot = master.current
+            names = tuple(hit['name'] for hit in snapshot.search['domestic'].search('kodex'))
+            if not _consistent(snapshot):
+                errors.append(snapshot.version)
+            seen.add((snapshot.version, names))
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    master.start_watcher(interval=0.01)
+    _write(korean_path, NEW_KOREAN, 1_000_100)
+    deadline = time.time() + 5
+    while master.current.version < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    stop.set()
+    for thread in readers:
+        thread.join(5)
+
+    assert master.current.version == 2
+    assert not errors
+    # 읽는 쪽은 이전 색인 또는 새 색인 중 하나만 봄
+    assert seen <= {(1, ('KODEX 200', 'KODEX 코스닥150')), (2, ('KODEX 200 (renamed)',))}
+    assert (2, ('KODEX 200 (renamed)',)) in seen
+    assert len(changes) == 1
+    assert (changes[0].added, changes[0].removed, changes[0].changed) == (['102110'], ['229200'], ['069500'])
+
+
+def test_failed_market_keeps_previous_frame(tmp_path):
+    korean_path, overseas_path = str(tmp_path / 'korean.csv'), str(tmp_path / 'overseas.csv')
+    _write(korean_path, OLD_KOREAN, 1_000_000)
+    _write(overseas_path, OVERSEAS, 1_000_000)
+    master = MasterData(_loader(korean_path, overseas_path), paths=[korean_path, overseas_path])
+
+    os.remove(overseas_path)
+    _write(korean_path, NEW_KOREAN, 1_000_100)
+    changes = master.reload()
+
+    snapshot = master.current
+    assert snapshot.version == 2 and _consistent(snapshot)
+    assert snapshot.overseas['Ticker/Code'].tolist() == ['SPY']
+    assert 'SPY' not in changes.tickers
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+import cache
+import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """빈 레지스트리 + 캐시 하나"""
+    monkeypatch.setattr(metrics, '_shards', {})
+    monkeypatch.setattr(metrics, 'MULTIPROC_DIR', '')
+    monkeypatch.setattr(cache, 'all_caches', lambda: [_FakeCache('quote', hits=3, misses=1, entries=2)])
+
+
+class _FakeCache:
+    def __init__(self, name, hits, misses, entries):
+        self.name, self.hits, self.misses, self.revalidations, self.entries = name, hits, misses, 0, entries
+
+    def __len__(self):
+        return self.entries
+
+
+def _samples(text, prefix):
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if line.startswith(prefix) and not line.startswith('#')}
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive(registry):
+    labels = ('/api/x', 'GET')
+    for seconds in (0.005, 0.0051, 0.3, 100.0):
+        metrics.observe('http_request_duration_seconds', labels, seconds)
+    text = metrics.render()
+
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    samples = _samples(text, 'http_request_duration_seconds')
+    bucket = 'http_request_duration_seconds_bucket{route="/api/x",method="GET",le="%s"}'
+    assert samples[bucket % '0.005'] == 1  # 경계값은 그 버킷에 포함 (le)
+    assert samples[bucket % '0.01'] == 2
+    assert samples[bucket % '0.25'] == 2
+    assert samples[bucket % '0.5'] == 3
+    assert samples[bucket % '40.0'] == 3
+    assert samples[bucket % '+Inf'] == 4
+    assert samples['http_request_duration_seconds_count{route="/api/x",method="GET"}'] == 4
+    assert samples['http_request_duration_seconds_sum{route="/api/x",method="GET"}'] == pytest.approx(100.3101)
+
+
+def test_render_counters_gauges_and_caches(registry):
+    metrics.inc('http_requests_total', ('/api/x', 'GET', 200))
+    metrics.inc('http_requests_total', ('/api/x', 'GET', 200), 2)
+    metrics.gauge_add('upstream_in_flight', ('kis',), 1)
+    text = metrics.render()
+
+    assert '# HELP http_requests_total HTTP requests by route and status\n# TYPE http_requests_total counter' in text
+    assert 'http_requests_total{route="/api/x",method="GET",status="200"} 3' in text
+    assert '# TYPE upstream_in_flight gauge\nupstream_in_flight{upstream="kis"} 1' in text
+    assert 'cache_hits_total{cache="quote"} 3' in text
+    assert 'cache_entries{cache="quote"} 2' in text
+    assert 'cache_hit_ratio{cache="quote"} 0.75' in text
+    assert text.endswith('\n')
+
+
+def test_render_sums_worker_files_and_keeps_dead_worker_counters(registry, monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, 'MULTIPROC_DIR', str(tmp_path))
+    other = {
+        'histograms': [['upstream_request_duration_seconds', ['kis', 'quote', 'ok'],
+                        [1] + [0] * len(metrics.BUCKETS) + [0.004]]],
+        'counters': [['http_requests_total', ['/api/x', 'GET', 200], 5]],
+        'gauges': [['upstream_in_flight', ['kis'], 2]],
+        'caches': {'quote': [10, 0, 1, 4]},
+    }
+    (tmp_path / '99999.json').write_text(json.dumps(other))
+    metrics.inc('http_requests_total', ('/api/x', 'GET', 200))
+    metrics.gauge_add('upstream_in_flight', ('kis',), 1)
+    metrics.observe('upstream_request_duration_seconds', ('kis', 'quote', 'ok'), 0.004)
+
+    samples = _samples(metrics.render(), '')
+    assert samples['http_requests_total{route="/api/x",method="GET",status="200"}'] == 6
+    assert samples['upstream_in_flight{upstream="kis"}'] == 3
+    assert samples['upstream_request_duration_seconds_count{upstream="kis",operation="quote",outcome="ok"}'] == 2
+    assert samples['cache_hits_total{cache="quote"}'] == 13
+    assert samples['cache_entries{cache="quote"}'] == 6
+    assert (tmp_path / f'{os.getpid()}.json').exists()  # 수집한 워커도 자기 값을 기록
+
+    # 워커가 끝나면 카운터는 archive.json에 남고 게이지/캐시 항목 수만 빠짐 (합계가 줄지 않음)
+    metrics.mark_process_dead(99999)
+    assert not (tmp_path / '99999.json').exists()
+    samples = _samples(metrics.render(), '')
+    assert samples['http_requests_total{route="/api/x",method="GET",status="200"}'] == 6
+    assert samples['upstream_in_flight{upstream="kis"}'] == 1
+    assert samples['cache_hits_total{cache="quote"}'] == 13
+    assert samples['cache_entries{cache="quote"}'] == 2
+
+    # 같은 워커가 두 번 정리돼도 중복 합산하지 않음
+    metrics.mark_process_dead(99999)
+    assert _samples(metrics.render(), 'http_requests_total{')[
+        'http_requests_total{route="/api/x",method="GET",status="200"}'] == 6
+
+
+def test_forked_worker_drops_inherited_values(registry, monkeypatch):
+    metrics.inc('http_requests_total', ('/api/x', 'GET', 200))
+    monkeypatch.setattr(metrics, '_flusher', None)
+    monkeypatch.setattr(metrics, '_owner_pid', -1)  # arbiter에서 기록한 값을 물려받은 상황
+    metrics.start()
+    assert 'http_requests_total' not in metrics.render()
+    assert metrics._owner_pid == os.getpid()
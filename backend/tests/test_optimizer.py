@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import optimizer
+
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD']
+MU = np.array([0.05, 0.08, 0.11, 0.07])
+VOL = np.array([0.10, 0.15, 0.25, 0.12])
+CORR = np.array([[1.0, 0.3, 0.2, 0.1],
+                 [0.3, 1.0, 0.4, 0.2],
+                 [0.2, 0.4, 1.0, 0.3],
+                 [0.1, 0.2, 0.3, 1.0]])
+COV = CORR * np.outer(VOL, VOL)
+
+
+@pytest.fixture(autouse=True)
+def estimates(monkeypatch):
+    monkeypatch.setattr(optimizer, 'get_estimates', lambda tickers, period='3y': {
+        'mu': MU, 'cov': COV, 'shrinkage': 0.0, 'observations': 756})
+
+
+def _weights(result, key):
+    return np.array([result[key]['weights'][t] for t in TICKERS])
+
+
+def _sharpe(w, risk_free):
+    return (w @ MU - risk_free) / np.sqrt(w @ COV @ w)
+
+
+@pytest.mark.parametrize('points', [2, 5, 20])
+def test_max_sharpe_matches_analytic_tangency(points):
+    risk_free = 0.02
+    tangency = np.linalg.solve(COV, MU - risk_free)
+    tangency /= tangency.sum()
+    assert (tangency > 0).all()  # 구간 제약이 걸리지 않는 내부해
+    result = optimizer.optimize(TICKERS, np.zeros(4), np.ones(4), risk_free=risk_free, frontier_points=points)
+    np.testing.assert_allclose(_weights(result, 'maxSharpe'), tangency, atol=2e-3)
+
+
+def test_max_sharpe_respects_bounds_and_beats_grid():
+    risk_free = 0.02
+    lower, upper = np.full(4, 0.05), np.full(4, 0.35)
+    result = optimizer.optimize(TICKERS, lower, upper, risk_free=risk_free, frontier_points=5)
+    w = _weights(result, 'maxSharpe')
+    assert w.sum() == pytest.approx(1, abs=1e-6)
+    assert (w >= lower - 1e-6).all() and (w <= upper + 1e-6).all()
+
+    # 제약 안의 격자 전수 탐색보다 나빠서는 안 됨
+    grid = np.arange(0.05, 0.3501, 0.01)
+    a, b, c = np.meshgrid(grid, grid, grid, indexing='ij')
+    d = 1 - a - b - c
+    ok = (d >= 0.05 - 1e-9) & (d <= 0.35 + 1e-9)
+    candidates = np.stack([a[ok], b[ok], c[ok], d[ok]], axis=1)
+    brute = ((candidates @ MU - risk_free) / np.sqrt(np.einsum('ij,jk,ik->i', candidates, COV, candidates))).max()
+    assert _sharpe(w, risk_free) >= brute - 1e-6
+
+
+def test_min_variance_and_risk_parity_constraints():
+    lower, upper = np.zeros(4), np.full(4, 0.4)
+    result = optimizer.optimize(TICKERS, lower, upper)
+    for key in ('minVariance', 'riskParity'):
+        w = _weights(result, key)
+        assert w.sum() == pytest.approx(1, abs=1e-6)
+        assert (w <= 0.4 + 1e-6).all() and (w >= -1e-9).all()
+    contrib = (lambda w: w * (COV @ w))(_weights(result, 'riskParity'))
+    assert contrib.max() / contrib.min() == pytest.approx(1, abs=1e-2)
+
+
+@pytest.mark.parametrize('bounds', [[0, 1], {'AAA': 0.5}, {'AAA': [0.1]}, {'min': 0.5, 'max': 1}])
+def test_parse_bounds_rejects_malformed(bounds):
+    with pytest.raises(ValueError):
+        optimizer.parse_bounds(TICKERS, bounds)
+
+
+def test_route_returns_400_for_list_bounds(client):
+    response = client.post('/api/optimize', json={'tickers': ['SPY', 'QQQ'], 'bounds': [0, 1]})
+    assert response.status_code == 400
@@ -0,0 +1,160 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scanner
+from price_panel import PricePanel, covering_period
+
+
+def _closes(n_days=60, tickers=('AAA', 'BBB', 'CCC'), end=None, seed=2):
+    rng = np.random.default_rng(seed)
+    prices = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(n_days, len(tickers))), axis=0))
+    end = end if end is not None else pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+    return pd.DataFrame(prices, index=pd.bdate_range(end=end, periods=n_days), columns=list(tickers))
+
+
+@pytest.fixture
+def panel(tmp_path):
+    panel = PricePanel(str(tmp_path))
+    assert panel._acquire_writer()
+    yield panel
+    panel._writer_file.close()
+
+
+def test_upsert_updates_last_row_and_appends(panel):
+    closes = _closes()
+    panel.build(closes.iloc[:-2])
+    update = closes.iloc[-3:].copy()
+    update.iloc[0, 1] = np.nan  # 값이 없는 칸은 기존 값 유지
+    assert panel.upsert(update) == 2
+    np.testing.assert_allclose(panel.frame().to_numpy(), closes.to_numpy(dtype=np.float32), rtol=1e-6)
+    assert panel.as_of == closes.index[-1]
+
+
+def test_upsert_past_capacity_rebuilds(panel, monkeypatch):
+    monkeypatch.setattr('price_panel.HEADROOM_ROWS', 1)
+    closes = _closes()
+    panel.build(closes.iloc[:-5])
+    generation = panel.status()['generation']
+    assert panel.upsert(closes.iloc[-5:]) == 5
+    assert panel.status()['generation'] == generation + 1
+    np.testing.assert_allclose(panel.frame().to_numpy(), closes.to_numpy(dtype=np.float32), rtol=1e-6)
+
+
+def test_covering_period():
+    today = pd.Timestamp.today().normalize()
+    assert covering_period(today - pd.Timedelta(days=2)) == '5d'
+    assert covering_period(today - pd.Timedelta(days=20)) == '1mo'
+    assert covering_period(today - pd.DateOffset(months=4)) == '6mo'
+    assert covering_period(today - pd.DateOffset(years=6), longest='5y') is None
+
+
+def _no_actions(frame):
+    return pd.DataFrame(0.0, index=frame.index, columns=frame.columns)
+
+
+def test_refresh_downloads_whole_gap(panel, monkeypatch):
+    closes = _closes(n_days=80)
+    calls = []
+
+    def fake_download(tickers, period='2y', actions=False):
+        calls.append(period)
+        frame = closes[closes.index >= pd.Timestamp.today().normalize() - pd.DateOffset(months=1)] \
+            if period == '1mo' else closes
+        return frame, _no_actions(frame), _no_actions(frame)
+
+    monkeypatch.setattr(scanner, 'download_closes', fake_download)
+    panel.universe = lambda: list(closes.columns)
+    # 3주 전까지만 있는 패널: '5d'로는 공백이 남으므로 '1mo'로 받아야 함
+    panel.build(closes[closes.index <= closes.index[-1] - pd.Timedelta(days=21)])
+    assert panel.refresh().startswith('appended')
+    assert calls == ['1mo']
+    assert panel.as_of == closes.index[-1]
+    assert len(panel.frame()) == len(closes)
+
+
+def test_refresh_adds_new_tickers_in_batches(panel, monkeypatch):
+    closes = _closes(tickers=('AAA', 'BBB', 'CCC', 'DDD'))
+    calls = []
+
+    def fake_download(tickers, period='2y', actions=False):
+        calls.append((tuple(tickers), period))
+        frame = closes[list(tickers)]
+        return frame, _no_actions(frame), _no_actions(frame)
+
+    monkeypatch.setattr(scanner, 'download_closes', fake_download)
+    monkeypatch.setattr('price_panel.BACKFILL_TICKERS', 1)
+    panel.universe = lambda: ['AAA', 'CCC', 'DDD']
+    panel.build(closes[['AAA', 'BBB']])
+    assert panel.refresh() == 'appended 0, added 1, 1 pending'
+    assert panel.tickers == ['AAA', 'CCC']  # 빠진 BBB는 열만 버림
+    assert panel.refresh() == 'appended 0, added 1'
+    assert panel.tickers == ['AAA', 'CCC', 'DDD']
+    # 기존 티커는 최근 기간만, 새 티커만 보관 기간 전체를 받음
+    assert calls == [(('AAA',), '5d'), (('CCC',), '5y'), (('AAA', 'CCC'), '5d'), (('DDD',), '5y')]
+    np.testing.assert_allclose(panel.frame().to_numpy(), closes[['AAA', 'CCC', 'DDD']].to_numpy(dtype=np.float32),
+                               rtol=1e-6)
+
+
+def test_refresh_refetches_split_ticker(panel, monkeypatch):
+    closes = _closes()
+    split = closes.copy()
+    split['BBB'] /= 2  # 2:1 분할 후 yfinance가 과거 종가를 모두 나눠서 줌
+    calls = []
+
+    def fake_download(tickers, period='2y', actions=False):
+        calls.append((tuple(tickers), period))
+        frame = split[list(tickers)]
+        splits = _no_actions(frame)
+        if period == '5d':
+            frame = frame.iloc[-2:]
+            splits = _no_actions(frame)
+            splits.loc[frame.index[-1], 'BBB'] = 2.0
+        return frame, _no_actions(frame), splits
+
+    monkeypatch.setattr(scanner, 'download_closes', fake_download)
+    panel.universe = lambda: list(closes.columns)
+    panel.build(closes.iloc[:-1])
+    assert panel.refresh() == 'appended 1, added 1'
+    assert calls[1] == (('BBB',), '5y')
+    np.testing.assert_allclose(panel.frame().to_numpy(), split.to_numpy(dtype=np.float32), rtol=1e-6)
+
+
+def test_panel_with_old_basis_is_ignored(panel):
+    panel.build(_closes())
+    meta_path = panel._path('panel.json')
+    with open(meta_path) as f:
+        meta = json.load(f)
+    del meta['basis']  # 예전 수정종가 패널
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    assert not panel.ready
+    panel.build(_closes(n_days=10))
+    assert panel.ready and panel.status()['rows'] == 10
+
+
+def test_refresh_refetches_unrecorded_tickers_with_prices(panel, monkeypatch, tmp_path):
+    from distribution_store import DistributionStore
+
+    closes = _closes()
+    closes['CCC'] = np.nan  # 상장폐지 등 값이 없는 열
+    store = DistributionStore(str(tmp_path / 'distributions'))
+    calls = []
+
+    def fake_download(tickers, period='2y', actions=False):
+        calls.append((tuple(tickers), period))
+        frame = closes[list(tickers)]
+        fetched = frame.loc[:, frame.notna().any()]
+        return frame, _no_actions(fetched), _no_actions(fetched)
+
+    monkeypatch.setattr(scanner, 'download_closes', fake_download)
+    monkeypatch.setattr('distribution_store.distribution_store', store)
+    panel.universe = lambda: list(closes.columns)
+    panel.build(closes)
+    # 분배 이력이 없는 AAA, BBB만 보관 기간 전체로 다시 받고, 값이 없는 CCC는 다시 받지 않음
+    assert panel.refresh() == 'appended 0, added 2'
+    assert calls[-1] == (('AAA', 'BBB'), '5y')
+    assert store.covers(['AAA', 'BBB']) and not store.covers(['CCC'])
+    assert panel.refresh() == 'appended 0'
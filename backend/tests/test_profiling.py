@@ -0,0 +1,54 @@
+import flask
+import pytest
+
+import profiling
+
+
+@pytest.fixture
+def profiled_app(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROFILE_ENABLED', 'true')
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    app = flask.Flask(__name__)
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+
+    profiling.init_app(app)
+    return app
+
+
+def _remote(addr):
+    return {'REMOTE_ADDR': addr}
+
+
+def test_without_token_rejects_everything_outside_debug(profiled_app, monkeypatch, tmp_path):
+    # 로컬 프록시 뒤에서는 외부 요청도 127.0.0.1로 보이므로 토큰 없이는 허용하지 않음
+    monkeypatch.delenv('PROFILE_TOKEN', raising=False)
+    client = profiled_app.test_client()
+    for addr in ('203.0.113.5', '127.0.0.1'):
+        assert client.post('/debug/profile/reset', environ_base=_remote(addr)).status_code == 403
+        client.get('/ping', headers={'X-Profile': 'cprofile'}, environ_base=_remote(addr))
+    assert not list(tmp_path.iterdir())
+
+
+def test_without_token_debug_allows_only_local_requests(profiled_app, monkeypatch, tmp_path):
+    monkeypatch.delenv('PROFILE_TOKEN', raising=False)
+    profiled_app.debug = True
+    client = profiled_app.test_client()
+    assert client.post('/debug/profile/reset', environ_base=_remote('203.0.113.5')).status_code == 403
+    client.get('/ping', headers={'X-Profile': 'cprofile'}, environ_base=_remote('203.0.113.5'))
+    assert not list(tmp_path.iterdir())
+
+    assert client.post('/debug/profile/reset', environ_base=_remote('127.0.0.1')).status_code == 200
+    client.get('/ping', headers={'X-Profile': 'cprofile'}, environ_base=_remote('127.0.0.1'))
+    assert list(tmp_path.iterdir())
+
+
+def test_token_required_when_set(profiled_app, monkeypatch):
+    monkeypatch.setenv('PROFILE_TOKEN', 'secret')
+    client = profiled_app.test_client()
+    assert client.get('/debug/profile/status', environ_base=_remote('127.0.0.1')).status_code == 403
+    assert client.get('/debug/profile/status', headers={'X-Profile-Token': 'wrong'}).status_code == 403
+    assert client.get('/debug/profile/status', headers={'X-Profile-Token': 'secret'},
+                      environ_base=_remote('203.0.113.5')).status_code == 200
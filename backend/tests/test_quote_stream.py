@@ -0,0 +1,40 @@
+import socket
+import time
+
+import pytest
+
+import quote_stream
+from quote_stream import Subscriber, limit_write_time
+
+
+def test_write_timeout_unblocks_slow_reader():
+    server, client = socket.socketpair()
+    try:
+        assert limit_write_time({'gunicorn.socket': server}, 0.2)
+        started = time.time()
+        with pytest.raises(socket.timeout):
+            while True:  # 상대가 읽지 않으므로 버퍼가 차면 sendall이 막힘
+                server.sendall(b'x' * 65536)
+        assert time.time() - started < 5
+    finally:
+        server.close()
+        client.close()
+
+
+def test_write_timeout_without_server_socket_is_noop():
+    assert not limit_write_time({}, 1)
+
+
+def test_subscriber_coalesces_per_ticker(monkeypatch):
+    monkeypatch.setattr(quote_stream, 'MIN_INTERVAL', 0)
+    subscriber = Subscriber(['069500', '229200'])
+    for price in (100, 101, 102):
+        subscriber.offer({'ticker': '069500', 'price': price})
+    subscriber.offer({'ticker': '229200', 'price': 50})
+    batch = subscriber.next_batch(0.1)
+    assert sorted((t['ticker'], t['price']) for t in batch) == [('069500', 102), ('229200', 50)]
+    assert subscriber.coalesced == 2
+    assert subscriber.next_batch(0.01) is None
+    subscriber.close()
+    with pytest.raises(ConnectionAbortedError):
+        subscriber.next_batch(0.01)
@@ -0,0 +1,173 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import resilience
+from resilience import CLOSED, HALF_OPEN, OPEN, Upstream, UpstreamUnavailable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class NotFound(Exception):
+    response = SimpleNamespace(status_code=404)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience, 'time', SimpleNamespace(time=clock.time))
+    return clock
+
+
+def _upstream(**overrides):
+    options = dict(timeout=5.0, max_concurrency=4, failure_threshold=2, failure_ratio=0.5, window_seconds=60,
+                   reset_seconds=30)
+    options.update(overrides)
+    return Upstream('test', **options)
+
+
+def _ok():
+    return 'ok'
+
+
+def _fail():
+    raise ConnectionError('down')
+
+
+def _calls(upstream, *fns):
+    for fn in fns:
+        try:
+            upstream.call('op', fn)
+        except Exception:
+            pass
+
+
+def test_opens_on_windowed_failure_ratio(clock):
+    upstream = _upstream()
+    _calls(upstream, _ok, _ok, _ok, _fail, _fail)
+    assert upstream.state == CLOSED  # 2/5 실패 < 50%
+    _calls(upstream, _fail)
+    assert upstream.state == OPEN  # 3/6
+    with pytest.raises(UpstreamUnavailable, match='circuit open'):
+        upstream.call('op', _ok)
+
+
+def test_old_outcomes_leave_the_window(clock):
+    upstream = _upstream()
+    _calls(upstream, _fail)
+    clock.now += 61
+    _calls(upstream, _fail)
+    assert (upstream.state, upstream.failures) == (CLOSED, 1)
+
+
+def test_half_open_allows_a_single_probe(clock):
+    upstream = _upstream(failure_threshold=1)
+    _calls(upstream, _fail)
+    assert upstream.state == OPEN
+    clock.now += 31
+    release, entered = threading.Event(), threading.Event()
+
+    def probe():
+        entered.set()
+        release.wait(5)
+        return 'ok'
+
+    result = []
+    worker = threading.Thread(target=lambda: result.append(upstream.call('op', probe)))
+    worker.start()
+    assert entered.wait(5)
+    assert upstream.state == HALF_OPEN
+    with pytest.raises(UpstreamUnavailable, match='circuit open'):
+        upstream.call('op', _ok)  # 시험 호출 중에는 다른 호출을 보내지 않음
+    release.set()
+    worker.join(5)
+    assert result == ['ok'] and upstream.state == CLOSED
+
+
+def test_failed_probe_reopens(clock):
+    upstream = _upstream(failure_threshold=1)
+    _calls(upstream, _fail)
+    clock.now += 31
+    _calls(upstream, _fail)
+    assert upstream.state == OPEN and upstream.opened_at == clock.now
+
+
+def test_late_success_does_not_close_open_breaker(clock):
+    upstream = _upstream()
+    release, entered = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(5)
+        return 'late'
+
+    result = []
+    worker = threading.Thread(target=lambda: result.append(upstream.call('op', slow)))
+    worker.start()
+    assert entered.wait(5)
+    _calls(upstream, _fail, _fail)
+    assert upstream.state == OPEN
+    release.set()
+    worker.join(5)
+    assert result == ['late'] and upstream.state == OPEN
+
+
+def test_bulkhead_rejects_when_full(clock, monkeypatch):
+    monkeypatch.setattr(resilience, 'BULKHEAD_WAIT', 0.01)
+    upstream = _upstream(max_concurrency=1)
+    release, entered = threading.Event(), threading.Event()
+
+    def hold():
+        entered.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=lambda: upstream.call('op', hold))
+    worker.start()
+    assert entered.wait(5)
+    with pytest.raises(UpstreamUnavailable, match='bulkhead full'):
+        upstream.call('op', _ok)
+    release.set()
+    worker.join(5)
+    assert upstream.rejected == 1 and upstream.failures == 0  # 포화는 업스트림 실패로 세지 않음
+
+
+def test_timeout_counts_as_failure(clock):
+    upstream = _upstream(failure_threshold=1)
+    release = threading.Event()
+    with pytest.raises(UpstreamUnavailable, match='timeout'):
+        upstream.call('op', release.wait, 5, call_timeout=0.05)
+    release.set()
+    assert upstream.state == OPEN and upstream.failures == 1
+
+
+def test_data_errors_do_not_trip(clock):
+    upstream = _upstream(failure_threshold=1)
+
+    def missing():
+        raise NotFound('no such symbol')
+
+    for _ in range(3):
+        with pytest.raises(NotFound):
+            upstream.call('op', missing)
+    assert (upstream.state, upstream.failures) == (CLOSED, 0)
+
+
+def test_fallback_serves_last_good_value(clock, monkeypatch):
+    monkeypatch.setitem(resilience.upstreams, 'test', _upstream(failure_threshold=10))
+    assert resilience.call_with_fallback('test', 'op', 'fallback-key', _ok) == ('ok', False)
+    assert resilience.call_with_fallback('test', 'op', 'fallback-key', _fail) == ('ok', True)
+    with pytest.raises(ConnectionError):
+        resilience.call_with_fallback('test', 'op', 'other-key', _fail)  # 정상값이 없으면 그대로 실패
+
+    def missing():
+        raise NotFound('gone')
+
+    with pytest.raises(NotFound):
+        resilience.call_with_fallback('test', 'op', 'fallback-key', missing)  # 데이터 없음은 대체하지 않음
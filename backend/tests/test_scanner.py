@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+import scanner
+from scanner import UniverseScanner
+
+
+def _closes(n_days=320, n_tickers=6, seed=1):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, size=(n_days, n_tickers)), axis=0))
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=n_days)
+    return pd.DataFrame(prices, index=dates, columns=[f"T{i}" for i in range(n_tickers)])
+
+
+def _small():
+    return UniverseScanner(fast=5, slow=20, breakout=30)
+
+
+def test_append_bar_matches_full_build():
+    closes = _closes()
+    incremental, full = _small(), _small()
+    incremental.build(closes.iloc[:-3])
+    for date, row in closes.iloc[-3:].iterrows():
+        assert incremental.append_bar(date, row)
+    full.build(closes)
+    np.testing.assert_allclose(incremental.window, full.window)
+    for rule in scanner.RULES:
+        np.testing.assert_array_equal(incremental.signals[rule], full.signals[rule])
+
+
+def test_same_day_bar_replaces_intraday_close():
+    closes = _closes()
+    partial = closes.iloc[-1] * 0.9
+    live, full = _small(), _small()
+    live.build(closes.iloc[:-1])
+    assert live.append_bar(closes.index[-1], partial)
+    assert not live.append_bar(closes.index[-1], closes.iloc[-1])  # 같은 날짜: 행 추가 없이 교체
+    assert not live.append_bar(closes.index[-2], closes.iloc[-2])  # 지난 날짜는 무시
+    full.build(closes)
+    np.testing.assert_allclose(live.window, full.window)
+    assert live.as_of == closes.index[-1]
+    for rule in scanner.RULES:
+        np.testing.assert_array_equal(live.signals[rule], full.signals[rule])
+
+
+def test_incremental_refresh_covers_gap_since_last_bar(monkeypatch):
+    closes = _closes()
+    periods = []
+
+    def fake_download(tickers, period='2y', actions=False):
+        periods.append(period)
+        return closes
+
+    monkeypatch.setattr(scanner, 'download_closes', fake_download)
+    monkeypatch.setattr(scanner, 'universe_scanner', _small())
+    monkeypatch.setattr(scanner.panel, 'covers', lambda tickers, start: False)
+    tickers = list(closes.columns)
+
+    scanner.refresh_universe(tickers)
+    assert periods == ['2y']
+    # 마지막 일봉에서 3주가 지났으면 '5d'가 아니라 공백을 덮는 기간으로 받음
+    scanner.universe_scanner.as_of = pd.Timestamp.today().normalize() - pd.Timedelta(days=21)
+    scanner.refresh_universe(tickers)
+    assert periods[-1] == '1mo'
+    # 스캔 기간보다 오래 비었으면 다시 빌드
+    scanner.universe_scanner.as_of = pd.Timestamp.today().normalize() - pd.DateOffset(years=3)
+    scanner.refresh_universe(tickers)
+    assert periods[-1] == '2y'
+    assert scanner.universe_scanner.as_of == closes.index[-1]
+
+
+def test_download_closes_leaves_out_tickers_without_prices(monkeypatch):
+    dates = pd.bdate_range(end='2025-10-17', periods=5)
+
+    def fake_download(chunk, **kwargs):
+        if chunk == ['C']:
+            return pd.DataFrame()  # 묶음 전체 실패
+        fields = {'Close': [[10.0, np.nan]] * 5, 'Dividends': [[0.0, 0.0]] * 4 + [[0.2, 0.0]],
+                  'Stock Splits': [[0.0, 0.0]] * 5}
+        return pd.concat({field: pd.DataFrame(values, index=dates, columns=chunk) for field, values in fields.items()},
+                         axis=1)
+
+    monkeypatch.setattr(scanner, 'DOWNLOAD_CHUNK', 2)
+    monkeypatch.setattr(scanner.yf, 'download', fake_download)
+    closes, dividends, splits = scanner.download_closes(['A', 'B', 'C'], '5d', actions=True)
+    assert list(closes.columns) == ['A', 'B', 'C']
+    # 종가가 없는 B(조회 실패), C(빈 묶음)는 '분배 없음'으로 기록되지 않도록 빠짐
+    assert list(dividends.columns) == ['A'] and list(splits.columns) == ['A']
+    assert dividends['A'].iloc[-1] == 0.2
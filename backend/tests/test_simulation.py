@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import simulation
+
+
+def _returns(n_assets=3, n_days=600, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(0.0003, 0.01, size=(n_days, n_assets)),
+                        columns=[f"A{i}" for i in range(n_assets)])
+
+
+def test_dca_contributions_stop_after_dca_years():
+    plan = {'method': 'dca', 'totalSeed': 1000, 'dcaAmount': 100, 'dcaIntervalDays': 365.25 / 12, 'dcaYears': 2}
+    schedule = simulation.contribution_schedule(plan, 10 * 12)
+    assert schedule[0] == pytest.approx(1100)
+    assert np.allclose(schedule[1:24], 100)
+    assert not schedule[24:].any()
+    # dcaYears가 없으면 전체 기간 납입
+    assert np.allclose(simulation.contribution_schedule({**plan, 'dcaYears': None}, 36)[1:], 100)
+
+
+def test_invested_plateaus_after_dca_years():
+    plan = {'method': 'dca', 'totalSeed': 0, 'dcaAmount': 100, 'dcaIntervalDays': 365.25 / 12, 'dcaYears': 1}
+    result = simulation.run_simulation(_returns(), np.ones(3), plan, years=5, n_paths=1000, seed=1)
+    assert result['months'] == 60
+    assert result['final']['invested'] == 1200
+
+
+@pytest.mark.parametrize('model', simulation.MODELS)
+def test_seeded_result_is_reproducible(model):
+    args = dict(plan={'totalSeed': 1000}, years=3, n_paths=2000, model=model, seed=7)
+    first = simulation.run_simulation(_returns(), np.ones(3), **args)
+    second = simulation.run_simulation(_returns(), np.ones(3), **args)
+    assert first['final'] == second['final']
+
+
+def test_bootstrap_matches_per_asset_expansion():
+    """구간별 포트폴리오 수익률을 뽑는 것이 자산별 구간 수익률을 뽑아 합친 것과 같음"""
+    returns, weights = _returns(), np.array([0.5, 0.3, 0.2])
+    blocks = simulation.monthly_blocks(returns.to_numpy())
+    months, paths = 24, 500
+    contributions = np.zeros(months)
+    contributions[0] = 1.0
+    record = np.arange(months)
+    seed = np.random.SeedSequence(5)
+    got = simulation._simulate_chunk((seed, paths, 'bootstrap', weights, None, None,
+                                      np.expm1(blocks) @ weights, contributions, record))
+    picks = np.random.default_rng(seed).integers(0, len(blocks), size=(paths, months))
+    expected = np.cumprod(1.0 + np.expm1(blocks[picks]) @ weights, axis=1)
+    np.testing.assert_allclose(got, expected.astype(np.float32), rtol=1e-5)
+
+
+def test_chunk_size_bounds_intermediate_arrays():
+    for months, assets in ((12, 1), (480, 20), (480, 100)):
+        for model in simulation.MODELS:
+            paths = simulation.chunk_paths(months, assets, model)
+            width = months if model == 'bootstrap' else months * assets
+            assert 1 <= paths <= simulation.CHUNK_PATHS
+            assert paths * width <= max(simulation.CHUNK_ELEMENTS, width)
+
+
+def test_route_rejects_too_many_assets(client):
+    assets = [{'ticker': f"T{i}", 'value': 1} for i in range(simulation.MAX_ASSETS + 1)]
+    response = client.post('/api/simulate', json={'plan': {'years': 5}, 'assets': assets})
+    assert response.status_code == 400
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from ticker_resolver import TickerResolver, UnknownTicker
+
+
+@pytest.fixture
+def resolver():
+    resolver = TickerResolver()
+    resolver.load_master(pd.DataFrame({'Ticker/Code': ['069500'], 'Name': ['KODEX 200']}),
+                         pd.DataFrame({'Ticker/Code': ['SPY'], 'Name': ['SPDR S&P 500']}))
+    return resolver
+
+
+def test_inputs_normalize_to_one_symbol(resolver):
+    for text in ('069500', '069500.KS', 'A069500', ' 069500.ks '):
+        symbol = resolver.resolve(text)
+        assert (symbol.yf, symbol.kis, symbol.display, symbol.listed) == ('069500.KS', '069500', '069500', True)
+    assert resolver.resolve('spy').yf == 'SPY'
+
+
+def test_lookup_tries_kosdaq_and_remembers(resolver):
+    probed = []
+
+    def probe(symbol):
+        probed.append(symbol.yf)
+        return 'data' if symbol.yf.endswith('.KQ') else None
+
+    symbol, result = resolver.lookup('247540', probe)
+    assert (symbol.yf, result) == ('247540.KQ', 'data')
+    assert probed == ['247540.KS', '247540.KQ']
+    assert resolver.known('247540.kq').yf == '247540.KQ'
+
+
+def test_misses_are_cached(resolver):
+    with pytest.raises(UnknownTicker):
+        resolver.lookup('999999', lambda symbol: None)
+    with pytest.raises(UnknownTicker):
+        resolver.resolve('999999')  # 업스트림을 다시 부르지 않음
+    with pytest.raises(UnknownTicker):
+        resolver.resolve('@@@')
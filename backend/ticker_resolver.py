@@ -0,0 +1,168 @@
+"""
+티커 해석기: 사용자 입력 -> yfinance / KIS / 화면 표시용 심볼
+
+- 마스터 CSV(국내/해외 ETF 목록)로 만든 색인과 조회로 알게 된 심볼을 dict 조회 한 번으로 찾음
+  ('069500', '069500.KS', 'A069500', 'spy' 모두 같은 항목)
+- 마스터에 없는 국내 6자리 코드는 .KS -> .KQ 순으로 후보를 시도하고(lookup),
+  실제로 데이터가 나온 심볼을 기억해 다음부터는 바로 찾음
+- 모든 후보가 '데이터 없음'이면 RESOLVER_MISS_TTL초(기본 1시간) 동안 기억해
+  같은 입력은 업스트림을 부르지 않고 바로 UnknownTicker
+"""
+
+import logging
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+import resilience
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MISS_TTL = float(os.getenv('RESOLVER_MISS_TTL', 3600))
+
+_SYMBOL_PATTERN = re.compile(r'^[A-Z0-9^][A-Z0-9.\-=^]{0,19}$')
+_DOMESTIC_CODE = re.compile(r'^A?(\d{6})(?:\.(KS|KQ))?$')
+
+
+class Symbol(NamedTuple):
+    yf: str             # yfinance 심볼 (069500.KS, 247540.KQ, SPY)
+    kis: Optional[str]  # KIS 종목코드 (국내만)
+    display: str        # 화면 표시 / 캐시 키 (069500, SPY)
+    name: Optional[str]
+    market: str         # 'domestic' | 'overseas'
+    listed: bool        # 마스터에 있거나 조회로 확인된 심볼인지 (False면 추측한 후보)
+
+
+class UnknownTicker(Exception):
+    """형식이 잘못됐거나 최근 조회에서 데이터가 없었던 티커"""
+
+    def __init__(self, ticker: str, reason: str):
+        super().__init__(f"unknown ticker {ticker!r}: {reason}")
+        self.ticker = ticker
+        self.reason = reason
+
+
+def normalize(text: Any) -> str:
+    """색인 키: 앞뒤 공백 제거 + 대문자, 국내 코드는 'A' 접두사와 .KS/.KQ 접미사를 뗀 6자리"""
+    key = str(text).strip().upper()
+    match = _DOMESTIC_CODE.match(key)
+    return match.group(1) if match else key
+
+
+def _miss_key(text: Any) -> str:
+    # '247540.KS'가 없다고 '247540'(.KQ 포함)까지 막지 않도록 접미사를 유지
+    return str(text).strip().upper()
+
+
+def build_index(korean_df: pd.DataFrame, overseas_df: pd.DataFrame) -> Dict[str, Symbol]:
+    """마스터 데이터프레임(Ticker/Code, Name 컬럼)으로 색인 생성
+
+    티커는 intern해서 마스터 fingerprint의 키와 같은 문자열 객체를 공유 (워커 fork 후 공유 메모리 유지)
+    """
+    index: Dict[str, Symbol] = {}
+    if not overseas_df.empty:
+        for code, name in zip(overseas_df['Ticker/Code'], overseas_df['Name']):
+            code = sys.intern(str(code).strip().upper())
+            if code and code != 'NAN':
+                index[code] = Symbol(code, None, code, name if isinstance(name, str) else None, 'overseas', True)
+    # 국내 ETF는 모두 유가증권시장(.KS) 상장
+    if not korean_df.empty:
+        for code, name in zip(korean_df['Ticker/Code'], korean_df['Name']):
+            code = sys.intern(str(code).strip())
+            if code.isdigit():
+                index[code] = Symbol(f"{code}.KS", code, code, name, 'domestic', True)
+    return index
+
+
+class TickerResolver:
+    def __init__(self, miss_ttl: float = MISS_TTL):
+        self._index: Dict[str, Symbol] = {}
+        self.learned = TTLCache('ticker_learned', ttl=7 * 24 * 3600, maxsize=4096)
+        self.misses = TTLCache('ticker_misses', ttl=miss_ttl, maxsize=8192)
+
+    def load_master(self, korean_df: pd.DataFrame, overseas_df: pd.DataFrame) -> None:
+        # 새 dict를 다 만든 뒤 참조만 교체하므로 조회 중인 요청은 이전 색인을 그대로 봄
+        self._index = build_index(korean_df, overseas_df)
+        logger.info("[resolver] indexed %d master symbols", len(self._index))
+
+    def known(self, text: Any) -> Optional[Symbol]:
+        """마스터 또는 학습된 심볼 (없으면 None, 업스트림 호출 없음)"""
+        key = normalize(text)
+        return self._index.get(key) or self.learned.get(key)
+
+    def resolve(self, text: Any) -> Symbol:
+        """입력을 심볼로 변환. 모르는 입력은 첫 번째 후보(listed=False)를 반환
+
+        형식이 잘못됐거나 최근에 데이터가 없었던 입력은 UnknownTicker.
+        """
+        symbol = self.known(text)
+        if symbol is not None:
+            return symbol
+        if self.misses.get(_miss_key(text)) is not None:
+            raise UnknownTicker(str(text), 'no data (cached)')
+        candidates = self.candidates(text)
+        if not candidates:
+            raise UnknownTicker(str(text), 'invalid symbol')
+        return candidates[0]
+
+    def candidates(self, text: Any) -> List[Symbol]:
+        """마스터에 없는 입력에 대해 시도해 볼 심볼 (국내 코드는 .KS, .KQ 순)"""
+        key = str(text).strip().upper()
+        match = _DOMESTIC_CODE.match(key)
+        if match:
+            code, suffix = match.groups()
+            suffixes = [suffix] if suffix else ['KS', 'KQ']
+            return [Symbol(f"{code}.{s}", code, code, None, 'domestic', False) for s in suffixes]
+        if not _SYMBOL_PATTERN.match(key):
+            return []
+        return [Symbol(key, None, key, None, 'overseas', False)]
+
+    def learn(self, text: Any, symbol: Symbol) -> None:
+        self.learned.set(normalize(text), symbol._replace(listed=True))
+
+    def forget(self, codes: set) -> int:
+        """해당 티커들의 학습/미스 기록 삭제 (마스터 변경 시). 삭제한 개수 반환"""
+        return (self.learned.discard(lambda key: key in codes)
+                + self.misses.discard(lambda key: normalize(key) in codes))
+
+    def record_miss(self, text: Any) -> None:
+        self.misses.set(_miss_key(text), True)
+
+    def lookup(self, text: Any, probe: Callable[[Symbol], Any]) -> Tuple[Symbol, Any]:
+        """probe(심볼)로 데이터를 가져오며 해석. (심볼, probe 결과) 반환
+
+        알고 있는 심볼은 바로 probe하고, 모르는 입력은 후보를 차례로 시도합니다.
+        probe가 None을 돌려주거나 '데이터 없음' 예외를 내면 다음 후보로 넘어가고,
+        모두 실패하면 입력을 miss로 기억한 뒤 UnknownTicker.
+        업스트림 장애(UpstreamUnavailable 등)는 miss로 기억하지 않고 그대로 올림.
+        """
+        symbol = self.known(text)
+        if symbol is not None:
+            return symbol, probe(symbol)
+
+        self.resolve(text)  # 형식 오류 / 최근 miss면 여기서 UnknownTicker
+        reason = 'no data'
+        for candidate in self.candidates(text):
+            try:
+                result = probe(candidate)
+            except Exception as e:
+                if not resilience.is_data_error(e):
+                    raise
+                reason = f"{type(e).__name__}: {e}"[:200]
+                continue
+            if result is not None:
+                self.learn(text, candidate)
+                return candidate, result
+        logger.info("[resolver] %r not found (%s), remembering for %ss", text, reason, self.misses.ttl)
+        self.record_miss(text)
+        raise UnknownTicker(str(text), reason)
+
+    def status(self) -> Dict[str, int]:
+        return {'master': len(self._index), 'learned': len(self.learned), 'misses': len(self.misses)}
+
+
+resolver = TickerResolver()
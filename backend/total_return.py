@@ -0,0 +1,191 @@
+"""
+비교 차트용 총수익(분배금 재투자) 지수 + 통화 환산 (/api/etf/compare-series)
+
+- 총수익 지수: 실제 종가 P와 분배금 D로 TR_t = TR_{t-1} * (P_t + D_t) / P_{t-1} (배열 누적곱 한 번)
+  mode='price'면 분배금 없이 가격만
+- 통화 환산: 로컬에 저장한 USD/KRW 일별 환율(yfinance KRW=X)로 기준 통화(KRW/USD)로 바꿈
+  환율은 FX_STORE_PATH(기본 snapshots/fx/USDKRW.npz, 빈 값이면 메모리만)에 저장하고
+  FX_REFRESH_SECONDS(기본 6시간)마다 새로 받아 합침. 업스트림 장애 시 저장된 환율 사용
+- 티커별 환산 지수는 (티커, 통화, 시작일, mode)로 캐시하고, 비교 요청은 캐시된 열을 날짜 합집합에 맞춰
+  앞 값으로 채운 뒤 공통 시작일(모든 티커에 값이 있는 첫날)에서 100으로 다시 맞추기만 함
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache
+from history_store import get_history
+from price_panel import period_start
+from ticker_resolver import Symbol
+
+logger = logging.getLogger(__name__)
+
+CURRENCIES = ('KRW', 'USD', 'LOCAL')   # LOCAL: 환산하지 않음
+MODES = ('total', 'price')
+FX_SYMBOL = 'KRW=X'                    # 1 USD당 원화
+FX_PATH = os.getenv('FX_STORE_PATH', os.path.join(os.path.dirname(__file__), 'snapshots', 'fx', 'USDKRW.npz'))
+FX_REFRESH_SECONDS = float(os.getenv('FX_REFRESH_SECONDS', 6 * 3600))
+# 시작일을 덮는 가장 짧은 yfinance 기간으로 히스토리를 받음
+FETCH_PERIODS = ('1mo', '3mo', '6mo', '1y', '2y', '5y', '10y')
+
+# 키: (yfinance 심볼, 통화, 시작일 YYYY-MM-DD, mode) -> 시작일부터의 환산 지수 (첫 값 100)
+series_cache = TTLCache('total_return', ttl=600, maxsize=2048)
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+class RatesUnavailable(Exception):
+    """저장된 환율이 없고 새로 받지도 못함"""
+
+
+def currency_of(symbol: Symbol) -> str:
+    return 'KRW' if symbol.market == 'domestic' else 'USD'
+
+
+def fetch_period(start: pd.Timestamp) -> str:
+    for period in FETCH_PERIODS:
+        if period_start(period) <= start:
+            return period
+    return 'max'
+
+
+def total_return_index(close: np.ndarray, dividends: Optional[np.ndarray] = None) -> np.ndarray:
+    """실제 종가(+분배금)로 첫 값 1인 지수 (분배금은 지급일 종가에 더해 재투자)"""
+    growth = np.ones(len(close), dtype=np.float64)
+    if len(close) > 1:
+        paid = close[1:] if dividends is None else close[1:] + dividends[1:]
+        growth[1:] = paid / close[:-1]
+    return np.cumprod(growth)
+
+
+class FxRates:
+    """USD/KRW 일별 환율 (디스크 저장 + 주기적으로 새 날짜만 합침)"""
+
+    def __init__(self, path: str = FX_PATH, refresh_seconds: float = FX_REFRESH_SECONDS):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._rates: Optional[pd.Series] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self) -> Optional[pd.Series]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        with np.load(self.path, allow_pickle=False) as npz:
+            days, rates = npz['days'], npz['rates']
+        return pd.Series(rates, index=pd.DatetimeIndex((_EPOCH + days).astype('datetime64[ns]')), name=FX_SYMBOL)
+
+    def _save(self, rates: pd.Series) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        days = (rates.index.values.astype('datetime64[D]') - _EPOCH).astype(np.int32)
+        tmp = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, days=days, rates=rates.to_numpy(dtype=np.float64))
+        os.replace(tmp, self.path)
+
+    def _fetch(self, since: Optional[pd.Timestamp]) -> pd.Series:
+        period = '10y' if since is None else fetch_period(since)
+        close = get_history(FX_SYMBOL, period)['Close'].dropna()
+        index = pd.DatetimeIndex(close.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return pd.Series(close.to_numpy(dtype=np.float64), index=index.normalize(), name=FX_SYMBOL)
+
+    def rates(self) -> pd.Series:
+        """날짜 오름차순 환율. 새로 받지 못하면 저장된 값, 그것도 없으면 예외"""
+        if self._rates is not None and time.time() - self._checked_at < self.refresh_seconds:
+            return self._rates
+        with self._lock:
+            if self._rates is not None and time.time() - self._checked_at < self.refresh_seconds:
+                return self._rates
+            stored = self._rates if self._rates is not None else self._load()
+            # 다른 워커가 방금 저장했으면 업스트림을 다시 부르지 않음
+            fresh = (stored is not None and self.path and os.path.exists(self.path)
+                     and time.time() - os.stat(self.path).st_mtime < self.refresh_seconds)
+            if not fresh:
+                try:
+                    latest = self._fetch(None if stored is None else stored.index[-1])
+                    merged = latest if stored is None else latest.combine_first(stored)
+                    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    if len(merged):
+                        self._save(merged)
+                        stored = merged
+                except Exception as e:
+                    if stored is None:
+                        raise RatesUnavailable(f"USD/KRW rates: {e}") from e
+                    logger.warning("[fx] refresh failed, using stored rates until %s: %s",
+                                   stored.index[-1].date(), e)
+            if stored is None or stored.empty:
+                raise RatesUnavailable('no USD/KRW rates')
+            self._rates, self._checked_at = stored, time.time()
+            return stored
+
+
+fx = FxRates()
+
+
+def _convert(values: np.ndarray, dates: pd.DatetimeIndex, source: str, target: str) -> np.ndarray:
+    if target == 'LOCAL' or source == target:
+        return values
+    rates = fx.rates()
+    # 환율이 없는 날(양국 휴장일 차이)은 직전 환율
+    rates = rates.reindex(rates.index.union(dates)).ffill().bfill().reindex(dates).to_numpy()
+    return values * rates if target == 'KRW' else values / rates
+
+
+def series(symbol: Symbol, currency: str, start: pd.Timestamp, mode: str = 'total') -> Optional[pd.Series]:
+    """시작일부터의 (총수익 / 가격) 지수를 기준 통화로 환산해 첫 값 100으로 맞춘 일별 시계열 (데이터 없으면 None)"""
+    key = (symbol.yf, currency, start.strftime('%Y-%m-%d'), mode)
+    cached = series_cache.get(key)
+    if cached is not None:
+        return cached
+
+    hist = get_history(symbol.display, fetch_period(start), adjusted=False)
+    hist = hist[hist['Close'] > 0]
+    if hist.empty:
+        return None
+    dates = pd.DatetimeIndex(hist.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    dates = dates.normalize()
+    # 시작일 직전 거래일부터 (시작일이 휴장일이어도 첫 값이 시작일 기준이 되도록)
+    first = max(int(np.searchsorted(dates, start, side='right')) - 1, 0)
+    close = hist['Close'].to_numpy(dtype=np.float64)[first:]
+    dividends = None
+    if mode == 'total' and 'Dividends' in hist:
+        dividends = hist['Dividends'].fillna(0).to_numpy(dtype=np.float64)[first:]
+    dates = dates[first:]
+
+    values = _convert(total_return_index(close, dividends) * close[0], dates, currency_of(symbol), currency)
+    result = pd.Series(values / values[0] * 100, index=dates, name=symbol.display)
+    result = result[~result.index.duplicated(keep='last')]
+    series_cache.set(key, result)
+    return result
+
+
+def compare(columns: List[pd.Series]) -> Dict:
+    """티커별 지수를 날짜 합집합에 맞추고 공통 시작일에서 100으로 다시 맞춤 (휴장일은 앞 값 유지)
+
+    같은 심볼로 해석된 입력(069500 / 069500.KS)은 시계열 이름이 같으므로 첫 열만 사용
+    """
+    unique = {}
+    for column in columns:
+        unique.setdefault(column.name, column)
+    columns = list(unique.values())
+    frame = pd.concat(columns, axis=1, sort=True).ffill()
+    common = max(column.index[0] for column in columns)
+    frame = frame[frame.index >= common]
+    values = frame.to_numpy(dtype=np.float64)
+    rebased = np.round(values / values[0] * 100, 4)
+    return {
+        'start': common.strftime('%Y-%m-%d'),
+        'dates': frame.index.strftime('%Y-%m-%d').tolist(),
+        'series': {name: rebased[:, i].tolist() for i, name in enumerate(frame.columns)},
+    }
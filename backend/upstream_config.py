@@ -0,0 +1,86 @@
+"""
+업스트림 주소 재정의 (부하 테스트용 대역 서버 연결)
+
+- YF_BASE_URL: 설정 시 yfinance의 *.yahoo.com 요청을 `{YF_BASE_URL}/{원래 호스트}{경로}`로 보냄
+- GEMINI_BASE_URL: 설정 시 Gemini를 REST 전송으로 해당 주소에 호출
+- KIS는 기존 KIS_BASE_URL 환경변수를 그대로 사용
+
+gevent 워커(monkey patch)에서는 패치된 소켓 위에서 동작하는 클라이언트만 사용:
+- yfinance: 기본 curl_cffi 세션은 C 레벨에서 블로킹되어 허브 전체를 멈추므로 requests 세션으로 교체
+- Gemini: gRPC 전송 대신 REST 전송
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+
+class _RedirectingSession(requests.Session):
+    """yahoo.com 호스트 요청만 대역 서버로 재작성하는 세션"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        if parts.hostname and parts.hostname.endswith('yahoo.com'):
+            url = f"{self.base_url}/{parts.hostname}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else '')
+        return super().request(method, url, *args, **kwargs)
+
+
+def gevent_patched() -> bool:
+    """gevent monkey patch가 적용된 프로세스인지 (gunicorn -k gevent)"""
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey
+
+    return monkey.is_module_patched('socket')
+
+
+_yf_session: Optional[requests.Session] = None
+
+
+def install_yfinance_session(session: requests.Session) -> None:
+    global _yf_session
+    from yfinance.data import YfData
+
+    _yf_session = session
+    YfData(session=session)
+
+
+def yf_download_kwargs() -> Dict:
+    """yf.download()에 넘길 추가 인자
+
+    yf.download()는 session을 주지 않으면 새 기본 세션을 만들어 전역 세션을 덮어쓰므로
+    설치한 세션이 있으면 명시적으로 넘겨야 함
+    """
+    return {'session': _yf_session} if _yf_session is not None else {}
+
+
+def gemini_configure_kwargs() -> Dict:
+    """genai.configure()에 추가로 넘길 인자 (재정의가 필요 없으면 빈 dict)"""
+    kwargs: Dict = {}
+    base_url: Optional[str] = os.getenv('GEMINI_BASE_URL')
+    if base_url:
+        kwargs['client_options'] = {'api_endpoint': base_url.rstrip('/')}
+    if base_url or gevent_patched():
+        kwargs['transport'] = 'rest'
+    return kwargs
+
+
+def configure_upstreams() -> None:
+    import yfinance as yf
+
+    # yfinance는 기본적으로 전송 오류를 삼키고 빈 결과를 돌려주므로 예외로 올려
+    # resilience 브레이커가 장애와 '데이터 없음'(YFTickerMissingError 등)을 구분할 수 있게 함
+    yf.config.debug.hide_exceptions = False
+
+    base_url = os.getenv('YF_BASE_URL')
+    if base_url:
+        install_yfinance_session(_RedirectingSession(base_url))
+    elif gevent_patched():
+        install_yfinance_session(requests.Session())
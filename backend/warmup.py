@@ -0,0 +1,129 @@
+"""
+무거운 의존성 지연 로딩 + 백그라운드 워밍업 (콜드 스타트 / gunicorn 워커 생성 시간 단축)
+
+- yfinance(~0.6초), google.generativeai(~0.8초)는 import만으로 워커 시작 시간의 대부분을 차지하므로
+  모듈 최상단에서 import하지 않고 `from warmup import yf, genai`로 받아 처음 속성에 접근할 때 불러옴
+  처음 불러올 때 한 번만 설정 실행 (yfinance: 업스트림 세션/예외 설정, Gemini: GEMINI_API_KEY)
+- start(): 워커가 뜨자마자 백그라운드 스레드에서 위 SDK와 라우트 안에서 import하는 모듈을 미리 불러와
+  첫 요청이 import를 기다리지 않게 함 (WARMUP_ON_START=false면 끄고 첫 사용 시 불러옴)
+- alive(요청을 받을 수 있음)와 warm(미리 불러올 모듈을 모두 불러옴)을 구분해 /readyz에서 보고
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from upstream_config import configure_upstreams, gemini_configure_kwargs
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'true').lower() != 'false'
+
+# 라우트 안에서 지연 import하는 모듈 (워밍업 때 미리 불러옴)
+ROUTE_MODULES = ['kis_api', 'history_store', 'indicators', 'scanner', 'simulation', 'optimizer',
+                 'lookthrough', 'quote_stream', 'fund_metrics', 'total_return']
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 import (+ 설정)하는 모듈 대리자 (스레드 안전)"""
+
+    def __init__(self, name: str, setup: Optional[Callable] = None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+        self._lock = threading.Lock()
+        self.load_ms: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    if self._setup is not None:
+                        self._setup(module)
+                    self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+                    self._module = module
+                    logger.info("[warmup] loaded %s in %.0fms", self._name, self.load_ms)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def _configure_gemini(module) -> None:
+    api_key = os.getenv('GEMINI_API_KEY')
+    if api_key:
+        module.configure(api_key=api_key, **gemini_configure_kwargs())
+
+
+yf = LazyModule('yfinance', setup=lambda module: configure_upstreams())
+genai = LazyModule('google.generativeai', setup=_configure_gemini)
+
+_started_at = time.time()
+_warm = threading.Event()
+_thread: Optional[threading.Thread] = None
+_route_modules_ms: Dict[str, float] = {}
+_errors: Dict[str, str] = {}
+
+
+def warm_up() -> None:
+    """SDK와 라우트 모듈을 모두 불러옴 (실패한 모듈은 기록만 하고 첫 사용 시 다시 시도)"""
+    started = time.perf_counter()
+    for lazy in (yf, genai):
+        try:
+            lazy.load()
+        except Exception as e:
+            _errors[lazy._name] = f"{type(e).__name__}: {e}"[:300]
+    for name in ROUTE_MODULES:
+        module_started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            _route_modules_ms[name] = round((time.perf_counter() - module_started) * 1000, 1)
+        except Exception as e:
+            _errors[name] = f"{type(e).__name__}: {e}"[:300]
+    if _errors:
+        logger.warning("[warmup] failed to preload %s", _errors)
+    logger.info("[warmup] warm in %.0fms", (time.perf_counter() - started) * 1000)
+    _warm.set()
+
+
+def start() -> None:
+    """백그라운드 워밍업 시작 (프로세스당 한 번, WARMUP_ON_START=false면 바로 warm으로 표시)"""
+    global _thread
+    if not WARMUP_ON_START:
+        _warm.set()  # 미리 불러오지 않으면 기다릴 것도 없음 (첫 사용 시 불러옴)
+        return
+    if _thread is not None or is_warm():
+        return
+    _thread = threading.Thread(target=warm_up, name='warmup', daemon=True)
+    _thread.start()
+
+
+def is_warm() -> bool:
+    return _warm.is_set()
+
+
+def wait(timeout: Optional[float] = None) -> bool:
+    return _warm.wait(timeout)
+
+
+def status() -> Dict:
+    return {
+        'warm': is_warm(),
+        'uptimeSeconds': round(time.time() - _started_at, 1),
+        'sdks': {lazy._name: lazy.load_ms for lazy in (yf, genai)},
+        'routeModules': dict(_route_modules_ms),
+        'errors': dict(_errors),
+        'warmupOnStart': WARMUP_ON_START,
+    }
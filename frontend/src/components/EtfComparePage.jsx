@@ -112,8 +112,8 @@ const buildRealComparisonData = async (tickers) => {
             currentPrice: '₩30,000', // 실제 데이터에서는 price 정보가 없으므로 기본값
             priceChange: '+0.35%',
             holdings: data.holdings.slice(0, 5).map(h => ({
-              name: h.name || h.Stock || 'Unknown',
-              value: h.weight || h.Weight || 0
+              name: h.stockName || h.stockCode || 'Unknown',
+              value: h.weight || 0
             }))
           }
         } catch (error) {
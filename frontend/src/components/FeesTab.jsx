@@ -42,19 +42,28 @@ const FeesTab = ({ rows = [] }) => {
     fetchFeesData()
   }, [rows])
 
+  // 데이터가 없는 항목(총보수 미공시, 상장 5년 미만 등)은 null로 옴
+  const formatPercent = (value, digits, signed = false) => {
+    if (value === null || value === undefined) return '-'
+    return `${signed && value >= 0 ? '+' : ''}${value.toFixed(digits)}%`
+  }
+
   const getFeeLevel = (fee) => {
+    if (fee === null || fee === undefined) return { level: '정보 없음', color: 'default' }
     if (fee <= 0.05) return { level: '낮음', color: 'success' }
     if (fee <= 0.10) return { level: '보통', color: 'warning' }
     return { level: '높음', color: 'error' }
   }
 
   const getDividendLevel = (dividend) => {
+    if (dividend === null || dividend === undefined) return { level: '정보 없음', color: 'default' }
     if (dividend >= 3.0) return { level: '높음', color: 'success' }
     if (dividend >= 1.5) return { level: '보통', color: 'warning' }
     return { level: '낮음', color: 'error' }
   }
 
   const getPerformanceColor = (returnValue) => {
+    if (returnValue === null || returnValue === undefined) return 'white'
     return returnValue >= 0 ? 'success.main' : 'error.main'
   }
 
@@ -129,7 +138,7 @@ const FeesTab = ({ rows = [] }) => {
                   <TableCell sx={{ color: 'white', borderColor: '#2a2f55' }}>
                     <Box display="flex" alignItems="center" gap={1}>
                       <Typography variant="body2">
-                        {(etf.fees.totalExpenseRatio * 100).toFixed(2)}%
+                        {formatPercent(etf.fees.totalExpenseRatio, 2)}
                       </Typography>
                       <Chip 
                         label={feeLevel.level} 
@@ -144,7 +153,7 @@ const FeesTab = ({ rows = [] }) => {
                   <TableCell sx={{ color: 'white', borderColor: '#2a2f55' }}>
                     <Box display="flex" alignItems="center" gap={1}>
                       <Typography variant="body2">
-                        {etf.dividend.dividendYield.toFixed(1)}%
+                        {formatPercent(etf.dividend.dividendYield, 2)}
                       </Typography>
                       <Chip 
                         label={dividendLevel.level} 
@@ -158,20 +167,20 @@ const FeesTab = ({ rows = [] }) => {
                   
                   <TableCell sx={{ color: getPerformanceColor(etf.performance.ytdReturn), borderColor: '#2a2f55' }}>
                     <Typography variant="body2" sx={{ fontWeight: 'bold' }}>
-                      {etf.performance.ytdReturn >= 0 ? '+' : ''}{etf.performance.ytdReturn.toFixed(1)}%
+                      {formatPercent(etf.performance.ytdReturn, 1, true)}
                     </Typography>
                   </TableCell>
                   
                   <TableCell sx={{ color: getPerformanceColor(etf.performance.oneYearReturn), borderColor: '#2a2f55' }}>
                     <Typography variant="body2" sx={{ fontWeight: 'bold' }}>
-                      {etf.performance.oneYearReturn >= 0 ? '+' : ''}{etf.performance.oneYearReturn.toFixed(1)}%
+                      {formatPercent(etf.performance.oneYearReturn, 1, true)}
                     </Typography>
                   </TableCell>
                   
                   <TableCell sx={{ color: 'white', borderColor: '#2a2f55' }}>
                     <Box>
                       <Typography variant="body2">
-                        {etf.dividend.lastDividend.toLocaleString()}원
+                        {etf.dividend.lastDividend === null ? '-' : `${etf.dividend.lastDividend.toLocaleString()}${etf.currency === 'USD' ? ' USD' : '원'}`}
                       </Typography>
                       <Typography variant="caption" sx={{ color: '#9aa4d4' }}>
                         {etf.dividend.dividendDate}
@@ -191,10 +200,10 @@ const FeesTab = ({ rows = [] }) => {
           📊 수수료 및 배당금 정보 안내:
         </Typography>
         <Typography variant="caption" sx={{ color: '#9aa4d4', display: 'block', mb: 0.5 }}>
-          • 총 보수율: 연간 관리비 + 보관비 + 기타 비용
+          • 총 보수율: 운용보고서 기준 연간 총비용 비율
         </Typography>
         <Typography variant="caption" sx={{ color: '#9aa4d4', display: 'block', mb: 0.5 }}>
-          • 배당수익률: 연간 배당금 / 현재 주가 × 100
+          • 배당수익률: 최근 12개월 분배금 합계 / 현재 주가 × 100
         </Typography>
         <Typography variant="caption" sx={{ color: '#9aa4d4', display: 'block' }}>
           • 수익률은 과거 실적이며 미래 수익을 보장하지 않습니다
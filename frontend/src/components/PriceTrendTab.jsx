@@ -3,9 +3,12 @@ import { Box, Typography, CircularProgress, Alert, Button, ButtonGroup } from '@
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
 
 const LINE_COLORS = ['#5B8DEF', '#22C55E', '#F59E0B', '#EF4444', '#8B5CF6']
+const PERIOD_PARAMS = { '1m': '1mo', '3m': '3mo', '6m': '6mo', '1y': '1y' }
 
 const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
   const [data, setData] = useState([])
+  const [lines, setLines] = useState([])
+  const [failed, setFailed] = useState([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
   const [selectedPeriod, setSelectedPeriod] = useState(period)
@@ -15,6 +18,8 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
     const fetchData = async () => {
       if (!etfs || etfs.length === 0) {
         setData([])
+        setLines([])
+        setFailed([])
         return
       }
 
@@ -22,24 +27,30 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
       setError(null)
 
       try {
-        // 여러 ETF의 주가 히스토리를 병렬로 가져오기
-        const promises = etfs.map(async (etf) => {
-          const ticker = etf.ticker || etf
-          console.log(`🔍 Fetching price history for ticker: ${ticker}`)
-          const response = await fetch(`http://localhost:5000/api/etf/${ticker}/price-history?period=${selectedPeriod}`)
-          if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`)
-          const data = await response.json()
-          console.log(`✅ Received price history for ${ticker}:`, data)
-          return data
+        // 총수익(분배금 재투자) 지수를 원화로 환산해 공통 시작일 기준 100으로 맞춘 시계열을 한 번에 가져오기
+        const tickers = etfs.map(etf => etf.ticker || etf)
+        const params = new URLSearchParams({
+          tickers: tickers.join(','),
+          period: PERIOD_PARAMS[selectedPeriod] || '1y',
+          currency: 'KRW',
+          mode: 'total'
         })
+        const response = await fetch(`http://localhost:5000/api/etf/compare-series?${params}`)
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`)
+        const result = await response.json()
 
-        const results = await Promise.all(promises)
-        console.log('📊 All price history results:', results)
-        
-        // 데이터를 차트용 형태로 변환
-        const chartData = transformDataForChart(results, etfs)
-        console.log('📈 Transformed chart data:', chartData)
-        setData(chartData)
+        // 시계열은 백엔드가 해석한 이름(069500.KS -> 069500)으로 오므로 입력 티커를 그 이름에 연결
+        const seen = new Set()
+        const resolved = []
+        etfs.forEach(etf => {
+          const key = result.symbols?.[String(etf.ticker || etf).toUpperCase()]
+          if (!key || seen.has(key) || !result.series[key]) return
+          seen.add(key)
+          resolved.push({ key, name: etf.name || etf.ticker || etf, color: LINE_COLORS[resolved.length % LINE_COLORS.length] })
+        })
+        setLines(resolved)
+        setFailed(Object.keys(result.errors || {}))
+        setData(transformDataForChart(result))
       } catch (err) {
         console.error('Failed to fetch price trend data:', err)
         setError('데이터를 불러올 수 없습니다.')
@@ -51,40 +62,13 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
     fetchData()
   }, [etfs, selectedPeriod])
 
-  const transformDataForChart = (results, etfs) => {
-    // 모든 날짜를 수집
-    const allDates = new Set()
-    results.forEach(result => {
-      result.priceHistory.forEach(item => allDates.add(item.date))
-    })
-    
-    const sortedDates = Array.from(allDates).sort()
-    
-    // 각 날짜별로 데이터 구성
-    return sortedDates.map(date => {
+  // 100 기준 지수 -> 공통 시작일 대비 변화율(%)
+  const transformDataForChart = (result) => {
+    return result.dates.map((date, i) => {
       const dataPoint = { date }
-      
-      results.forEach((result, index) => {
-        const etf = etfs[index]
-        const ticker = etf.ticker || etf
-        const name = etf.name || etf
-        
-        // 해당 날짜의 데이터 찾기
-        const dayData = result.priceHistory.find(item => item.date === date)
-        if (dayData) {
-          // 첫 번째 날짜를 기준으로 100%로 설정하고 상대적 변화율 계산
-          if (index === 0 && sortedDates.indexOf(date) === 0) {
-            dataPoint[`${ticker}_base`] = dayData.close
-          }
-          
-          const basePrice = dataPoint[`${ticker}_base`] || result.priceHistory[0].close
-          const changePercent = ((dayData.close - basePrice) / basePrice) * 100
-          
-          dataPoint[ticker] = changePercent
-          dataPoint[`${ticker}_name`] = name
-        }
+      Object.entries(result.series).forEach(([ticker, values]) => {
+        dataPoint[ticker] = values[i] - 100
       })
-      
       return dataPoint
     })
   }
@@ -109,7 +93,7 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
           </Typography>
           {payload.map((entry, index) => (
             <Typography key={index} variant="body2" sx={{ color: entry.color }}>
-              {entry.dataKey.includes('_name') ? '' : `${entry.dataKey}: ${entry.value.toFixed(2)}%`}
+              {`${entry.name}: ${entry.value.toFixed(2)}%`}
             </Typography>
           ))}
         </Box>
@@ -199,28 +183,19 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
               tickFormatter={(value) => `${value}%`}
             />
             <Tooltip content={<CustomTooltip />} />
-            <Legend 
-              wrapperStyle={{ color: 'white', paddingTop: '20px' }}
-              formatter={(value, entry) => {
-                // ETF 이름을 표시하도록 수정
-                const etf = etfs.find(e => (e.ticker || e) === value)
-                return etf ? (etf.name || etf) : value
-              }}
-            />
-            {etfs.map((etf, idx) => {
-              const ticker = etf.ticker || etf
-              return (
-                <Line
-                  key={ticker}
-                  type="monotone"
-                  dataKey={ticker}
-                  stroke={LINE_COLORS[idx % LINE_COLORS.length]}
-                  strokeWidth={2}
-                  dot={false}
-                  activeDot={{ r: 5, fill: LINE_COLORS[idx % LINE_COLORS.length] }}
-                />
-              )
-            })}
+            <Legend wrapperStyle={{ color: 'white', paddingTop: '20px' }} />
+            {lines.map((line) => (
+              <Line
+                key={line.key}
+                type="monotone"
+                dataKey={line.key}
+                name={line.name}
+                stroke={line.color}
+                strokeWidth={2}
+                dot={false}
+                activeDot={{ r: 5, fill: line.color }}
+              />
+            ))}
           </LineChart>
         </ResponsiveContainer>
       </Box>
@@ -256,26 +231,28 @@ const PriceTrendTab = ({ etfs = [], period = '3m' }) => {
 
       {/* 범례 */}
       <Box sx={{ display: 'flex', justifyContent: 'center', gap: 3, flexWrap: 'wrap' }}>
-        {etfs.map((etf, idx) => {
-          const ticker = etf.ticker || etf
-          const name = etf.name || etf
-          return (
-            <Box key={ticker} sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-              <Box
-                sx={{
-                  width: 12,
-                  height: 12,
-                  backgroundColor: LINE_COLORS[idx % LINE_COLORS.length],
-                  borderRadius: '50%'
-                }}
-              />
-              <Typography variant="body2" sx={{ color: '#9aa4d4', fontSize: '0.75rem' }}>
-                {name}
-              </Typography>
-            </Box>
-          )
-        })}
+        {lines.map((line) => (
+          <Box key={line.key} sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+            <Box
+              sx={{
+                width: 12,
+                height: 12,
+                backgroundColor: line.color,
+                borderRadius: '50%'
+              }}
+            />
+            <Typography variant="body2" sx={{ color: '#9aa4d4', fontSize: '0.75rem' }}>
+              {line.name}
+            </Typography>
+          </Box>
+        ))}
       </Box>
+
+      {failed.length > 0 && (
+        <Alert severity="warning" sx={{ mt: 2, backgroundColor: '#1a1f3a', color: 'white' }}>
+          데이터를 찾을 수 없어 제외한 ETF: {failed.join(', ')}
+        </Alert>
+      )}
     </Box>
   )
 }
@@ -91,3 +91,35 @@ export const fetchEtfData = async (ticker) => {
     throw error
   }
 }
+
+/**
+ * 여러 ETF의 기술적 지표를 서버에서 일괄 계산하여 가져오는 함수
+ * @param {Array} tickers - ETF 티커 배열
+ * @param {Array} indicators - 지표 명세 배열 (예: ['sma', { name: 'rsi', window: 14 }])
+ * @param {string} period - 기간
+ * @returns {Promise<Object>} 티커별 지표 결과
+ */
+export const fetchIndicators = async (tickers, indicators, period = '1y') => {
+  try {
+    const response = await fetch('/api/indicators', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ tickers, indicators, period })
+    })
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`)
+    }
+
+    const data = await response.json()
+
+    if (data.error) {
+      throw new Error(data.error)
+    }
+
+    return data.results
+  } catch (error) {
+    console.error('Failed to fetch indicators:', error)
+    throw error
+  }
+}